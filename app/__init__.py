@@ -288,6 +288,13 @@ def create_app() -> Flask:
     # Import all domain models to ensure SQLAlchemy can resolve relationships
     # This must be done after DB initialization but before any queries
     from .domain.models.payment import Payment, PaymentAllocation, PaymentReminder  # noqa: F401
+    from .domain.models.credit_exposure import CustomerCreditExposure  # noqa: F401
+    from .domain.models.customer_sales_aggregate import CustomerSalesAggregate  # noqa: F401
+    from .domain.models.sales_fact import SalesDailyFact, SalesDailyOrderFact, SalesPeriodRollup  # noqa: F401
+    from .domain.models.dashboard_counter import DashboardCounter  # noqa: F401
+    from .domain.models.report_job import ReportJob  # noqa: F401
+    from .domain.models.replenishment import ReplenishmentSkuState  # noqa: F401
+    from .domain.models.receivables_aging import AgingSummarySnapshot  # noqa: F401
 
     # Register CQRS handlers
     from .application.common.mediator import mediator
@@ -406,12 +413,14 @@ def create_app() -> Flask:
     from .application.products.pricing.commands.commands import (
         CreatePriceListCommand, UpdatePriceListCommand, DeletePriceListCommand,
         AddProductToPriceListCommand, UpdateProductPriceInListCommand, RemoveProductFromPriceListCommand,
+        ImportPriceListCommand,
         CreateVolumePricingCommand, UpdateVolumePricingCommand, DeleteVolumePricingCommand,
         CreatePromotionalPriceCommand, UpdatePromotionalPriceCommand, DeletePromotionalPriceCommand
     )
     from .application.products.pricing.commands.handlers import (
         CreatePriceListHandler, UpdatePriceListHandler, DeletePriceListHandler,
         AddProductToPriceListHandler, UpdateProductPriceInListHandler, RemoveProductFromPriceListHandler,
+        ImportPriceListHandler,
         CreateVolumePricingHandler, UpdateVolumePricingHandler, DeleteVolumePricingHandler,
         CreatePromotionalPriceHandler, UpdatePromotionalPriceHandler, DeletePromotionalPriceHandler
     )
@@ -420,12 +429,14 @@ def create_app() -> Flask:
     from .application.products.pricing.queries.queries import (
         ListPriceListsQuery, GetPriceListByIdQuery, GetProductsInPriceListQuery,
         GetVolumePricingQuery,
-        GetActivePromotionalPricesQuery, GetPromotionalPricesByProductQuery
+        GetActivePromotionalPricesQuery, GetPromotionalPricesByProductQuery,
+        SimulatePricingQuery
     )
     from .application.products.pricing.queries.handlers import (
         ListPriceListsHandler, GetPriceListByIdHandler, GetProductsInPriceListHandler,
         GetVolumePricingHandler,
-        GetActivePromotionalPricesHandler, GetPromotionalPricesByProductHandler
+        GetActivePromotionalPricesHandler, GetPromotionalPricesByProductHandler,
+        SimulatePricingHandler
     )
     
     mediator.register_command(CreatePriceListCommand, CreatePriceListHandler())
@@ -434,6 +445,7 @@ def create_app() -> Flask:
     mediator.register_command(AddProductToPriceListCommand, AddProductToPriceListHandler())
     mediator.register_command(UpdateProductPriceInListCommand, UpdateProductPriceInListHandler())
     mediator.register_command(RemoveProductFromPriceListCommand, RemoveProductFromPriceListHandler())
+    mediator.register_command(ImportPriceListCommand, ImportPriceListHandler())
     
     mediator.register_command(CreateVolumePricingCommand, CreateVolumePricingHandler())
     mediator.register_command(UpdateVolumePricingCommand, UpdateVolumePricingHandler())
@@ -451,6 +463,7 @@ def create_app() -> Flask:
     
     mediator.register_query(GetActivePromotionalPricesQuery, GetActivePromotionalPricesHandler())
     mediator.register_query(GetPromotionalPricesByProductQuery, GetPromotionalPricesByProductHandler())
+    mediator.register_query(SimulatePricingQuery, SimulatePricingHandler())
     
     # Register Domain Event Handlers
     from .application.common.domain_event_dispatcher import domain_event_dispatcher
@@ -526,6 +539,58 @@ def create_app() -> Flask:
         OrderShippedDomainEvent,
         OrderShippedDomainEventHandler().handle
     )
+    
+    # Register credit exposure read model handler
+    from .domain.models.order import OrderStatusChangedDomainEvent
+    from .domain.models.invoice import InvoiceValidatedDomainEvent
+    from .domain.models.payment import PaymentCreatedDomainEvent, PaymentAllocatedDomainEvent
+    from .application.customers.events.credit_exposure_handler import CreditExposureDomainEventHandler
+    
+    credit_exposure_handler = CreditExposureDomainEventHandler()
+    for credit_event in (
+        OrderConfirmedDomainEvent,
+        OrderCanceledDomainEvent,
+        OrderStatusChangedDomainEvent,
+        InvoiceValidatedDomainEvent,
+        PaymentCreatedDomainEvent,
+        PaymentAllocatedDomainEvent,
+    ):
+        domain_event_dispatcher.register_handler(credit_event, credit_exposure_handler.handle)
+    
+    # Register customer sales aggregates read model handler
+    from .application.customers.events.sales_aggregate_handler import CustomerSalesAggregateDomainEventHandler
+    
+    sales_aggregate_handler = CustomerSalesAggregateDomainEventHandler()
+    domain_event_dispatcher.register_handler(OrderConfirmedDomainEvent, sales_aggregate_handler.handle)
+    domain_event_dispatcher.register_handler(OrderCanceledDomainEvent, sales_aggregate_handler.handle)
+    
+    # Register sales fact read model handler
+    from .domain.models.order import OrderCreatedDomainEvent
+    from .application.sales.orders.events.sales_fact_handler import SalesFactDomainEventHandler
+    
+    sales_fact_handler = SalesFactDomainEventHandler()
+    for sales_event in (
+        OrderCreatedDomainEvent,
+        OrderConfirmedDomainEvent,
+        OrderCanceledDomainEvent,
+        OrderStatusChangedDomainEvent,
+    ):
+        domain_event_dispatcher.register_handler(sales_event, sales_fact_handler.handle)
+    
+    # Register receivables aging summary cache handler
+    from .domain.models.invoice import InvoiceSentDomainEvent, InvoicePaidDomainEvent, CreditNoteCreatedDomainEvent
+    from .application.billing.payments.events.aging_summary_handler import AgingSummaryDomainEventHandler
+    
+    aging_summary_handler = AgingSummaryDomainEventHandler()
+    for aging_event in (
+        InvoiceValidatedDomainEvent,
+        InvoiceSentDomainEvent,
+        InvoicePaidDomainEvent,
+        CreditNoteCreatedDomainEvent,
+        PaymentCreatedDomainEvent,
+        PaymentAllocatedDomainEvent,
+    ):
+        domain_event_dispatcher.register_handler(aging_event, aging_summary_handler.handle)
     # TODO: Register handlers for CategoryCreatedDomainEvent, etc.
 
     # Register Customer Commands
@@ -840,16 +905,18 @@ def create_app() -> Flask:
     
     # Invoice Commands/Queries
     from .application.billing.invoices.commands.commands import (
-        CreateInvoiceCommand, ValidateInvoiceCommand, SendInvoiceCommand, CreateCreditNoteCommand
+        CreateInvoiceCommand, ValidateInvoiceCommand, SendInvoiceCommand, CreateCreditNoteCommand,
+        CreateInvoicesFromOrdersCommand
     )
     from .application.billing.invoices.commands.handlers import (
-        CreateInvoiceHandler, ValidateInvoiceHandler, SendInvoiceHandler, CreateCreditNoteHandler
+        CreateInvoiceHandler, ValidateInvoiceHandler, SendInvoiceHandler, CreateCreditNoteHandler,
+        CreateInvoicesFromOrdersHandler
     )
     from .application.billing.invoices.queries.queries import (
-        ListInvoicesQuery, GetInvoiceByIdQuery, GetInvoiceHistoryQuery
+        ListInvoicesQuery, GetInvoiceByIdQuery, GetInvoicesByIdsQuery, GetInvoiceHistoryQuery
     )
     from .application.billing.invoices.queries.handlers import (
-        ListInvoicesHandler, GetInvoiceByIdHandler, GetInvoiceHistoryHandler
+        ListInvoicesHandler, GetInvoiceByIdHandler, GetInvoicesByIdsHandler, GetInvoiceHistoryHandler
     )
     
     # Register Invoice Commands
@@ -857,26 +924,29 @@ def create_app() -> Flask:
     mediator.register_command(ValidateInvoiceCommand, ValidateInvoiceHandler())
     mediator.register_command(SendInvoiceCommand, SendInvoiceHandler())
     mediator.register_command(CreateCreditNoteCommand, CreateCreditNoteHandler())
+    mediator.register_command(CreateInvoicesFromOrdersCommand, CreateInvoicesFromOrdersHandler())
     
     # Register Invoice Queries
     mediator.register_query(ListInvoicesQuery, ListInvoicesHandler())
     mediator.register_query(GetInvoiceByIdQuery, GetInvoiceByIdHandler())
+    mediator.register_query(GetInvoicesByIdsQuery, GetInvoicesByIdsHandler())
     mediator.register_query(GetInvoiceHistoryQuery, GetInvoiceHistoryHandler())
     
     # Payment Commands/Queries
     from .application.billing.payments.commands.commands import (
         CreatePaymentCommand, AllocatePaymentCommand, ReconcilePaymentCommand, ImportBankStatementCommand,
-        ConfirmPaymentCommand
+        ConfirmPaymentCommand, AutoAllocatePaymentsCommand
     )
     from .application.billing.payments.commands.handlers import (
         CreatePaymentHandler, AllocatePaymentHandler, ReconcilePaymentHandler, ImportBankStatementHandler,
-        ConfirmPaymentHandler
+        ConfirmPaymentHandler, AutoAllocatePaymentsHandler
     )
     from .application.billing.payments.queries.queries import (
-        ListPaymentsQuery, GetPaymentByIdQuery, GetOverdueInvoicesQuery, GetAgingReportQuery
+        ListPaymentsQuery, GetPaymentByIdQuery, GetOverdueInvoicesQuery, GetAgingReportQuery, GetAgingSummaryQuery
     )
     from .application.billing.payments.queries.handlers import (
-        ListPaymentsHandler, GetPaymentByIdHandler, GetOverdueInvoicesHandler, GetAgingReportHandler
+        ListPaymentsHandler, GetPaymentByIdHandler, GetOverdueInvoicesHandler, GetAgingReportHandler,
+        GetAgingSummaryHandler
     )
     
     # Register Payment Commands
@@ -885,12 +955,14 @@ def create_app() -> Flask:
     mediator.register_command(ReconcilePaymentCommand, ReconcilePaymentHandler())
     mediator.register_command(ImportBankStatementCommand, ImportBankStatementHandler())
     mediator.register_command(ConfirmPaymentCommand, ConfirmPaymentHandler())
+    mediator.register_command(AutoAllocatePaymentsCommand, AutoAllocatePaymentsHandler())
     
     # Register Payment Queries
     mediator.register_query(ListPaymentsQuery, ListPaymentsHandler())
     mediator.register_query(GetPaymentByIdQuery, GetPaymentByIdHandler())
     mediator.register_query(GetOverdueInvoicesQuery, GetOverdueInvoicesHandler())
     mediator.register_query(GetAgingReportQuery, GetAgingReportHandler())
+    mediator.register_query(GetAgingSummaryQuery, GetAgingSummaryHandler())
     
     # Register Dashboard Queries
     from .application.dashboard.queries import (
@@ -9,6 +9,7 @@ from app.application.dashboard.queries.queries import (
     GetKPIsQuery, GetRevenueQuery, GetStockAlertsQuery, GetActiveOrdersQuery
 )
 from app.security.rbac import require_roles
+from app.services.dashboard_kpi_service import DashboardKPIService
 from app.utils.response import success_response, error_response
 from app.utils.locale import get_user_locale
 
@@ -18,7 +19,7 @@ dashboard_bp = Blueprint("dashboard", __name__)
 def _kpi_dto_to_dict(dto):
     """Convert KPIDTO to dict."""
     return {
-        'total_revenue': float(dto.total_revenue),
+        'total_revenue': float(dto.total_revenue) if dto.total_revenue is not None else None,
         'total_revenue_period': dto.total_revenue_period,
         'revenue_change_percent': float(dto.revenue_change_percent) if dto.revenue_change_percent else None,
         'total_orders': dto.total_orders,
@@ -91,6 +92,8 @@ def get_kpis():
     - period: 'day', 'week', 'month', 'year' (default: 'month')
     - start_date: ISO date string (optional)
     - end_date: ISO date string (optional)
+    - kpis: Comma-separated KPI names to compute (optional, default: all), e.g.
+      'total_revenue,total_orders,active_customers,products_in_stock,stock_alerts_count,active_orders_count'
     - locale: 'fr' or 'ar' (optional)
     """
     try:
@@ -99,6 +102,13 @@ def get_kpis():
         
         # Get query parameters
         period = request.args.get('period', 'month')
+        kpis = None
+        if request.args.get('kpis'):
+            kpis = [name.strip() for name in request.args.get('kpis').split(',') if name.strip()]
+            try:
+                DashboardKPIService.validate_kpis(kpis)
+            except ValueError as e:
+                return error_response(message=str(e), status_code=400)
         start_date = None
         end_date = None
         
@@ -111,7 +121,8 @@ def get_kpis():
         query = GetKPIsQuery(
             period=period,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            kpis=kpis
         )
         kpi_dto = mediator.dispatch(query)
         
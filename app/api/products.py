@@ -1,4 +1,4 @@
-from flask import Blueprint, request, send_file, Response
+from flask import Blueprint, request, send_file, Response, stream_with_context
 from flask_babel import get_locale, gettext as _
 from app.application.common.mediator import mediator
 from app.application.products.commands.commands import (
@@ -20,21 +20,24 @@ from app.application.products.variants.queries.queries import (
 from app.application.products.pricing.commands.commands import (
     CreatePriceListCommand, UpdatePriceListCommand, DeletePriceListCommand,
     AddProductToPriceListCommand, UpdateProductPriceInListCommand, RemoveProductFromPriceListCommand,
+    ImportPriceListCommand,
     CreateVolumePricingCommand, UpdateVolumePricingCommand, DeleteVolumePricingCommand
 )
 from app.application.products.pricing.queries.queries import (
     ListPriceListsQuery, GetPriceListByIdQuery, GetProductsInPriceListQuery,
-    GetVolumePricingQuery
+    GetVolumePricingQuery, SimulatePricingQuery
 )
 from app.api.schemas.product_schema import (
     ProductCreateSchema, ProductUpdateSchema, ProductSchema,
     CategoryCreateSchema, CategoryUpdateSchema, CategorySchema
 )
 from app.security.rbac import require_roles
+from flask_jwt_extended import get_jwt_identity
 from app.utils.response import success_response, error_response, paginated_response
 from app.services.import_export import ImportExportService
+from app.services.streaming_export import spooled_file
+from datetime import date
 from decimal import Decimal
-import io
 
 products_bp = Blueprint("products", __name__)
 
@@ -398,30 +401,26 @@ def export_products():
         category_id = request.args.get('category_id', type=int)
         status = request.args.get('status')
         
-        query = ListProductsQuery(
-            page=1,
-            per_page=10000,  # Large limit for export
+        # Products are read by keyset pages and written as they are read
+        products = ImportExportService.iter_products_for_export(
             search=search,
             category_id=category_id,
             status=status
         )
-        products = mediator.dispatch(query)
-        
-        # Convert to dictionaries
-        products_data = [ProductSchema().dump(p) for p in products]
         
         if format_type == 'excel':
-            excel_bytes = ImportExportService.export_products_to_excel(products_data)
+            output = spooled_file()
+            ImportExportService.write_products_excel(products, output)
+            output.seek(0)
             return send_file(
-                io.BytesIO(excel_bytes),
+                output,
                 mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
                 as_attachment=True,
                 download_name='products_export.xlsx'
             )
         else:  # CSV
-            csv_content = ImportExportService.export_products_to_csv(products_data)
             return Response(
-                csv_content,
+                stream_with_context(ImportExportService.stream_products_csv(products)),
                 mimetype='text/csv',
                 headers={'Content-Disposition': 'attachment; filename=products_export.csv'}
             )
@@ -982,4 +981,125 @@ def remove_product_from_price_list(price_list_id: int, product_id: int):
     except ValueError as e:
         return error_response(_(str(e)), status_code=400)
     except Exception as e:
-        return error_response(_(str(e)), status_code=400)
\ No newline at end of file
+        return error_response(_(str(e)), status_code=400)
+
+@products_bp.post("/price-lists/<int:price_list_id>/import")
+@require_roles("admin", "commercial")
+def import_price_list(price_list_id: int):
+    """
+    Bulk load a supplier tariff file (CSV or XLSX with code and price columns) into a price list.
+    
+    Form fields: file, dry_run (true/false), replace_missing (true/false).
+    Supports locale parameter (?locale=fr|ar).
+    """
+    try:
+        if 'file' not in request.files:
+            return error_response(_('No file provided'), status_code=400)
+        
+        file = request.files['file']
+        if file.filename == '':
+            return error_response(_('No file selected'), status_code=400)
+        
+        user_id = get_jwt_identity()
+        command = ImportPriceListCommand(
+            price_list_id=price_list_id,
+            file=file.stream,
+            filename=file.filename,
+            replace_missing=request.form.get('replace_missing', 'false').lower() == 'true',
+            dry_run=request.form.get('dry_run', 'false').lower() == 'true',
+            changed_by=int(user_id) if user_id else None
+        )
+        summary = mediator.dispatch(command)
+        
+        return success_response({
+            'price_list_id': summary.price_list_id,
+            'dry_run': summary.dry_run,
+            'rows_read': summary.rows_read,
+            'inserted': summary.inserted,
+            'updated': summary.updated,
+            'deleted': summary.deleted,
+            'unchanged': summary.unchanged,
+            'errors': len(summary.errors),
+            'error_details': summary.errors,
+            'changes': [
+                {
+                    'action': change.action,
+                    'product_id': change.product_id,
+                    'product_code': change.product_code,
+                    'old_price': float(change.old_price) if change.old_price is not None else None,
+                    'new_price': float(change.new_price) if change.new_price is not None else None
+                }
+                for change in summary.changes
+            ]
+        }, message=_('Price list import simulated') if summary.dry_run else _('Price list imported successfully'))
+    except ValueError as e:
+        return error_response(_(str(e)), status_code=400)
+    except Exception as e:
+        return error_response(_('Import failed: {}').format(str(e)), status_code=500)
+
+
+# ==================== Pricing Simulation Endpoints ====================
+
+def _simulation_breakdown_to_dict(breakdown) -> dict:
+    """Convert a SimulationBreakdown to a JSON-serializable dict."""
+    return {
+        'key': breakdown.key,
+        'line_count': breakdown.line_count,
+        'repriced_line_count': breakdown.repriced_line_count,
+        'quantity': float(breakdown.quantity),
+        'current_revenue': float(breakdown.current_revenue),
+        'simulated_revenue': float(breakdown.simulated_revenue),
+        'revenue_delta': float(breakdown.revenue_delta),
+        'current_margin': float(breakdown.current_margin),
+        'simulated_margin': float(breakdown.simulated_margin),
+        'margin_delta': float(breakdown.margin_delta)
+    }
+
+
+@products_bp.post("/pricing/simulate")
+@require_roles("admin", "commercial", "direction")
+def simulate_pricing():
+    """
+    Simulate a candidate price list or volume-tier grid against historical order lines.
+    
+    Body: date_from, date_to (ISO dates) and either price_list_id or rules
+    ({product_prices, volume_tiers, customer_ids}); optional include_volume_tiers,
+    all_customers and top. Supports locale parameter (?locale=fr|ar).
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return error_response(_('Request body is required'), status_code=400)
+        if not data.get('date_from') or not data.get('date_to'):
+            return error_response(_('date_from and date_to are required'), status_code=400)
+        try:
+            top = int(data.get('top', 50))
+        except (TypeError, ValueError):
+            return error_response(_('top must be an integer'), status_code=400)
+        
+        query = SimulatePricingQuery(
+            date_from=date.fromisoformat(data['date_from']),
+            date_to=date.fromisoformat(data['date_to']),
+            price_list_id=data.get('price_list_id'),
+            rules=data.get('rules'),
+            include_volume_tiers=bool(data.get('include_volume_tiers', False)),
+            all_customers=bool(data.get('all_customers', False)),
+            top=top
+        )
+        result = mediator.dispatch(query)
+        
+        return success_response({
+            'date_from': result.date_from.isoformat(),
+            'date_to': result.date_to.isoformat(),
+            'line_count': result.line_count,
+            'repriced_line_count': result.repriced_line_count,
+            'elapsed_ms': result.elapsed_ms,
+            'totals': _simulation_breakdown_to_dict(result.totals),
+            'by_product': [_simulation_breakdown_to_dict(b) for b in result.by_product],
+            'by_customer': [_simulation_breakdown_to_dict(b) for b in result.by_customer],
+            'by_category': [_simulation_breakdown_to_dict(b) for b in result.by_category]
+        })
+    except ValueError as e:
+        return error_response(_(str(e)), status_code=400)
+    except Exception as e:
+        return error_response(_('Failed to simulate pricing: {}').format(str(e)), status_code=500)
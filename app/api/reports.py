@@ -1,9 +1,10 @@
 """API endpoints for reports and analytics."""
-from flask import Blueprint, request, jsonify, send_file
+import os
+from flask import Blueprint, request, jsonify, send_file, Response, stream_with_context, url_for
+from flask_jwt_extended import get_jwt_identity
 from flask_babel import gettext as _
 from datetime import date, datetime
 from decimal import Decimal
-from io import BytesIO
 
 from app.application.common.mediator import mediator
 from app.application.reports.queries.queries import (
@@ -12,6 +13,10 @@ from app.application.reports.queries.queries import (
     GetSalesForecastQuery, GetStockForecastQuery
 )
 from app.services.report_export_service import ReportExportService
+from app.services.streaming_export import spooled_file
+from app.services.report_job_service import ReportJobService, REPORT_FORMATS
+from app.domain.models.report_job import ReportJob
+from app.infrastructure.db import get_session
 from app.security.rbac import require_roles
 
 reports_bp = Blueprint('reports', __name__, url_prefix='/api/reports')
@@ -420,9 +425,11 @@ def export_report():
         export_service = ReportExportService()
         
         if format_type == 'excel':
-            excel_bytes = export_service.export_to_excel(report_data)
+            output = spooled_file()
+            export_service.write_excel(report_data, output)
+            output.seek(0)
             return send_file(
-                BytesIO(excel_bytes),
+                output,
                 mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
                 as_attachment=True,
                 download_name=f'{report_data.title.replace(" ", "_")}.xlsx'
@@ -436,12 +443,11 @@ def export_report():
                 download_name=f'{report_data.title.replace(" ", "_")}.pdf'
             )
         elif format_type == 'csv':
-            csv_content = export_service.export_to_csv(report_data)
-            return send_file(
-                BytesIO(csv_content.encode('utf-8')),
+            filename = f'{report_data.title.replace(" ", "_")}.csv'
+            return Response(
+                stream_with_context(export_service.stream_csv(report_data)),
                 mimetype='text/csv',
-                as_attachment=True,
-                download_name=f'{report_data.title.replace(" ", "_")}.csv'
+                headers={'Content-Disposition': f'attachment; filename={filename}'}
             )
         else:
             return jsonify({
@@ -455,3 +461,123 @@ def export_report():
             'error': str(e)
         }), 500
 
+
+
+# ==================== Report Jobs ====================
+
+def _job_to_dict(job: ReportJob, cached: bool = False) -> dict:
+    """Serialize a report job for the API."""
+    data = {
+        'id': job.id,
+        'report_type': job.report_type,
+        'format': job.format,
+        'status': job.status,
+        'progress': job.progress,
+        'error': job.error,
+        'cached': cached,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'completed_at': job.completed_at.isoformat() if job.completed_at else None,
+        'expires_at': job.expires_at.isoformat() if job.expires_at else None,
+        'status_url': url_for('reports.get_report_job', job_id=job.id),
+    }
+    if job.status == 'completed':
+        if job.format == 'json':
+            data['result'] = job.result
+        else:
+            data['download_url'] = url_for('reports.download_report_job', job_id=job.id)
+    return data
+
+
+@reports_bp.route('/jobs', methods=['POST'])
+@require_roles('admin', 'direction', 'commercial')
+def submit_report_job():
+    """
+    Submit a report as a background job.
+    
+    Body: report_type, format ('json', 'excel', 'pdf', 'csv') and the report
+    query parameters. A request matching a pending, running or unexpired
+    completed job returns that job (cached: true).
+    """
+    try:
+        data = request.get_json() or {}
+        parameters = dict(data)
+        report_type = parameters.pop('report_type', None)
+        output_format = parameters.pop('format', 'json')
+        for name in ('start_date', 'end_date'):
+            if parameters.get(name):
+                parameters[name] = _parse_date(parameters[name])
+        
+        # Get current user ID from JWT (string identity)
+        current_user_id = get_jwt_identity()
+        if isinstance(current_user_id, str):
+            current_user_id = int(current_user_id)
+        
+        with get_session() as session:
+            job, created = ReportJobService(session).submit(
+                report_type, parameters, output_format=output_format, created_by=current_user_id
+            )
+            job_id = job.id
+            session.commit()
+        
+        if created:
+            ReportJobService.enqueue(job_id)
+        
+        with get_session() as session:
+            job = session.get(ReportJob, job_id)
+            return jsonify({
+                'success': True,
+                'data': _job_to_dict(job, cached=not created)
+            }), 200 if job.status == 'completed' else 202
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@reports_bp.route('/jobs/<job_id>', methods=['GET'])
+@require_roles('admin', 'direction', 'commercial')
+def get_report_job(job_id: str):
+    """Get the status, progress and (for JSON jobs) result of a report job."""
+    with get_session() as session:
+        job = session.get(ReportJob, job_id)
+        if not job:
+            return jsonify({
+                'success': False,
+                'error': f'Report job {job_id} not found'
+            }), 404
+        return jsonify({
+            'success': True,
+            'data': _job_to_dict(job)
+        })
+
+
+@reports_bp.route('/jobs/<job_id>/download', methods=['GET'])
+@require_roles('admin', 'direction', 'commercial')
+def download_report_job(job_id: str):
+    """Download the exported file of a completed report job."""
+    with get_session() as session:
+        job = session.get(ReportJob, job_id)
+        if not job or job.status != 'completed' or not job.file_path:
+            return jsonify({
+                'success': False,
+                'error': f'No file available for report job {job_id}'
+            }), 404
+        file_path, file_name, output_format = job.file_path, job.file_name, job.format
+    
+    if not os.path.exists(file_path):
+        return jsonify({
+            'success': False,
+            'error': f'Report job {job_id} has expired'
+        }), 410
+    return send_file(
+        file_path,
+        mimetype=REPORT_FORMATS[output_format][1],
+        as_attachment=True,
+        download_name=file_name
+    )
@@ -438,17 +438,16 @@ def get_quote_suggestions(quote_id: int):
     try:
         locale = get_user_locale()
         
-        # Get quote
-        quote_dto = mediator.dispatch(GetQuoteByIdQuery(id=quote_id, include_lines=True))
-        
         # Use Pricing Service
         from app.infrastructure.db import get_session
         from app.services.pricing_service import PricingService
+        from sqlalchemy.orm import selectinload
         
         with get_session() as session:
-            # Get quote entity for service
+            # Get quote entity for service (lines loaded in one query);
+            # customer history comes from the precomputed sales aggregates
             from app.domain.models.quote import Quote
-            quote = session.get(Quote, quote_id)
+            quote = session.get(Quote, quote_id, options=[selectinload(Quote.lines)])
             if not quote:
                 return error_response(_('Quote not found'), status_code=404)
             
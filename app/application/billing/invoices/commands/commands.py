@@ -59,3 +59,15 @@ class CreateCreditNoteCommand(Command):
     created_by: int = None
     number: Optional[str] = None
 
+
+@dataclass
+class CreateInvoicesFromOrdersCommand(Command):
+    """Command to invoice many delivered orders in one batch run (e.g. month-end invoicing)."""
+    invoice_date: date
+    created_by: int
+    due_date: Optional[date] = None  # None = invoice date + 30 days
+    order_ids: Optional[List[int]] = None  # None = every delivered order not invoiced yet
+    customer_ids: Optional[List[int]] = None
+    customer_category: Optional[str] = None  # Customer group
+    delivered_from: Optional[date] = None
+    delivered_to: Optional[date] = None
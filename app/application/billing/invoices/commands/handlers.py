@@ -5,9 +5,10 @@ from app.application.common.cqrs import CommandHandler
 from app.domain.models.invoice import Invoice, InvoiceLine, CreditNote
 from app.domain.models.order import Order, OrderStatus
 from app.infrastructure.db import get_session
-from app.services.invoice_numbering_service import InvoiceNumberingService
+from app.services.invoice_numbering_service import INVOICE_PREFIX, InvoiceNumberingService
 from .commands import (
-    CreateInvoiceCommand, ValidateInvoiceCommand, SendInvoiceCommand, CreateCreditNoteCommand
+    CreateInvoiceCommand, ValidateInvoiceCommand, SendInvoiceCommand, CreateCreditNoteCommand,
+    CreateInvoicesFromOrdersCommand
 )
 
 
@@ -25,6 +26,13 @@ class CreateInvoiceHandler(CommandHandler):
             Invoice ID (int) to avoid detached instance issues
         """
         with get_session() as session:
+            # Lock the invoice numbering sequence first: invoice creations (single
+            # and bulk) are serialized until commit, so the existence check and the
+            # invoiced quantities read below include invoices created concurrently
+            year = command.invoice_date.year
+            numbering_service = InvoiceNumberingService(session)
+            sequence = numbering_service.lock_sequence(INVOICE_PREFIX, year)
+            
             # Get the order with lines eagerly loaded
             from sqlalchemy.orm import joinedload
             order = session.query(Order).options(
@@ -52,9 +60,10 @@ class CreateInvoiceHandler(CommandHandler):
                     f"An invoice already exists for order '{order.number}': {existing_invoice.number}"
                 )
             
-            # Use InvoiceNumberingService to generate number
-            numbering_service = InvoiceNumberingService(session)
-            invoice_number = command.number or numbering_service.generate_invoice_number()
+            # Next number of the locked sequence
+            invoice_number = command.number or numbering_service.format_number(
+                INVOICE_PREFIX, year, sequence.allocate(1)[0]
+            )
             
             # Calculate due date if not provided (default: 30 days from invoice date)
             due_date = command.due_date
@@ -247,3 +256,34 @@ class CreateCreditNoteHandler(CommandHandler):
             
             return credit_note_id
 
+
+class CreateInvoicesFromOrdersHandler(CommandHandler):
+    """Handler for invoicing many delivered orders in one batch run."""
+    
+    def handle(self, command: CreateInvoicesFromOrdersCommand):
+        """
+        Create a draft invoice for each delivered, not yet invoiced order matching the filters.
+        
+        Args:
+            command: CreateInvoicesFromOrdersCommand with invoice date and order filters
+            
+        Returns:
+            InvoicingRunResult with the created invoices and the skipped orders
+        """
+        from app.services.bulk_invoicing_service import BulkInvoicingService
+        
+        with get_session() as session:
+            service = BulkInvoicingService(session)
+            order_ids = service.find_orders_to_invoice(
+                order_ids=command.order_ids,
+                customer_ids=command.customer_ids,
+                customer_category=command.customer_category,
+                delivered_from=command.delivered_from,
+                delivered_to=command.delivered_to
+            )
+            return service.invoice_orders(
+                order_ids,
+                invoice_date=command.invoice_date,
+                created_by=command.created_by,
+                due_date=command.due_date
+            )
@@ -1,7 +1,7 @@
 """Invoice query DTOs for CQRS."""
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from app.application.common.cqrs import Query
 
 
@@ -24,6 +24,12 @@ class GetInvoiceByIdQuery(Query):
     id: int
 
 
+@dataclass
+class GetInvoicesByIdsQuery(Query):
+    """Query to get several invoices, with lines and credit notes, by ID."""
+    ids: List[int]
+
+
 @dataclass
 class GetInvoiceHistoryQuery(Query):
     """Query to get invoice history (status changes, payments, etc.)."""
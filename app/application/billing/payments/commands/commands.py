@@ -2,7 +2,7 @@
 from dataclasses import dataclass, field
 from decimal import Decimal
 from datetime import date
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from app.application.common.cqrs import Command
 
 
@@ -51,7 +51,7 @@ class ImportBankStatementCommand(Command):
     """Command to import bank statement and auto-reconcile payments."""
     bank_account: str
     statement_date: date
-    transactions: List[dict]  # List of transaction dicts with reference, amount, date, etc.
+    transactions: Iterable[dict]  # Transaction dicts with reference, amount, date, etc. (list or parsed statement stream)
     imported_by: Optional[int] = None
 
 
@@ -61,3 +61,11 @@ class ConfirmPaymentCommand(Command):
     payment_id: int
     confirmed_by: Optional[int] = None
 
+
+@dataclass
+class AutoAllocatePaymentsCommand(Command):
+    """Command to allocate the unallocated amount of many payments in one batch run."""
+    strategy: str = 'fifo'  # 'fifo' or 'proportional'
+    payment_ids: Optional[List[int]] = None  # None = every confirmed or reconciled payment with an unallocated amount
+    created_by: Optional[int] = None
+    dry_run: bool = False
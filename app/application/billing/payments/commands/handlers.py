@@ -7,7 +7,7 @@ from app.domain.models.invoice import Invoice
 from app.infrastructure.db import get_session
 from .commands import (
     CreatePaymentCommand, AllocatePaymentCommand, ReconcilePaymentCommand, ImportBankStatementCommand,
-    ConfirmPaymentCommand, PaymentAllocationInput
+    ConfirmPaymentCommand, PaymentAllocationInput, AutoAllocatePaymentsCommand
 )
 
 
@@ -117,7 +117,8 @@ class AllocatePaymentHandler(CommandHandler):
             Payment ID (int)
         """
         with get_session() as session:
-            payment = session.get(Payment, command.payment_id)
+            # Payment then invoices locked until commit, as the batch allocation run does
+            payment = session.get(Payment, command.payment_id, with_for_update=True)
             if not payment:
                 raise ValueError(f"Payment with ID {command.payment_id} not found.")
             
@@ -128,7 +129,7 @@ class AllocatePaymentHandler(CommandHandler):
             # Process allocations
             for alloc_input in command.allocations:
                 # Get invoice
-                invoice = session.get(Invoice, alloc_input.invoice_id)
+                invoice = session.get(Invoice, alloc_input.invoice_id, with_for_update=True)
                 if not invoice:
                     raise ValueError(f"Invoice with ID {alloc_input.invoice_id} not found.")
                 
@@ -241,3 +242,30 @@ class ConfirmPaymentHandler(CommandHandler):
             
             return payment_id
 
+
+class AutoAllocatePaymentsHandler(CommandHandler):
+    """Handler for allocating many payments to open invoices in one batch run."""
+    
+    def handle(self, command: AutoAllocatePaymentsCommand):
+        """
+        Allocate the unallocated amount of the payments to their customers' open invoices.
+        
+        Args:
+            command: AutoAllocatePaymentsCommand with strategy and optional payment IDs
+            
+        Returns:
+            AllocationRunResult with one result per payment
+        """
+        from app.services.payment_auto_allocation_service import PaymentAutoAllocationService
+        
+        with get_session() as session:
+            result = PaymentAutoAllocationService(session).allocate_payments(
+                strategy=command.strategy,
+                payment_ids=command.payment_ids,
+                created_by=command.created_by,
+                dry_run=command.dry_run
+            )
+            
+            session.commit()
+            
+            return result
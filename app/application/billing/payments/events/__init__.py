@@ -0,0 +1,6 @@
+"""Payment domain event handlers."""
+from .aging_summary_handler import AgingSummaryDomainEventHandler
+
+__all__ = [
+    'AgingSummaryDomainEventHandler',
+]
@@ -0,0 +1,27 @@
+"""Domain event handler invalidating the cached receivables aging summary."""
+from typing import Optional
+from app.application.common.domain_event_handler import DomainEventHandler
+from app.domain.events.domain_event import DomainEvent
+from app.domain.events.integration_event import IIntegrationEvent
+from app.infrastructure.db import get_session
+from app.services.aging_service import AgingService
+
+
+class AgingSummaryDomainEventHandler(DomainEventHandler):
+    """
+    Handler marking the aging summary snapshots stale.
+    
+    Registered for invoice and payment events that change amounts due; the
+    next dashboard request recomputes the summary instead of serving the
+    snapshot.
+    """
+    
+    def map_to_integration_event(self, domain_event: DomainEvent) -> Optional[IIntegrationEvent]:
+        """Cache invalidation is internal only."""
+        return None
+    
+    def handle_internal(self, event: DomainEvent) -> None:
+        """Mark every cached aging summary stale."""
+        with get_session() as session:
+            AgingService(session).mark_summaries_stale()
+            session.commit()
@@ -1,18 +1,20 @@
 """Query handlers for payment management."""
-from decimal import Decimal
+from dataclasses import asdict
 from datetime import date, datetime, timedelta
 from typing import List, Optional
 from sqlalchemy import or_, and_, func, case
+from sqlalchemy.orm import joinedload
 from app.application.common.cqrs import QueryHandler
 from app.domain.models.payment import Payment, PaymentAllocation, PaymentStatus, PaymentMethod
-from app.domain.models.invoice import Invoice
+from app.domain.models.invoice import Invoice, InvoiceStatus
 from app.domain.models.customer import Customer
 from app.infrastructure.db import get_session
+from app.services.aging_service import AgingService
 from .queries import (
-    ListPaymentsQuery, GetPaymentByIdQuery, GetOverdueInvoicesQuery, GetAgingReportQuery
+    ListPaymentsQuery, GetPaymentByIdQuery, GetOverdueInvoicesQuery, GetAgingReportQuery, GetAgingSummaryQuery
 )
 from .payment_dto import (
-    PaymentDTO, PaymentAllocationDTO, OverdueInvoiceDTO, AgingBucketDTO, AgingReportDTO
+    PaymentDTO, PaymentAllocationDTO, OverdueInvoiceDTO, AgingBucketDTO, AgingReportDTO, AgingSummaryDTO
 )
 
 
@@ -229,10 +231,9 @@ class GetOverdueInvoicesHandler(QueryHandler):
         with get_session() as session:
             today = date.today()
             
-            # Build query for overdue invoices
-            q = session.query(Invoice).filter(
-                Invoice.status.in_(["validated", "sent", "partially_paid", "overdue"]),
-                Invoice.due_date < today,
+            # Invoices moved to overdue by the daily transition (customer loaded in the same query)
+            q = session.query(Invoice).options(joinedload(Invoice.customer)).filter(
+                Invoice.status == InvoiceStatus.OVERDUE.value,
                 Invoice.remaining_amount > 0
             )
             
@@ -254,9 +255,6 @@ class GetOverdueInvoicesHandler(QueryHandler):
             # Convert to DTOs
             result = []
             for invoice in invoices:
-                # Load customer
-                session.refresh(invoice, ['customer'])
-                
                 # Calculate days overdue
                 days_overdue = (today - invoice.due_date).days
                 
@@ -295,6 +293,9 @@ class GetAgingReportHandler(QueryHandler):
         """
         Get aging report for customers.
         
+        Bucket sums and counts are aggregated in SQL (see AgingService);
+        invoice details are only loaded when requested, one keyset page at a time.
+        
         Args:
             query: GetAgingReportQuery with filters
             
@@ -303,126 +304,81 @@ class GetAgingReportHandler(QueryHandler):
         """
         with get_session() as session:
             as_of_date = query.as_of_date or date.today()
+            aging_service = AgingService(session)
             
-            # Build query for outstanding invoices
-            q = session.query(Invoice).filter(
-                Invoice.remaining_amount > 0
+            customers = aging_service.customer_aging(
+                as_of_date,
+                customer_id=query.customer_id,
+                include_paid=query.include_paid,
+                boundaries=query.bucket_boundaries
             )
             
-            if not query.include_paid:
-                # Include validated, sent, partially_paid, and overdue invoices
-                # (validated invoices may not be sent yet but still have outstanding amounts)
-                q = q.filter(Invoice.status.in_(["validated", "sent", "partially_paid", "overdue"]))
-            
-            if query.customer_id:
-                q = q.filter(Invoice.customer_id == query.customer_id)
-            
-            invoices = q.all()
-            
-            # Group by customer and calculate aging buckets
-            customer_data = {}
-            
-            for invoice in invoices:
-                # Load customer
-                session.refresh(invoice, ['customer'])
-                
-                customer_id = invoice.customer_id
-                if customer_id not in customer_data:
-                    # Get customer info
-                    customer_code = None
-                    customer_name = None
-                    if invoice.customer:
-                        customer_code = getattr(invoice.customer, 'code', None)
-                        if hasattr(invoice.customer, 'company_name') and invoice.customer.company_name:
-                            customer_name = invoice.customer.company_name
-                        elif hasattr(invoice.customer, 'name'):
-                            customer_name = invoice.customer.name
-                    
-                    customer_data[customer_id] = {
-                        'customer_id': customer_id,
-                        'customer_code': customer_code,
-                        'customer_name': customer_name,
-                        'buckets': {
-                            '0-30': Decimal(0),
-                            '31-60': Decimal(0),
-                            '61-90': Decimal(0),
-                            '90+': Decimal(0)
-                        },
-                        'invoices': []
-                    }
-                
-                # Calculate days overdue (can be negative for future due dates)
-                days_overdue = (as_of_date - invoice.due_date).days
-                
-                # Determine bucket
-                # For invoices not yet due (negative days_overdue), place in 0-30 bucket
-                if days_overdue <= 30:
-                    bucket = '0-30'
-                elif days_overdue <= 60:
-                    bucket = '31-60'
-                elif days_overdue <= 90:
-                    bucket = '61-90'
-                else:
-                    bucket = '90+'
-                
-                # Add to bucket
-                customer_data[customer_id]['buckets'][bucket] += invoice.remaining_amount
-                
-                # Add invoice to list
-                customer_data[customer_id]['invoices'].append(OverdueInvoiceDTO(
-                    invoice_id=invoice.id,
-                    invoice_number=invoice.number,
-                    customer_id=invoice.customer_id,
-                    customer_code=customer_data[customer_id]['customer_code'],
-                    customer_name=customer_data[customer_id]['customer_name'],
-                    invoice_date=invoice.invoice_date,
-                    due_date=invoice.due_date,
-                    total=invoice.total,
-                    paid_amount=invoice.paid_amount,
-                    remaining_amount=invoice.remaining_amount,
-                    days_overdue=days_overdue,
-                    status=invoice.status
-                ))
-            
-            # Convert to DTOs
             result = []
-            for customer_id, data in customer_data.items():
-                # Calculate total outstanding
-                total_outstanding = sum(data['buckets'].values())
-                
-                # Create bucket DTOs
-                buckets = []
-                for bucket_name, amount in data['buckets'].items():
-                    if amount > 0:
-                        # Count invoices that belong to this bucket
-                        invoice_count = 0
-                        for inv in data['invoices']:
-                            days_overdue = (as_of_date - inv.due_date).days
-                            if bucket_name == '0-30' and days_overdue <= 30:
-                                invoice_count += 1
-                            elif bucket_name == '31-60' and 31 <= days_overdue <= 60:
-                                invoice_count += 1
-                            elif bucket_name == '61-90' and 61 <= days_overdue <= 90:
-                                invoice_count += 1
-                            elif bucket_name == '90+' and days_overdue > 90:
-                                invoice_count += 1
-                        buckets.append(AgingBucketDTO(
-                            bucket_name=bucket_name,
-                            total_amount=amount,
-                            invoice_count=invoice_count
-                        ))
-                
-                result.append(AgingReportDTO(
-                    customer_id=data['customer_id'],
-                    customer_code=data['customer_code'],
-                    customer_name=data['customer_name'],
-                    total_outstanding=total_outstanding,
-                    buckets=buckets,
-                    invoices=data['invoices']
-                ))
-            
-            # Sort by total outstanding (highest first)
-            result.sort(key=lambda x: x.total_outstanding, reverse=True)
+            for customer in customers:
+                report = _aging_report_dto(customer)
+                if query.include_invoices:
+                    invoices, report.invoices_next_cursor = aging_service.invoice_page(
+                        as_of_date,
+                        customer_id=customer.customer_id,
+                        include_paid=query.include_paid,
+                        after=query.invoices_after,
+                        limit=query.invoices_per_page
+                    )
+                    report.invoices = [OverdueInvoiceDTO(**asdict(invoice)) for invoice in invoices]
+                result.append(report)
             
             return result
 
+
+class GetAgingSummaryHandler(QueryHandler):
+    """Handler for getting the payments dashboard aging summary."""
+    
+    def handle(self, query: GetAgingSummaryQuery) -> AgingSummaryDTO:
+        """
+        Get today's aging summary, from the snapshot cache when fresh.
+        
+        Args:
+            query: GetAgingSummaryQuery
+            
+        Returns:
+            AgingSummaryDTO
+        """
+        with get_session() as session:
+            summary = AgingService(session).cached_summary(query.bucket_boundaries)
+            session.commit()
+            
+            return AgingSummaryDTO(
+                as_of_date=summary.as_of_date,
+                total_outstanding=summary.total_outstanding,
+                overdue_amount=summary.overdue_amount,
+                overdue_count=summary.overdue_count,
+                customer_count=summary.customer_count,
+                buckets=[
+                    AgingBucketDTO(
+                        bucket_name=bucket.name,
+                        total_amount=bucket.total_amount,
+                        invoice_count=bucket.invoice_count
+                    )
+                    for bucket in summary.buckets
+                ],
+                top_customers=[_aging_report_dto(customer) for customer in summary.top_customers]
+            )
+
+
+def _aging_report_dto(customer) -> AgingReportDTO:
+    """AgingReportDTO of a CustomerAging (without invoice details)."""
+    return AgingReportDTO(
+        customer_id=customer.customer_id,
+        customer_code=customer.customer_code,
+        customer_name=customer.customer_name,
+        total_outstanding=customer.total_outstanding,
+        buckets=[
+            AgingBucketDTO(
+                bucket_name=bucket.name,
+                total_amount=bucket.total_amount,
+                invoice_count=bucket.invoice_count
+            )
+            for bucket in customer.buckets
+        ]
+    )
+
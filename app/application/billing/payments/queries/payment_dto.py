@@ -1,5 +1,5 @@
 """Payment DTOs for query responses."""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
 from datetime import date, datetime
 from typing import List, Optional
@@ -77,4 +77,17 @@ class AgingReportDTO:
     total_outstanding: Decimal = Decimal(0)
     buckets: Optional[List[AgingBucketDTO]] = None
     invoices: Optional[List[OverdueInvoiceDTO]] = None
+    invoices_next_cursor: Optional[str] = None  # Cursor of the next invoice page (None on the last page)
+
+
+@dataclass
+class AgingSummaryDTO:
+    """DTO for the receivables aging summary (payments dashboard)."""
+    as_of_date: date
+    total_outstanding: Decimal = Decimal(0)
+    overdue_amount: Decimal = Decimal(0)
+    overdue_count: int = 0
+    customer_count: int = 0
+    buckets: List[AgingBucketDTO] = field(default_factory=list)
+    top_customers: List[AgingReportDTO] = field(default_factory=list)
 
@@ -2,7 +2,7 @@
 from dataclasses import dataclass
 from decimal import Decimal
 from datetime import date
-from typing import Optional
+from typing import Optional, Tuple
 from app.application.common.cqrs import Query
 
 
@@ -43,4 +43,14 @@ class GetAgingReportQuery(Query):
     customer_id: Optional[int] = None
     as_of_date: Optional[date] = None  # Default to today
     include_paid: bool = False  # Include paid invoices in report
+    bucket_boundaries: Optional[Tuple[int, ...]] = None  # Bucket upper bounds in days (default 30, 60, 90)
+    include_invoices: bool = False  # Load one page of invoice details per customer
+    invoices_after: Optional[str] = None  # Keyset cursor of the invoice page (see invoices_next_cursor)
+    invoices_per_page: int = 100
+
+
+@dataclass
+class GetAgingSummaryQuery(Query):
+    """Query to get the cached receivables aging summary of the payments dashboard."""
+    bucket_boundaries: Optional[Tuple[int, ...]] = None  # Bucket upper bounds in days (default 30, 60, 90)
 
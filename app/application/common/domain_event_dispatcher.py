@@ -24,21 +24,26 @@ class DomainEventDispatcher:
         """
         if event_type not in self._handlers:
             self._handlers[event_type] = []
-        # Avoid duplicate handler registration
-        # Check by handler function name and module to detect duplicates even if different instances
-        handler_name = getattr(handler, '__name__', str(handler))
-        handler_module = getattr(handler, '__module__', '')
-        handler_key = f"{handler_module}.{handler_name}"
-        
-        existing_keys = []
-        for h in self._handlers[event_type]:
-            h_name = getattr(h, '__name__', str(h))
-            h_module = getattr(h, '__module__', '')
-            existing_keys.append(f"{h_module}.{h_name}")
-        
-        if handler_key not in existing_keys:
+        # Avoid duplicate handler registration (create_app may run several times,
+        # registering the same handler class again with a new instance)
+        handler_key = self._handler_key(handler)
+        if all(self._handler_key(h) != handler_key for h in self._handlers[event_type]):
             self._handlers[event_type].append(handler)
     
+    @staticmethod
+    def _handler_key(handler: Callable) -> tuple:
+        """
+        Identity of a handler for duplicate detection.
+        
+        Bound methods are identified by their class and function, so two
+        instances of the same handler class count as one registration while
+        different handler classes sharing a method name (handle) do not.
+        """
+        handler_self = getattr(handler, '__self__', None)
+        if handler_self is not None:
+            return (handler_self.__class__, handler.__func__)
+        return (getattr(handler, '__module__', ''), getattr(handler, '__qualname__', str(handler)))
+    
     def dispatch(self, event: IDomainEvent) -> None:
         """
         Dispatch a domain event to all registered handlers.
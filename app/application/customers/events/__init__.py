@@ -0,0 +1,8 @@
+"""Customer domain event handlers."""
+from .credit_exposure_handler import CreditExposureDomainEventHandler
+from .sales_aggregate_handler import CustomerSalesAggregateDomainEventHandler
+
+__all__ = [
+    'CreditExposureDomainEventHandler',
+    'CustomerSalesAggregateDomainEventHandler',
+]
@@ -0,0 +1,80 @@
+"""Domain event handler maintaining the customer credit exposure read model."""
+from decimal import Decimal
+from typing import Optional
+from app.application.common.domain_event_handler import DomainEventHandler
+from app.domain.models.order import (
+    OrderConfirmedDomainEvent, OrderCanceledDomainEvent, OrderStatusChangedDomainEvent
+)
+from app.domain.models.invoice import InvoiceValidatedDomainEvent
+from app.domain.models.payment import PaymentCreatedDomainEvent, PaymentAllocatedDomainEvent
+from app.domain.models.credit_exposure import OPEN_ORDER_STATUSES
+from app.domain.events.domain_event import DomainEvent
+from app.domain.events.integration_event import IIntegrationEvent
+from app.infrastructure.db import get_session
+from app.services.credit_service import CreditService
+
+
+class CreditExposureDomainEventHandler(DomainEventHandler):
+    """
+    Handler keeping customer_credit_exposure up to date.
+    
+    Registered for order status transitions, invoice validation and payment events.
+    Each event is translated into an incremental delta on the customer's row, so
+    credit checks never have to aggregate orders or invoices.
+    """
+    
+    def map_to_integration_event(self, domain_event: DomainEvent) -> Optional[IIntegrationEvent]:
+        """Read model maintenance is internal only."""
+        return None
+    
+    def handle_internal(self, event: DomainEvent) -> None:
+        """
+        Apply the exposure change carried by the event.
+        
+        - Order confirmed: the order total becomes open debt
+        - Order canceled / status changed: open debt moves in or out depending on
+          whether the previous and new statuses are open statuses
+        - Invoice validated: its amount due becomes unpaid invoice debt
+        - Payment allocated: the allocated amount is no longer owed on the invoice
+        - Payment created: tracked as the customer's last payment
+        """
+        if not getattr(event, 'customer_id', 0):
+            return
+        
+        with get_session() as session:
+            credit_service = CreditService(session)
+            
+            if isinstance(event, OrderConfirmedDomainEvent):
+                credit_service.apply_exposure_delta(
+                    event.customer_id, open_order_delta=Decimal(str(event.order_total))
+                )
+            elif isinstance(event, OrderCanceledDomainEvent):
+                if event.previous_status in OPEN_ORDER_STATUSES:
+                    credit_service.apply_exposure_delta(
+                        event.customer_id, open_order_delta=-Decimal(str(event.order_total))
+                    )
+            elif isinstance(event, OrderStatusChangedDomainEvent):
+                was_open = event.old_status in OPEN_ORDER_STATUSES
+                is_open = event.new_status in OPEN_ORDER_STATUSES
+                if was_open != is_open:
+                    total = Decimal(str(event.order_total))
+                    credit_service.apply_exposure_delta(
+                        event.customer_id, open_order_delta=total if is_open else -total
+                    )
+            elif isinstance(event, InvoiceValidatedDomainEvent):
+                credit_service.apply_exposure_delta(
+                    event.customer_id, unpaid_invoice_delta=Decimal(str(event.amount_due))
+                )
+            elif isinstance(event, PaymentAllocatedDomainEvent):
+                credit_service.apply_exposure_delta(
+                    event.customer_id, unpaid_invoice_delta=-Decimal(str(event.allocated_amount))
+                )
+            elif isinstance(event, PaymentCreatedDomainEvent):
+                credit_service.record_payment(
+                    customer_id=event.customer_id,
+                    payment_id=event.payment_id,
+                    payment_date=event.payment_date,
+                    amount=event.amount
+                )
+            
+            session.commit()
@@ -0,0 +1,47 @@
+"""Domain event handler maintaining the customer sales aggregates read model."""
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from app.application.common.domain_event_handler import DomainEventHandler
+from app.domain.models.order import OrderConfirmedDomainEvent, OrderCanceledDomainEvent
+from app.domain.models.customer_sales_aggregate import SALES_ORDER_STATUSES
+from app.domain.events.domain_event import DomainEvent
+from app.domain.events.integration_event import IIntegrationEvent
+from app.infrastructure.db import get_session
+from app.services.customer_sales_aggregate_service import CustomerSalesAggregateService
+
+
+class CustomerSalesAggregateDomainEventHandler(DomainEventHandler):
+    """
+    Handler keeping customer_sales_aggregates up to date.
+    
+    A confirmed order is added to the customer's rolling figures. A canceled
+    order may already be outside the window, so the customer is recomputed.
+    """
+    
+    def map_to_integration_event(self, domain_event: DomainEvent) -> Optional[IIntegrationEvent]:
+        """Read model maintenance is internal only."""
+        return None
+    
+    def handle_internal(self, event: DomainEvent) -> None:
+        """Apply the order event to the customer's sales aggregate."""
+        if not getattr(event, 'customer_id', 0):
+            return
+        
+        with get_session() as session:
+            aggregate_service = CustomerSalesAggregateService(session)
+            
+            if isinstance(event, OrderConfirmedDomainEvent):
+                aggregate_service.apply_order_delta(
+                    event.customer_id,
+                    revenue_delta=Decimal(str(event.order_total)),
+                    order_count_delta=1,
+                    order_date=date.today()
+                )
+            elif (
+                isinstance(event, OrderCanceledDomainEvent)
+                and event.previous_status in SALES_ORDER_STATUSES
+            ):
+                aggregate_service.refresh_aggregate(event.customer_id)
+            
+            session.commit()
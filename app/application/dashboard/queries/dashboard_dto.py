@@ -15,19 +15,19 @@ class RevenueDataPoint:
 
 @dataclass
 class KPIDTO:
-    """DTO for dashboard KPIs."""
-    total_revenue: Decimal
-    total_revenue_period: str  # 'This month', 'This week', etc.
-    total_orders: int
-    total_orders_period: str
-    active_customers: int
-    products_in_stock: int
+    """DTO for dashboard KPIs (KPIs that were not requested are None)."""
+    total_revenue: Optional[Decimal] = None
+    total_revenue_period: Optional[str] = None  # 'This month', 'This week', etc.
+    total_orders: Optional[int] = None
+    total_orders_period: Optional[str] = None
+    active_customers: Optional[int] = None
+    products_in_stock: Optional[int] = None
     revenue_change_percent: Optional[Decimal] = None
     orders_change_percent: Optional[Decimal] = None
     customers_change_percent: Optional[Decimal] = None
     products_change_percent: Optional[Decimal] = None
-    stock_alerts_count: int = 0
-    active_orders_count: int = 0
+    stock_alerts_count: Optional[int] = None
+    active_orders_count: Optional[int] = None
     revenue_trend: Optional[List[RevenueDataPoint]] = None
     orders_trend: Optional[List[Dict[str, Any]]] = None
     top_products: Optional[List[Dict[str, Any]]] = None
@@ -1,10 +1,10 @@
 """Query handlers for dashboard KPIs and statistics."""
 from app.application.common.cqrs import QueryHandler
 from app.domain.models.order import Order
-from app.domain.models.customer import Customer
-from app.domain.models.product import Product
 from app.domain.models.stock import StockItem
 from app.infrastructure.db import get_session
+from app.services.sales_fact_service import SalesFactService
+from app.services.dashboard_kpi_service import DashboardKPIService, COUNTER_KPIS
 from .queries import (
     GetKPIsQuery,
     GetRevenueQuery,
@@ -15,137 +15,71 @@ from .dashboard_dto import (
     KPIDTO, RevenueDTO, RevenueDataPoint,
     StockAlertsDTO, ActiveOrdersDTO
 )
-from typing import List, Dict, Any
-from sqlalchemy import func, and_, or_, case
-from sqlalchemy.orm import joinedload
-from datetime import datetime, date, timedelta
-from decimal import Decimal
+from typing import List, Optional, Tuple
+from sqlalchemy import func, and_, case
+from datetime import date, timedelta
+
+
+def _resolve_period(period: str, start_date: Optional[date], end_date: Optional[date]) -> Tuple[date, date, date, date]:
+    """Current (start, end) and previous comparison (start, end) dates of a dashboard period."""
+    end_date = end_date or date.today()
+    if not start_date:
+        # Calculate start date based on period
+        if period == "day":
+            start_date = end_date
+        elif period == "week":
+            start_date = end_date - timedelta(days=7)
+        elif period == "year":
+            start_date = end_date.replace(month=1, day=1)
+        else:
+            start_date = end_date.replace(day=1)
+    
+    # Previous period of the same length, just before the current one
+    period_days = (end_date - start_date).days
+    prev_start_date = start_date - timedelta(days=period_days + 1)
+    prev_end_date = start_date - timedelta(days=1)
+    return start_date, end_date, prev_start_date, prev_end_date
 
 
 class GetKPIsHandler(QueryHandler):
-    """Handler for getting all dashboard KPIs."""
+    """Handler for getting dashboard KPIs."""
     
     def handle(self, query: GetKPIsQuery) -> KPIDTO:
-        """Get all dashboard KPIs."""
+        """
+        Get the requested dashboard KPIs.
+        
+        Revenue and order KPIs for the current and previous period come from one
+        conditional aggregation over the sales rollups; entity counts come from the
+        cached dashboard counters.
+        
+        Raises:
+            ValueError: If an unknown KPI is requested
+        """
+        start_date, end_date, prev_start_date, prev_end_date = _resolve_period(
+            query.period, query.start_date, query.end_date
+        )
+        
         with get_session() as session:
-            # Calculate date range
-            end_date = query.end_date or date.today()
-            if query.start_date:
-                start_date = query.start_date
-            else:
-                # Calculate start date based on period
-                if query.period == "day":
-                    start_date = end_date
-                elif query.period == "week":
-                    start_date = end_date - timedelta(days=7)
-                elif query.period == "month":
-                    start_date = end_date.replace(day=1)
-                elif query.period == "year":
-                    start_date = end_date.replace(month=1, day=1)
-                else:
-                    start_date = end_date.replace(day=1)
-            
-            # Previous period for comparison
-            period_days = (end_date - start_date).days
-            prev_start_date = start_date - timedelta(days=period_days + 1)
-            prev_end_date = start_date - timedelta(days=1)
-            
-            # Total Revenue (from confirmed/delivered orders)
-            revenue_query = session.query(
-                func.sum(Order.total).label('total')
-            ).filter(
-                Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered', 'invoiced']),
-                func.date(Order.created_at) >= start_date,
-                func.date(Order.created_at) <= end_date
-            )
-            total_revenue = revenue_query.scalar() or Decimal('0')
-            
-            # Previous period revenue
-            prev_revenue_query = session.query(
-                func.sum(Order.total).label('total')
-            ).filter(
-                Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered', 'invoiced']),
-                func.date(Order.created_at) >= prev_start_date,
-                func.date(Order.created_at) <= prev_end_date
-            )
-            prev_revenue = prev_revenue_query.scalar() or Decimal('0')
-            
-            # Calculate revenue change percent
-            revenue_change = None
-            if prev_revenue > 0:
-                revenue_change = ((total_revenue - prev_revenue) / prev_revenue) * 100
-            
-            # Total Orders
-            orders_query = session.query(
-                func.count(Order.id).label('count')
-            ).filter(
-                func.date(Order.created_at) >= start_date,
-                func.date(Order.created_at) <= end_date
-            )
-            total_orders = orders_query.scalar() or 0
-            
-            # Previous period orders
-            prev_orders_query = session.query(
-                func.count(Order.id).label('count')
-            ).filter(
-                func.date(Order.created_at) >= prev_start_date,
-                func.date(Order.created_at) <= prev_end_date
-            )
-            prev_orders = prev_orders_query.scalar() or 0
-            
-            # Calculate orders change percent
-            orders_change = None
-            if prev_orders > 0:
-                orders_change = ((total_orders - prev_orders) / prev_orders) * 100
-            
-            # Active Customers
-            active_customers_query = session.query(
-                func.count(Customer.id).label('count')
-            ).filter(
-                Customer.status == 'active'
-            )
-            active_customers = active_customers_query.scalar() or 0
-            
-            # Products in Stock (active products)
-            products_query = session.query(
-                func.count(Product.id).label('count')
-            ).filter(
-                Product.status == 'active'
-            )
-            products_in_stock = products_query.scalar() or 0
-            
-            # Stock Alerts Count
-            stock_alerts_query = session.query(
-                func.count(StockItem.id).label('count')
-            ).filter(
-                StockItem.physical_quantity < StockItem.min_stock,
-                StockItem.min_stock.isnot(None)
+            kpis = DashboardKPIService(session).compute(
+                query.kpis, start_date, end_date, prev_start_date, prev_end_date
             )
-            stock_alerts_count = stock_alerts_query.scalar() or 0
-            
-            # Active Orders Count
-            active_orders_query = session.query(
-                func.count(Order.id).label('count')
-            ).filter(
-                Order.status.in_(['confirmed', 'ready', 'shipped'])
-            )
-            active_orders_count = active_orders_query.scalar() or 0
             
             # Period label
             period_label = self._get_period_label(query.period, start_date, end_date)
             
-            return KPIDTO(
-                total_revenue=total_revenue,
-                total_revenue_period=period_label,
-                revenue_change_percent=revenue_change,
-                total_orders=total_orders,
-                total_orders_period=period_label,
-                orders_change_percent=orders_change,
-                active_customers=active_customers,
-                products_in_stock=products_in_stock,
-                stock_alerts_count=stock_alerts_count,
-                active_orders_count=active_orders_count
-            )
+            dto = KPIDTO()
+            if 'total_revenue' in kpis:
+                dto.total_revenue = kpis['total_revenue'].value
+                dto.total_revenue_period = period_label
+                dto.revenue_change_percent = kpis['total_revenue'].change_percent
+            if 'total_orders' in kpis:
+                dto.total_orders = kpis['total_orders'].value
+                dto.total_orders_period = period_label
+                dto.orders_change_percent = kpis['total_orders'].change_percent
+            for name in COUNTER_KPIS:
+                if name in kpis:
+                    setattr(dto, name, kpis[name].value)
+            return dto
     
     def _get_period_label(self, period: str, start_date: date, end_date: date) -> str:
         """Get human-readable period label."""
@@ -166,50 +100,15 @@ class GetRevenueHandler(QueryHandler):
     
     def handle(self, query: GetRevenueQuery) -> RevenueDTO:
         """Get revenue statistics."""
+        start_date, end_date, prev_start_date, prev_end_date = _resolve_period(
+            query.period, query.start_date, query.end_date
+        )
+        
         with get_session() as session:
-            # Calculate date range
-            end_date = query.end_date or date.today()
-            if query.start_date:
-                start_date = query.start_date
-            else:
-                if query.period == "day":
-                    start_date = end_date
-                elif query.period == "week":
-                    start_date = end_date - timedelta(days=7)
-                elif query.period == "month":
-                    start_date = end_date.replace(day=1)
-                elif query.period == "year":
-                    start_date = end_date.replace(month=1, day=1)
-                else:
-                    start_date = end_date.replace(day=1)
-            
-            # Total revenue
-            revenue_query = session.query(
-                func.sum(Order.total).label('total')
-            ).filter(
-                Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered', 'invoiced']),
-                func.date(Order.created_at) >= start_date,
-                func.date(Order.created_at) <= end_date
-            )
-            total = revenue_query.scalar() or Decimal('0')
-            
-            # Previous period for comparison
-            period_days = (end_date - start_date).days
-            prev_start_date = start_date - timedelta(days=period_days + 1)
-            prev_end_date = start_date - timedelta(days=1)
-            
-            prev_revenue_query = session.query(
-                func.sum(Order.total).label('total')
-            ).filter(
-                Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered', 'invoiced']),
-                func.date(Order.created_at) >= prev_start_date,
-                func.date(Order.created_at) <= prev_end_date
-            )
-            prev_revenue = prev_revenue_query.scalar() or Decimal('0')
-            
-            change_percent = None
-            if prev_revenue > 0:
-                change_percent = ((total - prev_revenue) / prev_revenue) * 100
+            # Current and previous period revenue in one statement
+            revenue = DashboardKPIService(session).compute(
+                ['total_revenue'], start_date, end_date, prev_start_date, prev_end_date
+            )['total_revenue']
             
             # Trend data
             trend_data = self._get_revenue_trend(session, start_date, end_date, query.group_by)
@@ -217,52 +116,23 @@ class GetRevenueHandler(QueryHandler):
             period_label = self._get_period_label(query.period, start_date, end_date)
             
             return RevenueDTO(
-                total=total,
+                total=revenue.value,
                 period=period_label,
-                change_percent=change_percent,
+                change_percent=revenue.change_percent,
                 trend_data=trend_data
             )
     
     def _get_revenue_trend(self, session, start_date: date, end_date: date, group_by: str) -> List[RevenueDataPoint]:
-        """Get revenue trend data points."""
-        # Group by date - use func.date() for SQLite compatibility
-        # For PostgreSQL, date_trunc would be better but we'll use date() for compatibility
-        if group_by == "day":
-            date_expr = func.date(Order.created_at)
-        elif group_by == "week":
-            # For week grouping, use date() and group by week number
-            # This is a simplified approach that works with both SQLite and PostgreSQL
-            date_expr = func.date(Order.created_at)
-        elif group_by == "month":
-            # For month grouping, extract year and month
-            date_expr = func.date(Order.created_at)
-        else:
-            date_expr = func.date(Order.created_at)
-        
-        trend_query = session.query(
-            date_expr.label('date'),
-            func.sum(Order.total).label('revenue'),
-            func.count(Order.id).label('orders_count')
-        ).filter(
-            Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered', 'invoiced']),
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
-        ).group_by(
-            date_expr
-        ).order_by(
-            date_expr
-        )
-        
-        results = trend_query.all()
-        trend_data = []
-        for row in results:
-            trend_data.append(RevenueDataPoint(
-                date=row.date if isinstance(row.date, date) else row.date.date(),
-                revenue=row.revenue or Decimal('0'),
-                orders_count=row.orders_count or 0
-            ))
-        
-        return trend_data
+        """Get revenue trend data points from the sales rollups (one point per period start)."""
+        series = SalesFactService(session).get_series(start_date, end_date, group_by or "day")
+        return [
+            RevenueDataPoint(
+                date=period_start,
+                revenue=totals.order_total,
+                orders_count=totals.order_count
+            )
+            for period_start, totals in series
+        ]
     
     def _get_period_label(self, period: str, start_date: date, end_date: date) -> str:
         """Get human-readable period label."""
@@ -290,35 +160,30 @@ class GetStockAlertsHandler(QueryHandler):
                 conditions.append(StockItem.location_id == query.location_id)
             
             # Low stock alerts
-            low_stock_conditions = conditions + [
+            low_stock = and_(
                 StockItem.physical_quantity < StockItem.min_stock,
                 StockItem.min_stock.isnot(None),
                 StockItem.physical_quantity > 0
-            ]
+            )
             
             # Out of stock alerts
-            out_of_stock_conditions = conditions + [
-                StockItem.physical_quantity <= 0
-            ]
+            out_of_stock = StockItem.physical_quantity <= 0
             
             # Overstock alerts
-            overstock_conditions = conditions + [
+            overstock = and_(
                 StockItem.physical_quantity > StockItem.max_stock,
                 StockItem.max_stock.isnot(None)
-            ]
-            
-            # Count alerts
-            low_stock_count = session.query(func.count(StockItem.id)).filter(
-                and_(*low_stock_conditions)
-            ).scalar() or 0
-            
-            out_of_stock_count = session.query(func.count(StockItem.id)).filter(
-                and_(*out_of_stock_conditions)
-            ).scalar() or 0
+            )
             
-            overstock_count = session.query(func.count(StockItem.id)).filter(
-                and_(*overstock_conditions)
-            ).scalar() or 0
+            # Count all alert types in one pass
+            row = session.query(
+                func.coalesce(func.sum(case((low_stock, 1), else_=0)), 0),
+                func.coalesce(func.sum(case((out_of_stock, 1), else_=0)), 0),
+                func.coalesce(func.sum(case((overstock, 1), else_=0)), 0)
+            ).filter(
+                and_(*conditions) if conditions else True
+            ).one()
+            low_stock_count, out_of_stock_count, overstock_count = (int(value) for value in row)
             
             total_count = low_stock_count + out_of_stock_count + overstock_count
             
@@ -1,6 +1,6 @@
 """Queries for dashboard KPIs and statistics."""
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, date
 from decimal import Decimal
 
@@ -9,10 +9,11 @@ from app.application.common.cqrs import Query
 
 @dataclass
 class GetKPIsQuery(Query):
-    """Query to get all dashboard KPIs."""
+    """Query to get dashboard KPIs."""
     period: str = "month"  # 'day', 'week', 'month', 'year'
     start_date: Optional[date] = None
     end_date: Optional[date] = None
+    kpis: Optional[List[str]] = None  # KPI names to compute (None = all, see dashboard_kpi_service.KPI_NAMES)
 
 
 @dataclass
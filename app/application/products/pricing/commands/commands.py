@@ -1,7 +1,7 @@
 """Commands for Price List management."""
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 from app.application.common.cqrs import Command
 
 
@@ -53,6 +53,17 @@ class RemoveProductFromPriceListCommand(Command):
     product_id: int
 
 
+@dataclass
+class ImportPriceListCommand(Command):
+    """Command to bulk load a tariff file (CSV or XLSX) into a price list."""
+    price_list_id: int
+    file: Any  # Binary file object, streamed
+    filename: str
+    replace_missing: bool = False  # Remove entries whose product is not in the file
+    dry_run: bool = False
+    changed_by: Optional[int] = None
+
+
 # ProductVolumePricing Commands
 @dataclass
 class CreateVolumePricingCommand(Command):
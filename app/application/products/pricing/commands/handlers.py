@@ -11,6 +11,7 @@ from .commands import (
     AddProductToPriceListCommand,
     UpdateProductPriceInListCommand,
     RemoveProductFromPriceListCommand,
+    ImportPriceListCommand,
     CreateVolumePricingCommand,
     UpdateVolumePricingCommand,
     DeleteVolumePricingCommand,
@@ -18,6 +19,7 @@ from .commands import (
     UpdatePromotionalPriceCommand,
     DeletePromotionalPriceCommand
 )
+from app.services.price_list_import_service import PriceListImportService, PriceListImportSummary
 from sqlalchemy.exc import IntegrityError
 
 
@@ -283,6 +285,43 @@ class RemoveProductFromPriceListHandler(CommandHandler):
             session.commit()
 
 
+class ImportPriceListHandler(CommandHandler):
+    """Handler for bulk loading a tariff file into a price list."""
+    
+    def handle(self, command: ImportPriceListCommand) -> PriceListImportSummary:
+        """
+        Stream a tariff file, diff it against the price list and apply the changes in bulk.
+        
+        Args:
+            command: ImportPriceListCommand with price_list_id, file and options
+            
+        Returns:
+            PriceListImportSummary (nothing is committed when dry_run is set)
+            
+        Raises:
+            ValueError: If price list not found or the file cannot be read
+        """
+        with get_session() as session:
+            price_list = session.get(PriceList, command.price_list_id)
+            if not price_list:
+                raise ValueError(f"Price list with ID {command.price_list_id} not found.")
+            
+            service = PriceListImportService(session)
+            summary = service.import_price_list(
+                price_list_id=command.price_list_id,
+                rows=service.iter_rows(command.file, command.filename),
+                replace_missing=command.replace_missing,
+                dry_run=command.dry_run,
+                changed_by=command.changed_by
+            )
+            
+            if command.dry_run:
+                session.rollback()
+            else:
+                session.commit()
+            return summary
+
+
 # ProductVolumePricing Handlers
 class CreateVolumePricingHandler(CommandHandler):
     """Handler for creating a volume pricing tier."""
@@ -10,7 +10,11 @@ from .queries import (
     GetProductsInPriceListQuery,
     GetVolumePricingQuery,
     GetActivePromotionalPricesQuery,
-    GetPromotionalPricesByProductQuery
+    GetPromotionalPricesByProductQuery,
+    SimulatePricingQuery
+)
+from app.services.pricing_simulation_service import (
+    MAX_SIMULATION_TOP, PricingRuleSet, PricingSimulationService, PricingSimulationResult
 )
 from .pricing_dto import PriceListDTO, ProductPriceListDTO, ProductVolumePricingDTO, ProductPromotionalPriceDTO
 from sqlalchemy import or_, func
@@ -380,3 +384,47 @@ class GetPromotionalPricesByProductHandler(QueryHandler):
             
             return items
 
+
+
+class SimulatePricingHandler(QueryHandler):
+    """Handler for simulating candidate pricing rules against historical order lines."""
+    
+    def handle(self, query: SimulatePricingQuery) -> PricingSimulationResult:
+        """
+        Re-price the order lines of the period under the candidate rules.
+        
+        Args:
+            query: SimulatePricingQuery with a price list ID or ad-hoc rules
+            
+        Returns:
+            PricingSimulationResult with revenue and margin deltas
+            
+        Raises:
+            ValueError: If neither a price list nor rules are given, or the period or top is invalid
+        """
+        if query.date_from > query.date_to:
+            raise ValueError("date_from must be before or equal to date_to.")
+        if query.top is not None and not 1 <= query.top <= MAX_SIMULATION_TOP:
+            raise ValueError(f"top must be between 1 and {MAX_SIMULATION_TOP}.")
+        
+        with get_session() as session:
+            if query.price_list_id is not None:
+                if not session.get(PriceList, query.price_list_id):
+                    raise ValueError(f"Price list with ID {query.price_list_id} not found.")
+                rule_set = PricingRuleSet.from_price_list(
+                    session,
+                    query.price_list_id,
+                    include_volume_tiers=query.include_volume_tiers,
+                    all_customers=query.all_customers
+                )
+            elif query.rules:
+                rule_set = PricingRuleSet.from_dict(query.rules)
+            else:
+                raise ValueError("Either price_list_id or rules is required.")
+            
+            return PricingSimulationService(session).simulate(
+                rule_set,
+                query.date_from,
+                query.date_to,
+                top=query.top
+            )
@@ -1,6 +1,7 @@
 """Queries for Price List management."""
 from dataclasses import dataclass
-from typing import Optional
+from datetime import date
+from typing import Any, Dict, Optional
 from app.application.common.cqrs import Query
 
 
@@ -54,3 +55,16 @@ class GetPromotionalPricesByProductQuery(Query):
     product_id: int
     include_expired: bool = True  # Include expired promotions
 
+
+
+# Pricing simulation
+@dataclass
+class SimulatePricingQuery(Query):
+    """Query to simulate candidate pricing rules against historical order lines."""
+    date_from: date
+    date_to: date
+    price_list_id: Optional[int] = None  # Evaluate a stored (possibly inactive) price list
+    rules: Optional[Dict[str, Any]] = None  # Or ad-hoc rules: product_prices, volume_tiers, customer_ids
+    include_volume_tiers: bool = False
+    all_customers: bool = False
+    top: Optional[int] = 50  # Breakdowns kept per axis, at most MAX_SIMULATION_TOP; None = all
@@ -197,7 +197,8 @@ class GetPriceHistoryHandler(QueryHandler):
             history_query = session.query(ProductPriceHistory).options(
                 joinedload(ProductPriceHistory.user)
             ).filter(
-                ProductPriceHistory.product_id == query.product_id
+                ProductPriceHistory.product_id == query.product_id,
+                ProductPriceHistory.price_list_id.is_(None)
             ).order_by(
                 ProductPriceHistory.changed_at.desc()
             )
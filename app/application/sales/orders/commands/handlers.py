@@ -1,10 +1,12 @@
 """Command handlers for order management."""
 from decimal import Decimal
+from sqlalchemy.orm import selectinload
 from app.application.common.cqrs import CommandHandler
 from app.domain.models.order import Order, OrderLine
 from app.domain.models.quote import Quote
 from app.infrastructure.db import get_session
 from app.services.pricing_service import PricingService
+from app.services.order_confirmation_service import OrderConfirmationService
 from .commands import (
     CreateOrderCommand, UpdateOrderCommand, ConfirmOrderCommand,
     CancelOrderCommand, UpdateOrderStatusCommand,
@@ -133,11 +135,11 @@ class ConfirmOrderHandler(CommandHandler):
         """
         Confirm an order.
         
-        This will:
-        - Validate stock availability
-        - Validate customer credit limit
-        - Change status to 'confirmed'
-        - Trigger OrderConfirmedDomainEvent (which reserves stock)
+        This will (through OrderConfirmationService, in a single transaction):
+        - Validate stock availability for all lines with one grouped query
+        - Validate customer credit limit from the credit exposure read model
+        - Change status to 'confirmed' and trigger OrderConfirmedDomainEvent
+        - Reserve stock (the event handler skips orders already reserved)
         
         Args:
             command: ConfirmOrderCommand with order_id and confirmed_by
@@ -149,7 +151,9 @@ class ConfirmOrderHandler(CommandHandler):
             ValueError: If order not found, validation fails, or order cannot be confirmed
         """
         with get_session() as session:
-            order = session.get(Order, command.order_id)
+            order = session.query(Order).options(
+                selectinload(Order.lines)
+            ).filter(Order.id == command.order_id).first()
             if not order:
                 raise ValueError(f"Order with ID {command.order_id} not found.")
             
@@ -164,8 +168,8 @@ class ConfirmOrderHandler(CommandHandler):
                 raise ValueError(f"Cannot confirm order '{order.number}' without lines.")
             
             try:
-                # Confirm order (validates stock and credit, raises domain event)
-                order.confirm(command.confirmed_by)
+                # Confirm order (validates stock and credit, reserves stock, raises domain event)
+                OrderConfirmationService(session).confirm(order, command.confirmed_by)
                 
                 order_id = order.id
                 session.commit()
@@ -0,0 +1,29 @@
+"""Domain event handler maintaining the sales fact read model."""
+from typing import Optional
+from app.application.common.domain_event_handler import DomainEventHandler
+from app.domain.events.domain_event import DomainEvent
+from app.domain.events.integration_event import IIntegrationEvent
+from app.infrastructure.db import get_session
+from app.services.sales_fact_service import SalesFactService
+
+
+class SalesFactDomainEventHandler(DomainEventHandler):
+    """
+    Handler keeping sales_daily_fact, sales_daily_order_fact and their rollups up to date.
+    
+    Registered for order creation and lifecycle events; the (day, customer) slice
+    of the order is rebuilt, whatever the age of the order.
+    """
+    
+    def map_to_integration_event(self, domain_event: DomainEvent) -> Optional[IIntegrationEvent]:
+        """Read model maintenance is internal only."""
+        return None
+    
+    def handle_internal(self, event: DomainEvent) -> None:
+        """Rebuild the sales facts of the order's day and customer."""
+        if not getattr(event, 'order_id', 0):
+            return
+        
+        with get_session() as session:
+            SalesFactService(session).refresh_order(event.order_id)
+            session.commit()
@@ -7,6 +7,7 @@ from app.domain.models.user import User
 from app.domain.models.stock import StockItem, Location
 from app.domain.models.quote import Quote
 from app.infrastructure.db import get_session
+from app.utils.period import date_range_filter
 from .queries import (
     ListOrdersQuery,
     GetOrderByIdQuery,
@@ -18,7 +19,6 @@ from .order_dto import (
 from typing import List
 from sqlalchemy import or_, func, and_
 from sqlalchemy.orm import joinedload
-from datetime import datetime
 
 
 class ListOrdersHandler(QueryHandler):
@@ -48,11 +48,8 @@ class ListOrdersHandler(QueryHandler):
                 )
             
             # Date filters
-            if query.date_from:
-                q = q.filter(Order.created_at >= datetime.combine(query.date_from, datetime.min.time()))
-            
-            if query.date_to:
-                q = q.filter(Order.created_at <= datetime.combine(query.date_to, datetime.max.time()))
+            if query.date_from or query.date_to:
+                q = q.filter(date_range_filter(Order.created_at, query.date_from, query.date_to))
             
             # Get total count
             total = q.count()
@@ -6,6 +6,7 @@ from app.application.settings.commands.commands import (
 )
 from app.domain.models.settings import CompanySettings, AppSettings
 from app.infrastructure.db import get_session
+from app.services.pdf_service_helper import invalidate_company_info
 
 
 class UpdateCompanySettingsHandler(CommandHandler):
@@ -42,6 +43,7 @@ class UpdateCompanySettingsHandler(CommandHandler):
             )
             
             session.commit()
+            invalidate_company_info()
             return company_settings.id
 
 
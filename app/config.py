@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 
 class Config:
@@ -43,8 +44,41 @@ class Config:
     MAIL_USERNAME = os.getenv("BREVO_SMTP_EMAIL", "")
     MAIL_PASSWORD = os.getenv("BREVO_SMTP_KEY", "")
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER", "noreply@gmflow.com")
+    # Email transport: 'smtp', 'memory' (tests) or 'file' (.eml files in MAIL_FILE_PATH)
+    MAIL_BACKEND = os.getenv("MAIL_BACKEND", "smtp").lower()
+    MAIL_FILE_PATH = os.getenv("MAIL_FILE_PATH", os.path.join(tempfile.gettempdir(), "mail_outbox"))
+    MAIL_POOL_SIZE = int(os.getenv("MAIL_POOL_SIZE", "2"))  # SMTP connections kept open per process
+    MAIL_POOL_IDLE_TIMEOUT = float(os.getenv("MAIL_POOL_IDLE_TIMEOUT", "60"))  # Reopen connections idle longer (s)
+    MAIL_KEEPALIVE_SECONDS = float(os.getenv("MAIL_KEEPALIVE_SECONDS", "30"))  # NOOP check after this idle time (s)
+    MAIL_RATE_LIMIT = float(os.getenv("MAIL_RATE_LIMIT", "10"))  # Messages per second (provider limit, 0: none)
+    MAIL_MAX_RETRIES = int(os.getenv("MAIL_MAX_RETRIES", "3"))  # Retries of transient errors
+    MAIL_RETRY_BACKOFF = float(os.getenv("MAIL_RETRY_BACKOFF", "1.0"))  # First retry delay (s), doubled each retry
+    MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "50"))  # Messages per connection in send queues
     APP_URL = os.getenv("APP_URL", "http://localhost:5000")
     
+    # Background report jobs
+    # Run report jobs inline instead of through the Celery broker (default in development)
+    REPORT_JOBS_EAGER = os.getenv("REPORT_JOBS_EAGER", "true" if ENV == "development" else "false").lower() == "true"
+    REPORT_JOBS_DIR = os.getenv("REPORT_JOBS_DIR", os.path.join(tempfile.gettempdir(), "report_jobs"))
+    REPORT_JOB_TTL_SECONDS = int(os.getenv("REPORT_JOB_TTL_SECONDS", "900"))  # Cached results lifetime
+    
+    # Automatic payment reminders: invoices per batch, PDF rendering processes
+    REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "200"))
+    REMINDER_PDF_WORKERS = int(os.getenv("REMINDER_PDF_WORKERS", "2"))
+    
+    # PDF rendering: processes of the shared render pool (0 or 1: render in process), batch chunk size
+    PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+    PDF_BATCH_CHUNK_SIZE = int(os.getenv("PDF_BATCH_CHUNK_SIZE", "200"))
+    
+    # Stored PDFs of validated / sent documents: directory and size limit (least recently used evicted,
+    # checked every PDF_ARTIFACTS_EVICT_EVERY stored files)
+    PDF_ARTIFACTS_DIR = os.getenv("PDF_ARTIFACTS_DIR", os.path.join(tempfile.gettempdir(), "pdf_artifacts"))
+    PDF_ARTIFACTS_MAX_MB = int(os.getenv("PDF_ARTIFACTS_MAX_MB", "512"))
+    PDF_ARTIFACTS_EVICT_EVERY = int(os.getenv("PDF_ARTIFACTS_EVICT_EVERY", "50"))
+    
+    # Replenishment planning: user recorded on the purchase requests of the nightly run (disabled if unset)
+    REPLENISHMENT_USER_ID = int(os.getenv("REPLENISHMENT_USER_ID", "0")) or None
+    
     # Stock Management Mode: 'simple' or 'advanced'
     # 'simple': Single site/warehouse, simplified interface (for small businesses)
     # 'advanced': Multi-site support, full features (for larger businesses)
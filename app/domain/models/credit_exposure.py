@@ -0,0 +1,41 @@
+"""Customer credit exposure read model for O(1) credit checks."""
+from decimal import Decimal
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, Date, DateTime
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from ...infrastructure.db import Base
+
+
+# Order statuses that count as open (not yet invoiced) customer debt
+OPEN_ORDER_STATUSES = ('confirmed', 'ready', 'shipped', 'delivered')
+
+# Invoice statuses whose remaining amount is still owed by the customer
+UNPAID_INVOICE_STATUSES = ('validated', 'sent', 'partially_paid', 'overdue')
+
+
+class CustomerCreditExposure(Base):
+    """
+    Read model holding the running credit exposure of a customer.
+
+    Maintained incrementally by domain event handlers (order status transitions,
+    invoice validation, payments) and checked nightly against the source tables.
+    """
+    __tablename__ = "customer_credit_exposure"
+
+    customer_id = Column(Integer, ForeignKey("customers.id"), primary_key=True)
+    open_order_amount = Column(Numeric(14, 2), nullable=False, default=Decimal(0))
+    unpaid_invoice_amount = Column(Numeric(14, 2), nullable=False, default=Decimal(0))
+    last_payment_id = Column(Integer, ForeignKey("payments.id"), nullable=True)
+    last_payment_date = Column(Date, nullable=True)
+    last_payment_amount = Column(Numeric(12, 2), nullable=True)
+    reconciled_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    customer = relationship("Customer")
+
+    @property
+    def total_exposure(self) -> Decimal:
+        """Open orders plus unpaid invoices."""
+        return Decimal(str(self.open_order_amount or 0)) + Decimal(str(self.unpaid_invoice_amount or 0))
@@ -0,0 +1,47 @@
+"""Customer rolling sales aggregates used for quote discount suggestions."""
+from decimal import Decimal
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, Date, DateTime
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from ...infrastructure.db import Base
+
+
+# Order statuses counted as customer purchases (everything but draft and canceled)
+SALES_ORDER_STATUSES = ('confirmed', 'in_preparation', 'ready', 'shipped', 'delivered', 'invoiced')
+
+# Length of the rolling window, in months
+ROLLING_WINDOW_MONTHS = 12
+
+
+class CustomerSalesAggregate(Base):
+    """
+    Read model holding a customer's rolling 12-month purchase figures.
+
+    Incremented when an order is confirmed, recomputed when an order is canceled,
+    and rebuilt nightly so orders leaving the window are expired.
+    """
+    __tablename__ = "customer_sales_aggregates"
+
+    customer_id = Column(Integer, ForeignKey("customers.id"), primary_key=True)
+    revenue_12m = Column(Numeric(14, 2), nullable=False, default=Decimal(0))
+    order_count_12m = Column(Integer, nullable=False, default=0)
+    last_order_date = Column(Date, nullable=True)
+    window_start = Column(Date, nullable=False)
+    refreshed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    customer = relationship("Customer")
+
+    @property
+    def average_basket(self) -> Decimal:
+        """Average order amount over the window."""
+        if not self.order_count_12m:
+            return Decimal(0)
+        return (Decimal(str(self.revenue_12m or 0)) / self.order_count_12m).quantize(Decimal('0.01'))
+
+    @property
+    def monthly_order_frequency(self) -> Decimal:
+        """Average number of orders per month over the window."""
+        return (Decimal(self.order_count_12m or 0) / ROLLING_WINDOW_MONTHS).quantize(Decimal('0.01'))
@@ -0,0 +1,19 @@
+"""Cached entity counters displayed on the dashboard."""
+from sqlalchemy import Column, Integer, String, DateTime
+
+from ...infrastructure.db import Base
+
+
+class DashboardCounter(Base):
+    """
+    Cached count of an entity set shown on the dashboard (active customers,
+    active products, stock alerts, active orders).
+
+    Rows are recomputed together in one statement when older than the
+    counter max age, and periodically by a Celery task.
+    """
+    __tablename__ = "dashboard_counters"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime, nullable=False)
@@ -2,8 +2,8 @@
 from dataclasses import dataclass
 from decimal import Decimal
 from datetime import date, datetime
-from typing import List, Optional
-from sqlalchemy import Column, Integer, String, Text, Numeric, ForeignKey, Date, DateTime, Boolean
+from typing import List, Optional, Tuple
+from sqlalchemy import Column, Integer, String, Text, Numeric, ForeignKey, Date, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -13,6 +13,10 @@ from ...domain.primitives.aggregate_root import AggregateRoot
 from ...domain.events.domain_event import DomainEvent
 
 
+# Statuses moved to overdue once past the due date with an amount left to pay
+OVERDUE_CANDIDATE_STATUSES = ("validated", "sent", "partially_paid")
+
+
 class InvoiceStatus(enum.Enum):
     """Invoice status enumeration."""
     DRAFT = "draft"
@@ -39,6 +43,8 @@ class InvoiceValidatedDomainEvent(DomainEvent):
     invoice_id: int = 0
     invoice_number: str = ""
     validated_by: int = 0
+    customer_id: int = 0
+    amount_due: Decimal = Decimal(0)
 
 
 @dataclass
@@ -50,6 +56,16 @@ class InvoiceSentDomainEvent(DomainEvent):
     sent_by: int = 0
 
 
+@dataclass
+class InvoiceOverdueDomainEvent(DomainEvent):
+    """Domain event raised when an unpaid invoice passes its due date."""
+    invoice_id: int = 0
+    invoice_number: str = ""
+    customer_id: int = 0
+    due_date: Optional[date] = None
+    remaining_amount: Decimal = Decimal(0)
+
+
 @dataclass
 class InvoicePaidDomainEvent(DomainEvent):
     """Domain event raised when an invoice is fully paid."""
@@ -69,6 +85,27 @@ class CreditNoteCreatedDomainEvent(DomainEvent):
     customer_id: int = 0
 
 
+class DocumentSequence(Base):
+    """
+    Last number issued for a document numbering series (prefix and year).
+    
+    The row is locked while numbers are taken, so concurrent invoice
+    creations are serialized and numbers stay gap-free: numbers taken by a
+    transaction that rolls back are released with it.
+    """
+    __tablename__ = "document_sequences"
+
+    prefix = Column(String(10), primary_key=True)  # e.g. 'FA' (invoices)
+    year = Column(Integer, primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
+
+    def allocate(self, count: int) -> range:
+        """Take the next `count` sequence values."""
+        start = self.last_value + 1
+        self.last_value += count
+        return range(start, self.last_value + 1)
+
+
 class InvoiceLine(Base):
     """Invoice line entity."""
     __tablename__ = "invoice_lines"
@@ -100,16 +137,28 @@ class InvoiceLine(Base):
     product = relationship("Product")
     variant = relationship("ProductVariant", foreign_keys=[variant_id])
 
-    def calculate_totals(self):
-        """Calculate line totals."""
+    @staticmethod
+    def compute_totals(
+        quantity: Decimal,
+        unit_price: Decimal,
+        discount_percent: Decimal,
+        tax_rate: Decimal
+    ) -> Tuple[Decimal, Decimal, Decimal]:
+        """Line totals as (discount_amount, line_total_ht, line_total_ttc)."""
         # Calculate line total HT
-        subtotal = self.quantity * self.unit_price
-        discount_amount = subtotal * (self.discount_percent / Decimal(100))
-        self.discount_amount = discount_amount
-        self.line_total_ht = subtotal - discount_amount
+        subtotal = quantity * unit_price
+        discount_amount = subtotal * (discount_percent / Decimal(100))
+        line_total_ht = subtotal - discount_amount
         
         # Calculate line total TTC
-        self.line_total_ttc = self.line_total_ht * (Decimal(1) + self.tax_rate / Decimal(100))
+        line_total_ttc = line_total_ht * (Decimal(1) + tax_rate / Decimal(100))
+        return discount_amount, line_total_ht, line_total_ttc
+
+    def calculate_totals(self):
+        """Calculate line totals."""
+        self.discount_amount, self.line_total_ht, self.line_total_ttc = InvoiceLine.compute_totals(
+            self.quantity, self.unit_price, self.discount_percent, self.tax_rate
+        )
 
 
 class CreditNote(Base, AggregateRoot):
@@ -295,6 +344,19 @@ class Invoice(Base, AggregateRoot):
     validated_by_user = relationship("User", foreign_keys=[validated_by])
     creator = relationship("User", foreign_keys=[created_by])
 
+    __table_args__ = (
+        # Receivables aging: status IN (open statuses) grouped / bucketed on due_date
+        Index('ix_invoices_status_due_date', 'status', 'due_date'),
+        # FEC export: keyset scan in (invoice_date, number) order
+        Index('ix_invoices_invoice_date_number', 'invoice_date', 'number'),
+        # Overdue transitions: open invoices not yet overdue, by due date
+        Index(
+            'ix_invoices_open_due_date', 'due_date',
+            postgresql_where=status.in_(OVERDUE_CANDIDATE_STATUSES),
+            sqlite_where=status.in_(OVERDUE_CANDIDATE_STATUSES)
+        ),
+    )
+
     @staticmethod
     def _generate_number() -> str:
         """Generate invoice number in format FA-YYYY-XXXXX."""
@@ -449,7 +511,9 @@ class Invoice(Base, AggregateRoot):
         self.raise_domain_event(InvoiceValidatedDomainEvent(
             invoice_id=self.id,
             invoice_number=self.number,
-            validated_by=user_id
+            validated_by=user_id,
+            customer_id=self.customer_id,
+            amount_due=self.remaining_amount
         ))
 
     def send(self, user_id: int):
@@ -505,12 +569,24 @@ class Invoice(Base, AggregateRoot):
                 self.status = "partially_paid"
 
     def mark_overdue(self):
-        """Mark invoice as overdue (called by scheduled task)."""
-        if self.status in ["paid", "canceled", "overdue"]:
-            return  # Already paid, canceled, or already marked overdue
+        """
+        Mark invoice as overdue.
+        
+        The scheduled job moves all invoices at once (InvoiceStateService);
+        this applies the same rule to a single invoice.
+        """
+        if self.status not in OVERDUE_CANDIDATE_STATUSES or self.remaining_amount <= 0:
+            return  # Draft, paid, canceled, or already marked overdue
         
         if datetime.now().date() > self.due_date:
             self.status = "overdue"
+            self.raise_domain_event(InvoiceOverdueDomainEvent(
+                invoice_id=self.id,
+                invoice_number=self.number,
+                customer_id=self.customer_id,
+                due_date=self.due_date,
+                remaining_amount=self.remaining_amount
+            ))
 
     def cancel(self):
         """Cancel the invoice."""
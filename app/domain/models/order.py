@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from decimal import Decimal
 from datetime import date, datetime, timedelta
 from typing import List, Optional
-from sqlalchemy import Column, Integer, String, Text, Numeric, ForeignKey, Date, DateTime, JSON, CheckConstraint
+from sqlalchemy import Column, Integer, String, Text, Numeric, ForeignKey, Date, DateTime, JSON, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -42,6 +42,7 @@ class OrderConfirmedDomainEvent(DomainEvent):
     order_number: str = ""
     customer_id: int = 0
     confirmed_by: int = 0
+    order_total: Decimal = Decimal(0)
 
 
 @dataclass
@@ -50,6 +51,19 @@ class OrderCanceledDomainEvent(DomainEvent):
     order_id: int = 0
     order_number: str = ""
     customer_id: int = 0
+    order_total: Decimal = Decimal(0)
+    previous_status: str = ""
+
+
+@dataclass
+class OrderStatusChangedDomainEvent(DomainEvent):
+    """Domain event raised on workflow status transitions (update_status)."""
+    order_id: int = 0
+    order_number: str = ""
+    customer_id: int = 0
+    order_total: Decimal = Decimal(0)
+    old_status: str = ""
+    new_status: str = ""
 
 
 @dataclass
@@ -95,6 +109,12 @@ class OrderLine(Base):
     variant = relationship("ProductVariant", foreign_keys=[variant_id])
     stock_reservations = relationship("StockReservation", back_populates="order_line", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Product analytics: product -> orders lookups without touching the heap (PostgreSQL)
+        Index('ix_order_lines_product_order', 'product_id', 'order_id',
+              postgresql_include=['quantity', 'line_total_ht']),
+    )
+
     def calculate_totals(self):
         """Calculate line totals."""
         # Calculate line total HT
@@ -182,6 +202,11 @@ class Order(Base, AggregateRoot):
     confirmed_by_user = relationship("User", foreign_keys=[confirmed_by])
     created_by_user = relationship("User", foreign_keys=[created_by])
 
+    __table_args__ = (
+        # Revenue analytics: status IN (...) AND created_at in a half-open range (see app.utils.period)
+        Index('ix_orders_status_created_at', 'status', 'created_at', postgresql_include=['total']),
+    )
+
     @staticmethod
     def _generate_number() -> str:
         """Generate order number in format CMD-YYYY-XXXXX."""
@@ -359,10 +384,15 @@ class Order(Base, AggregateRoot):
                 'message': result.message
             }
 
-    def confirm(self, user_id: int):
+    def confirm(self, user_id: int, stock_validation: Optional[dict] = None,
+                credit_validation: Optional[dict] = None):
         """
         Confirm the order: validate stock and credit, change status.
         Stock reservation will be handled by OrderConfirmedDomainEventHandler.
+        
+        stock_validation and credit_validation may be supplied by a caller that
+        already validated the order in its own session (see OrderConfirmationService);
+        they have the same shape as validate_stock() and validate_credit() results.
         """
         if self.status != "draft":
             raise ValueError(f"Cannot confirm order '{self.number}' in status '{self.status}'. Order must be in 'draft' status.")
@@ -371,14 +401,16 @@ class Order(Base, AggregateRoot):
             raise ValueError(f"Cannot confirm order '{self.number}' without lines.")
         
         # Validate stock
-        stock_validation = self.validate_stock()
+        if stock_validation is None:
+            stock_validation = self.validate_stock()
         if not stock_validation['valid']:
             # Raise exception if stock is insufficient
             issues_str = "; ".join(stock_validation['issues'])
             raise ValueError(f"Cannot confirm order '{self.number}': {issues_str}")
         
         # Validate credit
-        credit_validation = self.validate_credit()
+        if credit_validation is None:
+            credit_validation = self.validate_credit()
         if not credit_validation['valid']:
             raise ValueError(credit_validation['message'])
         
@@ -392,7 +424,8 @@ class Order(Base, AggregateRoot):
             order_id=self.id,
             order_number=self.number,
             customer_id=self.customer_id,
-            confirmed_by=user_id
+            confirmed_by=user_id,
+            order_total=self.total
         ))
 
     def cancel(self):
@@ -403,6 +436,8 @@ class Order(Base, AggregateRoot):
         if self.status in ("invoiced", "canceled"):
             raise ValueError(f"Cannot cancel order '{self.number}' in status '{self.status}'.")
         
+        previous_status = self.status
+        
         # Update status
         self.status = "canceled"
         
@@ -410,7 +445,9 @@ class Order(Base, AggregateRoot):
         self.raise_domain_event(OrderCanceledDomainEvent(
             order_id=self.id,
             order_number=self.number,
-            customer_id=self.customer_id
+            customer_id=self.customer_id,
+            order_total=self.total,
+            previous_status=previous_status
         ))
 
     def update_status(self, new_status: str):
@@ -435,8 +472,18 @@ class Order(Base, AggregateRoot):
                 f"Valid transitions: {valid_transitions[self.status]}"
             )
         
+        old_status = self.status
         self.status = new_status
         
+        self.raise_domain_event(OrderStatusChangedDomainEvent(
+            order_id=self.id,
+            order_number=self.number,
+            customer_id=self.customer_id,
+            order_total=self.total,
+            old_status=old_status,
+            new_status=new_status
+        ))
+        
         # Special handling for delivered status
         if new_status == "delivered":
             if not self.delivery_date_actual:
@@ -3,7 +3,9 @@ from dataclasses import dataclass
 from decimal import Decimal
 from datetime import date, datetime
 from typing import List, Optional
-from sqlalchemy import Column, Integer, String, Text, Numeric, ForeignKey, Date, DateTime, Boolean, Enum as SQLEnum
+from sqlalchemy import (
+    Column, Integer, String, Text, Numeric, ForeignKey, Date, DateTime, Boolean, UniqueConstraint, Enum as SQLEnum
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -39,6 +41,7 @@ class PaymentCreatedDomainEvent(DomainEvent):
     customer_id: int = 0
     amount: Decimal = Decimal(0)
     payment_method: str = ""
+    payment_date: Optional[date] = None
 
 
 @dataclass
@@ -47,6 +50,7 @@ class PaymentAllocatedDomainEvent(DomainEvent):
     payment_id: int = 0
     invoice_id: int = 0
     allocated_amount: Decimal = Decimal(0)
+    customer_id: int = 0
 
 
 @dataclass
@@ -127,6 +131,11 @@ class PaymentReminder(Base):
     # Relationships
     invoice = relationship("Invoice", foreign_keys=[invoice_id], back_populates="reminders")
 
+    __table_args__ = (
+        # One reminder per level: a batch run claims a level by inserting its row
+        UniqueConstraint('invoice_id', 'reminder_type', name='uq_payment_reminders_invoice_type'),
+    )
+
     @staticmethod
     def create(
         invoice_id: int,
@@ -274,7 +283,8 @@ class Payment(Base, AggregateRoot):
             payment_id=0,  # Will be set after flush
             customer_id=customer_id,
             amount=amount,
-            payment_method=payment_method.value
+            payment_method=payment_method.value,
+            payment_date=payment_date
         ))
         
         return payment
@@ -318,7 +328,8 @@ class Payment(Base, AggregateRoot):
         self.raise_domain_event(PaymentAllocatedDomainEvent(
             payment_id=self.id,
             invoice_id=invoice_id,
-            allocated_amount=amount
+            allocated_amount=amount,
+            customer_id=self.customer_id
         ))
 
     def get_total_allocated(self) -> Decimal:
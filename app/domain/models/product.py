@@ -389,6 +389,7 @@ class ProductPriceHistory(Base):
     changed_by = Column(Integer, ForeignKey('users.id'), nullable=True)
     changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     reason = Column(String(255), nullable=True)  # Optional reason for price change
+    price_list_id = Column(Integer, ForeignKey('price_lists.id'), nullable=True, index=True)  # NULL for base price changes
     
     # Relationships
     product = relationship("Product", backref="price_history")
@@ -466,6 +466,7 @@ class PurchaseRequest(Base, AggregateRoot):
     requested_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     requested_date = Column(Date, nullable=False, server_default=func.current_date())
     required_date = Column(Date, nullable=True)  # When items are needed
+    supplier_id = Column(Integer, ForeignKey("suppliers.id"), nullable=True)  # Suggested supplier (replenishment)
     
     # Status workflow
     status = Column(String(20), nullable=False, default='draft', index=True)
@@ -492,6 +493,7 @@ class PurchaseRequest(Base, AggregateRoot):
     requester = relationship("User", foreign_keys=[requested_by])
     approver = relationship("User", foreign_keys=[approved_by])
     converted_to_po = relationship("PurchaseOrder", foreign_keys=[converted_to_po_id])
+    supplier = relationship("Supplier", foreign_keys=[supplier_id])
 
     @staticmethod
     def _generate_number() -> str:
@@ -524,7 +526,8 @@ class PurchaseRequest(Base, AggregateRoot):
         requested_date: date = None,
         required_date: date = None,
         notes: str = None,
-        internal_notes: str = None
+        internal_notes: str = None,
+        supplier_id: int = None
     ):
         """Factory method to create a new PurchaseRequest."""
         if requested_date is None:
@@ -537,6 +540,7 @@ class PurchaseRequest(Base, AggregateRoot):
             required_date=required_date,
             notes=notes.strip() if notes else None,
             internal_notes=internal_notes.strip() if internal_notes else None,
+            supplier_id=supplier_id,
             status='draft'
         )
         
@@ -0,0 +1,21 @@
+"""Cached receivables aging summary shown on the payments dashboard."""
+from sqlalchemy import Column, String, Date, DateTime, Boolean, JSON
+
+from ...infrastructure.db import Base
+
+
+class AgingSummarySnapshot(Base):
+    """
+    Receivables aging summary (bucket totals, overdue totals, top customers)
+    computed for a set of bucket boundaries.
+
+    Invoice and payment events mark snapshots stale; a stale, expired or
+    previous-day snapshot is recomputed on the next read.
+    """
+    __tablename__ = "aging_summary_snapshots"
+
+    key = Column(String(50), primary_key=True)  # Bucket boundaries, e.g. '30,60,90'
+    as_of_date = Column(Date, nullable=False)
+    payload = Column(JSON, nullable=False)
+    stale = Column(Boolean, nullable=False, default=False)
+    refreshed_at = Column(DateTime, nullable=False)
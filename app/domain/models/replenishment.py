@@ -0,0 +1,27 @@
+"""Per-SKU state of the replenishment planner."""
+from decimal import Decimal
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime
+from sqlalchemy.sql import func
+
+from ...infrastructure.db import Base
+
+
+class ReplenishmentSkuState(Base):
+    """
+    Inputs and outcome of the last replenishment planning run for a product.
+
+    input_hash fingerprints what the plan of the product depends on (stock,
+    quantities on order, demand velocity, supplier and lead time, stock
+    settings): a later run skips products whose fingerprint is unchanged.
+    """
+    __tablename__ = "replenishment_sku_states"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    input_hash = Column(String(64), nullable=False)
+    supplier_id = Column(Integer, ForeignKey("suppliers.id"), nullable=True)  # Preferred supplier
+    daily_demand = Column(Numeric(14, 4), nullable=False, default=Decimal(0))
+    reorder_point = Column(Numeric(14, 3), nullable=False, default=Decimal(0))
+    suggested_quantity = Column(Numeric(14, 3), nullable=False, default=Decimal(0))
+    purchase_request_id = Column(Integer, ForeignKey("purchase_requests.id"), nullable=True)  # Request of the last need
+    planned_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
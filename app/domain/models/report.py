@@ -66,6 +66,9 @@ class ReportTemplate(Base, AggregateRoot):
             
         Returns:
             ReportTemplate instance
+            
+        Raises:
+            ValueError: If the name, report type or a calculated field formula is invalid
         """
         if not name or not name.strip():
             raise ValueError("Template name is required.")
@@ -74,6 +77,8 @@ class ReportTemplate(Base, AggregateRoot):
         if report_type not in valid_types:
             raise ValueError(f"Report type must be one of: {', '.join(valid_types)}")
         
+        ReportTemplate._validate_calculated_fields(calculated_fields)
+        
         template = ReportTemplate()
         template.name = name.strip()
         template.report_type = report_type
@@ -88,6 +93,12 @@ class ReportTemplate(Base, AggregateRoot):
         
         return template
 
+    @staticmethod
+    def _validate_calculated_fields(calculated_fields: Optional[List[Dict[str, Any]]]) -> None:
+        """Parse the calculated field formulas (compiled formulas are cached for report builds)."""
+        from ...services.report_formula import validate_calculated_fields
+        validate_calculated_fields(calculated_fields)
+
     def update(
         self,
         name: Optional[str] = None,
@@ -115,6 +126,7 @@ class ReportTemplate(Base, AggregateRoot):
         if grouping is not None:
             self.grouping = grouping
         if calculated_fields is not None:
+            ReportTemplate._validate_calculated_fields(calculated_fields)
             self.calculated_fields = calculated_fields
         if is_public is not None:
             self.is_public = is_public
@@ -0,0 +1,37 @@
+"""Background report jobs and their cached results."""
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+
+from ...infrastructure.db import Base
+
+
+class ReportJob(Base):
+    """
+    Report generated in the background by a Celery task.
+
+    The cache key is a hash of the report type, output format and query
+    parameters: a completed job that has not expired answers every request
+    with the same key. JSON results are stored in `result`; exported files
+    (excel, pdf, csv) are written to the report jobs directory.
+    """
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        Index('ix_report_jobs_cache_key_status', 'cache_key', 'status'),
+    )
+
+    id = Column(String(32), primary_key=True)  # Random hex id, used in download links
+    cache_key = Column(String(64), nullable=False)
+    report_type = Column(String(50), nullable=False)  # 'sales', 'margins', 'stock', 'customers', 'purchases', 'custom'
+    format = Column(String(10), nullable=False, default='json')  # 'json', 'excel', 'pdf', 'csv'
+    parameters = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default='pending')  # pending, running, completed, failed
+    progress = Column(Integer, nullable=False, default=0)  # Percent
+    result = Column(JSON, nullable=True)  # ReportData as JSON (format 'json')
+    file_path = Column(String(500), nullable=True)  # Exported file (other formats)
+    file_name = Column(String(255), nullable=True)
+    error = Column(Text, nullable=True)
+    created_by = Column(Integer, ForeignKey('users.id'), nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=True)  # Set on completion (result TTL)
@@ -0,0 +1,89 @@
+"""Sales star-schema read model: daily facts and period rollups."""
+from decimal import Decimal
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, Date, DateTime, UniqueConstraint, Index
+from sqlalchemy.sql import func
+
+from ...infrastructure.db import Base
+
+
+# Rollup granularities
+ROLLUP_PERIODS = ('day', 'week', 'month')
+
+
+class SalesDailyFact(Base):
+    """
+    Order line measures per day x product x customer x order status.
+
+    order_count is the number of orders containing the product; since an order
+    belongs to exactly one day, customer and status, it can be summed across rows
+    of the same product.
+    """
+    __tablename__ = "sales_daily_fact"
+
+    id = Column(Integer, primary_key=True)
+    sale_date = Column(Date, nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
+    status = Column(String(20), nullable=False)
+    quantity = Column(Numeric(14, 3), nullable=False, default=Decimal(0))
+    revenue_ht = Column(Numeric(14, 2), nullable=False, default=Decimal(0))
+    cost_amount = Column(Numeric(14, 2), nullable=False, default=Decimal(0))
+    line_count = Column(Integer, nullable=False, default=0)
+    order_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('sale_date', 'product_id', 'customer_id', 'status', name='uq_sales_daily_fact_grain'),
+        Index('ix_sales_daily_fact_customer_date', 'customer_id', 'sale_date'),
+        Index('ix_sales_daily_fact_product_date', 'product_id', 'sale_date'),
+    )
+
+
+class SalesDailyOrderFact(Base):
+    """
+    Order header measures per day x customer x order status.
+
+    Order totals (TTC, after document discount) and order counts cannot be
+    derived from line facts, so they are kept at the customer grain.
+    """
+    __tablename__ = "sales_daily_order_fact"
+
+    id = Column(Integer, primary_key=True)
+    sale_date = Column(Date, nullable=False)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
+    status = Column(String(20), nullable=False)
+    order_count = Column(Integer, nullable=False, default=0)
+    order_subtotal = Column(Numeric(14, 2), nullable=False, default=Decimal(0))
+    order_total = Column(Numeric(14, 2), nullable=False, default=Decimal(0))
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('sale_date', 'customer_id', 'status', name='uq_sales_daily_order_fact_grain'),
+        Index('ix_sales_daily_order_fact_customer_date', 'customer_id', 'sale_date'),
+    )
+
+
+class SalesPeriodRollup(Base):
+    """
+    Sales totals per period (day, week starting Sunday, month) x order status.
+
+    Dashboard KPIs for any date range are computed by summing whole-month rows
+    plus day rows for the partial months at the edges.
+    """
+    __tablename__ = "sales_period_rollup"
+
+    id = Column(Integer, primary_key=True)
+    period_type = Column(String(10), nullable=False)  # 'day', 'week', 'month'
+    period_start = Column(Date, nullable=False)
+    period_end = Column(Date, nullable=False)  # Inclusive
+    status = Column(String(20), nullable=False)
+    order_count = Column(Integer, nullable=False, default=0)
+    order_total = Column(Numeric(14, 2), nullable=False, default=Decimal(0))
+    revenue_ht = Column(Numeric(14, 2), nullable=False, default=Decimal(0))
+    quantity = Column(Numeric(14, 3), nullable=False, default=Decimal(0))
+    cost_amount = Column(Numeric(14, 2), nullable=False, default=Decimal(0))
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('period_type', 'period_start', 'status', name='uq_sales_period_rollup_grain'),
+    )
@@ -1,5 +1,5 @@
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Iterator, List
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
@@ -15,10 +15,34 @@ engine = None
 SessionLocal = None
 _domain_events_listener_registered = False
 
+# session.info key of the domain events raised by bulk statements
+_PENDING_DOMAIN_EVENTS = 'pending_domain_events'
 
-def _dispatch_domain_events(session):
-    """Dispatch domain events after transaction commit."""
-    # Collect domain events from all tracked aggregates
+
+def add_domain_events(session: Session, events: List) -> None:
+    """
+    Queue domain events to dispatch after the session's next commit.
+    
+    Bulk statements do not go through the aggregates, so their events are
+    queued on the session; they are dispatched with the aggregates' events
+    when the caller commits, and discarded on rollback.
+    
+    Args:
+        session: Session running the bulk statements
+        events: Domain events
+    """
+    session.info.setdefault(_PENDING_DOMAIN_EVENTS, []).extend(events)
+
+
+def _discard_domain_events(session):
+    """Drop the queued domain events of a rolled back transaction."""
+    if session.in_nested_transaction():
+        return  # Savepoint rolled back, the transaction goes on
+    session.info.pop(_PENDING_DOMAIN_EVENTS, None)
+
+
+def _collect_aggregate_events(session) -> List:
+    """Collect (and clear) the domain events of all tracked aggregates."""
     # Access events while objects are still bound to the session
     domain_events = []
     # Make a copy of identity_map values to avoid iteration issues
@@ -26,7 +50,7 @@ def _dispatch_domain_events(session):
     try:
         # Check if session is still active
         if not session.is_active:
-            return
+            return domain_events
         
         # Get all tracked objects before accessing their attributes
         # This ensures we're working with objects that are still bound
@@ -35,7 +59,7 @@ def _dispatch_domain_events(session):
             tracked_objects = list(session.identity_map.values())
         except (RuntimeError, AttributeError):
             # Session might be closed, skip event dispatch
-            return
+            return domain_events
         
         for obj in tracked_objects:
             # Only process objects that are AggregateRoot (have domain events)
@@ -60,6 +84,16 @@ def _dispatch_domain_events(session):
         # Session might be closed or object detached, skip event dispatch
         pass
     
+    return domain_events
+
+
+def _dispatch_domain_events(session):
+    """Dispatch domain events after transaction commit."""
+    # Events queued by bulk statements first (once the whole transaction is
+    # committed, not on savepoint release), then those of tracked aggregates
+    domain_events = [] if session.in_nested_transaction() else session.info.pop(_PENDING_DOMAIN_EVENTS, [])
+    domain_events.extend(_collect_aggregate_events(session))
+    
     # Dispatch all events (only if we have events to avoid unnecessary processing)
     if domain_events:
         domain_event_dispatcher.dispatch_all(domain_events)
@@ -75,6 +109,7 @@ def init_db(db_uri: str) -> None:
     # The listener is registered at the Session class level, so it applies to all sessions
     if not _domain_events_listener_registered:
         event.listens_for(Session, "after_commit")(_dispatch_domain_events)
+        event.listens_for(Session, "after_rollback")(_discard_domain_events)
         _domain_events_listener_registered = True
 
 
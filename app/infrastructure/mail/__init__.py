@@ -0,0 +1,14 @@
+"""Email transport infrastructure: SMTP connection pool, send queue and test backends."""
+from .metrics import EmailMetrics
+from .send_queue import EmailSendQueue, SendResult
+from .transport import (
+    EmailTransport, FileTransport, MemoryTransport, RateLimiter, SMTPConnection,
+    SMTPConnectionPool, SMTPTransport, create_email_transport, get_email_transport,
+    is_transient_error
+)
+
+__all__ = [
+    'EmailMetrics', 'EmailSendQueue', 'SendResult', 'EmailTransport', 'FileTransport',
+    'MemoryTransport', 'RateLimiter', 'SMTPConnection', 'SMTPConnectionPool', 'SMTPTransport',
+    'create_email_transport', 'get_email_transport', 'is_transient_error'
+]
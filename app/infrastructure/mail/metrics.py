@@ -0,0 +1,77 @@
+"""Send metrics of an email transport."""
+import threading
+import time
+from typing import Dict, Optional
+
+
+class EmailMetrics:
+    """
+    Thread-safe counters of an email transport: messages sent and failed,
+    retries, connections opened, send latency and throughput.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        """Zero every counter."""
+        with self._lock:
+            self.sent = 0
+            self.failed = 0
+            self.retries = 0
+            self.connections_opened = 0
+            self.latency_total = 0.0
+            self.latency_max = 0.0
+            self.first_sent_at: Optional[float] = None
+            self.last_sent_at: Optional[float] = None
+    
+    def record_sent(self, latency: float) -> None:
+        """Record a delivered message and its send latency (seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            self.sent += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            if self.first_sent_at is None:
+                self.first_sent_at = now - latency
+            self.last_sent_at = now
+    
+    def record_failed(self) -> None:
+        """Record a message given up on."""
+        with self._lock:
+            self.failed += 1
+    
+    def record_retry(self) -> None:
+        """Record a send attempt retried after a transient error."""
+        with self._lock:
+            self.retries += 1
+    
+    def record_connection(self) -> None:
+        """Record a connection opened to the server."""
+        with self._lock:
+            self.connections_opened += 1
+    
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Current values.
+        
+        Returns:
+            Dict with sent, failed, retries, connections_opened,
+            avg_latency_ms, max_latency_ms and throughput (messages per second
+            between the first and the last send)
+        """
+        with self._lock:
+            elapsed = (
+                self.last_sent_at - self.first_sent_at
+                if self.first_sent_at is not None else 0.0
+            )
+            return {
+                'sent': self.sent,
+                'failed': self.failed,
+                'retries': self.retries,
+                'connections_opened': self.connections_opened,
+                'avg_latency_ms': round(1000 * self.latency_total / self.sent, 1) if self.sent else 0.0,
+                'max_latency_ms': round(1000 * self.latency_max, 1),
+                'throughput': round(self.sent / elapsed, 2) if elapsed > 0 else 0.0,
+            }
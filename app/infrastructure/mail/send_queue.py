@@ -0,0 +1,81 @@
+"""Send queue: messages delivered in batches, one connection per batch."""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.message import Message
+from typing import Any, List, Optional, Tuple
+from .transport import EmailTransport
+
+
+@dataclass
+class SendResult:
+    """Outcome of a queued message."""
+    key: Any
+    success: bool
+    error: Optional[str] = None
+
+
+class EmailSendQueue:
+    """
+    Collects messages, then sends them in batches of `batch_size`, each
+    batch on one connection of the transport. With workers > 1, batches go
+    out in parallel (up to the transport pool size).
+    
+    Usage:
+        queue = EmailSendQueue(get_email_transport())
+        for ...:
+            queue.put(msg, recipients, key=reminder_id)
+        for result in queue.flush():
+            ...
+    """
+    
+    def __init__(self, transport: EmailTransport, batch_size: int = 50, workers: int = 1):
+        self.transport = transport
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self._pending: List[Tuple[Message, List[str], Any]] = []
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def put(self, msg: Message, recipients: List[str], key: Any = None) -> None:
+        """
+        Queue a message.
+        
+        Args:
+            msg: Message built by EmailService.build_message
+            recipients: Recipient addresses
+            key: Caller identifier returned in the SendResult
+        """
+        self._pending.append((msg, recipients, key))
+    
+    def flush(self) -> List[SendResult]:
+        """
+        Send the queued messages.
+        
+        Returns:
+            SendResult per message, in queue order
+        """
+        pending, self._pending = self._pending, []
+        batches = [
+            pending[start:start + self.batch_size]
+            for start in range(0, len(pending), self.batch_size)
+        ]
+        if self.workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(batches))) as executor:
+                batch_results = list(executor.map(self._send_batch, batches))
+        else:
+            batch_results = [self._send_batch(batch) for batch in batches]
+        return [result for results in batch_results for result in results]
+    
+    def _send_batch(self, batch: List[Tuple[Message, List[str], Any]]) -> List[SendResult]:
+        """Send a batch on one connection; failures do not stop the batch."""
+        results = []
+        with self.transport.connection() as connection:
+            for msg, recipients, key in batch:
+                try:
+                    self.transport.send(msg, recipients, connection=connection)
+                except Exception as e:
+                    results.append(SendResult(key=key, success=False, error=str(e)))
+                else:
+                    results.append(SendResult(key=key, success=True))
+        return results
@@ -0,0 +1,436 @@
+"""Email transports: pooled SMTP, plus in-memory and file backends for tests and development."""
+import os
+import smtplib
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from email.message import Message
+from typing import Callable, Iterator, List, Optional, Tuple
+from flask import current_app
+from .metrics import EmailMetrics
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Whether a send error may succeed on retry.
+    
+    Transient: dropped or refused connections, socket errors and 4xx replies.
+    Permanent: 5xx replies (authentication, rejected sender or recipients...).
+    
+    Args:
+        error: Exception raised by the send
+    
+    Returns:
+        True if the send should be retried
+    """
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    return isinstance(error, OSError)
+
+
+class RateLimiter:
+    """
+    Token bucket: at most `rate` messages per second, bursts of `burst`.
+    A rate of 0 disables the limit. Thread-safe.
+    """
+    
+    def __init__(self, rate: float = 0, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a message may be sent."""
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class SMTPConnection:
+    """
+    SMTP connection kept open across messages.
+    
+    The connection is opened on the first message and reopened once if the
+    server dropped it in between (idle timeout).
+    """
+    
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        use_tls: bool = True,
+        use_ssl: bool = False,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: float = 30,
+        on_connect: Optional[Callable[[], None]] = None
+    ):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.on_connect = on_connect
+        self.server = None
+        self.sent_count = 0
+        self.connect_count = 0
+        self.last_used = time.monotonic()
+    
+    def connect(self):
+        """Open the connection (TLS and login included)."""
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        
+        if self.use_tls and not self.use_ssl:
+            server.starttls()
+        
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        
+        self.server = server
+        self.connect_count += 1
+        if self.on_connect:
+            self.on_connect()
+    
+    def is_alive(self) -> bool:
+        """Check an open connection with NOOP."""
+        if self.server is None:
+            return False
+        try:
+            return self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+    
+    def send(self, msg: Message, recipients: List[str]):
+        """
+        Send a message, reconnecting once if the connection was dropped.
+        
+        Args:
+            msg: Message built by EmailService.build_message
+            recipients: Recipient addresses
+        """
+        if self.server is None:
+            self.connect()
+        try:
+            self.server.sendmail(msg['From'], recipients, msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            self.server = None
+            self.connect()
+            self.server.sendmail(msg['From'], recipients, msg.as_string())
+        self.sent_count += 1
+        self.last_used = time.monotonic()
+    
+    def close(self):
+        """Quit the server (errors on quit are ignored)."""
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        finally:
+            self.server = None
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of SMTP connections kept open between sends.
+    
+    A connection idle for more than `keepalive` seconds is checked with NOOP
+    before reuse, and one idle for more than `idle_timeout` seconds is closed
+    and reopened (servers drop idle clients). A connection that raised while
+    in use is closed before going back to the pool. Thread-safe: callers
+    block while all `max_size` connections are in use.
+    """
+    
+    def __init__(
+        self,
+        factory: Callable[[], SMTPConnection],
+        max_size: int = 2,
+        idle_timeout: float = 60,
+        keepalive: float = 30
+    ):
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self.keepalive = keepalive
+        self._idle: List[SMTPConnection] = []
+        self._in_use = 0
+        self._condition = threading.Condition()
+    
+    def acquire(self) -> SMTPConnection:
+        """Take a connection (open or to be opened on first send)."""
+        with self._condition:
+            while not self._idle and self._in_use >= self.max_size:
+                self._condition.wait()
+            connection = self._idle.pop() if self._idle else self.factory()
+            self._in_use += 1
+        
+        idle_for = time.monotonic() - connection.last_used
+        if connection.server is not None and (
+            idle_for > self.idle_timeout or (idle_for > self.keepalive and not connection.is_alive())
+        ):
+            connection.close()
+        return connection
+    
+    def release(self, connection: SMTPConnection, discard: bool = False) -> None:
+        """Give a connection back (closed first if discard)."""
+        if discard:
+            connection.close()
+        with self._condition:
+            self._in_use -= 1
+            self._idle.append(connection)
+            self._condition.notify()
+    
+    @contextmanager
+    def connection(self) -> Iterator[SMTPConnection]:
+        """Connection held for the block."""
+        connection = self.acquire()
+        try:
+            yield connection
+        except Exception:
+            self.release(connection, discard=True)
+            raise
+        else:
+            self.release(connection)
+    
+    def close(self) -> None:
+        """Close the idle connections."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+class EmailTransport(ABC):
+    """Delivers built messages. Subclasses implement send()."""
+    
+    def __init__(self):
+        self.metrics = EmailMetrics()
+    
+    @contextmanager
+    def connection(self) -> Iterator[Optional[SMTPConnection]]:
+        """Connection to reuse for several send() calls (None when not applicable)."""
+        yield None
+    
+    @abstractmethod
+    def send(self, msg: Message, recipients: List[str], connection: Optional[SMTPConnection] = None) -> None:
+        """
+        Deliver a message.
+        
+        Args:
+            msg: Message with From set
+            recipients: Recipient addresses
+            connection: Optional connection from connection()
+        """
+        raise NotImplementedError
+    
+    def close(self) -> None:  # noqa: B027 - optional hook, nothing to release by default
+        """Release the transport resources."""
+
+
+class SMTPTransport(EmailTransport):
+    """
+    SMTP delivery through a connection pool, rate limited, with retries.
+    
+    Transient errors (see is_transient_error) are retried up to max_retries
+    times after retry_backoff, 2 x retry_backoff, 4 x retry_backoff...
+    seconds; the failing connection is closed and reopened.
+    """
+    
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        use_tls: bool = True,
+        use_ssl: bool = False,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        pool_size: int = 2,
+        idle_timeout: float = 60,
+        keepalive: float = 30,
+        rate_limit: float = 0,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        timeout: float = 30
+    ):
+        super().__init__()
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.pool = SMTPConnectionPool(
+            lambda: SMTPConnection(
+                host=host,
+                port=port,
+                use_tls=use_tls,
+                use_ssl=use_ssl,
+                username=username,
+                password=password,
+                timeout=timeout,
+                on_connect=self.metrics.record_connection
+            ),
+            max_size=pool_size,
+            idle_timeout=idle_timeout,
+            keepalive=keepalive
+        )
+    
+    @contextmanager
+    def connection(self) -> Iterator[SMTPConnection]:
+        """Pooled connection held for the block."""
+        with self.pool.connection() as connection:
+            yield connection
+    
+    def send(self, msg: Message, recipients: List[str], connection: Optional[SMTPConnection] = None) -> None:
+        """
+        Deliver a message, on the given connection or on a pooled one.
+        
+        Raises:
+            smtplib.SMTPException or OSError: Permanent error, or transient
+                error still failing after the retries
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            started_at = time.monotonic()
+            try:
+                if connection is not None:
+                    connection.send(msg, recipients)
+                else:
+                    with self.pool.connection() as pooled:
+                        pooled.send(msg, recipients)
+            except Exception as e:
+                if not is_transient_error(e) or attempt >= self.max_retries:
+                    self.metrics.record_failed()
+                    raise
+                attempt += 1
+                self.metrics.record_retry()
+                if connection is not None:
+                    connection.close()
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                continue
+            self.metrics.record_sent(time.monotonic() - started_at)
+            return
+    
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.pool.close()
+
+
+class MemoryTransport(EmailTransport):
+    """Keeps messages in `outbox` as (message, recipients) - for tests."""
+    
+    def __init__(self):
+        super().__init__()
+        self.outbox: List[Tuple[Message, List[str]]] = []
+        self._lock = threading.Lock()
+    
+    def send(self, msg: Message, recipients: List[str], connection: Optional[SMTPConnection] = None) -> None:
+        """Append the message to the outbox."""
+        with self._lock:
+            self.outbox.append((msg, list(recipients)))
+        self.metrics.record_sent(0.0)
+
+
+class FileTransport(EmailTransport):
+    """Writes each message to an .eml file of a directory - for development."""
+    
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def send(self, msg: Message, recipients: List[str], connection: Optional[SMTPConnection] = None) -> None:
+        """Write the message (recipients in an X-Recipients header)."""
+        started_at = time.monotonic()
+        if 'X-Recipients' not in msg:
+            msg['X-Recipients'] = ', '.join(recipients)
+        filename = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}.eml"
+        with open(os.path.join(self.directory, filename), 'wb') as output:
+            output.write(msg.as_bytes())
+        self.metrics.record_sent(time.monotonic() - started_at)
+
+
+def create_email_transport(config) -> EmailTransport:
+    """
+    Build the transport selected by MAIL_BACKEND ('smtp', 'memory' or 'file').
+    
+    Args:
+        config: Flask config (MAIL_* keys)
+    
+    Returns:
+        EmailTransport
+    
+    Raises:
+        ValueError: If the backend is unknown or SMTP is not configured
+    """
+    backend = (config.get('MAIL_BACKEND') or 'smtp').lower()
+    if backend == 'memory':
+        return MemoryTransport()
+    if backend == 'file':
+        return FileTransport(config.get('MAIL_FILE_PATH') or 'mail_outbox')
+    if backend != 'smtp':
+        raise ValueError(f"Unknown MAIL_BACKEND '{backend}' (expected 'smtp', 'memory' or 'file').")
+    
+    if not config.get('MAIL_SERVER'):
+        raise ValueError("SMTP server not configured. Set MAIL_SERVER in config.")
+    return SMTPTransport(
+        host=config.get('MAIL_SERVER'),
+        port=config.get('MAIL_PORT', 587),
+        use_tls=config.get('MAIL_USE_TLS', True),
+        use_ssl=config.get('MAIL_USE_SSL', False),
+        username=config.get('MAIL_USERNAME'),
+        password=config.get('MAIL_PASSWORD'),
+        pool_size=config.get('MAIL_POOL_SIZE', 2),
+        idle_timeout=config.get('MAIL_POOL_IDLE_TIMEOUT', 60),
+        keepalive=config.get('MAIL_KEEPALIVE_SECONDS', 30),
+        rate_limit=config.get('MAIL_RATE_LIMIT', 0),
+        max_retries=config.get('MAIL_MAX_RETRIES', 3),
+        retry_backoff=config.get('MAIL_RETRY_BACKOFF', 1.0),
+        timeout=config.get('MAIL_TIMEOUT', 30)
+    )
+
+
+_transport_lock = threading.Lock()
+
+
+def get_email_transport() -> EmailTransport:
+    """
+    Transport of the current app, built on first use and shared by the
+    process (its pool keeps connections open between sends).
+    
+    Returns:
+        EmailTransport
+    """
+    app = current_app._get_current_object()
+    transport = app.extensions.get('email_transport')
+    if transport is None:
+        with _transport_lock:
+            transport = app.extensions.get('email_transport')
+            if transport is None:
+                transport = create_email_transport(app.config)
+                app.extensions['email_transport'] = transport
+    return transport
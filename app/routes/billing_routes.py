@@ -17,13 +17,14 @@ from app.application.billing.payments.commands.commands import (
     ConfirmPaymentCommand, PaymentAllocationInput
 )
 from app.application.billing.payments.queries.queries import (
-    ListPaymentsQuery, GetPaymentByIdQuery, GetOverdueInvoicesQuery, GetAgingReportQuery
+    ListPaymentsQuery, GetPaymentByIdQuery, GetOverdueInvoicesQuery, GetAgingReportQuery, GetAgingSummaryQuery
 )
 from app.application.sales.orders.queries.queries import GetOrderByIdQuery
 from app.application.customers.queries.queries import ListCustomersQuery
-from app.services.invoice_pdf_service import InvoicePDFService
+from app.services.pdf_artifact_store import get_pdf_artifact_store
 from app.services.invoice_email_service import InvoiceEmailService
 from app.services.fec_export_service import FECExportService
+from app.services.streaming_export import spooled_file
 from app.infrastructure.db import get_session
 from app.security.session_auth import require_roles_or_redirect
 
@@ -193,12 +194,11 @@ def invoice_pdf(invoice_id: int):
             flash(_('Invoice not found'), 'error')
             return redirect(url_for('billing.invoices_list'))
         
-        # Generate PDF
-        pdf_service = InvoicePDFService()
-        pdf_buffer = pdf_service.generate_invoice_pdf(invoice)
+        # Stored PDF (rendered once the invoice is validated), else a fresh one
+        pdf_file = get_pdf_artifact_store().open('invoice', invoice.id, invoice)
         
         return send_file(
-            pdf_buffer,
+            pdf_file,
             mimetype='application/pdf',
             as_attachment=True,
             download_name=f"Facture_{invoice.number}.pdf"
@@ -219,6 +219,11 @@ def validate_invoice(invoice_id: int):
         command = ValidateInvoiceCommand(id=invoice_id, validated_by=validated_by)
         mediator.dispatch(command)
         
+        # The invoice no longer changes: render its PDF once, for later downloads and emails
+        invoice = mediator.dispatch(GetInvoiceByIdQuery(id=invoice_id))
+        if invoice:
+            get_pdf_artifact_store().warm('invoice', invoice.id, invoice)
+        
         flash(_('Invoice validated successfully'), 'success')
         
         if request.is_json:
@@ -368,25 +373,32 @@ def export_fec():
             except ValueError:
                 pass
         
-        # Export FEC
-        with get_session() as session:
-            fec_service = FECExportService(session)
-            fec_buffer = fec_service.export_invoices_to_fec(
-                date_from=date_from_parsed,
-                date_to=date_to_parsed
-            )
-            
-            # Generate filename
-            filename = f"FEC_{date_from_parsed or 'all'}_{date_to_parsed or 'all'}.txt"
-            if not date_from_parsed and not date_to_parsed:
-                filename = f"FEC_{datetime.now().strftime('%Y%m%d')}.txt"
-            
-            return send_file(
-                fec_buffer,
-                mimetype='text/plain; charset=utf-8',
-                as_attachment=True,
-                download_name=filename
-            )
+        # Generate filename
+        filename = f"FEC_{date_from_parsed or 'all'}_{date_to_parsed or 'all'}.txt"
+        if not date_from_parsed and not date_to_parsed:
+            filename = f"FEC_{datetime.now().strftime('%Y%m%d')}.txt"
+        
+        # Export FEC (invoices and credit notes in date order), written in full to a
+        # spooled file before it is sent: a failure mid-export must not deliver a
+        # truncated legal file with a 200 status
+        output = spooled_file()
+        try:
+            with get_session() as session:
+                FECExportService(session).write_fec(
+                    output,
+                    date_from=date_from_parsed,
+                    date_to=date_to_parsed
+                )
+        except Exception:
+            output.close()
+            raise
+        output.seek(0)
+        return send_file(
+            output,
+            mimetype='text/plain; charset=utf-8',
+            as_attachment=True,
+            download_name=filename
+        )
     except Exception as e:
         flash(_('An error occurred: %(error)s', error=str(e)), 'error')
         return redirect(url_for('billing.invoices_list'))
@@ -685,9 +697,13 @@ def reconcile_payments():
                 
                 statement_date = datetime.strptime(statement_date_str, '%Y-%m-%d').date()
                 
-                # Parse transactions from JSON or form
+                # Parse transactions from a statement file, JSON or form
+                statement_file = request.files.get('statement_file')
                 transactions_json = request.form.get('transactions')
-                if transactions_json:
+                if statement_file and statement_file.filename:
+                    from app.services.bank_statement_parser import iter_statement_transactions
+                    transactions = iter_statement_transactions(statement_file.stream, statement_file.filename)
+                elif transactions_json:
                     import json
                     transactions = json.loads(transactions_json)
                 else:
@@ -717,7 +733,8 @@ def reconcile_payments():
                 
                 result = mediator.dispatch(command)
                 flash(_('Bank statement imported: %(matched)s matched, %(unmatched)s unmatched', 
-                       matched=result.get('matched', 0), unmatched=result.get('unmatched', 0)), 'success')
+                       matched=len(result.get('matched', [])),
+                       unmatched=len(result.get('unmatched_transactions', []))), 'success')
                 return redirect(url_for('billing.reconcile_payments'))
             else:
                 # Single payment reconciliation
@@ -812,10 +829,13 @@ def aging_report():
             except ValueError:
                 pass
         
+        # Invoice details are only loaded for a single customer, one page at a time
         query = GetAgingReportQuery(
             customer_id=customer_id,
             as_of_date=as_of_date,
-            include_paid=include_paid
+            include_paid=include_paid,
+            include_invoices=customer_id is not None,
+            invoices_after=request.args.get('after')
         )
         
         aging_report = mediator.dispatch(query)
@@ -907,61 +927,36 @@ def get_customer_outstanding_json():
 def payments_dashboard():
     """Dashboard for outstanding payments with KPIs and charts."""
     try:
-        from datetime import date
+        # Cached summary: bucket totals, overdue totals and top customers
+        summary = mediator.dispatch(GetAgingSummaryQuery())
+        total_outstanding = summary.total_outstanding
         
-        # Get aging report for all customers
-        aging_query = GetAgingReportQuery(
-            customer_id=None,
-            as_of_date=date.today(),
-            include_paid=False
-        )
-        aging_report = mediator.dispatch(aging_query)
-        
-        # Calculate KPIs
-        total_outstanding = sum(customer.total_outstanding for customer in aging_report) if aging_report else Decimal(0)
-        
-        # Calculate by buckets
-        bucket_0_30 = Decimal(0)
-        bucket_31_60 = Decimal(0)
-        bucket_61_90 = Decimal(0)
-        bucket_90_plus = Decimal(0)
-        
-        invoice_count_0_30 = 0
-        invoice_count_31_60 = 0
-        invoice_count_61_90 = 0
-        invoice_count_90_plus = 0
-        
-        for customer in aging_report:
-            if customer.buckets:
-                for bucket in customer.buckets:
-                    if bucket.bucket_name == '0-30':
-                        bucket_0_30 += bucket.total_amount
-                        invoice_count_0_30 += bucket.invoice_count
-                    elif bucket.bucket_name == '31-60':
-                        bucket_31_60 += bucket.total_amount
-                        invoice_count_31_60 += bucket.invoice_count
-                    elif bucket.bucket_name == '61-90':
-                        bucket_61_90 += bucket.total_amount
-                        invoice_count_61_90 += bucket.invoice_count
-                    elif bucket.bucket_name == '90+':
-                        bucket_90_plus += bucket.total_amount
-                        invoice_count_90_plus += bucket.invoice_count
-        
-        # Get overdue invoices count
-        overdue_query = GetOverdueInvoicesQuery(
-            customer_id=None,
-            days_overdue=None,
-            page=1,
-            per_page=10000
-        )
-        overdue_invoices = mediator.dispatch(overdue_query)
-        total_overdue_count = len(overdue_invoices)
+        buckets = {bucket.bucket_name: bucket for bucket in summary.buckets}
+        
+        def bucket_amount(name):
+            return buckets[name].total_amount if name in buckets else Decimal(0)
+        
+        def bucket_count(name):
+            return buckets[name].invoice_count if name in buckets else 0
+        
+        bucket_0_30 = bucket_amount('0-30')
+        bucket_31_60 = bucket_amount('31-60')
+        bucket_61_90 = bucket_amount('61-90')
+        bucket_90_plus = bucket_amount('90+')
+        
+        invoice_count_0_30 = bucket_count('0-30')
+        invoice_count_31_60 = bucket_count('31-60')
+        invoice_count_61_90 = bucket_count('61-90')
+        invoice_count_90_plus = bucket_count('90+')
+        
+        total_overdue_count = summary.overdue_count
+        total_overdue_amount = summary.overdue_amount
         
-        # Calculate total overdue amount
-        total_overdue_amount = sum(inv.remaining_amount for inv in overdue_invoices) if overdue_invoices else Decimal(0)
+        # Top customers are already sorted by outstanding amount
+        aging_report = summary.top_customers
         
         # Get top 10 customers by outstanding amount
-        top_customers = sorted(aging_report, key=lambda x: x.total_outstanding, reverse=True)[:10] if aging_report else []
+        top_customers = aging_report[:10]
         
         # Calculate percentage distribution
         if total_outstanding > 0:
@@ -1016,7 +1011,7 @@ def payments_dashboard():
             top_customers=top_customers,
             chart_data=chart_data,
             top_customers_chart=top_customers_chart,
-            aging_report=aging_report[:20] if aging_report else []  # Limit to top 20 for table
+            aging_report=aging_report  # Top 20 customers for the table
         )
     except Exception as e:
         flash(_('An error occurred: %(error)s', error=str(e)), 'error')
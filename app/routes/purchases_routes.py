@@ -1160,7 +1160,7 @@ def purchase_receipt_pdf(receipt_id: int):
     """Download purchase receipt PDF."""
     try:
         from flask import send_file
-        from app.services.purchase_receipt_pdf_service import PurchaseReceiptPDFService
+        from app.services.pdf_artifact_store import get_pdf_artifact_store
         
         query = GetPurchaseReceiptByIdQuery(id=receipt_id)
         receipt = mediator.dispatch(query)
@@ -1169,12 +1169,11 @@ def purchase_receipt_pdf(receipt_id: int):
             flash(_('Purchase receipt not found'), 'error')
             return redirect(url_for('purchases_frontend.list_purchase_receipts'))
         
-        # Generate PDF
-        pdf_service = PurchaseReceiptPDFService()
-        pdf_buffer = pdf_service.generate_receipt_pdf(receipt)
+        # Stored PDF (rendered once the receipt is validated), else a fresh one
+        pdf_file = get_pdf_artifact_store().open('receipt', receipt.id, receipt)
         
         return send_file(
-            pdf_buffer,
+            pdf_file,
             mimetype='application/pdf',
             as_attachment=True,
             download_name=f"Bon_Reception_{receipt.number}.pdf"
@@ -1202,6 +1201,12 @@ def validate_purchase_receipt(receipt_id: int):
         )
         mediator.dispatch(command)
         
+        # The receipt no longer changes: render its PDF once, for later downloads
+        from app.services.pdf_artifact_store import get_pdf_artifact_store
+        receipt = mediator.dispatch(GetPurchaseReceiptByIdQuery(id=receipt_id))
+        if receipt:
+            get_pdf_artifact_store().warm('receipt', receipt.id, receipt)
+        
         flash(_('Purchase receipt validated. Stock has been updated.'), 'success')
         return redirect(url_for('purchases_frontend.view_purchase_receipt', receipt_id=receipt_id))
     except Exception as e:
@@ -1,9 +1,8 @@
 """Frontend routes for reports and analytics."""
-from flask import Blueprint, render_template, request, jsonify, session, send_file, current_app as app
+from flask import Blueprint, render_template, request, jsonify, session, send_file, Response, stream_with_context, current_app as app
 from flask_babel import gettext as _
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from io import BytesIO
 
 from app.security.session_auth import require_roles_or_redirect
 from app.application.common.mediator import mediator
@@ -13,6 +12,7 @@ from app.application.reports.queries.queries import (
     GetSalesForecastQuery, GetStockForecastQuery
 )
 from app.services.report_export_service import ReportExportService
+from app.services.streaming_export import spooled_file
 
 reports_routes = Blueprint('reports', __name__)
 
@@ -634,7 +634,9 @@ def export_report():
         export_service = ReportExportService()
         
         if format_type == 'excel':
-            file_data = export_service.export_to_excel(report_dto)
+            file_data = spooled_file()
+            export_service.write_excel(report_dto, file_data)
+            file_data.seek(0)
             mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
             filename = f'{report_type}_report.xlsx'
         elif format_type == 'pdf':
@@ -642,9 +644,11 @@ def export_report():
             mimetype = 'application/pdf'
             filename = f'{report_type}_report.pdf'
         elif format_type == 'csv':
-            file_data = export_service.export_to_csv(report_dto)
-            mimetype = 'text/csv'
-            filename = f'{report_type}_report.csv'
+            return Response(
+                stream_with_context(export_service.stream_csv(report_dto)),
+                mimetype='text/csv',
+                headers={'Content-Disposition': f'attachment; filename={report_type}_report.csv'}
+            )
         else:
             return jsonify({
                 'success': False,
@@ -652,7 +656,7 @@ def export_report():
             }), 400
         
         return send_file(
-            BytesIO(file_data),
+            file_data,
             mimetype=mimetype,
             as_attachment=True,
             download_name=filename
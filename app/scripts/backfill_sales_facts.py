@@ -0,0 +1,41 @@
+"""Script to (re)build the sales fact read model from existing orders."""
+import argparse
+import sys
+import os
+from datetime import date, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app import create_app
+from app.infrastructure.db import get_session
+from app.services.sales_fact_service import SalesFactService
+
+
+def backfill_sales_facts(date_from: date, date_to: date, chunk_days: int = 31) -> None:
+    """Rebuild facts and rollups month by month (one transaction per chunk)."""
+    app = create_app()
+    
+    with app.app_context():
+        chunk_start = date_from
+        while chunk_start <= date_to:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), date_to)
+            with get_session() as session:
+                counts = SalesFactService(session).backfill(chunk_start, chunk_end)
+                session.commit()
+            print(f"[OK] {chunk_start} -> {chunk_end}: {counts}")
+            chunk_start = chunk_end + timedelta(days=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the sales fact read model.")
+    parser.add_argument("--from", dest="date_from", required=True, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", default=date.today().isoformat(), help="Last day (YYYY-MM-DD)")
+    parser.add_argument("--chunk-days", type=int, default=31, help="Days rebuilt per transaction")
+    args = parser.parse_args()
+    
+    backfill_sales_facts(date.fromisoformat(args.date_from), date.fromisoformat(args.date_to), args.chunk_days)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark the streaming FEC export on synthetic invoices and credit notes.
+
+Creates the schema in a scratch SQLite database (in memory by default), fills
+it with synthetic validated invoices spread over a year plus credit notes,
+then streams the FEC file of the whole period to a temporary file and prints
+the duration and file size (and the peak allocations of the export with
+--trace-memory). Never point --database-url at the application database.
+
+    python app/scripts/benchmark_fec_export.py --invoices 500000
+    python app/scripts/benchmark_fec_export.py --invoices 500000 --trace-memory
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+# Import all models to ensure they are registered with Base
+from app.domain.models.user import User
+from app.domain.models.product import Product, PriceList  # noqa: F401
+from app.domain.models.category import Category  # noqa: F401
+from app.domain.models.customer import Customer
+from app.domain.models.supplier import Supplier  # noqa: F401
+from app.domain.models.purchase import PurchaseOrder  # noqa: F401
+from app.domain.models.stock import StockItem, Location  # noqa: F401
+from app.domain.models.quote import Quote  # noqa: F401
+from app.domain.models.order import Order  # noqa: F401
+from app.domain.models.invoice import Invoice, CreditNote
+from app.domain.models.payment import Payment  # noqa: F401
+from app.infrastructure.db import Base
+from app.services.fec_export_service import FECExportService
+
+
+def populate(session, invoice_count: int, customers: int, credit_note_every: int, batch_size: int) -> None:
+    """Insert synthetic customers, invoices and credit notes (seeded)."""
+    rng = random.Random(42)
+    start = date.today() - timedelta(days=365)
+    session.add(User(id=1, username='bench', role='admin', password_hash='x'))
+    session.execute(insert(Customer), [
+        {'id': index, 'code': f"C{index:05d}", 'type': 'B2B', 'name': f"Customer {index}",
+         'company_name': f"Customer {index} SARL", 'email': f"customer{index}@example.com"}
+        for index in range(1, customers + 1)
+    ])
+
+    for offset in range(0, invoice_count, batch_size):
+        invoices, credit_notes = [], []
+        for index in range(offset + 1, min(offset + batch_size, invoice_count) + 1):
+            invoice_date = start + timedelta(days=rng.randrange(365))
+            subtotal = Decimal(rng.randint(1000, 500000)) / 100
+            tax = (subtotal * Decimal('0.20')).quantize(Decimal('0.01'))
+            customer_id = rng.randint(1, customers)
+            invoices.append({
+                'id': index, 'number': f"FA-{index:07d}", 'customer_id': customer_id,
+                'invoice_date': invoice_date, 'due_date': invoice_date + timedelta(days=30),
+                'status': 'validated', 'subtotal': subtotal, 'discount_amount': Decimal(0),
+                'tax_amount': tax, 'total': subtotal + tax, 'paid_amount': Decimal(0),
+                'remaining_amount': subtotal + tax, 'created_by': 1
+            })
+            if index % credit_note_every == 0:
+                credit_notes.append({
+                    'number': f"AV-{index:07d}", 'invoice_id': index, 'customer_id': customer_id,
+                    'reason': 'Return', 'total_amount': subtotal, 'tax_amount': tax, 'total_ttc': subtotal + tax,
+                    'status': 'validated', 'created_by': 1,
+                    'created_at': datetime.combine(invoice_date + timedelta(days=5), datetime.min.time())
+                })
+        session.execute(insert(Invoice), invoices)
+        if credit_notes:
+            session.execute(insert(CreditNote), credit_notes)
+    session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming FEC export.")
+    parser.add_argument("--invoices", type=int, default=500000, help="Synthetic invoices")
+    parser.add_argument("--customers", type=int, default=5000, help="Synthetic customers")
+    parser.add_argument("--credit-note-every", type=int, default=50, help="One credit note per N invoices")
+    parser.add_argument("--batch-size", type=int, default=20000, help="Rows per insert batch")
+    parser.add_argument("--database-url", default="sqlite://", help="Scratch database (default: in memory)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Report the peak Python allocations of the export (slower)")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    began = time.perf_counter()
+    with Session() as session:
+        populate(session, args.invoices, args.customers, args.credit_note_every, args.batch_size)
+    print(f"Populated {args.invoices} invoices in {time.perf_counter() - began:.1f} s")
+
+    if args.trace_memory:
+        tracemalloc.start()
+    with Session() as session, tempfile.TemporaryFile() as output:
+        began = time.perf_counter()
+        FECExportService(session).write_fec(output)
+        elapsed = time.perf_counter() - began
+        size = output.tell()
+
+    print(f"FEC export: {elapsed:.1f} s, {size / 2 ** 20:.1f} MiB written")
+    if args.trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        print(f"Peak traced allocations: {peak / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Benchmark func.date() filters against half-open timestamp ranges on synthetic orders.
+
+Builds scratch copies of the orders / order_lines columns used by analytics
+(with the ix_orders_status_created_at and ix_order_lines_product_order
+indexes), fills them with synthetic data and prints the query plan and timing
+of each predicate. Never point --database-url at the application database.
+
+    python app/scripts/benchmark_order_date_filters.py --orders 5000000
+    python app/scripts/benchmark_order_date_filters.py --database-url postgresql://.../bench
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, Numeric, DateTime, Index,
+    create_engine, select, insert, func, text
+)
+
+from app.utils.period import date_range_filter
+
+REVENUE_STATUSES = ('confirmed', 'ready', 'shipped', 'delivered', 'invoiced')
+STATUS_WEIGHTS = (
+    ('draft', 5), ('confirmed', 10), ('ready', 5), ('shipped', 10),
+    ('delivered', 20), ('invoiced', 45), ('canceled', 5),
+)
+
+metadata = MetaData()
+
+bench_orders = Table(
+    'bench_orders', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('customer_id', Integer, nullable=False),
+    Column('status', String(20), nullable=False),
+    Column('total', Numeric(12, 2), nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Index('ix_bench_orders_status_created_at', 'status', 'created_at', postgresql_include=['total']),
+)
+
+bench_order_lines = Table(
+    'bench_order_lines', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('order_id', Integer, nullable=False),
+    Column('product_id', Integer, nullable=False),
+    Column('quantity', Numeric(12, 3), nullable=False),
+    Column('line_total_ht', Numeric(12, 2), nullable=False),
+    Index('ix_bench_order_lines_product_order', 'product_id', 'order_id',
+          postgresql_include=['quantity', 'line_total_ht']),
+)
+
+
+def populate(engine, order_count: int, lines_per_order: int, products: int, days: int, batch_size: int) -> None:
+    """Insert synthetic orders spread over the last `days` days."""
+    rng = random.Random(42)
+    statuses = [status for status, weight in STATUS_WEIGHTS for _ in range(weight)]
+    start = datetime.combine(date.today() - timedelta(days=days), datetime.min.time())
+    seconds = days * 86400
+    line_id = 0
+
+    with engine.begin() as conn:
+        for offset in range(0, order_count, batch_size):
+            orders, lines = [], []
+            for order_id in range(offset + 1, min(offset + batch_size, order_count) + 1):
+                orders.append({
+                    'id': order_id,
+                    'customer_id': rng.randint(1, 20000),
+                    'status': rng.choice(statuses),
+                    'total': Decimal(rng.randint(1000, 500000)) / 100,
+                    'created_at': start + timedelta(seconds=rng.randrange(seconds)),
+                })
+                for _ in range(lines_per_order):
+                    line_id += 1
+                    lines.append({
+                        'id': line_id,
+                        'order_id': order_id,
+                        'product_id': rng.randint(1, products),
+                        'quantity': Decimal(rng.randint(1, 20)),
+                        'line_total_ht': Decimal(rng.randint(100, 100000)) / 100,
+                    })
+            conn.execute(insert(bench_orders), orders)
+            if lines:
+                conn.execute(insert(bench_order_lines), lines)
+            print(f"  {offset + len(orders):,} / {order_count:,} orders")
+        conn.execute(text('ANALYZE'))
+
+
+def explain(conn, statement) -> str:
+    """Return the query plan of a statement (EXPLAIN ANALYZE on PostgreSQL)."""
+    compiled = statement.compile(conn, compile_kwargs={'literal_binds': True})
+    if conn.dialect.name == 'postgresql':
+        rows = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {compiled}")).all()
+        return '\n'.join(row[0] for row in rows)
+    if conn.dialect.name == 'sqlite':
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        return '\n'.join(row[-1] for row in rows)
+    rows = conn.execute(text(f"EXPLAIN {compiled}")).all()
+    return '\n'.join(str(row) for row in rows)
+
+
+def best_time(conn, statement, repeat: int) -> float:
+    """Best wall-clock time in milliseconds over `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(statement).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def build_queries(start_date: date, end_date: date, product_id: int):
+    """(label, func.date() statement, half-open range statement) pairs."""
+    def kpi(predicate):
+        return select(func.count(), func.sum(bench_orders.c.total)).where(
+            bench_orders.c.status.in_(REVENUE_STATUSES), *predicate
+        )
+
+    def product(predicate):
+        return select(func.sum(bench_order_lines.c.quantity)).join(
+            bench_orders, bench_orders.c.id == bench_order_lines.c.order_id
+        ).where(
+            bench_order_lines.c.product_id == product_id,
+            bench_orders.c.status.in_(REVENUE_STATUSES),
+            *predicate
+        )
+
+    legacy = (
+        func.date(bench_orders.c.created_at) >= start_date,
+        func.date(bench_orders.c.created_at) <= end_date,
+    )
+    sargable = (date_range_filter(bench_orders.c.created_at, start_date, end_date),)
+    return [
+        ('Revenue KPI (30 days)', kpi(legacy), kpi(sargable)),
+        (f'Product {product_id} quantity (30 days)', product(legacy), product(sargable)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sargable order date filters on synthetic data.")
+    parser.add_argument("--database-url", default="sqlite:///benchmark_orders.db",
+                        help="Scratch database (default: ./benchmark_orders.db)")
+    parser.add_argument("--orders", type=int, default=5_000_000, help="Synthetic orders to generate")
+    parser.add_argument("--lines-per-order", type=int, default=2, help="Order lines per order")
+    parser.add_argument("--products", type=int, default=5000, help="Distinct product IDs")
+    parser.add_argument("--days", type=int, default=3 * 365, help="History spread, in days")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Orders inserted per statement")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per query (best time reported)")
+    parser.add_argument("--reuse", action="store_true", help="Keep existing benchmark tables and data")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if not args.reuse:
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+        print(f"Generating {args.orders:,} orders...")
+        populate(engine, args.orders, args.lines_per_order, args.products, args.days, args.batch_size)
+
+    end_date = date.today() - timedelta(days=1)
+    start_date = end_date - timedelta(days=29)
+    with engine.connect() as conn:
+        for label, legacy, sargable in build_queries(start_date, end_date, product_id=1):
+            print(f"\n=== {label} ===")
+            for name, statement in (('func.date(created_at)', legacy), ('half-open range', sargable)):
+                elapsed = best_time(conn, statement, args.repeat)
+                print(f"\n-- {name}: {elapsed:.1f} ms")
+                print(explain(conn, statement))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark custom report processing (ReportFrame) on synthetic report rows.
+
+Builds row dicts shaped like the base report rows (int IDs, text, ISO date
+strings, float amounts), then times a filter + sort and a group-by through
+ReportBuilderService.build_report, the path of custom reports.
+
+    python app/scripts/benchmark_report_frame.py --rows 500000
+    python app/scripts/benchmark_report_frame.py --rows 500000 --no-numpy
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from app.services import report_frame
+from app.services.report_builder_service import (
+    ReportBuilderService, FilterCondition, SortDefinition, GroupDefinition
+)
+from app.services.report_service import ReportData
+
+STATUSES = ('confirmed', 'partially_received', 'received', 'invoiced', 'canceled')
+
+
+def make_rows(count: int, customers: int) -> list:
+    """Synthetic report rows (seeded)."""
+    rng = random.Random(42)
+    start = date(2025, 1, 1)
+    names = [f"Customer {index:05d}" for index in range(customers)]
+    return [
+        {
+            'order_id': index,
+            'order_number': f"CMD-{index:07d}",
+            'customer_id': (customer := rng.randrange(customers)),
+            'customer_name': names[customer],
+            'order_date': str(start + timedelta(days=rng.randrange(365))),
+            'status': rng.choice(STATUSES),
+            'total_ht': round(rng.uniform(10, 5000), 2),
+            'total_ttc': round(rng.uniform(12, 6000), 2),
+        }
+        for index in range(count)
+    ]
+
+
+def timed(label: str, rows: list, **customizations) -> float:
+    """Run one customization on a fresh copy of the rows and print its duration."""
+    report = ReportData(
+        title="Benchmark",
+        report_type='benchmark',
+        period_start=date(2025, 1, 1),
+        period_end=date(2025, 12, 31),
+        data=list(rows),
+        summary={},
+        metadata={}
+    )
+    began = time.perf_counter()
+    result = ReportBuilderService().build_report(report, **customizations)
+    elapsed = time.perf_counter() - began
+    print(f"{label:<16} {elapsed:7.3f} s  ({len(result.data)} rows)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark custom report processing.")
+    parser.add_argument("--rows", type=int, default=500000, help="Report rows")
+    parser.add_argument("--customers", type=int, default=5000, help="Distinct customers (groups)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (best is reported)")
+    parser.add_argument("--no-numpy", action="store_true", help="Force the pure-Python path")
+    args = parser.parse_args()
+
+    if args.no_numpy:
+        report_frame.np = None
+    print(f"{args.rows} rows, NumPy {'off' if report_frame.np is None else report_frame.np.__version__}")
+    rows = make_rows(args.rows, args.customers)
+
+    cases = {
+        'filter + sort': dict(
+            filters=[
+                FilterCondition(field='total_ht', operator='greater_than', value=1000),
+                FilterCondition(field='status', operator='in', value=['confirmed', 'received', 'invoiced']),
+                FilterCondition(field='order_date', operator='between', value='2025-02-01', value2='2025-11-30'),
+            ],
+            sorting=[SortDefinition(field='customer_name', direction='asc'),
+                     SortDefinition(field='total_ht', direction='desc')]
+        ),
+        'group-by sum': dict(
+            grouping=[GroupDefinition(field='customer_name', label='Customer', aggregate='sum')],
+            sorting=[SortDefinition(field='total_ht', direction='desc')]
+        ),
+    }
+    for label, customizations in cases.items():
+        best = min(timed(label, rows, **customizations) for _ in range(args.repeat))
+        print(f"{label:<16} best {best:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
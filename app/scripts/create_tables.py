@@ -21,6 +21,13 @@ from app.domain.models.quote import Quote, QuoteLine, QuoteVersion
 from app.domain.models.order import Order, OrderLine, StockReservation
 from app.domain.models.invoice import Invoice, InvoiceLine, CreditNote
 from app.domain.models.payment import Payment, PaymentAllocation, PaymentReminder
+from app.domain.models.credit_exposure import CustomerCreditExposure
+from app.domain.models.customer_sales_aggregate import CustomerSalesAggregate
+from app.domain.models.sales_fact import SalesDailyFact, SalesDailyOrderFact, SalesPeriodRollup
+from app.domain.models.dashboard_counter import DashboardCounter
+from app.domain.models.report_job import ReportJob
+from app.domain.models.replenishment import ReplenishmentSkuState
+from app.domain.models.receivables_aging import AgingSummarySnapshot
 from app.infrastructure.outbox.outbox_event import OutboxEvent
 
 
@@ -0,0 +1,442 @@
+"""Receivables aging: bucketed outstanding amounts computed in SQL."""
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, update, func, case, and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.domain.models.customer import Customer
+from app.domain.models.invoice import Invoice
+from app.domain.models.receivables_aging import AgingSummarySnapshot
+
+logger = logging.getLogger(__name__)
+
+# Invoice statuses with an amount still due (validated invoices may not be sent yet)
+OPEN_INVOICE_STATUSES = ("validated", "sent", "partially_paid", "overdue")
+
+# Upper bounds (days past due) of the aging buckets; a last bucket holds older invoices
+DEFAULT_BUCKET_BOUNDARIES = (30, 60, 90)
+
+# Cached dashboard summaries older than this are recomputed even without events
+SUMMARY_MAX_AGE = timedelta(minutes=15)
+
+# Customers kept in the dashboard summary
+SUMMARY_TOP_CUSTOMERS = 20
+
+# Invoices per page of aging details
+INVOICE_PAGE_SIZE = 100
+
+
+def normalize_boundaries(boundaries: Optional[Sequence[int]] = None) -> Tuple[int, ...]:
+    """
+    Validated bucket boundaries.
+
+    Args:
+        boundaries: Increasing positive day counts (None = DEFAULT_BUCKET_BOUNDARIES)
+
+    Returns:
+        Boundaries tuple
+
+    Raises:
+        ValueError: If the boundaries are empty, not positive or not increasing
+    """
+    if not boundaries:
+        return DEFAULT_BUCKET_BOUNDARIES
+    boundaries = tuple(int(boundary) for boundary in boundaries)
+    increasing = all(a < b for a, b in zip(boundaries[:-1], boundaries[1:], strict=True))
+    if boundaries[0] <= 0 or not increasing:
+        raise ValueError("Aging bucket boundaries must be positive and increasing")
+    return boundaries
+
+
+def bucket_names(boundaries: Sequence[int]) -> List[str]:
+    """Bucket labels, e.g. ['0-30', '31-60', '61-90', '90+'] (not yet due invoices are in the first one)."""
+    names = []
+    lower = 0
+    for boundary in boundaries:
+        names.append(f"{lower}-{boundary}")
+        lower = boundary + 1
+    names.append(f"{boundaries[-1]}+")
+    return names
+
+
+def bucket_expression(as_of: date, boundaries: Sequence[int]):
+    """
+    SQL CASE giving the bucket index of an invoice.
+
+    days past due <= boundary is written as due_date >= as_of - boundary, so
+    the expression compares the raw due_date column (portable, index friendly).
+    """
+    return case(
+        *[
+            (Invoice.due_date >= as_of - timedelta(days=boundary), index)
+            for index, boundary in enumerate(boundaries)
+        ],
+        else_=len(boundaries)
+    )
+
+
+def encode_cursor(due_date: date, invoice_id: int) -> str:
+    """Keyset cursor of an invoice in (due_date, id) order."""
+    return f"{due_date.isoformat()}_{invoice_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """
+    Decode a keyset cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    day, _, invoice_id = cursor.partition('_')
+    return date.fromisoformat(day), int(invoice_id)
+
+
+@dataclass
+class AgingBucket:
+    """Outstanding amount and invoice count of a bucket."""
+    name: str
+    total_amount: Decimal = Decimal(0)
+    invoice_count: int = 0
+
+
+@dataclass
+class CustomerAging:
+    """Aging buckets of one customer."""
+    customer_id: int
+    customer_code: Optional[str]
+    customer_name: Optional[str]
+    buckets: List[AgingBucket]
+    total_outstanding: Decimal = Decimal(0)
+
+
+@dataclass
+class AgingInvoice:
+    """Outstanding invoice with its days past due."""
+    invoice_id: int
+    invoice_number: str
+    customer_id: int
+    customer_code: Optional[str]
+    customer_name: Optional[str]
+    invoice_date: date
+    due_date: date
+    total: Decimal
+    paid_amount: Decimal
+    remaining_amount: Decimal
+    days_overdue: int
+    status: str
+
+
+@dataclass
+class AgingSummary:
+    """Receivables aging totals for the payments dashboard."""
+    as_of_date: date
+    buckets: List[AgingBucket]
+    total_outstanding: Decimal = Decimal(0)
+    overdue_amount: Decimal = Decimal(0)
+    overdue_count: int = 0
+    customer_count: int = 0
+    top_customers: List[CustomerAging] = field(default_factory=list)
+
+    def to_json(self) -> Dict[str, Any]:
+        """Summary as JSON values (Decimal as string, dates as ISO strings)."""
+        data = asdict(self)
+        data['as_of_date'] = self.as_of_date.isoformat()
+        return _decimals_to_str(data)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'AgingSummary':
+        """Summary rebuilt from to_json() output."""
+        def bucket(values):
+            return AgingBucket(values['name'], Decimal(values['total_amount']), values['invoice_count'])
+
+        return cls(
+            as_of_date=date.fromisoformat(data['as_of_date']),
+            buckets=[bucket(values) for values in data['buckets']],
+            total_outstanding=Decimal(data['total_outstanding']),
+            overdue_amount=Decimal(data['overdue_amount']),
+            overdue_count=data['overdue_count'],
+            customer_count=data['customer_count'],
+            top_customers=[
+                CustomerAging(
+                    customer_id=customer['customer_id'],
+                    customer_code=customer['customer_code'],
+                    customer_name=customer['customer_name'],
+                    buckets=[bucket(values) for values in customer['buckets']],
+                    total_outstanding=Decimal(customer['total_outstanding'])
+                )
+                for customer in data['top_customers']
+            ]
+        )
+
+
+def _decimals_to_str(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: _decimals_to_str(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decimals_to_str(item) for item in value]
+    return value
+
+
+def _customer_name(company_name: Optional[str], name: Optional[str]) -> Optional[str]:
+    """Display name of a customer (company name first, as on invoices)."""
+    return company_name or name
+
+
+class AgingService:
+    """
+    Receivables aging engine.
+
+    Per-customer bucket sums and counts come from one GROUP BY with a CASE
+    on due_date; invoice details are read separately, one keyset page at a
+    time. The dashboard summary is cached in aging_summary_snapshots and
+    marked stale by invoice and payment events.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize the aging service.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        self.session = session
+
+    def _open_invoice_filter(self, customer_id: Optional[int], include_paid: bool):
+        conditions = [Invoice.remaining_amount > 0]
+        if not include_paid:
+            conditions.append(Invoice.status.in_(OPEN_INVOICE_STATUSES))
+        if customer_id:
+            conditions.append(Invoice.customer_id == customer_id)
+        return and_(*conditions)
+
+    # ==================== Buckets ====================
+
+    def customer_aging(
+        self,
+        as_of: date,
+        customer_id: Optional[int] = None,
+        include_paid: bool = False,
+        boundaries: Optional[Sequence[int]] = None
+    ) -> List[CustomerAging]:
+        """
+        Aging buckets per customer.
+
+        Args:
+            as_of: Aging reference day
+            customer_id: Optional customer filter
+            include_paid: Do not filter on invoice status (amounts due only)
+            boundaries: Bucket boundaries (see normalize_boundaries)
+
+        Returns:
+            List of CustomerAging (non-empty buckets only), highest outstanding first
+        """
+        customers, _ = self._aggregate(as_of, customer_id, include_paid, normalize_boundaries(boundaries))
+        return customers
+
+    def _aggregate(
+        self,
+        as_of: date,
+        customer_id: Optional[int],
+        include_paid: bool,
+        boundaries: Tuple[int, ...]
+    ) -> Tuple[List[CustomerAging], Tuple[Decimal, int]]:
+        """Customer buckets and (overdue amount, overdue count), from a single statement."""
+        names = bucket_names(boundaries)
+        bucket = bucket_expression(as_of, boundaries).label('bucket')
+        overdue = Invoice.due_date < as_of
+        stmt = (
+            select(
+                Invoice.customer_id,
+                Customer.code,
+                Customer.company_name,
+                Customer.name,
+                bucket,
+                func.sum(Invoice.remaining_amount),
+                func.count(Invoice.id),
+                func.sum(case((overdue, Invoice.remaining_amount), else_=0)),
+                func.sum(case((overdue, 1), else_=0))
+            )
+            .outerjoin(Customer, Customer.id == Invoice.customer_id)
+            .where(self._open_invoice_filter(customer_id, include_paid))
+            .group_by(Invoice.customer_id, Customer.code, Customer.company_name, Customer.name, bucket)
+        )
+
+        customers: Dict[int, CustomerAging] = OrderedDict()
+        overdue_amount, overdue_count = Decimal(0), 0
+        for row_customer_id, code, company_name, name, index, amount, count, late_amount, late_count in (
+            self.session.execute(stmt).all()
+        ):
+            customer = customers.get(row_customer_id)
+            if customer is None:
+                customer = customers[row_customer_id] = CustomerAging(
+                    customer_id=row_customer_id,
+                    customer_code=code,
+                    customer_name=_customer_name(company_name, name),
+                    buckets=[AgingBucket(bucket_name) for bucket_name in names]
+                )
+            amount = Decimal(str(amount or 0))
+            customer.buckets[index].total_amount += amount
+            customer.buckets[index].invoice_count += int(count or 0)
+            customer.total_outstanding += amount
+            overdue_amount += Decimal(str(late_amount or 0))
+            overdue_count += int(late_count or 0)
+
+        result = list(customers.values())
+        for customer in result:
+            customer.buckets = [b for b in customer.buckets if b.total_amount > 0]
+        result.sort(key=lambda customer: customer.total_outstanding, reverse=True)
+        return result, (overdue_amount, overdue_count)
+
+    # ==================== Invoice details ====================
+
+    def invoice_page(
+        self,
+        as_of: date,
+        customer_id: Optional[int] = None,
+        include_paid: bool = False,
+        after: Optional[str] = None,
+        limit: int = INVOICE_PAGE_SIZE,
+        overdue_only: bool = False
+    ) -> Tuple[List[AgingInvoice], Optional[str]]:
+        """
+        One page of outstanding invoices in (due_date, id) order.
+
+        Args:
+            as_of: Aging reference day (for days past due)
+            customer_id: Optional customer filter
+            include_paid: Do not filter on invoice status
+            after: Cursor returned with the previous page (None = first page)
+            limit: Page size
+            overdue_only: Only invoices due before as_of
+
+        Returns:
+            (invoices, cursor of the next page or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        stmt = (
+            select(Invoice, Customer.code, Customer.company_name, Customer.name)
+            .outerjoin(Customer, Customer.id == Invoice.customer_id)
+            .where(self._open_invoice_filter(customer_id, include_paid))
+            .order_by(Invoice.due_date, Invoice.id)
+            .limit(limit + 1)
+        )
+        if overdue_only:
+            stmt = stmt.where(Invoice.due_date < as_of)
+        if after:
+            after_date, after_id = decode_cursor(after)
+            stmt = stmt.where(or_(
+                Invoice.due_date > after_date,
+                and_(Invoice.due_date == after_date, Invoice.id > after_id)
+            ))
+
+        rows = self.session.execute(stmt).all()
+        invoices = [
+            AgingInvoice(
+                invoice_id=invoice.id,
+                invoice_number=invoice.number,
+                customer_id=invoice.customer_id,
+                customer_code=code,
+                customer_name=_customer_name(company_name, name),
+                invoice_date=invoice.invoice_date,
+                due_date=invoice.due_date,
+                total=invoice.total,
+                paid_amount=invoice.paid_amount,
+                remaining_amount=invoice.remaining_amount,
+                days_overdue=(as_of - invoice.due_date).days,
+                status=invoice.status
+            )
+            for invoice, code, company_name, name in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit and invoices:
+            next_cursor = encode_cursor(invoices[-1].due_date, invoices[-1].invoice_id)
+        return invoices, next_cursor
+
+    # ==================== Dashboard summary ====================
+
+    def summary(self, as_of: date, boundaries: Optional[Sequence[int]] = None) -> AgingSummary:
+        """
+        Aging totals of all customers, computed now.
+
+        Args:
+            as_of: Aging reference day
+            boundaries: Bucket boundaries (see normalize_boundaries)
+
+        Returns:
+            AgingSummary (top customers limited to SUMMARY_TOP_CUSTOMERS)
+        """
+        boundaries = normalize_boundaries(boundaries)
+        customers, (overdue_amount, overdue_count) = self._aggregate(as_of, None, False, boundaries)
+        buckets = [AgingBucket(name) for name in bucket_names(boundaries)]
+        positions = {bucket.name: index for index, bucket in enumerate(buckets)}
+        for customer in customers:
+            for customer_bucket in customer.buckets:
+                bucket = buckets[positions[customer_bucket.name]]
+                bucket.total_amount += customer_bucket.total_amount
+                bucket.invoice_count += customer_bucket.invoice_count
+        return AgingSummary(
+            as_of_date=as_of,
+            buckets=buckets,
+            total_outstanding=sum((customer.total_outstanding for customer in customers), Decimal(0)),
+            overdue_amount=overdue_amount,
+            overdue_count=overdue_count,
+            customer_count=len(customers),
+            top_customers=customers[:SUMMARY_TOP_CUSTOMERS]
+        )
+
+    def cached_summary(self, boundaries: Optional[Sequence[int]] = None) -> AgingSummary:
+        """
+        Today's aging summary from the snapshot cache.
+
+        The snapshot is recomputed when missing, marked stale, computed on a
+        previous day or older than SUMMARY_MAX_AGE. The caller commits the
+        session.
+
+        Args:
+            boundaries: Bucket boundaries (see normalize_boundaries)
+
+        Returns:
+            AgingSummary
+        """
+        boundaries = normalize_boundaries(boundaries)
+        key = ','.join(str(boundary) for boundary in boundaries)
+        today = date.today()
+        now = datetime.now()
+
+        snapshot = self.session.get(AgingSummarySnapshot, key)
+        if (
+            snapshot is not None and not snapshot.stale and snapshot.as_of_date == today
+            and snapshot.refreshed_at > now - SUMMARY_MAX_AGE
+        ):
+            return AgingSummary.from_json(snapshot.payload)
+
+        summary = self.summary(today, boundaries)
+        values = dict(as_of_date=today, payload=summary.to_json(), stale=False, refreshed_at=now)
+        if snapshot is None:
+            try:
+                # Savepoint: a concurrent first request may create the same row first
+                with self.session.begin_nested():
+                    self.session.add(AgingSummarySnapshot(key=key, **values))
+                return summary
+            except IntegrityError:
+                snapshot = self.session.get(AgingSummarySnapshot, key, populate_existing=True)
+        for name, value in values.items():
+            setattr(snapshot, name, value)
+        self.session.flush()
+        return summary
+
+    def mark_summaries_stale(self) -> None:
+        """Mark every cached summary stale (the caller commits the session)."""
+        self.session.execute(
+            update(AgingSummarySnapshot).where(AgingSummarySnapshot.stale.is_(False)).values(stale=True)
+        )
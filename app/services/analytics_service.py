@@ -1,20 +1,18 @@
 """Analytics service for calculating sales, margins, and trends."""
 from typing import List, Dict, Any, Optional
 from decimal import Decimal
-from datetime import date, datetime, timedelta
+from datetime import date
 from dataclasses import dataclass
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, case, desc
+from sqlalchemy import and_, or_, case
 from sqlalchemy.orm import joinedload
 
-from app.domain.models.order import Order, OrderLine
 from app.domain.models.invoice import Invoice, InvoiceLine
-from app.domain.models.product import Product
-from app.domain.models.customer import Customer
 from app.domain.models.purchase import PurchaseOrder, PurchaseOrderLine
 from app.domain.models.stock import StockItem
 from app.infrastructure.db import get_session
+from app.services.sales_fact_service import SalesFactService
 
 
 @dataclass
@@ -93,46 +91,12 @@ class AnalyticsService:
             List of SalesDataPoint objects
         """
         with get_session() as session:
-            # Determine date grouping
-            if group_by == 'day':
-                date_expr = func.date(Order.created_at)
-            elif group_by == 'week':
-                date_expr = func.date(Order.created_at - func.cast(
-                    func.extract('dow', Order.created_at), 
-                    func.Integer
-                ) * timedelta(days=1))
-            elif group_by == 'month':
-                date_expr = func.date_trunc('month', Order.created_at)
-            elif group_by == 'year':
-                date_expr = func.date_trunc('year', Order.created_at)
-            else:
-                date_expr = func.date(Order.created_at)
-            
-            # Query sales data
-            results = session.query(
-                date_expr.label('period_date'),
-                func.sum(Order.total).label('revenue'),
-                func.count(Order.id).label('orders_count')
-            ).filter(
-                Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered', 'invoiced']),
-                func.date(Order.created_at) >= start_date,
-                func.date(Order.created_at) <= end_date
-            ).group_by(
-                date_expr
-            ).order_by(
-                date_expr
-            ).all()
+            series = SalesFactService(session).get_series(start_date, end_date, group_by)
             
             data_points = []
-            for row in results:
-                period_date = row.period_date
-                if isinstance(period_date, datetime):
-                    period_date = period_date.date()
-                elif not isinstance(period_date, date):
-                    period_date = date.fromisoformat(str(period_date))
-                
-                revenue = row.revenue or Decimal('0')
-                orders_count = row.orders_count or 0
+            for period_date, totals in series:
+                revenue = totals.order_total
+                orders_count = totals.order_count
                 avg_order_value = revenue / Decimal(orders_count) if orders_count > 0 else Decimal('0')
                 
                 data_points.append(SalesDataPoint(
@@ -162,38 +126,19 @@ class AnalyticsService:
             List of ProductSalesSummary objects
         """
         with get_session() as session:
-            results = session.query(
-                Product.id,
-                Product.code,
-                Product.name,
-                func.sum(OrderLine.quantity).label('quantity_sold'),
-                func.sum(OrderLine.line_total_ht).label('revenue'),
-                func.avg(OrderLine.unit_price).label('average_price'),
-                func.count(OrderLine.order_id.distinct()).label('orders_count')
-            ).join(
-                OrderLine, OrderLine.product_id == Product.id
-            ).join(
-                Order, Order.id == OrderLine.order_id
-            ).filter(
-                Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered', 'invoiced']),
-                func.date(Order.created_at) >= start_date,
-                func.date(Order.created_at) <= end_date
-            ).group_by(
-                Product.id, Product.code, Product.name
-            ).order_by(
-                desc(func.sum(OrderLine.line_total_ht))
-            ).limit(limit).all()
+            products = SalesFactService(session).get_top_products(start_date, end_date, limit)
             
             summaries = []
-            for row in results:
+            for row in products:
                 summaries.append(ProductSalesSummary(
-                    product_id=row.id,
-                    product_code=row.code,
-                    product_name=row.name,
-                    quantity_sold=row.quantity_sold or Decimal('0'),
-                    revenue=row.revenue or Decimal('0'),
-                    average_price=row.average_price or Decimal('0'),
-                    orders_count=row.orders_count or 0
+                    product_id=row.product_id,
+                    product_code=row.product_code,
+                    product_name=row.product_name,
+                    quantity_sold=row.quantity,
+                    revenue=row.revenue_ht,
+                    # Average net unit price (revenue / quantity)
+                    average_price=row.revenue_ht / row.quantity if row.quantity else Decimal('0'),
+                    orders_count=row.order_count
                 ))
             
             return summaries
@@ -216,33 +161,17 @@ class AnalyticsService:
             List of CustomerSalesSummary objects
         """
         with get_session() as session:
-            results = session.query(
-                Customer.id,
-                Customer.name,
-                func.sum(Order.total).label('revenue'),
-                func.count(Order.id).label('orders_count'),
-                func.max(func.date(Order.created_at)).label('last_order_date')
-            ).join(
-                Order, Order.customer_id == Customer.id
-            ).filter(
-                Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered', 'invoiced']),
-                func.date(Order.created_at) >= start_date,
-                func.date(Order.created_at) <= end_date
-            ).group_by(
-                Customer.id, Customer.name
-            ).order_by(
-                desc(func.sum(Order.total))
-            ).limit(limit).all()
+            customers = SalesFactService(session).get_top_customers(start_date, end_date, limit)
             
             summaries = []
-            for row in results:
-                revenue = row.revenue or Decimal('0')
-                orders_count = row.orders_count or 0
+            for row in customers:
+                revenue = row.order_total
+                orders_count = row.order_count
                 avg_order_value = revenue / Decimal(orders_count) if orders_count > 0 else Decimal('0')
                 
                 summaries.append(CustomerSalesSummary(
-                    customer_id=row.id,
-                    customer_name=row.name,
+                    customer_id=row.customer_id,
+                    customer_name=row.customer_name,
                     revenue=revenue,
                     orders_count=orders_count,
                     average_order_value=avg_order_value,
@@ -267,44 +196,25 @@ class AnalyticsService:
             List of MarginSummary objects
         """
         with get_session() as session:
-            # Get sales data with product costs
-            results = session.query(
-                Product.id,
-                Product.code,
-                Product.name,
-                Product.cost,
-                func.sum(OrderLine.quantity).label('quantity_sold'),
-                func.sum(OrderLine.line_total_ht).label('revenue')
-            ).join(
-                OrderLine, OrderLine.product_id == Product.id
-            ).join(
-                Order, Order.id == OrderLine.order_id
-            ).filter(
-                Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered', 'invoiced']),
-                func.date(Order.created_at) >= start_date,
-                func.date(Order.created_at) <= end_date
-            ).group_by(
-                Product.id, Product.code, Product.name, Product.cost
-            ).all()
+            # Sales facts carry the cost of the quantities sold (current product cost)
+            products = SalesFactService(session).get_top_products(start_date, end_date, limit=None)
             
             summaries = []
-            for row in results:
-                revenue = row.revenue or Decimal('0')
-                cost_per_unit = row.cost or Decimal('0')
-                quantity_sold = row.quantity_sold or Decimal('0')
-                total_cost = cost_per_unit * quantity_sold
+            for row in products:
+                revenue = row.revenue_ht
+                total_cost = row.cost_amount
                 margin = revenue - total_cost
                 margin_percent = (margin / revenue * Decimal(100)) if revenue > 0 else Decimal('0')
                 
                 summaries.append(MarginSummary(
-                    product_id=row.id,
-                    product_code=row.code,
-                    product_name=row.name,
+                    product_id=row.product_id,
+                    product_code=row.product_code,
+                    product_name=row.product_name,
                     revenue=revenue,
                     cost=total_cost,
                     margin=margin,
                     margin_percent=margin_percent,
-                    quantity_sold=quantity_sold
+                    quantity_sold=row.quantity
                 ))
             
             return summaries
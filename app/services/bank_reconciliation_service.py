@@ -1,10 +1,168 @@
 """Service for automatic bank reconciliation."""
+import re
+from bisect import bisect_left, bisect_right
 from decimal import Decimal
 from datetime import date, datetime
-from typing import List, Dict, Optional
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
-from app.domain.models.payment import Payment, PaymentStatus, PaymentMethod
-from app.infrastructure.db import get_session
+from app.domain.models.payment import Payment, PaymentMethod, PaymentReconciledDomainEvent, PaymentStatus
+from app.infrastructure.db import add_domain_events, get_session
+from app.services.bank_statement_parser import parse_amount, parse_date
+
+# Amount tolerance for rounding differences (cents)
+AMOUNT_TOLERANCE_CENTS = 1
+
+# Days between the transaction and payment dates for amount-based matching
+DATE_WINDOW_DAYS = 5
+
+# Minimum reference similarity (0-1) for a fuzzy reference match
+FUZZY_MIN_SCORE = 0.8
+
+# Shortest payment reference that counts as a full match on its own
+REFERENCE_MIN_LENGTH = 4
+
+# Payments reconciled per UPDATE statement
+RECONCILE_BATCH_SIZE = 1000
+
+_TOKEN_SEPARATORS = re.compile(r'[\s,;/+]+')
+_NON_ALPHANUMERIC = re.compile(r'[^0-9A-Z]')
+
+
+def normalize_reference(reference: Optional[str]) -> str:
+    """Reference compared case-insensitively, without spaces or punctuation."""
+    return _NON_ALPHANUMERIC.sub('', (reference or '').upper())
+
+
+def to_cents(amount: Decimal) -> int:
+    """Amount in integer cents."""
+    return int((amount * 100).to_integral_value())
+
+
+class PaymentIndex:
+    """
+    Unreconciled payments indexed for statement matching.
+
+    Payments are hashed by normalized reference then amount in cents, and
+    kept per amount in a list sorted by date for window lookups. Matched
+    payments are only flagged as claimed, so lookups skip them without
+    rebuilding any list.
+    """
+    
+    def __init__(self, rows: Iterable[Tuple[int, Optional[str], Decimal, date]]):
+        """
+        Build the index.
+        
+        Args:
+            rows: (payment id, reference, amount, payment date) tuples
+        """
+        self.payments: Dict[int, Tuple[str, int, date, Optional[str]]] = {}
+        self.by_reference: Dict[str, List[int]] = {}
+        self.by_amount: Dict[int, List[Tuple[int, int]]] = {}
+        self.claimed = set()
+        for payment_id, reference, amount, payment_date in rows:
+            normalized = normalize_reference(reference)
+            cents = to_cents(amount)
+            self.payments[payment_id] = (normalized, cents, payment_date, reference)
+            if normalized:
+                self.by_reference.setdefault(normalized, []).append(payment_id)
+            self.by_amount.setdefault(cents, []).append((payment_date.toordinal(), payment_id))
+        for entries in self.by_amount.values():
+            entries.sort()
+    
+    def claim(self, payment_ids: List[int]) -> None:
+        """Mark payments as matched."""
+        self.claimed.update(payment_ids)
+    
+    def unclaimed(self) -> List[int]:
+        """IDs of the payments not matched yet."""
+        return [payment_id for payment_id in self.payments if payment_id not in self.claimed]
+    
+    def match_references(self, tokens: List[str], cents: int) -> Optional[List[int]]:
+        """
+        Payments referenced by the transaction whose amounts add up to it.
+        
+        A transaction matches one payment with the same reference and amount,
+        or several payments (one transfer settling several payments) when it
+        mentions each of their references and the amounts add up.
+        
+        Args:
+            tokens: Normalized transaction reference, then each of its words
+            cents: Transaction amount in cents
+            
+        Returns:
+            Payment IDs, or None
+        """
+        candidates = []
+        for token in tokens:
+            for payment_id in self.by_reference.get(token, ()):
+                if payment_id in self.claimed or payment_id in candidates:
+                    continue
+                if abs(self.payments[payment_id][1] - cents) <= AMOUNT_TOLERANCE_CENTS:
+                    return [payment_id]
+                candidates.append(payment_id)
+        if len(candidates) > 1:
+            total = sum(self.payments[payment_id][1] for payment_id in candidates)
+            if abs(total - cents) <= AMOUNT_TOLERANCE_CENTS:
+                return candidates
+        return None
+    
+    def match_amount(
+        self, reference: str, tokens: List[str], cents: int, transaction_date: Optional[date]
+    ) -> Tuple[Optional[int], str]:
+        """
+        Payment with the transaction amount within DATE_WINDOW_DAYS of its date.
+        
+        Candidates are scored on reference similarity: a payment reference of
+        at least REFERENCE_MIN_LENGTH characters equal to the transaction
+        reference or one of its tokens scores 1.0, others their similarity
+        ratio. The best one matches if its score reaches FUZZY_MIN_SCORE,
+        otherwise a single candidate matches on amount and date alone; several
+        candidates are ambiguous.
+        
+        Args:
+            reference: Normalized transaction reference
+            tokens: Normalized transaction reference, then each of its words
+            cents: Transaction amount in cents
+            transaction_date: Transaction date
+        
+        Returns:
+            (payment ID or None, 'fuzzy_reference' or 'amount_date')
+        """
+        if transaction_date is None:
+            return None, ''
+        day = transaction_date.toordinal()
+        candidates = []
+        for amount in range(cents - AMOUNT_TOLERANCE_CENTS, cents + AMOUNT_TOLERANCE_CENTS + 1):
+            entries = self.by_amount.get(amount)
+            if not entries:
+                continue
+            start = bisect_left(entries, (day - DATE_WINDOW_DAYS, 0))
+            end = bisect_right(entries, (day + DATE_WINDOW_DAYS, float('inf')))
+            candidates.extend(
+                payment_id for _, payment_id in entries[start:end] if payment_id not in self.claimed
+            )
+        if not candidates:
+            return None, ''
+        
+        if reference:
+            best_id, best_score = None, 0.0
+            for payment_id in candidates:
+                candidate_reference = self.payments[payment_id][0]
+                if not candidate_reference:
+                    continue
+                if len(candidate_reference) >= REFERENCE_MIN_LENGTH and candidate_reference in tokens:
+                    score = 1.0
+                else:
+                    score = SequenceMatcher(None, reference, candidate_reference).ratio()
+                if score > best_score:
+                    best_id, best_score = payment_id, score
+            if best_score >= FUZZY_MIN_SCORE:
+                return best_id, 'fuzzy_reference'
+        if len(candidates) == 1:
+            return candidates[0], 'amount_date'
+        return None, ''
 
 
 class BankReconciliationService:
@@ -23,7 +181,7 @@ class BankReconciliationService:
         self,
         bank_account: str,
         statement_date: date,
-        transactions: List[Dict],
+        transactions: Iterable[Dict],
         imported_by: Optional[int] = None
     ) -> Dict:
         """
@@ -32,16 +190,17 @@ class BankReconciliationService:
         Args:
             bank_account: Bank account number
             statement_date: Statement date
-            transactions: List of transaction dicts with keys:
-                - reference: Bank reference (required)
+            transactions: Transaction dicts (list or generator, e.g. from
+                bank_statement_parser) with keys:
+                - reference: Bank reference
                 - amount: Transaction amount (required)
-                - date: Transaction date (required)
+                - date: Transaction date
                 - description: Optional description
             imported_by: User ID who imported the statement
             
         Returns:
             dict with reconciliation results:
-                - matched: List of matched payments
+                - matched: List of matches (payment_id, payment_ids, transaction, matched_by)
                 - unmatched_transactions: List of unmatched transactions
                 - unmatched_payments: List of unmatched payments
         """
@@ -60,63 +219,75 @@ class BankReconciliationService:
         session: Session,
         bank_account: str,
         statement_date: date,
-        transactions: List[Dict],
+        transactions: Iterable[Dict],
         imported_by: Optional[int] = None
     ) -> Dict:
-        """Internal implementation of reconciliation."""
+        """
+        Internal implementation of reconciliation.
+        
+        Two passes over the transactions: references first (exact, then
+        several payments settled by one transfer), then amount and date
+        window with fuzzy reference scoring for the rest, so a loose match
+        never takes a payment another transaction references exactly.
+        """
         matched = []
         unmatched_transactions = []
-        unmatched_payments = []
         
-        # Get all unreconciled payments for this bank account
-        unreconciled_payments = session.query(Payment).filter(
-            Payment.bank_account == bank_account,
-            Payment.reconciled == False,
-            Payment.status != PaymentStatus.CANCELLED
-        ).all()
+        # Unreconciled payments of this bank account (columns only)
+        index = PaymentIndex(session.execute(
+            select(Payment.id, Payment.reference, Payment.amount, Payment.payment_date).where(
+                Payment.bank_account == bank_account,
+                Payment.reconciled == False,
+                Payment.status != PaymentStatus.CANCELLED
+            )
+        ).all())
         
-        # Try to match each transaction with a payment
+        # Pass 1: references
+        pending = []
         for transaction in transactions:
-            reference = transaction.get('reference', '').strip()
-            amount = Decimal(str(transaction.get('amount', 0)))
-            trans_date = transaction.get('date')
-            
-            if not reference or amount <= 0:
+            amount = parse_amount(transaction.get('amount'))
+            if amount is None or amount <= 0:
                 unmatched_transactions.append(transaction)
                 continue
-            
-            # Try to find matching payment by reference
-            matched_payment = None
-            for payment in unreconciled_payments:
-                if payment.reference and payment.reference.strip() == reference:
-                    # Check amount match (with tolerance for rounding)
-                    if abs(payment.amount - amount) <= Decimal('0.01'):
-                        matched_payment = payment
-                        break
-            
-            if matched_payment:
-                # Reconcile payment
-                matched_payment.reconcile(
-                    bank_reference=reference,
-                    bank_account=bank_account,
-                    reconciled_by=imported_by
+            reference = normalize_reference(transaction.get('reference'))
+            cents = to_cents(amount)
+            tokens = [reference] if reference else []
+            for text in (transaction.get('reference'), transaction.get('description')):
+                tokens.extend(
+                    token for token in map(normalize_reference, _TOKEN_SEPARATORS.split(text or ''))
+                    if token and token not in tokens
                 )
-                matched.append({
-                    'payment_id': matched_payment.id,
-                    'transaction': transaction,
-                    'matched_by': 'reference'
-                })
-                unreconciled_payments.remove(matched_payment)
+            
+            payment_ids = index.match_references(tokens, cents)
+            if payment_ids:
+                index.claim(payment_ids)
+                matched_by = 'reference' if len(payment_ids) == 1 else 'reference_group'
+                matched.append(self._match(payment_ids, transaction, matched_by))
+            else:
+                pending.append((transaction, reference, tokens, cents))
+        
+        # Pass 2: amount within the date window, scored on reference similarity
+        for transaction, reference, tokens, cents in pending:
+            payment_id, matched_by = index.match_amount(
+                reference, tokens, cents, parse_date(transaction.get('date'))
+            )
+            if payment_id is not None:
+                index.claim([payment_id])
+                matched.append(self._match([payment_id], transaction, matched_by))
             else:
                 unmatched_transactions.append(transaction)
         
-        # Add remaining unreconciled payments to unmatched list
-        for payment in unreconciled_payments:
+        self._reconcile_matches(session, matched, bank_account, imported_by)
+        
+        # Remaining unreconciled payments
+        unmatched_payments = []
+        for payment_id in index.unclaimed():
+            _, cents, payment_date, reference = index.payments[payment_id]
             unmatched_payments.append({
-                'payment_id': payment.id,
-                'amount': float(payment.amount),
-                'payment_date': payment.payment_date.isoformat(),
-                'reference': payment.reference
+                'payment_id': payment_id,
+                'amount': cents / 100,
+                'payment_date': payment_date.isoformat(),
+                'reference': reference
             })
         
         return {
@@ -127,6 +298,55 @@ class BankReconciliationService:
             'bank_account': bank_account
         }
     
+    @staticmethod
+    def _match(payment_ids: List[int], transaction: Dict, matched_by: str) -> Dict:
+        return {
+            'payment_id': payment_ids[0],
+            'payment_ids': payment_ids,
+            'transaction': transaction,
+            'matched_by': matched_by
+        }
+    
+    def _reconcile_matches(
+        self,
+        session: Session,
+        matched: List[Dict],
+        bank_account: str,
+        reconciled_by: Optional[int]
+    ) -> None:
+        """
+        Mark matched payments reconciled with bulk UPDATEs by primary key.
+        
+        Their PaymentReconciledDomainEvent are queued on the session and
+        dispatched in one batch when the caller commits.
+        """
+        now = datetime.now()
+        rows = []
+        for match in matched:
+            bank_reference = (match['transaction'].get('reference') or '').strip()[:100] or None
+            for payment_id in match['payment_ids']:
+                rows.append({
+                    'id': payment_id,
+                    'reconciled': True,
+                    'reconciled_at': now,
+                    'reconciled_by': reconciled_by,
+                    'bank_reference': bank_reference,
+                    'bank_account': bank_account,
+                    'status': PaymentStatus.RECONCILED
+                })
+        for start in range(0, len(rows), RECONCILE_BATCH_SIZE):
+            session.execute(update(Payment), rows[start:start + RECONCILE_BATCH_SIZE])
+        add_domain_events(session, [
+            PaymentReconciledDomainEvent(payment_id=row['id'], bank_reference=row['bank_reference'] or '')
+            for row in rows
+        ])
+        
+        # Payments already loaded in the session reload their new state
+        reconciled_ids = {row['id'] for row in rows}
+        for instance in list(session.identity_map.values()):
+            if isinstance(instance, Payment) and instance.id in reconciled_ids:
+                session.expire(instance)
+    
     def auto_match_payment(
         self,
         payment_id: int,
@@ -0,0 +1,190 @@
+"""Streaming parsers for bank statement files (CSV and CAMT.053-like XML)."""
+import codecs
+import csv
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Dict, Iterator, Optional
+from xml.etree.ElementTree import iterparse
+
+# CSV header aliases (lower case) of each transaction field
+CSV_COLUMNS = {
+    'reference': ('reference', 'ref', 'référence', 'libelle', 'libellé', 'label'),
+    'amount': ('amount', 'montant'),
+    'credit': ('credit', 'crédit'),
+    'debit': ('debit', 'débit'),
+    'date': ('date', 'booking_date', 'date_operation', 'date opération', 'value_date', 'date_valeur'),
+    'description': ('description', 'details', 'détails', 'memo'),
+}
+
+# Date formats accepted in statements
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d/%m/%y', '%Y%m%d', '%d.%m.%Y')
+
+
+def parse_amount(value) -> Optional[Decimal]:
+    """
+    Parse a statement amount ('1234.56', '1 234,56', '1,234.56', '1.234,56', '-12,00').
+
+    The last of ',' and '.' is the decimal separator; the other one is a
+    thousands separator.
+
+    Returns:
+        Decimal, or None if the value is empty, invalid or not finite (NaN, Infinity)
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float, Decimal)):
+        text = str(value)
+    else:
+        text = re.sub(r'[\s\u00a0\u202f]', '', str(value))
+        separator = max(text.rfind(','), text.rfind('.'))
+        if separator >= 0:
+            text = re.sub(r'[,.]', '', text[:separator]) + '.' + text[separator + 1:]
+    if not text:
+        return None
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        return None
+    return amount if amount.is_finite() else None
+
+
+def parse_date(value) -> Optional[date]:
+    """
+    Parse a statement date (date, datetime or string in one of DATE_FORMATS).
+
+    Returns:
+        date, or None if the value is empty or invalid
+    """
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    text = str(value).strip()[:10]
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def iter_csv_transactions(stream: BinaryIO, encoding: str = 'utf-8-sig') -> Iterator[Dict]:
+    """
+    Transactions of a CSV statement, one row at a time.
+
+    The delimiter (',', ';' or tab) is detected from the header line. Amounts
+    come from an amount column or from credit / debit columns (debits are
+    negative).
+
+    Args:
+        stream: Binary file
+        encoding: File encoding
+
+    Yields:
+        Transaction dicts (reference, amount, date, description)
+    """
+    lines = codecs.iterdecode(stream, encoding)
+    header = next(lines, None)
+    if header is None:
+        return
+    delimiter = max((';', ',', '\t'), key=header.count)
+    names = [name.strip().lower() for name in next(csv.reader([header], delimiter=delimiter))]
+    columns = {}
+    for field_name, aliases in CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in names:
+                columns[field_name] = names.index(alias)
+                break
+
+    def cell(row, field_name):
+        index = columns.get(field_name)
+        return row[index].strip() if index is not None and index < len(row) else ''
+
+    for row in csv.reader(lines, delimiter=delimiter):
+        if not any(row):
+            continue
+        amount = parse_amount(cell(row, 'amount'))
+        if amount is None:
+            credit = parse_amount(cell(row, 'credit')) or Decimal(0)
+            debit = parse_amount(cell(row, 'debit')) or Decimal(0)
+            amount = credit - abs(debit)
+        yield {
+            'reference': cell(row, 'reference'),
+            'amount': amount,
+            'date': parse_date(cell(row, 'date')),
+            'description': cell(row, 'description'),
+        }
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_camt_transactions(stream: BinaryIO) -> Iterator[Dict]:
+    """
+    Transactions of a CAMT.053-like XML statement, one entry (Ntry) at a time.
+
+    Entries are parsed incrementally and cleared once read, so memory does
+    not grow with the statement size. Namespaces are ignored.
+
+    Reference: first of Ustrd (remittance information), EndToEndId,
+    AcctSvcrRef. Debit entries (CdtDbtInd = DBIT) get a negative amount.
+
+    Args:
+        stream: Binary file
+
+    Yields:
+        Transaction dicts (reference, amount, date, description)
+    """
+    for _, element in iterparse(stream, events=('end',)):
+        if _local_name(element.tag) != 'Ntry':
+            continue
+        values = {}
+        for child in element.iter():
+            name = _local_name(child.tag)
+            if name in ('Amt', 'CdtDbtInd', 'Ustrd', 'EndToEndId', 'AcctSvcrRef', 'AddtlNtryInf') \
+                    and name not in values and child.text:
+                values[name] = child.text.strip()
+            elif name in ('BookgDt', 'ValDt') and name not in values:
+                day = next((d.text for d in child if _local_name(d.tag) in ('Dt', 'DtTm') and d.text), None)
+                if day:
+                    values[name] = day
+        element.clear()
+
+        amount = parse_amount(values.get('Amt'))
+        if amount is not None and values.get('CdtDbtInd') == 'DBIT':
+            amount = -amount
+        reference = values.get('Ustrd') or values.get('EndToEndId') or values.get('AcctSvcrRef') or ''
+        if reference == 'NOTPROVIDED':
+            reference = values.get('AcctSvcrRef', '')
+        yield {
+            'reference': reference,
+            'amount': amount if amount is not None else Decimal(0),
+            'date': parse_date(values.get('BookgDt') or values.get('ValDt')),
+            'description': values.get('AddtlNtryInf', ''),
+        }
+
+
+def iter_statement_transactions(stream: BinaryIO, filename: str = '') -> Iterator[Dict]:
+    """
+    Transactions of a statement file, CSV or XML.
+
+    The format is taken from the file extension, or from the first bytes
+    when the extension is not .csv / .xml.
+
+    Args:
+        stream: Binary file (seekable when the format is sniffed)
+        filename: Original file name
+
+    Yields:
+        Transaction dicts (reference, amount, date, description)
+    """
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension not in ('csv', 'xml'):
+        head = stream.read(64)
+        stream.seek(0)
+        extension = 'xml' if re.match(rb'\s*(\xef\xbb\xbf)?\s*<', head) else 'csv'
+    if extension == 'xml':
+        return iter_camt_transactions(stream)
+    return iter_csv_transactions(stream)
@@ -0,0 +1,318 @@
+"""Bulk invoicing of delivered orders (month-end invoicing run)."""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List, Optional, Sequence
+
+from sqlalchemy import and_, exists, insert, select, update
+from sqlalchemy.orm import Session, selectinload
+
+from app.domain.models.customer import Customer
+from app.domain.models.invoice import Invoice, InvoiceCreatedDomainEvent, InvoiceLine
+from app.domain.models.order import Order, OrderLine, OrderStatus
+from app.infrastructure.db import add_domain_events
+from app.services.invoice_numbering_service import INVOICE_PREFIX, InvoiceNumberingService
+
+# Orders invoiced per transaction (one numbering lock / commit per chunk)
+INVOICING_CHUNK_SIZE = 500
+
+# Rows per bulk insert / update statement
+BATCH_SIZE = 1000
+
+# Default payment term when no due date is given (same as single invoice creation)
+DEFAULT_PAYMENT_DAYS = 30
+
+
+@dataclass
+class SkippedOrder:
+    """Order left out of an invoicing run."""
+    order_id: int
+    order_number: str
+    reason: str
+
+
+@dataclass
+class InvoicingRunResult:
+    """Outcome of a bulk invoicing run."""
+    invoice_ids: List[int] = field(default_factory=list)
+    invoice_numbers: List[str] = field(default_factory=list)
+    skipped: List[SkippedOrder] = field(default_factory=list)
+    total: Decimal = Decimal(0)
+    
+    @property
+    def invoice_count(self) -> int:
+        """Number of invoices created."""
+        return len(self.invoice_ids)
+
+
+@dataclass
+class _DraftInvoice:
+    order: Order
+    lines: List[dict]
+    order_line_updates: List[dict]
+    subtotal: Decimal = Decimal(0)
+    discount_amount: Decimal = Decimal(0)
+    tax_amount: Decimal = Decimal(0)
+    total: Decimal = Decimal(0)
+
+
+class BulkInvoicingService:
+    """
+    Creates draft invoices for many delivered orders at once.
+    
+    Orders are processed in chunks, one transaction each. A chunk:
+    
+    1. locks the invoice numbering sequence, so no other invoice creation
+       can pick the same orders or numbers until the chunk commits;
+    2. loads its orders, lines and customers with one query each, skipping
+       orders invoiced in the meantime;
+    3. computes lines and totals as CreateInvoiceHandler does;
+    4. takes a contiguous block of invoice numbers from the locked sequence;
+    5. bulk inserts invoices and lines, bulk updates the invoiced quantities
+       of the order lines and commits;
+    6. dispatches the InvoiceCreatedDomainEvent of its invoices in one batch
+       (bulk inserts do not go through the aggregates).
+    """
+    
+    def __init__(self, session: Session, chunk_size: int = INVOICING_CHUNK_SIZE):
+        """
+        Initialize the service.
+        
+        Args:
+            session: SQLAlchemy session (committed after each chunk)
+            chunk_size: Orders per transaction
+        """
+        self.session = session
+        self.chunk_size = max(1, chunk_size)
+        self.numbering_service = InvoiceNumberingService(session)
+    
+    def find_orders_to_invoice(
+        self,
+        order_ids: Optional[Sequence[int]] = None,
+        customer_ids: Optional[Sequence[int]] = None,
+        customer_category: Optional[str] = None,
+        delivered_from: Optional[date] = None,
+        delivered_to: Optional[date] = None
+    ) -> List[int]:
+        """
+        IDs of the delivered orders without an invoice, matching the filters.
+        
+        Args:
+            order_ids: Restrict to these orders
+            customer_ids: Restrict to these customers
+            customer_category: Restrict to a customer group (Customer.category)
+            delivered_from: First delivery date (inclusive)
+            delivered_to: Last delivery date (inclusive)
+        
+        Returns:
+            Order IDs, grouped by customer
+        """
+        stmt = select(Order.id).where(
+            Order.status == OrderStatus.DELIVERED.value,
+            ~self._invoiced(Order.id)
+        )
+        if order_ids is not None:
+            stmt = stmt.where(Order.id.in_(order_ids))
+        if customer_ids is not None:
+            stmt = stmt.where(Order.customer_id.in_(customer_ids))
+        if customer_category is not None:
+            stmt = stmt.join(Customer, Customer.id == Order.customer_id).where(
+                Customer.category == customer_category
+            )
+        if delivered_from is not None:
+            stmt = stmt.where(Order.delivery_date_actual >= delivered_from)
+        if delivered_to is not None:
+            stmt = stmt.where(Order.delivery_date_actual <= delivered_to)
+        return list(self.session.execute(stmt.order_by(Order.customer_id, Order.id)).scalars())
+    
+    def invoice_orders(
+        self,
+        order_ids: Sequence[int],
+        invoice_date: date,
+        created_by: int,
+        due_date: Optional[date] = None
+    ) -> InvoicingRunResult:
+        """
+        Create a draft invoice for each delivered order.
+        
+        Args:
+            order_ids: Orders to invoice (see find_orders_to_invoice)
+            invoice_date: Date of the invoices (its year numbers them)
+            created_by: User ID
+            due_date: Due date (defaults to invoice date + 30 days)
+        
+        Returns:
+            InvoicingRunResult
+        """
+        due_date = due_date or invoice_date + timedelta(days=DEFAULT_PAYMENT_DAYS)
+        if invoice_date > due_date:
+            raise ValueError("Invoice date cannot be after due date.")
+        
+        result = InvoicingRunResult()
+        for start in range(0, len(order_ids), self.chunk_size):
+            events = self._invoice_chunk(
+                order_ids[start:start + self.chunk_size], invoice_date, due_date, created_by, result
+            )
+            # The bulk inserts raise no events: queue them, dispatched on commit
+            add_domain_events(self.session, events)
+            self.session.commit()
+        return result
+    
+    def _invoice_chunk(
+        self,
+        order_ids: Sequence[int],
+        invoice_date: date,
+        due_date: date,
+        created_by: int,
+        result: InvoicingRunResult
+    ) -> List[InvoiceCreatedDomainEvent]:
+        """Invoice one chunk of orders (caller commits); returns its domain events."""
+        # 1. Serialize with other invoice creations until commit
+        sequence = self.numbering_service.lock_sequence(INVOICE_PREFIX, invoice_date.year)
+        
+        # 2. Load orders, lines and customers
+        orders = self.session.execute(
+            select(Order)
+            .options(selectinload(Order.lines), selectinload(Order.customer))
+            .where(Order.id.in_(order_ids))
+            .order_by(Order.customer_id, Order.id)
+        ).scalars().all()
+        invoiced_order_ids = set(self.session.execute(
+            select(Invoice.order_id).where(
+                Invoice.order_id.in_(order_ids),
+                Invoice.status != 'canceled'
+            )
+        ).scalars())
+        
+        # 3. Lines and totals
+        drafts: List[_DraftInvoice] = []
+        for order in orders:
+            if order.status != OrderStatus.DELIVERED.value:
+                reason = f"Order must be in 'delivered' status (is '{order.status}')."
+            elif order.id in invoiced_order_ids:
+                reason = "An invoice already exists for this order."
+            else:
+                draft = self._draft_invoice(order)
+                if draft.lines:
+                    drafts.append(draft)
+                    continue
+                reason = "No quantity left to invoice."
+            result.skipped.append(SkippedOrder(order_id=order.id, order_number=order.number, reason=reason))
+        
+        if not drafts:
+            return []
+        
+        # 4. Contiguous block of numbers
+        numbers = [
+            self.numbering_service.format_number(INVOICE_PREFIX, invoice_date.year, value)
+            for value in sequence.allocate(len(drafts))
+        ]
+        self.session.flush()
+        
+        # 5. Bulk insert invoices, then their lines
+        invoice_rows = []
+        for draft, number in zip(drafts, numbers, strict=True):
+            customer = draft.order.customer
+            invoice_rows.append({
+                'number': number,
+                'order_id': draft.order.id,
+                'customer_id': draft.order.customer_id,
+                'invoice_date': invoice_date,
+                'due_date': due_date,
+                'status': 'draft',
+                'subtotal': draft.subtotal,
+                'discount_percent': Decimal(0),
+                'discount_amount': draft.discount_amount,
+                'tax_amount': draft.tax_amount,
+                'total': draft.total,
+                'paid_amount': Decimal(0),
+                'remaining_amount': draft.total,
+                'vat_number': (customer.vat_number or None) if customer else None,
+                'siret': (customer.siret or None) if customer else None,
+                'created_by': created_by,
+            })
+        invoice_ids = self.session.execute(
+            insert(Invoice).returning(Invoice.id, sort_by_parameter_order=True), invoice_rows
+        ).scalars().all()
+        
+        line_rows = []
+        order_line_rows = []
+        for draft, invoice_id in zip(drafts, invoice_ids, strict=True):
+            line_rows.extend({**line, 'invoice_id': invoice_id} for line in draft.lines)
+            order_line_rows.extend(draft.order_line_updates)
+        for start in range(0, len(line_rows), BATCH_SIZE):
+            self.session.execute(insert(InvoiceLine), line_rows[start:start + BATCH_SIZE])
+        for start in range(0, len(order_line_rows), BATCH_SIZE):
+            self.session.execute(update(OrderLine), order_line_rows[start:start + BATCH_SIZE])
+        
+        # The ORM copies of the order lines are stale after the bulk update
+        for draft in drafts:
+            for order_line in draft.order.lines:
+                self.session.expire(order_line)
+        
+        events = []
+        for draft, invoice_id, number in zip(drafts, invoice_ids, numbers, strict=True):
+            result.invoice_ids.append(invoice_id)
+            result.invoice_numbers.append(number)
+            result.total += draft.total
+            events.append(InvoiceCreatedDomainEvent(
+                invoice_id=invoice_id,
+                invoice_number=number,
+                customer_id=draft.order.customer_id,
+                order_id=draft.order.id
+            ))
+        return events
+    
+    @staticmethod
+    def _draft_invoice(order: Order) -> _DraftInvoice:
+        """Invoice lines and totals of an order, as CreateInvoiceHandler computes them."""
+        draft = _DraftInvoice(order=order, lines=[], order_line_updates=[])
+        for order_line in order.lines:
+            # Orders marked delivered before quantity_delivered was tracked: use the ordered quantity
+            delivered_qty = order_line.quantity_delivered or Decimal(0)
+            if delivered_qty == 0:
+                delivered_qty = order_line.quantity
+            
+            invoicable_quantity = delivered_qty - (order_line.quantity_invoiced or Decimal(0))
+            if invoicable_quantity <= 0:
+                continue
+            
+            discount_percent = order_line.discount_percent or Decimal(0)
+            tax_rate = order_line.tax_rate if order_line.tax_rate is not None else Decimal(20.0)
+            discount_amount, line_total_ht, line_total_ttc = InvoiceLine.compute_totals(
+                invoicable_quantity, order_line.unit_price, discount_percent, tax_rate
+            )
+            draft.lines.append({
+                'order_line_id': order_line.id,
+                'product_id': order_line.product_id,
+                'variant_id': order_line.variant_id,
+                'description': None,
+                'quantity': invoicable_quantity,
+                'unit_price': order_line.unit_price,
+                'discount_percent': discount_percent,
+                'discount_amount': discount_amount,
+                'tax_rate': tax_rate,
+                'line_total_ht': line_total_ht,
+                'line_total_ttc': line_total_ttc,
+                'sequence': len(draft.lines) + 1,
+            })
+            draft.order_line_updates.append({
+                'id': order_line.id,
+                'quantity_delivered': delivered_qty,
+                'quantity_invoiced': (order_line.quantity_invoiced or Decimal(0)) + invoicable_quantity,
+            })
+            
+            draft.subtotal += line_total_ht
+            draft.tax_amount += line_total_ttc - line_total_ht
+        
+        # No document discount on invoices created from orders
+        draft.total = draft.subtotal - draft.discount_amount + draft.tax_amount
+        return draft
+    
+    @staticmethod
+    def _invoiced(order_id_column):
+        """EXISTS a non-canceled invoice for the order."""
+        return exists().where(and_(
+            Invoice.order_id == order_id_column,
+            Invoice.status != 'canceled'
+        ))
@@ -1,6 +1,7 @@
 """Credit validation service for customer credit limit checking."""
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from decimal import Decimal
+from datetime import date, datetime
 from dataclasses import dataclass
 
 from sqlalchemy.orm import Session
@@ -8,6 +9,11 @@ from sqlalchemy import func
 
 from app.domain.models.customer import Customer, CommercialConditions
 from app.domain.models.order import Order
+from app.domain.models.invoice import Invoice
+from app.domain.models.payment import Payment, PaymentStatus
+from app.domain.models.credit_exposure import (
+    CustomerCreditExposure, OPEN_ORDER_STATUSES, UNPAID_INVOICE_STATUSES
+)
 
 
 @dataclass
@@ -36,6 +42,19 @@ class CreditSummary:
     credit_utilization_percent: Decimal
     block_on_credit_exceeded: bool
     payment_terms_days: Optional[int] = None
+    unpaid_invoice_amount: Decimal = Decimal(0)
+    last_payment_date: Optional[date] = None
+    last_payment_amount: Optional[Decimal] = None
+
+
+@dataclass
+class CreditExposureDrift:
+    """Difference between the credit exposure read model and the source tables."""
+    customer_id: int
+    stored_open_order_amount: Decimal
+    actual_open_order_amount: Decimal
+    stored_unpaid_invoice_amount: Decimal
+    actual_unpaid_invoice_amount: Decimal
 
 
 class CreditService:
@@ -59,11 +78,9 @@ class CreditService:
         """
         Calculate current debt for a customer.
         
-        This includes:
-        - Unpaid invoices (when invoice module is implemented)
-        - Confirmed orders not yet invoiced (when invoice module is implemented)
-        
-        For now, returns 0 as invoice module is not yet implemented.
+        Reads the open order amount (confirmed orders not yet invoiced) from the
+        customer_credit_exposure read model, so the check is a single primary-key
+        lookup regardless of the number of orders the customer has.
         
         Args:
             customer_id: Customer ID
@@ -71,21 +88,188 @@ class CreditService:
         Returns:
             Current debt amount
         """
-        # TODO: When invoice module is implemented, calculate from:
-        # - Unpaid invoices (status != 'paid')
-        # - Confirmed orders not yet invoiced
-        
-        # For now, we can calculate from confirmed orders that are not yet invoiced
-        # This is a temporary solution until invoice module is ready
-        confirmed_orders_total = self.session.query(
-            func.sum(Order.total)
+        exposure = self.get_exposure(customer_id)
+        return Decimal(str(exposure.open_order_amount or 0))
+    
+    # ==================== Credit Exposure Read Model ====================
+    
+    def get_exposure(self, customer_id: int) -> CustomerCreditExposure:
+        """
+        Get the credit exposure row of a customer, building it from the source
+        tables the first time it is requested.
+        
+        Args:
+            customer_id: Customer ID
+            
+        Returns:
+            CustomerCreditExposure instance
+        """
+        exposure = self.session.get(CustomerCreditExposure, customer_id)
+        if exposure is None:
+            exposure = self.refresh_exposure(customer_id)
+        return exposure
+    
+    def refresh_exposure(self, customer_id: int) -> CustomerCreditExposure:
+        """
+        Recompute the credit exposure of one customer from orders, invoices and payments.
+        
+        Args:
+            customer_id: Customer ID
+            
+        Returns:
+            Up-to-date CustomerCreditExposure instance (flushed, not committed)
+        """
+        open_order_amount = self.session.query(
+            func.coalesce(func.sum(Order.total), 0)
         ).filter(
             Order.customer_id == customer_id,
-            Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered'])
-            # Note: We don't include 'invoiced' status as those should be in invoices
-        ).scalar() or Decimal(0)
+            Order.status.in_(OPEN_ORDER_STATUSES)
+        ).scalar()
+        
+        unpaid_invoice_amount = self.session.query(
+            func.coalesce(func.sum(Invoice.remaining_amount), 0)
+        ).filter(
+            Invoice.customer_id == customer_id,
+            Invoice.status.in_(UNPAID_INVOICE_STATUSES)
+        ).scalar()
+        
+        last_payment = self.session.query(Payment).filter(
+            Payment.customer_id == customer_id,
+            Payment.status != PaymentStatus.CANCELLED
+        ).order_by(Payment.payment_date.desc(), Payment.id.desc()).first()
+        
+        exposure = self.session.get(CustomerCreditExposure, customer_id)
+        if exposure is None:
+            exposure = CustomerCreditExposure(customer_id=customer_id)
+            self.session.add(exposure)
+        
+        exposure.open_order_amount = Decimal(str(open_order_amount))
+        exposure.unpaid_invoice_amount = Decimal(str(unpaid_invoice_amount))
+        exposure.last_payment_id = last_payment.id if last_payment else None
+        exposure.last_payment_date = last_payment.payment_date if last_payment else None
+        exposure.last_payment_amount = last_payment.amount if last_payment else None
+        exposure.reconciled_at = datetime.now()
+        self.session.flush()
+        
+        return exposure
+    
+    def apply_exposure_delta(
+        self,
+        customer_id: int,
+        open_order_delta: Decimal = Decimal(0),
+        unpaid_invoice_delta: Decimal = Decimal(0)
+    ) -> None:
+        """
+        Apply an incremental change to a customer's credit exposure.
+        
+        The update is a single atomic ``SET x = x + delta`` statement. When the
+        customer has no exposure row yet, it is built from the source tables
+        instead, which already include the change being applied.
+        
+        Args:
+            customer_id: Customer ID
+            open_order_delta: Change in open order amount
+            unpaid_invoice_delta: Change in unpaid invoice amount
+        """
+        if not open_order_delta and not unpaid_invoice_delta:
+            return
+        
+        updated = self.session.query(CustomerCreditExposure).filter(
+            CustomerCreditExposure.customer_id == customer_id
+        ).update({
+            CustomerCreditExposure.open_order_amount:
+                CustomerCreditExposure.open_order_amount + open_order_delta,
+            CustomerCreditExposure.unpaid_invoice_amount:
+                CustomerCreditExposure.unpaid_invoice_amount + unpaid_invoice_delta,
+        }, synchronize_session=False)
+        
+        if not updated:
+            self.refresh_exposure(customer_id)
+    
+    def record_payment(
+        self,
+        customer_id: int,
+        payment_id: int,
+        payment_date: Optional[date],
+        amount: Decimal
+    ) -> None:
+        """
+        Record a received payment as the customer's last payment if it is the most recent.
+        
+        Args:
+            customer_id: Customer ID
+            payment_id: Payment ID
+            payment_date: Date the payment was received
+            amount: Payment amount
+        """
+        exposure = self.session.get(CustomerCreditExposure, customer_id)
+        if exposure is None:
+            self.refresh_exposure(customer_id)
+            return
+        
+        if exposure.last_payment_date is None or (
+            payment_date is not None and payment_date >= exposure.last_payment_date
+        ):
+            exposure.last_payment_id = payment_id
+            exposure.last_payment_date = payment_date
+            exposure.last_payment_amount = amount
+            self.session.flush()
+    
+    def reconcile_exposures(self, fix: bool = True) -> List[CreditExposureDrift]:
+        """
+        Compare every stored exposure with the source tables and report drift.
         
-        return Decimal(str(confirmed_orders_total))
+        Uses one grouped query per source table, so the cost does not depend on
+        the number of customers being checked.
+        
+        Args:
+            fix: Rewrite drifted rows with the recomputed amounts
+            
+        Returns:
+            List of CreditExposureDrift for customers whose stored amounts differ
+        """
+        actual_orders = dict(self.session.query(
+            Order.customer_id, func.sum(Order.total)
+        ).filter(
+            Order.status.in_(OPEN_ORDER_STATUSES)
+        ).group_by(Order.customer_id).all())
+        
+        actual_invoices = dict(self.session.query(
+            Invoice.customer_id, func.sum(Invoice.remaining_amount)
+        ).filter(
+            Invoice.status.in_(UNPAID_INVOICE_STATUSES)
+        ).group_by(Invoice.customer_id).all())
+        
+        exposures = {
+            exposure.customer_id: exposure
+            for exposure in self.session.query(CustomerCreditExposure).all()
+        }
+        
+        drifts = []
+        now = datetime.now()
+        # Customers without a row are skipped: their exposure is built on first use
+        for customer_id, exposure in exposures.items():
+            actual_open = Decimal(str(actual_orders.get(customer_id) or 0))
+            actual_unpaid = Decimal(str(actual_invoices.get(customer_id) or 0))
+            stored_open = Decimal(str(exposure.open_order_amount or 0))
+            stored_unpaid = Decimal(str(exposure.unpaid_invoice_amount or 0))
+            
+            if stored_open != actual_open or stored_unpaid != actual_unpaid:
+                drifts.append(CreditExposureDrift(
+                    customer_id=customer_id,
+                    stored_open_order_amount=stored_open,
+                    actual_open_order_amount=actual_open,
+                    stored_unpaid_invoice_amount=stored_unpaid,
+                    actual_unpaid_invoice_amount=actual_unpaid
+                ))
+                if fix:
+                    exposure.open_order_amount = actual_open
+                    exposure.unpaid_invoice_amount = actual_unpaid
+            
+            exposure.reconciled_at = now
+        
+        self.session.flush()
+        return drifts
     
     def get_credit_summary(self, customer_id: int) -> CreditSummary:
         """
@@ -120,7 +304,8 @@ class CreditService:
             )
         
         credit_limit = commercial_conditions.credit_limit or Decimal(0)
-        current_debt = self.calculate_current_debt(customer_id)
+        exposure = self.get_exposure(customer_id)
+        current_debt = Decimal(str(exposure.open_order_amount or 0))
         available_credit = max(Decimal(0), credit_limit - current_debt)
         
         # Calculate utilization percentage
@@ -138,7 +323,10 @@ class CreditService:
             available_credit=available_credit,
             credit_utilization_percent=credit_utilization_percent,
             block_on_credit_exceeded=commercial_conditions.block_on_credit_exceeded,
-            payment_terms_days=commercial_conditions.payment_terms_days
+            payment_terms_days=commercial_conditions.payment_terms_days,
+            unpaid_invoice_amount=Decimal(str(exposure.unpaid_invoice_amount or 0)),
+            last_payment_date=exposure.last_payment_date,
+            last_payment_amount=exposure.last_payment_amount
         )
     
     # ==================== Credit Validation Methods ====================
@@ -163,12 +351,19 @@ class CreditService:
         Raises:
             ValueError: If customer not found
         """
-        customer = self.session.get(Customer, customer_id)
-        if not customer:
+        # Customer, commercial conditions and exposure in a single query
+        row = self.session.query(
+            Customer, CommercialConditions, CustomerCreditExposure
+        ).outerjoin(
+            CommercialConditions, CommercialConditions.customer_id == Customer.id
+        ).outerjoin(
+            CustomerCreditExposure, CustomerCreditExposure.customer_id == Customer.id
+        ).filter(Customer.id == customer_id).first()
+        
+        if not row:
             raise ValueError(f"Customer with ID {customer_id} not found.")
         
-        # Get commercial conditions
-        commercial_conditions = customer.commercial_conditions
+        customer, commercial_conditions, exposure = row
         
         # If no commercial conditions or credit checking disabled, allow the order
         if not commercial_conditions or not commercial_conditions.block_on_credit_exceeded:
@@ -187,12 +382,14 @@ class CreditService:
         credit_limit = commercial_conditions.credit_limit or Decimal(0)
         
         # Calculate current debt
-        current_debt = self.calculate_current_debt(customer_id)
+        if exposure is None:
+            exposure = self.refresh_exposure(customer_id)
+        current_debt = Decimal(str(exposure.open_order_amount or 0))
         
         # If updating an existing order, subtract the old order total from debt
         if order_id:
             existing_order = self.session.get(Order, order_id)
-            if existing_order and existing_order.status in ['confirmed', 'ready', 'shipped', 'delivered']:
+            if existing_order and existing_order.status in OPEN_ORDER_STATUSES:
                 current_debt = max(Decimal(0), current_debt - existing_order.total)
         
         # Calculate new debt after order
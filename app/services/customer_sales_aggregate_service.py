@@ -0,0 +1,181 @@
+"""Service maintaining customer rolling sales aggregates."""
+from typing import Optional
+from decimal import Decimal
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+
+from app.domain.models.order import Order
+from app.domain.models.customer_sales_aggregate import CustomerSalesAggregate, SALES_ORDER_STATUSES
+from app.utils.period import date_range_filter
+
+
+def rolling_window_start(today: Optional[date] = None) -> date:
+    """First day of the rolling 12-month window ending today."""
+    return (today or date.today()) - timedelta(days=365)
+
+
+class CustomerSalesAggregateService:
+    """
+    Service for the customer_sales_aggregates read model.
+
+    Quote discount suggestions read one row per customer instead of
+    aggregating the customer's order history on every request.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize the customer sales aggregate service.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        self.session = session
+
+    def get_aggregate(self, customer_id: int) -> CustomerSalesAggregate:
+        """
+        Get the sales aggregate of a customer.
+
+        The row is built from orders the first time it is requested. Otherwise the
+        stored row is served as-is: order events keep it current and the nightly
+        refresh slides its window, so reads never write.
+
+        Args:
+            customer_id: Customer ID
+
+        Returns:
+            CustomerSalesAggregate instance
+        """
+        aggregate = self.session.get(CustomerSalesAggregate, customer_id)
+        if aggregate is None:
+            aggregate = self.refresh_aggregate(customer_id)
+        return aggregate
+
+    def refresh_aggregate(self, customer_id: int) -> CustomerSalesAggregate:
+        """
+        Recompute the sales aggregate of one customer from its orders.
+
+        Args:
+            customer_id: Customer ID
+
+        Returns:
+            Up-to-date CustomerSalesAggregate instance (flushed, not committed)
+        """
+        window_start = rolling_window_start()
+        revenue, order_count, last_order_at = self.session.query(
+            func.coalesce(func.sum(Order.total), 0),
+            func.count(Order.id),
+            func.max(Order.created_at)
+        ).filter(
+            Order.customer_id == customer_id,
+            Order.status.in_(SALES_ORDER_STATUSES),
+            date_range_filter(Order.created_at, window_start)
+        ).one()
+
+        aggregate = self.session.get(CustomerSalesAggregate, customer_id)
+        if aggregate is None:
+            aggregate = CustomerSalesAggregate(customer_id=customer_id)
+            self.session.add(aggregate)
+
+        aggregate.revenue_12m = Decimal(str(revenue))
+        aggregate.order_count_12m = order_count or 0
+        aggregate.last_order_date = _to_date(last_order_at)
+        aggregate.window_start = window_start
+        aggregate.refreshed_at = datetime.now()
+        self.session.flush()
+
+        return aggregate
+
+    def apply_order_delta(
+        self,
+        customer_id: int,
+        revenue_delta: Decimal,
+        order_count_delta: int,
+        order_date: Optional[date] = None
+    ) -> None:
+        """
+        Apply an incremental change to a customer's sales aggregate.
+
+        A single atomic ``SET x = x + delta`` statement; when the customer has no
+        row yet it is built from orders instead, which already include the change.
+
+        Args:
+            customer_id: Customer ID
+            revenue_delta: Change in 12-month revenue
+            order_count_delta: Change in 12-month order count
+            order_date: Date of the order, recorded as last order date if more recent
+        """
+        values = {
+            CustomerSalesAggregate.revenue_12m: CustomerSalesAggregate.revenue_12m + revenue_delta,
+            CustomerSalesAggregate.order_count_12m: CustomerSalesAggregate.order_count_12m + order_count_delta,
+        }
+        updated = self.session.query(CustomerSalesAggregate).filter(
+            CustomerSalesAggregate.customer_id == customer_id
+        ).update(values, synchronize_session=False)
+
+        if not updated:
+            self.refresh_aggregate(customer_id)
+            return
+
+        if order_date is not None:
+            self.session.query(CustomerSalesAggregate).filter(
+                CustomerSalesAggregate.customer_id == customer_id,
+                (CustomerSalesAggregate.last_order_date.is_(None)) |
+                (CustomerSalesAggregate.last_order_date < order_date)
+            ).update({CustomerSalesAggregate.last_order_date: order_date}, synchronize_session=False)
+
+    def refresh_all(self) -> int:
+        """
+        Rebuild every customer's aggregate over the current window.
+
+        One grouped query over orders; customers whose orders all left the
+        window are reset to zero.
+
+        Returns:
+            Number of aggregate rows written
+        """
+        window_start = rolling_window_start()
+        rows = self.session.query(
+            Order.customer_id,
+            func.sum(Order.total),
+            func.count(Order.id),
+            func.max(Order.created_at)
+        ).filter(
+            Order.status.in_(SALES_ORDER_STATUSES),
+            date_range_filter(Order.created_at, window_start)
+        ).group_by(Order.customer_id).all()
+        actual = {row[0]: row[1:] for row in rows}
+
+        aggregates = {
+            aggregate.customer_id: aggregate
+            for aggregate in self.session.query(CustomerSalesAggregate).all()
+        }
+
+        now = datetime.now()
+        for customer_id in set(actual) | set(aggregates):
+            aggregate = aggregates.get(customer_id)
+            if aggregate is None:
+                aggregate = CustomerSalesAggregate(customer_id=customer_id)
+                self.session.add(aggregate)
+            revenue, order_count, last_order_at = actual.get(customer_id, (0, 0, None))
+            aggregate.revenue_12m = Decimal(str(revenue or 0))
+            aggregate.order_count_12m = order_count or 0
+            if last_order_at is not None or aggregate.last_order_date is None:
+                aggregate.last_order_date = _to_date(last_order_at)
+            aggregate.window_start = window_start
+            aggregate.refreshed_at = now
+
+        self.session.flush()
+        return len(set(actual) | set(aggregates))
+
+
+def _to_date(value) -> Optional[date]:
+    """Normalize a DATETIME aggregate (datetime, or string on SQLite) to a date."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)).date()
@@ -0,0 +1,233 @@
+"""Dashboard KPI engine: composable KPIs computed in as few statements as possible."""
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, func, case, and_, or_
+from sqlalchemy.orm import Session
+
+from app.domain.models.customer import Customer
+from app.domain.models.dashboard_counter import DashboardCounter
+from app.domain.models.order import Order
+from app.domain.models.product import Product
+from app.domain.models.sales_fact import SalesPeriodRollup
+from app.domain.models.stock import StockItem
+from app.services.sales_fact_service import SalesFactService, REVENUE_ORDER_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# KPIs computed for the current and previous period from the sales rollups
+SALES_KPIS = ('total_revenue', 'total_orders')
+
+# KPIs read from the cached dashboard counters
+COUNTER_KPIS = ('active_customers', 'products_in_stock', 'stock_alerts_count', 'active_orders_count')
+
+KPI_NAMES = SALES_KPIS + COUNTER_KPIS
+
+# Counters older than this are recomputed on read
+COUNTER_MAX_AGE = timedelta(minutes=5)
+
+# Order statuses counted as active (in progress) orders
+ACTIVE_ORDER_STATUSES = ('confirmed', 'ready', 'shipped')
+
+
+def _counter_expressions() -> Dict[str, Any]:
+    """Scalar subquery computing each counter."""
+    return {
+        'active_customers': select(func.count(Customer.id)).where(
+            Customer.status == 'active'
+        ).scalar_subquery(),
+        'products_in_stock': select(func.count(Product.id)).where(
+            Product.status == 'active'
+        ).scalar_subquery(),
+        'stock_alerts_count': select(func.count(StockItem.id)).where(
+            StockItem.min_stock.isnot(None),
+            StockItem.physical_quantity < StockItem.min_stock
+        ).scalar_subquery(),
+        'active_orders_count': select(func.count(Order.id)).where(
+            Order.status.in_(ACTIVE_ORDER_STATUSES)
+        ).scalar_subquery(),
+    }
+
+
+@dataclass
+class KPIValue:
+    """Value of a KPI, with the previous period value for period KPIs."""
+    value: Any
+    previous: Any = None
+
+    @property
+    def change_percent(self) -> Optional[Decimal]:
+        """Change versus the previous period, in percent (None without a previous value)."""
+        if not self.previous:
+            return None
+        return (Decimal(str(self.value)) - Decimal(str(self.previous))) / Decimal(str(self.previous)) * 100
+
+
+class DashboardKPIService:
+    """
+    Computes dashboard KPIs on demand.
+
+    Period KPIs (revenue, orders) for the current and previous period are
+    read from the sales rollups in a single statement using conditional
+    aggregation; entity counts are read from the dashboard_counters table
+    and recomputed together in one statement when stale. Only the requested
+    KPIs are computed.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize the dashboard KPI service.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        self.session = session
+
+    @staticmethod
+    def validate_kpis(kpis: Optional[Iterable[str]]) -> List[str]:
+        """
+        Normalize a KPI selection.
+
+        Args:
+            kpis: KPI names (None = all KPIs)
+
+        Returns:
+            List of KPI names, in KPI_NAMES order
+
+        Raises:
+            ValueError: If a KPI name is unknown
+        """
+        if kpis is None:
+            return list(KPI_NAMES)
+        requested = set(kpis)
+        unknown = requested - set(KPI_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown KPIs: {', '.join(sorted(unknown))}")
+        return [name for name in KPI_NAMES if name in requested]
+
+    def compute(
+        self,
+        kpis: Optional[Iterable[str]],
+        start_date: date,
+        end_date: date,
+        prev_start_date: date,
+        prev_end_date: date
+    ) -> Dict[str, KPIValue]:
+        """
+        Compute the requested KPIs.
+
+        Args:
+            kpis: KPI names (None = all KPIs)
+            start_date: First day of the current period
+            end_date: Last day of the current period
+            prev_start_date: First day of the comparison period
+            prev_end_date: Last day of the comparison period
+
+        Returns:
+            Dict of KPI name to KPIValue
+
+        Raises:
+            ValueError: If a KPI name is unknown
+        """
+        names = self.validate_kpis(kpis)
+        result: Dict[str, KPIValue] = {}
+
+        sales_kpis = [name for name in names if name in SALES_KPIS]
+        if sales_kpis:
+            result.update(self._compute_sales_kpis(sales_kpis, start_date, end_date, prev_start_date, prev_end_date))
+
+        counter_kpis = [name for name in names if name in COUNTER_KPIS]
+        if counter_kpis:
+            counters = self.get_counters(counter_kpis)
+            result.update({name: KPIValue(value=counters[name]) for name in counter_kpis})
+
+        return result
+
+    def _compute_sales_kpis(
+        self,
+        names: List[str],
+        start_date: date,
+        end_date: date,
+        prev_start_date: date,
+        prev_end_date: date
+    ) -> Dict[str, KPIValue]:
+        """Current and previous period sales KPIs in one conditional aggregation."""
+        facts = SalesFactService(self.session)
+        periods = (
+            facts.covering_condition(start_date, end_date),
+            facts.covering_condition(prev_start_date, prev_end_date),
+        )
+        is_revenue = SalesPeriodRollup.status.in_(REVENUE_ORDER_STATUSES)
+
+        columns = []
+        for name in names:
+            for period in periods:
+                if name == 'total_revenue':
+                    expr = case((and_(period, is_revenue), SalesPeriodRollup.order_total), else_=0)
+                else:  # total_orders (all statuses)
+                    expr = case((period, SalesPeriodRollup.order_count), else_=0)
+                columns.append(func.coalesce(func.sum(expr), 0))
+
+        row = self.session.execute(select(*columns).where(or_(*periods))).one()
+
+        result = {}
+        for index, name in enumerate(names):
+            current, previous = row[2 * index], row[2 * index + 1]
+            if name == 'total_revenue':
+                result[name] = KPIValue(value=Decimal(str(current)), previous=Decimal(str(previous)))
+            else:
+                result[name] = KPIValue(value=int(current), previous=int(previous))
+        return result
+
+    # ==================== Counters ====================
+
+    def get_counters(self, names: Iterable[str], max_age: timedelta = COUNTER_MAX_AGE) -> Dict[str, int]:
+        """
+        Read cached counters, recomputing missing or stale ones.
+
+        Args:
+            names: Counter names (see COUNTER_KPIS)
+            max_age: Maximum age of a cached value
+
+        Returns:
+            Dict of counter name to value
+        """
+        names = list(names)
+        rows = {
+            counter.name: counter
+            for counter in self.session.query(DashboardCounter).filter(DashboardCounter.name.in_(names)).all()
+        }
+        threshold = datetime.now() - max_age
+        stale = [name for name in names if name not in rows or rows[name].refreshed_at < threshold]
+
+        values = {name: rows[name].value for name in names if name not in stale}
+        if stale:
+            values.update(self.refresh_counters(stale))
+        return values
+
+    def refresh_counters(self, names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Recompute counters in one statement and store them.
+
+        The caller commits the session.
+
+        Args:
+            names: Counter names (None = all counters)
+
+        Returns:
+            Dict of counter name to value
+        """
+        expressions = _counter_expressions()
+        names = list(names) if names is not None else list(expressions)
+        row = self.session.execute(select(*(expressions[name].label(name) for name in names))).one()
+
+        now = datetime.now()
+        values = {name: int(row._mapping[name] or 0) for name in names}
+        for name, value in values.items():
+            self.session.merge(DashboardCounter(name=name, value=value, refreshed_at=now))
+        self.session.flush()
+        logger.debug("Refreshed dashboard counters: %s", values)
+        return values
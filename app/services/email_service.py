@@ -1,12 +1,13 @@
 """Email sending service using SMTP."""
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
 from flask import current_app
 from io import BytesIO
+from app.infrastructure.mail import EmailSendQueue, SMTPConnection, get_email_transport
 
 
 class EmailService:
@@ -38,7 +39,8 @@ class EmailService:
         body_text: str,
         body_html: Optional[str] = None,
         attachments: Optional[List[dict]] = None,
-        from_email: Optional[str] = None
+        from_email: Optional[str] = None,
+        connection: Optional[SMTPConnection] = None
     ) -> bool:
         """
         Send an email via SMTP.
@@ -50,14 +52,46 @@ class EmailService:
             body_html: Optional HTML body
             attachments: Optional list of attachments (dict with 'filename' and 'content' BytesIO)
             from_email: Optional sender email (defaults to MAIL_DEFAULT_SENDER)
+            connection: Optional open SMTPConnection (see open_connection);
+                a connection is opened and closed for this message otherwise
             
         Returns:
             True if email sent successfully, False otherwise
         """
-        self._get_config()
+        msg, recipients = self.build_message(
+            to=to,
+            subject=subject,
+            body_text=body_text,
+            body_html=body_html,
+            attachments=attachments,
+            from_email=from_email
+        )
+        
+        # Send through the pooled transport (MAIL_BACKEND)
+        try:
+            get_email_transport().send(msg, recipients, connection=connection)
+            
+            return True
+        except Exception as e:
+            current_app.logger.error(f"Failed to send email: {e}")
+            raise
+    
+    def build_message(
+        self,
+        to: str | List[str],
+        subject: str,
+        body_text: str,
+        body_html: Optional[str] = None,
+        attachments: Optional[List[dict]] = None,
+        from_email: Optional[str] = None
+    ) -> Tuple[MIMEMultipart, List[str]]:
+        """
+        Build a MIME message (see send_email for the arguments).
         
-        if not self.smtp_server:
-            raise ValueError("SMTP server not configured. Set MAIL_SERVER in config.")
+        Returns:
+            Tuple of (message, recipient addresses)
+        """
+        self._get_config()
         
         # Create message
         msg = MIMEMultipart('alternative')
@@ -89,26 +123,40 @@ class EmailService:
                 )
                 msg.attach(part)
         
-        # Send email
-        try:
-            if self.use_ssl:
-                server = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port)
-            else:
-                server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            
-            if self.use_tls and not self.use_ssl:
-                server.starttls()
-            
-            if self.username and self.password:
-                server.login(self.username, self.password)
-            
-            server.sendmail(msg['From'], recipients, msg.as_string())
-            server.quit()
+        return msg, recipients
+    
+    @contextmanager
+    def open_connection(self) -> Iterator[Optional[SMTPConnection]]:
+        """
+        Hold a pooled connection for several messages.
+        
+        Usage:
+            with email_service.open_connection() as connection:
+                for ...:
+                    email_service.send_email(..., connection=connection)
+        
+        Yields:
+            SMTPConnection (None with the memory / file backends)
+        """
+        with get_email_transport().connection() as connection:
+            yield connection
+    
+    def send_queue(self, batch_size: Optional[int] = None, workers: int = 1) -> EmailSendQueue:
+        """
+        Queue sending built messages in batches (see EmailSendQueue).
+        
+        Args:
+            batch_size: Messages per connection (defaults to MAIL_BATCH_SIZE config)
+            workers: Batches sent in parallel
             
-            return True
-        except Exception as e:
-            current_app.logger.error(f"Failed to send email: {e}")
-            raise
+        Returns:
+            EmailSendQueue on the app transport
+        """
+        return EmailSendQueue(
+            get_email_transport(),
+            batch_size=batch_size or current_app.config.get('MAIL_BATCH_SIZE', 50),
+            workers=workers
+        )
     
     def send_quote_email(
         self,
@@ -1,13 +1,21 @@
 """Service for exporting FEC (Fichier des Écritures Comptables) for French tax authorities."""
-from io import BytesIO, StringIO
+import heapq
+from io import BytesIO
 from decimal import Decimal
-from datetime import datetime, date
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.domain.models.invoice import Invoice, InvoiceLine
+from datetime import datetime, date, timedelta
+from typing import BinaryIO, Iterator, List, Optional
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, selectinload
+from app.domain.models.invoice import Invoice, InvoiceLine, CreditNote
 from app.domain.models.order import Order
 from app.domain.models.customer import Customer
 
+# Documents (invoices or credit notes) read per keyset query
+FEC_CHUNK_SIZE = 1000
+
+# FEC lines encoded per chunk written to the output
+FEC_WRITE_LINES = 2000
+
 
 class FECExportService:
     """Service for exporting accounting entries to FEC format."""
@@ -55,48 +63,190 @@ class FECExportService:
         Returns:
             BytesIO object containing the FEC file (UTF-8 encoded, tab-separated)
         """
-        # Build query
-        query = self.session.query(Invoice).filter(
-            Invoice.status != "canceled"  # Exclude canceled invoices
+        fec_buffer = BytesIO()
+        self.write_fec(
+            fec_buffer, date_from=date_from, date_to=date_to,
+            invoice_ids=invoice_ids, include_credit_notes=False
         )
+        fec_buffer.seek(0)
+        return fec_buffer
+    
+    # ==================== Streaming pipeline ====================
+    
+    def write_fec(
+        self,
+        output: BinaryIO,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        invoice_ids: Optional[List[int]] = None,
+        include_credit_notes: bool = True
+    ) -> None:
+        """
+        Write a FEC file incrementally to a binary file.
         
-        if date_from:
-            query = query.filter(Invoice.invoice_date >= date_from)
-        
-        if date_to:
-            query = query.filter(Invoice.invoice_date <= date_to)
+        Args:
+            output: Binary file (file on disk, spooled file, BytesIO)
+            date_from: Start date (optional)
+            date_to: End date (optional)
+            invoice_ids: Specific invoice IDs to export (optional, credit notes are then skipped)
+            include_credit_notes: Merge credit note entries in date order
+        """
+        for chunk in self.stream_fec(date_from, date_to, invoice_ids, include_credit_notes):
+            output.write(chunk)
+    
+    def stream_fec(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        invoice_ids: Optional[List[int]] = None,
+        include_credit_notes: bool = True
+    ) -> Iterator[bytes]:
+        """
+        FEC file as UTF-8 chunks, for a streaming response.
         
-        if invoice_ids:
-            query = query.filter(Invoice.id.in_(invoice_ids))
+        Args:
+            date_from: Start date (optional)
+            date_to: End date (optional)
+            invoice_ids: Specific invoice IDs to export (optional, credit notes are then skipped)
+            include_credit_notes: Merge credit note entries in date order
+            
+        Yields:
+            Encoded chunks of FEC_WRITE_LINES lines
+        """
+        lines = []
+        for line in self.iter_fec_lines(date_from, date_to, invoice_ids, include_credit_notes):
+            lines.append(line)
+            if len(lines) >= FEC_WRITE_LINES:
+                yield "".join(lines).encode('utf-8')
+                lines = []
+        if lines:
+            yield "".join(lines).encode('utf-8')
+    
+    def iter_fec_lines(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        invoice_ids: Optional[List[int]] = None,
+        include_credit_notes: bool = True
+    ) -> Iterator[str]:
+        """
+        FEC lines: the header, then the entries of every document by date.
         
-        # Order by invoice date and number
-        invoices = query.order_by(Invoice.invoice_date, Invoice.number).all()
+        Invoice and credit note entries are each read in date order and
+        merged with a heap merge on the entry date, so neither list is held
+        in memory.
         
-        # Generate FEC content
-        fec_content = StringIO()
+        Yields:
+            Tab-separated lines ending with a newline
+        """
+        yield "\t".join(self.FEC_COLUMNS) + "\n"
         
-        # Write header (column names)
-        fec_content.write("\t".join(self.FEC_COLUMNS))
-        fec_content.write("\n")
+        documents = [self.iter_invoice_entries(date_from, date_to, invoice_ids)]
+        if include_credit_notes and not invoice_ids:
+            documents.append(self.iter_credit_note_entries(date_from, date_to))
         
-        # Write invoice entries
-        for invoice in invoices:
-            # Load relationships
-            self.session.refresh(invoice, ['customer', 'lines', 'order'])
-            
-            # Generate accounting entries for this invoice
-            entries = self._generate_invoice_entries(invoice)
-            
+        for entries in heapq.merge(*documents, key=lambda entries: entries[0][3]):
             for entry in entries:
-                fec_content.write("\t".join(entry))
-                fec_content.write("\n")
+                yield "\t".join(entry) + "\n"
+    
+    def iter_invoice_entries(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        invoice_ids: Optional[List[int]] = None,
+        chunk_size: int = FEC_CHUNK_SIZE
+    ) -> Iterator[List[List[str]]]:
+        """
+        Accounting entries of each invoice, in (invoice date, number) order.
         
-        # Convert to BytesIO with UTF-8 encoding
-        fec_buffer = BytesIO()
-        fec_buffer.write(fec_content.getvalue().encode('utf-8'))
-        fec_buffer.seek(0)
+        Invoices are read in keyset chunks with their customers loaded by one
+        extra query per chunk; the session only keeps weak references to
+        them, so earlier chunks are garbage collected.
         
-        return fec_buffer
+        Args:
+            date_from: Start date (optional)
+            date_to: End date (optional)
+            invoice_ids: Specific invoice IDs (optional)
+            chunk_size: Invoices per query
+            
+        Yields:
+            Entry rows of one invoice
+        """
+        query = self.session.query(Invoice).options(selectinload(Invoice.customer)).filter(
+            Invoice.status != "canceled"  # Exclude canceled invoices
+        )
+        if date_from:
+            query = query.filter(Invoice.invoice_date >= date_from)
+        if date_to:
+            query = query.filter(Invoice.invoice_date <= date_to)
+        if invoice_ids:
+            query = query.filter(Invoice.id.in_(invoice_ids))
+        query = query.order_by(Invoice.invoice_date, Invoice.number)
+        
+        last = None
+        while True:
+            chunk_query = query
+            if last is not None:
+                # The redundant >= lets the database range-scan the index
+                chunk_query = chunk_query.filter(Invoice.invoice_date >= last[0], or_(
+                    Invoice.invoice_date > last[0],
+                    and_(Invoice.invoice_date == last[0], Invoice.number > last[1])
+                ))
+            invoices = chunk_query.limit(chunk_size).all()
+            if not invoices:
+                return
+            for invoice in invoices:
+                yield self._generate_invoice_entries(invoice)
+            last = (invoices[-1].invoice_date, invoices[-1].number)
+            if len(invoices) < chunk_size:
+                return
+    
+    def iter_credit_note_entries(
+        self,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        credit_note_ids: Optional[List[int]] = None,
+        chunk_size: int = FEC_CHUNK_SIZE
+    ) -> Iterator[List[List[str]]]:
+        """
+        Accounting entries of each credit note, in (creation time, number) order.
+        
+        Args:
+            date_from: Start date (optional)
+            date_to: End date (optional, inclusive)
+            credit_note_ids: Specific credit note IDs (optional)
+            chunk_size: Credit notes per query
+            
+        Yields:
+            Entry rows of one credit note
+        """
+        query = self.session.query(CreditNote).options(selectinload(CreditNote.customer)).filter(
+            CreditNote.status != "canceled"
+        )
+        if date_from:
+            query = query.filter(CreditNote.created_at >= date_from)
+        if date_to:
+            query = query.filter(CreditNote.created_at < date_to + timedelta(days=1))
+        if credit_note_ids:
+            query = query.filter(CreditNote.id.in_(credit_note_ids))
+        query = query.order_by(CreditNote.created_at, CreditNote.number)
+        
+        last = None
+        while True:
+            chunk_query = query
+            if last is not None:
+                chunk_query = chunk_query.filter(CreditNote.created_at >= last[0], or_(
+                    CreditNote.created_at > last[0],
+                    and_(CreditNote.created_at == last[0], CreditNote.number > last[1])
+                ))
+            credit_notes = chunk_query.limit(chunk_size).all()
+            if not credit_notes:
+                return
+            for credit_note in credit_notes:
+                yield self._generate_credit_note_entries(credit_note)
+            last = (credit_notes[-1].created_at, credit_notes[-1].number)
+            if len(credit_notes) < chunk_size:
+                return
     
     def _generate_invoice_entries(self, invoice: Invoice) -> List[List[str]]:
         """
@@ -255,46 +405,11 @@ class FECExportService:
         Returns:
             BytesIO object containing the FEC file
         """
-        from app.domain.models.invoice import CreditNote
-        
-        # Build query
-        query = self.session.query(CreditNote).filter(
-            CreditNote.status != "canceled"
-        )
-        
-        if date_from:
-            query = query.filter(CreditNote.created_at >= date_from)
-        
-        if date_to:
-            query = query.filter(CreditNote.created_at <= date_to)
-        
-        if credit_note_ids:
-            query = query.filter(CreditNote.id.in_(credit_note_ids))
-        
-        credit_notes = query.order_by(CreditNote.created_at, CreditNote.number).all()
-        
-        # Generate FEC content
-        fec_content = StringIO()
-        
-        # Write header
-        fec_content.write("\t".join(self.FEC_COLUMNS))
-        fec_content.write("\n")
-        
-        # Write credit note entries
-        for credit_note in credit_notes:
-            self.session.refresh(credit_note, ['customer', 'invoice'])
-            
-            entries = self._generate_credit_note_entries(credit_note)
-            
-            for entry in entries:
-                fec_content.write("\t".join(entry))
-                fec_content.write("\n")
-        
-        # Convert to BytesIO
         fec_buffer = BytesIO()
-        fec_buffer.write(fec_content.getvalue().encode('utf-8'))
+        fec_buffer.write(("\t".join(self.FEC_COLUMNS) + "\n").encode('utf-8'))
+        for entries in self.iter_credit_note_entries(date_from, date_to, credit_note_ids):
+            fec_buffer.write("".join("\t".join(entry) + "\n" for entry in entries).encode('utf-8'))
         fec_buffer.seek(0)
-        
         return fec_buffer
     
     def _generate_credit_note_entries(self, credit_note) -> List[List[str]]:
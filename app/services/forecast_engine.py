@@ -0,0 +1,303 @@
+"""Batch forecasting engine over dense series × day demand matrices."""
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - pure-Python fallback without numpy
+    np = None
+
+# Forecasting methods and the confidence level of their intervals (%)
+METHOD_CONFIDENCE = {
+    'moving_average': 95,
+    'exponential_smoothing': 90,
+    'linear_regression': 85,
+}
+
+# Confidence of the fallback used when a series is too short for a regression (%)
+FALLBACK_CONFIDENCE = 80
+
+# Days averaged by the moving average forecast
+MOVING_AVERAGE_WINDOW = 3
+
+# Smoothing factor of exponential smoothing
+SMOOTHING_ALPHA = 0.3
+
+# Default standard deviation of single-day series, as a fraction of the forecast
+DEFAULT_DEVIATION_RATIO = 0.1
+
+# Relative change between the last two days under which a trend is 'stable'
+STABLE_TREND_RATIO = 0.05
+
+
+class DemandMatrix:
+    """
+    Daily values of several series over consecutive days.
+
+    Rows are series (e.g. one per product), columns are the days from
+    start_date to end_date; days without a record are filled with 0. Rows
+    are a 2-D NumPy float array when NumPy is installed, lists of floats
+    otherwise.
+    """
+
+    def __init__(self, keys: Sequence[Hashable], start_date: date, end_date: date, rows: Any):
+        """
+        Initialize the matrix.
+
+        Args:
+            keys: Series keys, one per row
+            start_date: Day of the first column
+            end_date: Day of the last column (inclusive)
+            rows: Row values (len(keys) × days)
+        """
+        self.keys = list(keys)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.rows = rows
+        self._index = {key: index for index, key in enumerate(self.keys)}
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Tuple[Hashable, date, Any]],
+        start_date: date,
+        end_date: date,
+        keys: Optional[Sequence[Hashable]] = None
+    ) -> 'DemandMatrix':
+        """
+        Build a dense matrix from sparse (key, day, value) records.
+
+        Args:
+            records: (series key, day, value) tuples; values of a repeated
+                (key, day) pair are added
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            keys: Series to include, in row order (None = keys of the records,
+                in order of appearance); records of other keys are ignored
+
+        Returns:
+            DemandMatrix
+        """
+        days = max((end_date - start_date).days + 1, 0)
+        fixed_keys = keys is not None
+        index: Dict[Hashable, int] = {key: i for i, key in enumerate(keys or [])}
+        cells: List[Tuple[int, int, float]] = []
+        for key, day, value in records:
+            column = (day - start_date).days
+            if not 0 <= column < days or not value:
+                continue
+            row = index.get(key)
+            if row is None:
+                if fixed_keys:
+                    continue
+                row = index[key] = len(index)
+            cells.append((row, column, float(value)))
+
+        if np is not None:
+            rows = np.zeros((len(index), days), dtype=np.float64)
+            if cells:
+                row_indices, column_indices, values = zip(*cells, strict=True)
+                np.add.at(rows, (np.array(row_indices, dtype=np.intp), np.array(column_indices, dtype=np.intp)),
+                          np.array(values, dtype=np.float64))
+        else:
+            rows = [[0.0] * days for _ in range(len(index))]
+            for row, column, value in cells:
+                rows[row][column] += value
+        return cls(list(index), start_date, end_date, rows)
+
+    @property
+    def days(self) -> int:
+        """Number of days (columns)."""
+        return max((self.end_date - self.start_date).days + 1, 0)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def index(self, key: Hashable) -> Optional[int]:
+        """Row index of a series key (None if absent)."""
+        return self._index.get(key)
+
+    def row(self, key: Hashable) -> List[float]:
+        """Daily values of a series (zeros if the key is absent)."""
+        index = self._index.get(key)
+        if index is None:
+            return [0.0] * self.days
+        return [float(value) for value in self.rows[index]]
+
+    def totals(self) -> List[float]:
+        """Sum of each series over the period."""
+        if np is not None:
+            return self.rows.sum(axis=1).tolist()
+        return [math.fsum(row) for row in self.rows]
+
+    def active_days(self) -> List[int]:
+        """Number of days with a non-zero value, per series."""
+        if np is not None:
+            return np.count_nonzero(self.rows, axis=1).tolist()
+        return [sum(1 for value in row if value) for row in self.rows]
+
+
+@dataclass
+class BatchForecast:
+    """
+    Forecast of every series of a DemandMatrix.
+
+    The forecast of series i for future day h (0 = the day after the
+    history) is max(0, level[i] + slope[i] * h); the interval is
+    ±2 std_dev[i] around it.
+    """
+    keys: List[Hashable]
+    method: str
+    start_date: date  # First forecast day
+    mean: List[float]  # Historical daily average
+    level: List[float]  # Forecast of the first day
+    slope: List[float]  # Change per day (linear regression only)
+    std_dev: List[float]
+    last_change: List[float]  # Difference between the last two historical days
+    active_days: List[int]  # Historical days with a non-zero value
+    confidence: List[int]  # Interval confidence level (%)
+
+    def __post_init__(self):
+        self._index = {key: index for index, key in enumerate(self.keys)}
+
+    def index(self, key: Hashable) -> Optional[int]:
+        """Position of a series key (None if absent)."""
+        return self._index.get(key)
+
+    def value(self, index: int, step: int) -> float:
+        """Forecast of a series for a future day (0-based step)."""
+        return max(0.0, self.level[index] + self.slope[index] * step)
+
+    def points(self, index: int, horizon: int) -> List[Tuple[date, float, float, float]]:
+        """
+        Forecast points of a series.
+
+        Args:
+            index: Series position
+            horizon: Number of future days
+
+        Returns:
+            List of (day, forecast, lower bound, upper bound)
+        """
+        margin = 2 * self.std_dev[index]
+        points = []
+        for step in range(horizon):
+            value = self.value(index, step)
+            points.append((
+                self.start_date + timedelta(days=step), value, max(0.0, value - margin), value + margin
+            ))
+        return points
+
+    def totals(self, horizon: int) -> List[float]:
+        """Forecast demand of each series summed over the next horizon days."""
+        if np is not None:
+            level = np.asarray(self.level)
+            slope = np.asarray(self.slope)
+            steps = np.arange(horizon, dtype=np.float64)
+            return np.maximum(level[:, None] + slope[:, None] * steps, 0.0).sum(axis=1).tolist()
+        return [math.fsum(self.value(index, step) for step in range(horizon)) for index in range(len(self.keys))]
+
+    def trend(self, index: int) -> str:
+        """'increasing', 'decreasing' or 'stable', from the last two historical days."""
+        change = self.last_change[index]
+        if abs(change) < self.mean[index] * STABLE_TREND_RATIO:
+            return 'stable'
+        return 'increasing' if change > 0 else 'decreasing'
+
+
+def forecast(matrix: DemandMatrix, method: str = 'moving_average') -> BatchForecast:
+    """
+    Forecast every series of a matrix at once.
+
+    Args:
+        matrix: Daily history
+        method: 'moving_average' (last MOVING_AVERAGE_WINDOW days),
+            'exponential_smoothing' or 'linear_regression'; unknown methods
+            use linear regression
+
+    Returns:
+        BatchForecast
+    """
+    if method not in METHOD_CONFIDENCE:
+        method = 'linear_regression'
+    days = matrix.days
+    count = len(matrix)
+    start_date = matrix.end_date + timedelta(days=1)
+    if count == 0 or days == 0:
+        return BatchForecast(
+            keys=list(matrix.keys), method=method, start_date=start_date, mean=[0.0] * count,
+            level=[0.0] * count, slope=[0.0] * count, std_dev=[0.0] * count, last_change=[0.0] * count,
+            active_days=[0] * count, confidence=[METHOD_CONFIDENCE[method]] * count
+        )
+    compute = _forecast_numpy if np is not None else _forecast_python
+    mean, level, slope, std_dev, last_change = compute(matrix.rows, days, method)
+    confidence = METHOD_CONFIDENCE[method]
+    if method == 'linear_regression' and days < 2:
+        confidence = FALLBACK_CONFIDENCE
+    return BatchForecast(
+        keys=list(matrix.keys), method=method, start_date=start_date, mean=mean, level=level,
+        slope=slope, std_dev=std_dev, last_change=last_change, active_days=matrix.active_days(),
+        confidence=[confidence] * count
+    )
+
+
+def _forecast_numpy(rows, days: int, method: str):
+    mean = rows.mean(axis=1)
+    slope = np.zeros(len(rows))
+    if method == 'moving_average':
+        level = rows[:, -min(MOVING_AVERAGE_WINDOW, days):].mean(axis=1)
+    elif method == 'exponential_smoothing':
+        level = rows[:, 0].copy()
+        for column in range(1, days):
+            level = SMOOTHING_ALPHA * rows[:, column] + (1 - SMOOTHING_ALPHA) * level
+    elif days >= 2:
+        x = np.arange(days, dtype=np.float64)
+        centered = x - x.mean()
+        slope = rows @ centered / (centered @ centered)
+        level = mean - slope * x.mean() + slope * days
+    else:
+        level = mean
+
+    if days > 1:
+        std_dev = rows.std(axis=1, ddof=1)
+        last_change = rows[:, -1] - rows[:, -2]
+    else:
+        std_dev = level * DEFAULT_DEVIATION_RATIO
+        last_change = np.zeros(len(rows))
+    return mean.tolist(), level.tolist(), slope.tolist(), std_dev.tolist(), last_change.tolist()
+
+
+def _forecast_python(rows, days: int, method: str):
+    mean, level, slope, std_dev, last_change = [], [], [], [], []
+    x_mean = (days - 1) / 2
+    x_variance = sum((x - x_mean) ** 2 for x in range(days))
+    window = min(MOVING_AVERAGE_WINDOW, days)
+    for row in rows:
+        row_mean = math.fsum(row) / days
+        row_slope = 0.0
+        if method == 'moving_average':
+            row_level = math.fsum(row[-window:]) / window
+        elif method == 'exponential_smoothing':
+            row_level = row[0]
+            for value in row[1:]:
+                row_level = SMOOTHING_ALPHA * value + (1 - SMOOTHING_ALPHA) * row_level
+        elif days >= 2:
+            row_slope = math.fsum((x - x_mean) * value for x, value in enumerate(row)) / x_variance
+            row_level = row_mean - row_slope * x_mean + row_slope * days
+        else:
+            row_level = row_mean
+
+        if days > 1:
+            row_std = math.sqrt(math.fsum((value - row_mean) ** 2 for value in row) / (days - 1))
+            row_change = row[-1] - row[-2]
+        else:
+            row_std = row_level * DEFAULT_DEVIATION_RATIO
+            row_change = 0.0
+        mean.append(row_mean)
+        level.append(row_level)
+        slope.append(row_slope)
+        std_dev.append(row_std)
+        last_change.append(row_change)
+    return mean, level, slope, std_dev, last_change
@@ -1,17 +1,17 @@
 """Forecast service for generating sales and stock forecasts."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from decimal import Decimal
 from datetime import date, datetime, timedelta
 from dataclasses import dataclass
-import statistics
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, select
 
-from app.domain.models.order import Order, OrderLine
 from app.domain.models.product import Product
 from app.domain.models.stock import StockItem
 from app.infrastructure.db import get_session
+from app.services.forecast_engine import DemandMatrix, forecast
+from app.services.sales_fact_service import SalesFactService
 
 
 @dataclass
@@ -50,8 +50,21 @@ class StockForecast:
 
 
 class ForecastService:
-    """Service for generating sales and stock forecasts."""
-    
+    """
+    Service for generating sales and stock forecasts.
+
+    Daily history is read from the sales facts in one grouped query into a
+    dense series × day DemandMatrix (missing days count as 0), and every
+    series is forecast at once by app.services.forecast_engine; values are
+    converted to Decimal only in the returned results.
+    """
+
+    # Days of sales history used by stock forecasts
+    STOCK_HISTORY_DAYS = 90
+
+    # Reorder quantity as a multiple of the forecast demand (50% safety stock)
+    SAFETY_STOCK_MULTIPLIER = Decimal('1.5')
+
     def forecast_sales(
         self,
         start_date: date,
@@ -74,185 +87,14 @@ class ForecastService:
             SalesForecast object
         """
         with get_session() as session:
-            # Get historical sales data
-            query = session.query(
-                func.date(Order.created_at).label('sale_date'),
-                func.sum(OrderLine.quantity).label('quantity'),
-                func.sum(OrderLine.line_total_ht).label('revenue')
-            ).join(
-                OrderLine, OrderLine.order_id == Order.id
-            ).filter(
-                Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered', 'invoiced']),
-                func.date(Order.created_at) >= start_date,
-                func.date(Order.created_at) <= end_date
-            )
-            
-            if product_id:
-                query = query.filter(OrderLine.product_id == product_id)
-            
-            historical_data = query.group_by(
-                func.date(Order.created_at)
-            ).order_by(
-                func.date(Order.created_at)
-            ).all()
-            
-            if not historical_data:
-                # No historical data, return empty forecast
-                return SalesForecast(
-                    product_id=product_id,
-                    product_code=None,
-                    product_name=None,
-                    forecast_periods=[],
-                    historical_average=Decimal('0'),
-                    trend='stable',
-                    confidence_score=Decimal('0')
-                )
-            
-            # Extract historical values
-            historical_values = [Decimal(str(row.revenue or 0)) for row in historical_data]
-            historical_average = Decimal(str(statistics.mean([float(v) for v in historical_values])))
-            
-            # Generate forecast based on method
-            forecast_data_points = []
-            last_date = end_date
-            
-            if method == 'moving_average':
-                # Simple moving average (using last 3 periods)
-                window_size = min(3, len(historical_values))
-                if window_size > 0:
-                    recent_values = historical_values[-window_size:]
-                    base_forecast = Decimal(str(statistics.mean([float(v) for v in recent_values])))
-                else:
-                    base_forecast = historical_average
-                
-                # Calculate standard deviation for confidence intervals
-                if len(historical_values) > 1:
-                    std_dev = Decimal(str(statistics.stdev([float(v) for v in historical_values])))
-                else:
-                    std_dev = base_forecast * Decimal('0.1')  # 10% default
-                
-                # Generate forecast for each period
-                for i in range(forecast_periods):
-                    forecast_date = last_date + timedelta(days=i + 1)
-                    forecast_value = base_forecast
-                    # Confidence interval: ±2 standard deviations (95% confidence)
-                    lower_bound = max(Decimal('0'), forecast_value - (std_dev * Decimal('2')))
-                    upper_bound = forecast_value + (std_dev * Decimal('2'))
-                    confidence = Decimal('95')  # 95% confidence for moving average
-                    
-                    forecast_data_points.append(ForecastDataPoint(
-                        date=forecast_date,
-                        forecast_value=forecast_value,
-                        lower_bound=lower_bound,
-                        upper_bound=upper_bound,
-                        confidence=confidence
-                    ))
-            
-            elif method == 'exponential_smoothing':
-                # Exponential smoothing (alpha = 0.3)
-                alpha = Decimal('0.3')
-                if historical_values:
-                    smoothed_value = historical_values[0]
-                    for value in historical_values[1:]:
-                        smoothed_value = alpha * value + (Decimal('1') - alpha) * smoothed_value
-                    
-                    base_forecast = smoothed_value
-                    std_dev = Decimal(str(statistics.stdev([float(v) for v in historical_values]))) if len(historical_values) > 1 else base_forecast * Decimal('0.1')
-                    
-                    for i in range(forecast_periods):
-                        forecast_date = last_date + timedelta(days=i + 1)
-                        forecast_value = base_forecast
-                        lower_bound = max(Decimal('0'), forecast_value - (std_dev * Decimal('2')))
-                        upper_bound = forecast_value + (std_dev * Decimal('2'))
-                        confidence = Decimal('90')  # 90% confidence for exponential smoothing
-                        
-                        forecast_data_points.append(ForecastDataPoint(
-                            date=forecast_date,
-                            forecast_value=forecast_value,
-                            lower_bound=lower_bound,
-                            upper_bound=upper_bound,
-                            confidence=confidence
-                        ))
-                else:
-                    base_forecast = historical_average
-                    std_dev = base_forecast * Decimal('0.1')
-            
-            else:  # linear_regression or default
-                # Simple linear regression
-                if len(historical_values) >= 2:
-                    # Calculate trend
-                    n = len(historical_values)
-                    x_values = list(range(n))
-                    y_values = [float(v) for v in historical_values]
-                    
-                    x_mean = statistics.mean(x_values)
-                    y_mean = statistics.mean(y_values)
-                    
-                    numerator = sum((x_values[i] - x_mean) * (y_values[i] - y_mean) for i in range(n))
-                    denominator = sum((x_values[i] - x_mean) ** 2 for i in range(n))
-                    
-                    if denominator != 0:
-                        slope = Decimal(str(numerator / denominator))
-                        intercept = Decimal(str(y_mean - (float(slope) * x_mean)))
-                    else:
-                        slope = Decimal('0')
-                        intercept = Decimal(str(y_mean))
-                    
-                    std_dev = Decimal(str(statistics.stdev(y_values))) if len(y_values) > 1 else Decimal(str(y_mean * 0.1))
-                    
-                    for i in range(forecast_periods):
-                        forecast_date = last_date + timedelta(days=i + 1)
-                        x_forecast = n + i
-                        forecast_value = intercept + slope * Decimal(str(x_forecast))
-                        forecast_value = max(Decimal('0'), forecast_value)  # Ensure non-negative
-                        lower_bound = max(Decimal('0'), forecast_value - (std_dev * Decimal('2')))
-                        upper_bound = forecast_value + (std_dev * Decimal('2'))
-                        confidence = Decimal('85')  # 85% confidence for linear regression
-                        
-                        forecast_data_points.append(ForecastDataPoint(
-                            date=forecast_date,
-                            forecast_value=forecast_value,
-                            lower_bound=lower_bound,
-                            upper_bound=upper_bound,
-                            confidence=confidence
-                        ))
-                else:
-                    # Fallback to moving average
-                    base_forecast = historical_average
-                    std_dev = base_forecast * Decimal('0.1')
-                    for i in range(forecast_periods):
-                        forecast_date = last_date + timedelta(days=i + 1)
-                        forecast_value = base_forecast
-                        lower_bound = max(Decimal('0'), forecast_value - (std_dev * Decimal('2')))
-                        upper_bound = forecast_value + (std_dev * Decimal('2'))
-                        confidence = Decimal('80')
-                        
-                        forecast_data_points.append(ForecastDataPoint(
-                            date=forecast_date,
-                            forecast_value=forecast_value,
-                            lower_bound=lower_bound,
-                            upper_bound=upper_bound,
-                            confidence=confidence
-                        ))
-            
-            # Determine trend
-            if len(historical_values) >= 2:
-                recent_trend = historical_values[-1] - historical_values[-2] if len(historical_values) >= 2 else Decimal('0')
-                if abs(recent_trend) < historical_average * Decimal('0.05'):  # Less than 5% change
-                    trend = 'stable'
-                elif recent_trend > 0:
-                    trend = 'increasing'
-                else:
-                    trend = 'decreasing'
-            else:
-                trend = 'stable'
-            
-            # Calculate overall confidence score
-            confidence_score = Decimal('85') if len(historical_values) >= 10 else (
-                Decimal('70') if len(historical_values) >= 5 else Decimal('50')
+            records = SalesFactService(session).get_daily_demand(
+                start_date, end_date, measure='revenue_ht',
+                product_ids=[product_id] if product_id else None,
+                by_product=False
             )
+            matrix = DemandMatrix.from_records(records, start_date, end_date, keys=[None])
+            batch = forecast(matrix, method)
             
-            # Get product info if product_id provided
             product_code = None
             product_name = None
             if product_id:
@@ -260,16 +102,46 @@ class ForecastService:
                 if product:
                     product_code = product.code
                     product_name = product.name
-            
+        
+        active_days = batch.active_days[0] if len(batch.keys) else 0
+        if not active_days:
+            # No historical data, return empty forecast
             return SalesForecast(
                 product_id=product_id,
-                product_code=product_code,
-                product_name=product_name,
-                forecast_periods=forecast_data_points,
-                historical_average=historical_average,
-                trend=trend,
-                confidence_score=confidence_score
+                product_code=None,
+                product_name=None,
+                forecast_periods=[],
+                historical_average=Decimal('0'),
+                trend='stable',
+                confidence_score=Decimal('0')
             )
+        
+        confidence = Decimal(batch.confidence[0])
+        forecast_data_points = [
+            ForecastDataPoint(
+                date=day,
+                forecast_value=_to_decimal(value),
+                lower_bound=_to_decimal(lower_bound),
+                upper_bound=_to_decimal(upper_bound),
+                confidence=confidence
+            )
+            for day, value, lower_bound, upper_bound in batch.points(0, forecast_periods)
+        ]
+        
+        # Overall confidence score from the number of days with sales
+        confidence_score = Decimal('85') if active_days >= 10 else (
+            Decimal('70') if active_days >= 5 else Decimal('50')
+        )
+        
+        return SalesForecast(
+            product_id=product_id,
+            product_code=product_code,
+            product_name=product_name,
+            forecast_periods=forecast_data_points,
+            historical_average=_to_decimal(batch.mean[0]),
+            trend=batch.trend(0),
+            confidence_score=confidence_score
+        )
     
     def forecast_stock_needs(
         self,
@@ -285,64 +157,97 @@ class ForecastService:
             
         Returns:
             StockForecast object
+
+        Raises:
+            ValueError: If the product does not exist
         """
-        with get_session() as session:
-            # Get product
-            product = session.get(Product, product_id)
-            if not product:
-                raise ValueError(f"Product with ID {product_id} not found")
-            
-            # Get current stock
-            stock_items = session.query(StockItem).filter(
-                StockItem.product_id == product_id
-            ).all()
-            
-            current_stock = sum(item.physical_quantity for item in stock_items)
-            
-            # Get historical sales (last 90 days)
-            end_date = date.today()
-            start_date = end_date - timedelta(days=90)
-            
-            historical_sales = session.query(
-                func.sum(OrderLine.quantity).label('total_quantity')
-            ).join(
-                Order, Order.id == OrderLine.order_id
-            ).filter(
-                OrderLine.product_id == product_id,
-                Order.status.in_(['confirmed', 'ready', 'shipped', 'delivered', 'invoiced']),
-                func.date(Order.created_at) >= start_date,
-                func.date(Order.created_at) <= end_date
-            ).scalar() or Decimal('0')
-            
-            # Calculate average daily demand
-            days_in_period = (end_date - start_date).days or 1
-            average_daily_demand = historical_sales / Decimal(str(days_in_period))
-            
-            # Forecast demand for next period
-            forecast_demand = average_daily_demand * Decimal(str(forecast_days))
-            
-            # Calculate days until out of stock
-            days_until_out_of_stock = None
-            if average_daily_demand > 0:
-                days_until_out_of_stock = int(float(current_stock / average_daily_demand))
-            
-            # Recommended reorder quantity (forecast demand + safety stock)
-            safety_stock_multiplier = Decimal('1.5')  # 50% safety stock
-            recommended_reorder_quantity = forecast_demand * safety_stock_multiplier
+        forecasts = self.forecast_stock_needs_batch([product_id], forecast_days)
+        if not forecasts:
+            raise ValueError(f"Product with ID {product_id} not found")
+        return forecasts[0]
+    
+    def forecast_stock_needs_batch(
+        self,
+        product_ids: Optional[Sequence[int]] = None,
+        forecast_days: int = 30,
+        method: Optional[str] = None,
+        as_of: Optional[date] = None
+    ) -> List[StockForecast]:
+        """
+        Forecast stock needs of many products at once.
+
+        Runs three queries whatever the number of products: products, summed
+        stock per product, and daily sales per product over the last
+        STOCK_HISTORY_DAYS days.
+        
+        Args:
+            product_ids: Products to forecast (None = all active products)
+            forecast_days: Number of days to forecast ahead
+            method: Forecasting method of the daily demand (see
+                forecast_engine.forecast); None uses the historical daily average
+            as_of: Last day of history (default: today)
             
-            # Calculate confidence score based on data availability
-            confidence_score = Decimal('90') if days_in_period >= 60 else (
-                Decimal('70') if days_in_period >= 30 else Decimal('50')
+        Returns:
+            List of StockForecast, in product ID order
+        """
+        end_date = as_of or date.today()
+        start_date = end_date - timedelta(days=self.STOCK_HISTORY_DAYS - 1)
+        
+        with get_session() as session:
+            products_stmt = select(Product.id, Product.code, Product.name).order_by(Product.id)
+            stock_stmt = select(
+                StockItem.product_id, func.sum(StockItem.physical_quantity)
+            ).group_by(StockItem.product_id)
+            if product_ids is None:
+                products_stmt = products_stmt.where(Product.status == 'active')
+            else:
+                products_stmt = products_stmt.where(Product.id.in_(list(product_ids)))
+                stock_stmt = stock_stmt.where(StockItem.product_id.in_(list(product_ids)))
+            products = session.execute(products_stmt).all()
+            if not products:
+                return []
+            stock = {
+                stock_product_id: Decimal(str(quantity or 0))
+                for stock_product_id, quantity in session.execute(stock_stmt).all()
+            }
+            records = SalesFactService(session).get_daily_demand(
+                start_date, end_date, measure='quantity', product_ids=product_ids
             )
-            
-            return StockForecast(
+        
+        matrix = DemandMatrix.from_records(records, start_date, end_date, keys=[row[0] for row in products])
+        if method is None:
+            daily_demand = [total / matrix.days for total in matrix.totals()]
+            period_demand = [demand * forecast_days for demand in daily_demand]
+        else:
+            batch = forecast(matrix, method)
+            period_demand = batch.totals(forecast_days)
+            daily_demand = [total / forecast_days if forecast_days else 0.0 for total in period_demand]
+        
+        # Confidence score from the length of the history
+        confidence_score = Decimal('90') if matrix.days >= 60 else (
+            Decimal('70') if matrix.days >= 30 else Decimal('50')
+        )
+        
+        forecasts = []
+        for index, (product_id, code, name) in enumerate(products):
+            current_stock = stock.get(product_id, Decimal('0'))
+            forecast_demand = _to_decimal(period_demand[index])
+            days_until_out_of_stock = None
+            if daily_demand[index] > 0:
+                days_until_out_of_stock = int(float(current_stock) / daily_demand[index])
+            forecasts.append(StockForecast(
                 product_id=product_id,
-                product_code=product.code,
-                product_name=product.name,
+                product_code=code,
+                product_name=name,
                 current_stock=current_stock,
                 forecast_demand=forecast_demand,
                 days_until_out_of_stock=days_until_out_of_stock,
-                recommended_reorder_quantity=recommended_reorder_quantity,
+                recommended_reorder_quantity=forecast_demand * self.SAFETY_STOCK_MULTIPLIER,
                 confidence_score=confidence_score
-            )
+            ))
+        return forecasts
+
 
+def _to_decimal(value: float, places: int = 4) -> Decimal:
+    """Forecast value as a Decimal rounded to a few places."""
+    return Decimal(str(round(value, places)))
@@ -1,30 +1,25 @@
 """Import/Export service for products and customers."""
 import csv
 import io
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, BinaryIO
 from decimal import Decimal
 from flask_babel import gettext as _
 
+from app.services.streaming_export import (
+    WIDTH_SAMPLE_ROWS, iter_csv, estimate_column_widths, peek, write_only_workbook, set_column_widths
+)
+
+# Products read per keyset page when exporting
+EXPORT_BATCH_SIZE = 1000
+
 
 class ImportExportService:
     """Service for importing and exporting data (products, customers, etc.)."""
     
     @staticmethod
-    def export_products_to_csv(products: List[Dict[str, Any]]) -> str:
-        """
-        Export products to CSV format.
-        
-        Args:
-            products: List of product dictionaries
-            
-        Returns:
-            CSV string
-        """
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Header
-        writer.writerow([
+    def product_export_headers() -> List[str]:
+        """Translated header row of product exports."""
+        return [
             _('Code'),
             _('Name'),
             _('Description'),
@@ -34,97 +29,179 @@ class ImportExportService:
             _('Barcode'),
             _('Status'),
             _('Categories')
-        ])
+        ]
+    
+    @staticmethod
+    def _product_export_row(product: Dict[str, Any], as_text: bool = False) -> List[Any]:
+        """Export row of a product dictionary (prices as text for CSV)."""
+        categories = ', '.join([cat.get('name', '') for cat in product.get('categories', [])])
+        return [
+            product.get('code', ''),
+            product.get('name', ''),
+            product.get('description', ''),
+            str(product.get('price', '0')) if as_text else product.get('price', 0),
+            (str(product.get('cost', '') or '') if as_text else product.get('cost') or ''),
+            product.get('unit_of_measure', ''),
+            product.get('barcode', ''),
+            product.get('status', ''),
+            categories
+        ]
+    
+    @staticmethod
+    def iter_products_for_export(
+        search: Optional[str] = None,
+        category_id: Optional[int] = None,
+        status: Optional[str] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the products to export, one keyset page at a time.
         
-        # Data rows
-        for product in products:
-            categories = ', '.join([cat.get('name', '') for cat in product.get('categories', [])])
-            writer.writerow([
-                product.get('code', ''),
-                product.get('name', ''),
-                product.get('description', ''),
-                str(product.get('price', '0')),
-                str(product.get('cost', '') or ''),
-                product.get('unit_of_measure', ''),
-                product.get('barcode', ''),
-                product.get('status', ''),
-                categories
-            ])
+        Pages are read by increasing product id (WHERE id > last id), so each
+        page costs the same whatever its position and only one page is held
+        in memory.
         
-        return output.getvalue()
+        Args:
+            search: Optional search on name, code or description
+            category_id: Optional category filter
+            status: Optional status filter
+            batch_size: Products per page
+            
+        Yields:
+            Product dictionaries (code, name, ..., categories as [{'name': ...}])
+        """
+        from sqlalchemy import select, or_
+        from app.domain.models.category import Category
+        from app.domain.models.product import Product, product_categories
+        from app.infrastructure.db import get_session
+        
+        columns = (
+            Product.id, Product.code, Product.name, Product.description, Product.price, Product.cost,
+            Product.unit_of_measure, Product.barcode, Product.status
+        )
+        stmt = select(*columns).order_by(Product.id).limit(batch_size)
+        if search:
+            search_term = f"%{search}%"
+            stmt = stmt.where(or_(
+                Product.name.ilike(search_term),
+                Product.code.ilike(search_term),
+                Product.description.ilike(search_term)
+            ))
+        if category_id:
+            stmt = stmt.where(Product.id.in_(
+                select(product_categories.c.product_id).where(product_categories.c.category_id == category_id)
+            ))
+        if status:
+            stmt = stmt.where(Product.status == status)
+        
+        last_id = 0
+        with get_session() as session:
+            while True:
+                rows = session.execute(stmt.where(Product.id > last_id)).all()
+                if not rows:
+                    return
+                last_id = rows[-1].id
+                
+                categories: Dict[int, List[Dict[str, Any]]] = {}
+                for product_id, name in session.execute(
+                    select(product_categories.c.product_id, Category.name)
+                    .join(Category, Category.id == product_categories.c.category_id)
+                    .where(product_categories.c.product_id.in_([row.id for row in rows]))
+                    .order_by(product_categories.c.product_id, Category.name)
+                ):
+                    categories.setdefault(product_id, []).append({'name': name})
+                
+                for row in rows:
+                    product = dict(row._mapping)
+                    product['categories'] = categories.get(row.id, [])
+                    yield product
+                
+                if len(rows) < batch_size:
+                    return
     
     @staticmethod
-    def export_products_to_excel(products: List[Dict[str, Any]]) -> bytes:
+    def stream_products_csv(products: Iterable[Dict[str, Any]]) -> Iterator[str]:
         """
-        Export products to Excel format.
+        Export products to CSV, yielding chunks of rows.
+        
+        Args:
+            products: Product dictionaries (may be a generator)
+            
+        Yields:
+            CSV text chunks (header first)
+        """
+        def rows():
+            yield ImportExportService.product_export_headers()
+            for product in products:
+                yield ImportExportService._product_export_row(product, as_text=True)
+        
+        return iter_csv(rows())
+    
+    @staticmethod
+    def export_products_to_csv(products: List[Dict[str, Any]]) -> str:
+        """
+        Export products to CSV format.
         
         Args:
             products: List of product dictionaries
             
         Returns:
-            Excel file bytes
+            CSV string
         """
-        try:
-            import openpyxl
-            from openpyxl.styles import Font, Alignment
-        except ImportError:
-            raise ImportError("openpyxl is required for Excel export. Install it with: pip install openpyxl")
+        return ''.join(ImportExportService.stream_products_csv(products))
+    
+    @staticmethod
+    def write_products_excel(products: Iterable[Dict[str, Any]], output: BinaryIO) -> None:
+        """
+        Write products to an Excel file in write-only mode.
         
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = _('Products')
+        Rows are streamed to the workbook instead of kept as cells; column
+        widths are estimated from the first rows before writing.
         
-        # Header
-        headers = [
-            _('Code'),
-            _('Name'),
-            _('Description'),
-            _('Price'),
-            _('Cost'),
-            _('Unit of Measure'),
-            _('Barcode'),
-            _('Status'),
-            _('Categories')
-        ]
-        ws.append(headers)
+        Args:
+            products: Product dictionaries (may be a generator)
+            output: Binary file to write the workbook to
+        """
+        wb = write_only_workbook()
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, Alignment
+        
+        ws = wb.create_sheet(_('Products'))
+        headers = ImportExportService.product_export_headers()
+        rows = map(ImportExportService._product_export_row, products)
+        sample, rows = peek(rows, WIDTH_SAMPLE_ROWS)
+        set_column_widths(ws, estimate_column_widths(headers, sample))
         
-        # Style header
-        for cell in ws[1]:
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center')
+        # Header
+        header_font = Font(bold=True)
+        header_alignment = Alignment(horizontal='center')
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = header_font
+            cell.alignment = header_alignment
+            header_cells.append(cell)
+        ws.append(header_cells)
         
         # Data rows
-        for product in products:
-            categories = ', '.join([cat.get('name', '') for cat in product.get('categories', [])])
-            ws.append([
-                product.get('code', ''),
-                product.get('name', ''),
-                product.get('description', ''),
-                product.get('price', 0),
-                product.get('cost') or '',
-                product.get('unit_of_measure', ''),
-                product.get('barcode', ''),
-                product.get('status', ''),
-                categories
-            ])
+        for row in rows:
+            ws.append(row)
         
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        wb.save(output)
+    
+    @staticmethod
+    def export_products_to_excel(products: List[Dict[str, Any]]) -> bytes:
+        """
+        Export products to Excel format.
         
-        # Save to bytes
+        Args:
+            products: List of product dictionaries
+            
+        Returns:
+            Excel file bytes
+        """
         output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
+        ImportExportService.write_products_excel(products, output)
         return output.getvalue()
     
     @staticmethod
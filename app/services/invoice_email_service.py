@@ -3,7 +3,7 @@ from io import BytesIO
 from typing import Optional
 from flask import current_app, render_template_string
 from app.services.email_service import EmailService
-from app.services.invoice_pdf_service import InvoicePDFService
+from app.services.pdf_artifact_store import get_pdf_artifact_store
 from app.application.billing.invoices.queries.invoice_dto import InvoiceDTO
 
 
@@ -12,7 +12,6 @@ class InvoiceEmailService:
     
     def __init__(self):
         self.email_service = EmailService()
-        self.pdf_service = InvoicePDFService()
     
     def send_invoice(
         self,
@@ -33,8 +32,8 @@ class InvoiceEmailService:
         Returns:
             True if email sent successfully, False otherwise
         """
-        # Generate PDF
-        pdf_buffer = self.pdf_service.generate_invoice_pdf(invoice_dto)
+        # Stored PDF of the invoice (rendered on the first send)
+        pdf_buffer = BytesIO(get_pdf_artifact_store().read('invoice', invoice_dto.id, invoice_dto))
         
         # Prepare email subject
         if not subject:
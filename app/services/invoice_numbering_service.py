@@ -1,10 +1,15 @@
 """Service for managing sequential invoice numbering without gaps (French legal requirement)."""
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.domain.models.invoice import Invoice
+from app.domain.models.invoice import DocumentSequence, Invoice
 from app.domain.models.order import Order
 
+# Invoice number prefix (FA-YYYY-XXXXX)
+INVOICE_PREFIX = 'FA'
+
 
 class InvoiceNumberingService:
     """Service for generating sequential invoice numbers without gaps."""
@@ -26,32 +31,76 @@ class InvoiceNumberingService:
         Returns:
             Invoice number in format FA-YYYY-XXXXX
         """
+        return self.reserve_invoice_numbers(1, year)[0]
+    
+    def reserve_invoice_numbers(self, count: int, year: Optional[int] = None) -> List[str]:
+        """
+        Take a contiguous block of invoice numbers in one locked step.
+        
+        The year's sequence row stays locked until the caller's transaction
+        ends, so the invoices must be inserted in the same transaction: a
+        rollback releases the numbers and leaves no gap.
+        
+        Args:
+            count: Number of invoice numbers
+            year: Year for the invoice numbers (defaults to current year)
+            
+        Returns:
+            Invoice numbers in format FA-YYYY-XXXXX, in sequence order
+        """
         if year is None:
             year = datetime.now().year
+        if count <= 0:
+            return []
         
-        # Find the last invoice number for this year
-        last_invoice = self.session.query(Invoice).filter(
-            Invoice.number.like(f"FA-{year}-%")
-        ).order_by(Invoice.id.desc()).first()
+        sequence = self.lock_sequence(INVOICE_PREFIX, year)
+        return [self.format_number(INVOICE_PREFIX, year, value) for value in sequence.allocate(count)]
+    
+    def lock_sequence(self, prefix: str, year: int) -> DocumentSequence:
+        """
+        Lock the numbering sequence of a prefix and year (SELECT ... FOR UPDATE).
         
-        if last_invoice:
-            # Extract sequence number from last invoice
-            try:
-                parts = last_invoice.number.split('-')
-                if len(parts) == 3 and parts[0] == 'FA' and parts[1] == str(year):
-                    sequence = int(parts[2])
-                    sequence += 1
-                else:
-                    # Invalid format, start from 1
-                    sequence = 1
-            except (ValueError, IndexError):
-                # Invalid format, start from 1
-                sequence = 1
-        else:
-            # No invoices for this year, start from 1
-            sequence = 1
+        A missing sequence is created, starting after the highest number
+        already issued for the year.
         
-        return f"FA-{year}-{sequence:05d}"
+        Args:
+            prefix: Number prefix ('FA')
+            year: Year
+            
+        Returns:
+            DocumentSequence, locked until the end of the transaction
+        """
+        sequence = self.session.query(DocumentSequence).filter(
+            DocumentSequence.prefix == prefix,
+            DocumentSequence.year == year
+        ).with_for_update().one_or_none()
+        if sequence is not None:
+            return sequence
+        
+        last_number = self.session.query(func.max(Invoice.number)).filter(
+            Invoice.number.like(f"{prefix}-{year}-%")
+        ).scalar()
+        try:
+            last_value = int(last_number.split('-')[2]) if last_number else 0
+        except (ValueError, IndexError):
+            last_value = 0
+        
+        try:
+            # Savepoint: a concurrent transaction may create the same row first
+            with self.session.begin_nested():
+                sequence = DocumentSequence(prefix=prefix, year=year, last_value=last_value)
+                self.session.add(sequence)
+        except IntegrityError:
+            sequence = self.session.query(DocumentSequence).filter(
+                DocumentSequence.prefix == prefix,
+                DocumentSequence.year == year
+            ).with_for_update().one()
+        return sequence
+    
+    @staticmethod
+    def format_number(prefix: str, year: int, value: int) -> str:
+        """Number in format PREFIX-YYYY-XXXXX."""
+        return f"{prefix}-{year}-{value:05d}"
     
     def generate_credit_note_number(self, year: Optional[int] = None) -> str:
         """
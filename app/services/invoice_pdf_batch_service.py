@@ -0,0 +1,106 @@
+"""Batch rendering of invoice PDFs (period exports, mass mailings)."""
+from collections import deque
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from flask import current_app
+from sqlalchemy import select
+
+from app.application.billing.invoices.queries.invoice_dto import InvoiceDTO
+from app.application.billing.invoices.queries.queries import GetInvoicesByIdsQuery
+from app.application.common.mediator import mediator
+from app.domain.models.invoice import Invoice
+from app.infrastructure.db import get_session
+from app.services.pdf_render_pool import PDFRenderPool, get_pdf_render_pool
+
+# Invoices loaded per query (DTOs held in memory at once)
+PDF_BATCH_CHUNK_SIZE = 200
+
+# Invoice statuses rendered by default (drafts are not final documents)
+RENDERABLE_STATUSES = ('validated', 'sent', 'paid', 'partially_paid', 'overdue')
+
+
+class InvoicePDFBatchService:
+    """
+    Renders the PDFs of many invoices.
+    
+    Invoices are loaded by chunks of DTOs (one query per relationship and
+    chunk, not per invoice) and rendered in the PDF render pool, the next
+    chunk loading while the pool renders the current one.
+    
+    Usage:
+        service = InvoicePDFBatchService()
+        ids = service.invoice_ids_for_period(date(2024, 1, 1), date(2024, 1, 31))
+        for invoice_dto, pdf_content in service.render(ids):
+            archive.writestr(f"{invoice_dto.number}.pdf", pdf_content)
+    """
+    
+    def __init__(self, render_pool: Optional[PDFRenderPool] = None, chunk_size: Optional[int] = None):
+        """
+        Initialize the service.
+        
+        Args:
+            render_pool: Render pool (defaults to the pool of the app)
+            chunk_size: Invoices loaded per query (defaults to PDF_BATCH_CHUNK_SIZE config)
+        """
+        self.render_pool = render_pool or get_pdf_render_pool()
+        self.chunk_size = chunk_size or current_app.config.get('PDF_BATCH_CHUNK_SIZE', PDF_BATCH_CHUNK_SIZE)
+    
+    def invoice_ids_for_period(
+        self,
+        date_from: date,
+        date_to: date,
+        statuses: Optional[Sequence[str]] = None
+    ) -> List[int]:
+        """
+        IDs of the invoices dated in a period.
+        
+        Args:
+            date_from: First invoice date (inclusive)
+            date_to: Last invoice date (inclusive)
+            statuses: Invoice statuses (defaults to RENDERABLE_STATUSES)
+        
+        Returns:
+            Invoice IDs, ordered by invoice number
+        """
+        with get_session() as session:
+            return list(session.execute(
+                select(Invoice.id)
+                .where(
+                    Invoice.invoice_date >= date_from,
+                    Invoice.invoice_date <= date_to,
+                    Invoice.status.in_(statuses or RENDERABLE_STATUSES)
+                )
+                .order_by(Invoice.number)
+            ).scalars())
+    
+    def render(self, invoice_ids: Sequence[int]) -> Iterator[Tuple[InvoiceDTO, bytes]]:
+        """
+        Render invoice PDFs, in the order of the IDs.
+        
+        Args:
+            invoice_ids: Invoice IDs (missing invoices are skipped)
+        
+        Yields:
+            (InvoiceDTO, PDF bytes) per rendered invoice; invoices whose PDF
+            failed are logged and skipped
+        """
+        dtos = self._load(invoice_ids)
+        pending = deque()
+        
+        def jobs() -> Iterator[Tuple[str, tuple]]:
+            for invoice_dto in dtos:
+                pending.append(invoice_dto)
+                yield 'invoice', (invoice_dto,)
+        
+        for pdf_content in self.render_pool.render_many(jobs()):
+            invoice_dto = pending.popleft()
+            if pdf_content is None:
+                current_app.logger.error(f"Invoice PDF generation failed for invoice {invoice_dto.id}")
+                continue
+            yield invoice_dto, pdf_content
+    
+    def _load(self, invoice_ids: Sequence[int]) -> Iterable[InvoiceDTO]:
+        """Invoice DTOs, loaded by chunks."""
+        for start in range(0, len(invoice_ids), self.chunk_size):
+            chunk = list(invoice_ids[start:start + self.chunk_size])
+            yield from mediator.dispatch(GetInvoicesByIdsQuery(ids=chunk))
@@ -19,8 +19,9 @@ from app.services.pdf_service import PDFService
 class InvoicePDFService(PDFService):
     """Service for generating legal-compliant invoice PDFs using the same template as orders."""
     
-    def __init__(self):
-        super().__init__()  # Initialize PDFService to get styles and helpers
+    def _setup_custom_styles(self):
+        """Setup the common styles plus the invoice ones (built once per class, see PDFService)."""
+        super()._setup_custom_styles()
         self._setup_invoice_styles()
     
     def _setup_invoice_styles(self):
@@ -0,0 +1,70 @@
+"""Scheduled, set-based invoice status transitions."""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.domain.models.invoice import Invoice, InvoiceOverdueDomainEvent, OVERDUE_CANDIDATE_STATUSES
+from app.infrastructure.db import add_domain_events
+
+
+class InvoiceStateService:
+    """
+    Applies date-driven invoice status transitions to every invoice at once.
+    
+    Invoices past their due date move to 'overdue' in a single UPDATE that
+    scans the partial index ix_invoices_open_due_date (invoices that can still
+    become overdue, by due date). Overdue lists then read the stored status.
+    """
+    
+    def __init__(self, session: Session):
+        """
+        Initialize the service.
+        
+        Args:
+            session: SQLAlchemy session (committed by the transitions)
+        """
+        self.session = session
+    
+    def mark_overdue_invoices(self, as_of: Optional[date] = None) -> List[InvoiceOverdueDomainEvent]:
+        """
+        Move the unpaid invoices due before a date to 'overdue'. Their
+        InvoiceOverdueDomainEvent are queued on the session (the bulk UPDATE
+        does not go through the aggregates) and dispatched in one batch on
+        commit.
+        
+        Args:
+            as_of: Reference date (defaults to today): invoices due before it are overdue
+        
+        Returns:
+            Events of the invoices moved to overdue
+        """
+        as_of = as_of or date.today()
+        rows = self.session.execute(
+            update(Invoice)
+            .where(
+                Invoice.status.in_(OVERDUE_CANDIDATE_STATUSES),
+                Invoice.due_date < as_of,
+                Invoice.remaining_amount > 0
+            )
+            .values(status='overdue')
+            .returning(
+                Invoice.id, Invoice.number, Invoice.customer_id, Invoice.due_date, Invoice.remaining_amount
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        
+        events = [
+            InvoiceOverdueDomainEvent(
+                invoice_id=invoice_id,
+                invoice_number=number,
+                customer_id=customer_id,
+                due_date=due_date,
+                remaining_amount=remaining_amount
+            )
+            for invoice_id, number, customer_id, due_date, remaining_amount in rows
+        ]
+        add_domain_events(self.session, events)
+        self.session.commit()
+        return events
@@ -0,0 +1,212 @@
+"""Order confirmation service: validation and stock reservation in one transaction."""
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List
+from decimal import Decimal
+from dataclasses import dataclass, field
+
+from sqlalchemy.orm import Session
+
+from app.domain.models.order import Order
+from app.services.credit_service import CreditService
+from app.services.stock_service import StockService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OrderConfirmationResult:
+    """Result of an order confirmation."""
+    order_id: int
+    order_number: str
+    reserved_lines: int
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total_ms(self) -> float:
+        """Total time spent in all stages."""
+        return sum(self.timings_ms.values())
+
+
+class OrderConfirmationService:
+    """
+    Fast path for confirming a draft order.
+
+    Instead of Order.confirm() opening its own sessions for stock (one query per line)
+    and credit (SUM over orders), and the after-commit handler reloading the order to
+    reserve stock, the confirmation runs in the caller's session as:
+
+    1. stock: one grouped availability query for all lines
+    2. credit: one query on customer, conditions and credit exposure
+    3. confirm: status change and domain event
+    4. reserve: one locked query on candidate stock items, reservations added
+       to the order so they are committed with the status change
+
+    Per-stage timings are returned and logged to track confirmation latency.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize the order confirmation service.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        self.session = session
+        self.stock_service = StockService(session)
+        self.credit_service = CreditService(session)
+
+    @contextmanager
+    def _stage(self, timings: Dict[str, float], name: str):
+        """Record the duration of a confirmation stage in milliseconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[name] = round((time.perf_counter() - started) * 1000, 3)
+
+    def confirm(self, order: Order, user_id: int) -> OrderConfirmationResult:
+        """
+        Validate and confirm an order, reserving its stock in the same transaction.
+
+        The caller commits the session; on ValueError the caller must roll back.
+
+        Args:
+            order: Draft order (with lines) attached to this service's session
+            user_id: User confirming the order
+
+        Returns:
+            OrderConfirmationResult with per-stage timings
+
+        Raises:
+            ValueError: If stock or credit validation fails, or the order cannot be confirmed
+        """
+        timings: Dict[str, float] = {}
+
+        with self._stage(timings, 'stock'):
+            stock_validation = self.validate_stock(order)
+
+        with self._stage(timings, 'credit'):
+            credit_validation = self.validate_credit(order)
+
+        with self._stage(timings, 'confirm'):
+            order.confirm(
+                user_id,
+                stock_validation=stock_validation,
+                credit_validation=credit_validation
+            )
+
+        with self._stage(timings, 'reserve'):
+            reserved_lines = self.reserve_stock(order)
+
+        result = OrderConfirmationResult(
+            order_id=order.id,
+            order_number=order.number,
+            reserved_lines=reserved_lines,
+            timings_ms=timings
+        )
+        logger.info(
+            "Order %s confirmed in %.1f ms (%s)",
+            order.number,
+            result.total_ms,
+            ", ".join(f"{name}={duration:.1f}ms" for name, duration in timings.items())
+        )
+        return result
+
+    def validate_stock(self, order: Order) -> dict:
+        """
+        Validate stock availability for all lines with one grouped query.
+
+        Quantities of lines sharing the same product/variant are added together
+        before being compared with the available stock.
+
+        Returns:
+            Dict with 'valid': bool, 'issues': List[str] (same shape as Order.validate_stock)
+        """
+        required: Dict[tuple, Decimal] = defaultdict(Decimal)
+        first_lines = {}
+        for line in order.lines:
+            key = (line.product_id, line.variant_id)
+            required[key] += Decimal(str(line.quantity))
+            first_lines.setdefault(key, line)
+
+        available = self.stock_service.get_available_quantities(required.keys())
+
+        issues: List[str] = []
+        for key, quantity in required.items():
+            total_available = available.get(key, Decimal(0))
+            if total_available < quantity:
+                # Product is only loaded for the error message
+                product = first_lines[key].product
+                product_code = product.code if product is not None else f"Product {key[0]}"
+                issues.append(
+                    f"Insufficient stock for {product_code}: "
+                    f"required {quantity}, available {total_available}"
+                )
+
+        return {
+            'valid': len(issues) == 0,
+            'issues': issues
+        }
+
+    def validate_credit(self, order: Order) -> dict:
+        """
+        Validate the customer's credit limit for the order.
+
+        Returns:
+            Dict with the same shape as Order.validate_credit
+        """
+        result = self.credit_service.validate_credit_for_order(
+            customer_id=order.customer_id,
+            order_total=order.total,
+            order_id=order.id
+        )
+        return {
+            'valid': result.valid,
+            'current_debt': result.current_debt,
+            'credit_limit': result.credit_limit,
+            'message': result.message
+        }
+
+    def reserve_stock(self, order: Order) -> int:
+        """
+        Reserve stock for every line of the order through the aggregate root.
+
+        Returns:
+            Number of lines with at least one reservation
+
+        Raises:
+            ValueError: If stock became insufficient since validation
+        """
+        order_lines = [
+            {
+                'line_id': line.id,
+                'product_id': line.product_id,
+                'variant_id': line.variant_id,
+                'quantity': line.quantity
+            }
+            for line in order.lines
+        ]
+        results = self.stock_service.reserve_stock_for_lines(order_lines)
+
+        reserved_lines = 0
+        for line_id, line_results in results.items():
+            failures = [r for r in line_results if not r.success and r.stock_item_id == 0]
+            if failures:
+                raise ValueError(f"Cannot confirm order '{order.number}': {failures[0].message}")
+
+            reserved = False
+            for result in line_results:
+                if result.success and result.quantity_reserved > 0:
+                    order.add_stock_reservation(
+                        order_line_id=line_id,
+                        stock_item_id=result.stock_item_id,
+                        quantity=result.quantity_reserved
+                    )
+                    reserved = True
+            if reserved:
+                reserved_lines += 1
+
+        return reserved_lines
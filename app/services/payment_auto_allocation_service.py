@@ -1,12 +1,146 @@
 """Service for automatic payment allocation to invoices."""
+from collections import defaultdict
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import List, Optional, Literal
-from datetime import date
+from typing import Dict, List, Optional, Literal, Sequence, Tuple
+from datetime import date, datetime
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, insert, update
 
-from app.domain.models.invoice import Invoice
+from app.domain.models.invoice import Invoice, InvoicePaidDomainEvent
+from app.domain.models.payment import Payment, PaymentAllocation, PaymentAllocatedDomainEvent, PaymentStatus
+from app.infrastructure.db import add_domain_events
+
+# Invoice statuses that can receive a payment
+ALLOCATABLE_INVOICE_STATUSES = ("sent", "partially_paid", "overdue", "validated")
+
+# Payment statuses whose unallocated amount is allocated by a batch run
+ALLOCATABLE_PAYMENT_STATUSES = (PaymentStatus.CONFIRMED, PaymentStatus.RECONCILED)
+
+# Rows per bulk insert / update statement (and ids per IN clause)
+BATCH_SIZE = 1000
+
+ALLOCATION_STRATEGIES = ('fifo', 'proportional')
+
+
+def _cents(amount: Decimal) -> int:
+    return int((Decimal(amount) * 100).to_integral_value())
+
+
+def _amount(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def allocate_fifo_cents(remaining: Sequence[int], amount: int) -> List[int]:
+    """
+    FIFO allocation in cents: oldest invoices are paid first.
+
+    Args:
+        remaining: Remaining amount of each invoice (cents, oldest first)
+        amount: Amount to allocate (cents)
+
+    Returns:
+        Amount allocated to each invoice (cents)
+    """
+    shares = []
+    for invoice_remaining in remaining:
+        share = min(invoice_remaining, max(amount, 0))
+        shares.append(share)
+        amount -= share
+    return shares
+
+
+def allocate_proportional_cents(remaining: Sequence[int], amount: int) -> List[int]:
+    """
+    Proportional allocation in cents with exact rounding.
+
+    Each invoice gets the floor of its share, then the cents left over go
+    one by one to the largest remainders (largest remainder method), so the
+    shares add up to the amount and never exceed an invoice's remaining.
+
+    Args:
+        remaining: Remaining amount of each invoice (cents)
+        amount: Amount to allocate (cents)
+
+    Returns:
+        Amount allocated to each invoice (cents)
+    """
+    total = sum(remaining)
+    if total <= 0 or amount <= 0:
+        return [0] * len(remaining)
+    if amount >= total:
+        return list(remaining)
+    shares = []
+    fractions = []
+    for index, invoice_remaining in enumerate(remaining):
+        share, fraction = divmod(amount * invoice_remaining, total)
+        shares.append(share)
+        fractions.append((-fraction, index))
+    for _, index in sorted(fractions)[:amount - sum(shares)]:
+        shares[index] += 1
+    return shares
+
+
+@dataclass
+class InvoiceAllocation:
+    """Amount of a payment allocated to one invoice."""
+    invoice_id: int
+    invoice_number: str
+    amount: Decimal
+    invoice_status: str  # Status after the allocation
+
+
+@dataclass
+class PaymentAllocationResult:
+    """Allocation of one payment in a batch run."""
+    payment_id: int
+    customer_id: int
+    amount: Decimal  # Unallocated amount before the run
+    allocated: Decimal = Decimal(0)
+    allocations: List[InvoiceAllocation] = field(default_factory=list)
+
+    @property
+    def unallocated(self) -> Decimal:
+        """Amount left unallocated (no more open invoices)."""
+        return self.amount - self.allocated
+
+    @property
+    def status(self) -> str:
+        """'allocated', 'partial' or 'unallocated'."""
+        if not self.allocated:
+            return 'unallocated'
+        return 'allocated' if self.allocated == self.amount else 'partial'
+
+
+@dataclass
+class AllocationRunResult:
+    """Outcome of a batch allocation run."""
+    strategy: str
+    payments: List[PaymentAllocationResult] = field(default_factory=list)
+    dry_run: bool = False
+
+    @property
+    def allocation_count(self) -> int:
+        """Number of payment allocations written."""
+        return sum(len(payment.allocations) for payment in self.payments)
+
+    @property
+    def allocated_total(self) -> Decimal:
+        """Total amount allocated."""
+        return sum((payment.allocated for payment in self.payments), Decimal(0))
+
+
+@dataclass
+class _OpenInvoice:
+    id: int
+    number: str
+    customer_id: int
+    total: int  # Cents
+    paid: int  # Cents
+    remaining: int  # Cents
+    status: str
+    changed: bool = False
 
 
 class PaymentAutoAllocationService:
@@ -34,121 +168,264 @@ class PaymentAutoAllocationService:
             customer_id: Customer ID
             payment_amount: Total payment amount to allocate
             strategy: Allocation strategy ('fifo' or 'proportional')
-            
+        
         Returns:
             List of allocation dictionaries with 'invoice_id' and 'amount' keys
-            
+        
         Raises:
             ValueError: If strategy is invalid or no unpaid invoices found
         """
-        if strategy not in ['fifo', 'proportional']:
-            raise ValueError(f"Invalid allocation strategy: {strategy}. Must be 'fifo' or 'proportional'.")
+        self._check_strategy(strategy)
         
         # Get all unpaid invoices for the customer
-        unpaid_invoices = self.session.query(Invoice).filter(
-            Invoice.customer_id == customer_id,
-            Invoice.remaining_amount > 0,
-            Invoice.status.in_(["sent", "partially_paid", "overdue", "validated"])
-        ).order_by(Invoice.due_date.asc()).all()
+        unpaid_invoices = self.session.execute(
+            select(Invoice.id, Invoice.remaining_amount).where(
+                Invoice.customer_id == customer_id,
+                Invoice.remaining_amount > 0,
+                Invoice.status.in_(ALLOCATABLE_INVOICE_STATUSES)
+            ).order_by(Invoice.due_date.asc(), Invoice.id.asc())
+        ).all()
         
         if not unpaid_invoices:
             return []
         
-        if strategy == 'fifo':
-            return self._allocate_fifo(unpaid_invoices, payment_amount)
-        elif strategy == 'proportional':
-            return self._allocate_proportional(unpaid_invoices, payment_amount)
+        allocate = allocate_fifo_cents if strategy == 'fifo' else allocate_proportional_cents
+        shares = allocate([_cents(remaining) for _, remaining in unpaid_invoices], _cents(payment_amount))
+        return [
+            {'invoice_id': invoice_id, 'amount': _amount(share)}
+            for (invoice_id, _), share in zip(unpaid_invoices, shares, strict=True)
+            if share > 0
+        ]
+    
+    @staticmethod
+    def _check_strategy(strategy: str) -> None:
+        if strategy not in ALLOCATION_STRATEGIES:
+            raise ValueError(f"Invalid allocation strategy: {strategy}. Must be 'fifo' or 'proportional'.")
+    
+    # ==================== Batch run ====================
     
-    def _allocate_fifo(
+    def allocate_payments(
         self,
-        invoices: List[Invoice],
-        payment_amount: Decimal
-    ) -> List[dict]:
+        strategy: Literal['fifo', 'proportional'] = 'fifo',
+        payment_ids: Optional[Sequence[int]] = None,
+        created_by: Optional[int] = None,
+        dry_run: bool = False
+    ) -> AllocationRunResult:
         """
-        Allocate payment using FIFO strategy (First In First Out).
+        Allocate the unallocated amount of many payments in one run.
+        
+        Payments are processed by payment date. Open invoices of every
+        affected customer are loaded at once (by due date) and allocated in
+        memory, in cents, so a customer's later payments see the invoices
+        already settled by earlier ones. Allocations are then inserted and
+        invoices updated with bulk statements; the caller commits the session.
+        
+        Payments, then invoices, are locked (SELECT ... FOR UPDATE, by id)
+        before their amounts are read, so a concurrent run or manual
+        allocation waits instead of being overwritten by the bulk update.
         
-        Pays oldest invoices first (by due_date).
+        Bulk statements do not go through the aggregates, so the run queues
+        the PaymentAllocated / InvoicePaid domain events they would raise on
+        the session; their handlers run when the caller commits.
         
         Args:
-            invoices: List of unpaid invoices (already sorted by due_date)
-            payment_amount: Total payment amount to allocate
-            
+            strategy: 'fifo' or 'proportional'
+            payment_ids: Payments to allocate (None = every confirmed or
+                reconciled payment with an unallocated amount)
+            created_by: User ID recorded on the allocations
+            dry_run: Compute the allocations without writing them
+        
         Returns:
-            List of allocation dictionaries
+            AllocationRunResult with one result per payment
+        
+        Raises:
+            ValueError: If the strategy is invalid
         """
-        allocations = []
-        remaining_amount = payment_amount
-        
-        for invoice in invoices:
-            if remaining_amount <= 0:
-                break
-            
-            # Calculate how much to allocate to this invoice
-            invoice_remaining = invoice.remaining_amount
-            allocation_amount = min(invoice_remaining, remaining_amount)
-            
-            allocations.append({
-                'invoice_id': invoice.id,
-                'amount': allocation_amount
-            })
-            
-            remaining_amount -= allocation_amount
-        
-        return allocations
+        self._check_strategy(strategy)
+        result = AllocationRunResult(strategy=strategy, dry_run=dry_run)
+        
+        payments = self._unallocated_payments(payment_ids, lock=not dry_run)
+        if not payments:
+            return result
+        invoices = self._open_invoices({customer_id for _, customer_id, _ in payments}, lock=not dry_run)
+        
+        allocate = allocate_fifo_cents if strategy == 'fifo' else allocate_proportional_cents
+        allocation_rows = []
+        for payment_id, customer_id, unallocated in payments:
+            payment_result = PaymentAllocationResult(
+                payment_id=payment_id, customer_id=customer_id, amount=_amount(unallocated)
+            )
+            result.payments.append(payment_result)
+            open_invoices = [invoice for invoice in invoices.get(customer_id, ()) if invoice.remaining > 0]
+            shares = allocate([invoice.remaining for invoice in open_invoices], unallocated)
+            for invoice, share in zip(open_invoices, shares, strict=True):
+                if share <= 0:
+                    continue
+                invoice.paid += share
+                invoice.remaining = invoice.total - invoice.paid
+                if invoice.remaining <= 0:
+                    invoice.status = "paid"
+                elif invoice.status in ("sent", "validated"):
+                    invoice.status = "partially_paid"
+                invoice.changed = True
+                payment_result.allocated += _amount(share)
+                payment_result.allocations.append(InvoiceAllocation(
+                    invoice_id=invoice.id, invoice_number=invoice.number,
+                    amount=_amount(share), invoice_status=invoice.status
+                ))
+                allocation_rows.append({
+                    'payment_id': payment_id,
+                    'invoice_id': invoice.id,
+                    'allocated_amount': _amount(share),
+                    'created_by': created_by,
+                    'created_at': datetime.now()
+                })
+        
+        if not dry_run and allocation_rows:
+            self._write(allocation_rows, invoices, result)
+        return result
     
-    def _allocate_proportional(
+    def _unallocated_payments(
         self,
-        invoices: List[Invoice],
-        payment_amount: Decimal
-    ) -> List[dict]:
+        payment_ids: Optional[Sequence[int]],
+        lock: bool = False
+    ) -> List[Tuple[int, int, int]]:
         """
-        Allocate payment proportionally based on remaining amounts.
+        (payment id, customer id, unallocated cents) of the payments to allocate, by payment date.
         
-        Each invoice gets: (invoice_remaining / total_remaining) × payment_amount
+        With lock, the payments are locked and their unallocated amounts read
+        again: a concurrent run may have allocated them while we waited.
+        """
+        rows = self._unallocated_payment_rows(payment_ids)
+        if lock and rows:
+            locked_ids = [payment_id for payment_id, _, _ in rows]
+            self._lock_rows(Payment, locked_ids)
+            rows = self._unallocated_payment_rows(locked_ids)
+        return rows
+    
+    def _unallocated_payment_rows(self, payment_ids: Optional[Sequence[int]]) -> List[Tuple[int, int, int]]:
+        """(payment id, customer id, unallocated cents), by payment date (or payment_ids order)."""
+        allocated = (
+            select(PaymentAllocation.payment_id, func.sum(PaymentAllocation.allocated_amount).label('allocated'))
+            .group_by(PaymentAllocation.payment_id)
+            .subquery()
+        )
+        stmt = (
+            select(Payment.id, Payment.customer_id, Payment.amount, allocated.c.allocated)
+            .outerjoin(allocated, allocated.c.payment_id == Payment.id)
+            .where(Payment.status.in_(ALLOCATABLE_PAYMENT_STATUSES))
+            .order_by(Payment.payment_date, Payment.id)
+        )
+        rows = []
+        id_chunks = [None] if payment_ids is None else [
+            list(payment_ids[start:start + BATCH_SIZE]) for start in range(0, len(payment_ids), BATCH_SIZE)
+        ]
+        for chunk in id_chunks:
+            chunk_stmt = stmt if chunk is None else stmt.where(Payment.id.in_(chunk))
+            for payment_id, customer_id, amount, allocated_amount in self.session.execute(chunk_stmt):
+                unallocated = _cents(amount) - _cents(allocated_amount or 0)
+                if unallocated > 0:
+                    rows.append((payment_id, customer_id, unallocated))
+        if payment_ids is not None and len(id_chunks) > 1:
+            order = {payment_id: index for index, payment_id in enumerate(payment_ids)}
+            rows.sort(key=lambda row: order[row[0]])
+        return rows
+    
+    def _open_invoices(self, customer_ids, lock: bool = False) -> Dict[int, List[_OpenInvoice]]:
+        """
+        Open invoices of the customers, by due date.
         
-        Args:
-            invoices: List of unpaid invoices
-            payment_amount: Total payment amount to allocate
-            
-        Returns:
-            List of allocation dictionaries
+        With lock, the invoices are locked (by id, so concurrent runs lock
+        them in the same order) until the caller commits: their paid and
+        remaining amounts are written back as read.
         """
-        # Calculate total remaining amount
-        total_remaining = sum(inv.remaining_amount for inv in invoices)
+        invoices: Dict[int, List[_OpenInvoice]] = defaultdict(list)
+        due_dates = {}
+        customer_ids = sorted(customer_ids)
+        for start in range(0, len(customer_ids), BATCH_SIZE):
+            stmt = select(
+                Invoice.id, Invoice.number, Invoice.customer_id, Invoice.total,
+                Invoice.paid_amount, Invoice.remaining_amount, Invoice.status, Invoice.due_date
+            ).where(
+                Invoice.customer_id.in_(customer_ids[start:start + BATCH_SIZE]),
+                Invoice.remaining_amount > 0,
+                Invoice.status.in_(ALLOCATABLE_INVOICE_STATUSES)
+            ).order_by(Invoice.id)
+            if lock:
+                stmt = stmt.with_for_update()
+            for row in self.session.execute(stmt):
+                invoice_id, number, customer_id, total, paid, remaining, status, due_date = row
+                due_dates[invoice_id] = due_date
+                invoices[customer_id].append(_OpenInvoice(
+                    id=invoice_id, number=number, customer_id=customer_id, total=_cents(total),
+                    paid=_cents(paid or 0), remaining=_cents(remaining), status=status
+                ))
+        for customer_invoices in invoices.values():
+            customer_invoices.sort(key=lambda invoice: (due_dates[invoice.id], invoice.id))
+        return invoices
+    
+    def _lock_rows(self, model, ids: Sequence[int]) -> None:
+        """Lock rows by primary key (SELECT ... FOR UPDATE, by id) until the caller commits."""
+        ids = sorted(ids)
+        for start in range(0, len(ids), BATCH_SIZE):
+            self.session.execute(
+                select(model.id).where(model.id.in_(ids[start:start + BATCH_SIZE])).order_by(model.id).with_for_update()
+            ).all()
+    
+    def _write(
+        self,
+        allocation_rows: List[dict],
+        invoices: Dict[int, List[_OpenInvoice]],
+        result: AllocationRunResult
+    ) -> None:
+        """Bulk insert allocations, bulk update invoices and queue their domain events."""
+        for start in range(0, len(allocation_rows), BATCH_SIZE):
+            self.session.execute(insert(PaymentAllocation), allocation_rows[start:start + BATCH_SIZE])
         
-        if total_remaining == 0:
-            return []
+        invoice_rows = [
+            {
+                'id': invoice.id,
+                'paid_amount': _amount(invoice.paid),
+                'remaining_amount': _amount(invoice.remaining),
+                'status': invoice.status
+            }
+            for customer_invoices in invoices.values()
+            for invoice in customer_invoices
+            if invoice.changed
+        ]
+        for start in range(0, len(invoice_rows), BATCH_SIZE):
+            self.session.execute(update(Invoice), invoice_rows[start:start + BATCH_SIZE])
         
-        allocations = []
-        remaining_amount = payment_amount
-        
-        # Allocate proportionally, but ensure we don't exceed invoice remaining
-        for i, invoice in enumerate(invoices):
-            if remaining_amount <= 0:
-                break
-            
-            # Calculate proportional amount
-            proportion = invoice.remaining_amount / total_remaining
-            proportional_amount = payment_amount * proportion
-            
-            # Round to 2 decimal places and ensure we don't exceed invoice remaining
-            allocation_amount = min(
-                round(proportional_amount, 2),
-                invoice.remaining_amount,
-                remaining_amount
-            )
-            
-            # For the last invoice, allocate any remaining amount to avoid rounding errors
-            if i == len(invoices) - 1:
-                allocation_amount = min(remaining_amount, invoice.remaining_amount)
-            
-            if allocation_amount > 0:
-                allocations.append({
-                    'invoice_id': invoice.id,
-                    'amount': allocation_amount
-                })
-                
-                remaining_amount -= allocation_amount
+        # Instances already loaded in the session reload their new state
+        payment_ids = {payment.payment_id for payment in result.payments if payment.allocations}
+        invoice_ids = {row['id'] for row in invoice_rows}
+        for instance in list(self.session.identity_map.values()):
+            if (
+                isinstance(instance, Invoice) and instance.id in invoice_ids
+                or isinstance(instance, Payment) and instance.id in payment_ids
+            ):
+                self.session.expire(instance)
         
-        return allocations
-
+        # Events of Payment.allocate / Invoice.record_payment, which the bulk writes bypass
+        customers = {payment.payment_id: payment.customer_id for payment in result.payments}
+        events = [
+            PaymentAllocatedDomainEvent(
+                payment_id=row['payment_id'],
+                invoice_id=row['invoice_id'],
+                allocated_amount=row['allocated_amount'],
+                customer_id=customers[row['payment_id']]
+            )
+            for row in allocation_rows
+        ]
+        events.extend(
+            InvoicePaidDomainEvent(
+                invoice_id=invoice.id,
+                invoice_number=invoice.number,
+                customer_id=invoice.customer_id,
+                paid_amount=_amount(invoice.paid)
+            )
+            for customer_invoices in invoices.values()
+            for invoice in customer_invoices
+            if invoice.changed and invoice.status == 'paid'
+        )
+        add_domain_events(self.session, events)
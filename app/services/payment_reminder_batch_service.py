@@ -0,0 +1,312 @@
+"""Batched payment reminder run: bulk selection, pooled PDF rendering and queued sending."""
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from flask import current_app
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.application.billing.invoices.queries.invoice_dto import InvoiceDTO
+from app.domain.models.customer import Customer
+from app.domain.models.invoice import Invoice
+from app.domain.models.payment import PaymentReminder
+from app.infrastructure.db import get_session
+from app.infrastructure.mail import EmailSendQueue
+from app.services.payment_reminder_email_service import PaymentReminderEmailService
+from app.services.payment_reminder_service import REMINDABLE_STATUSES, PaymentReminderService
+from app.services.pdf_render_pool import PDFRenderPool
+
+# Invoices handled per batch (one claim / send / checkpoint cycle)
+REMINDER_BATCH_SIZE = 200
+
+# PDF rendering processes (0 or 1: render in the current process)
+REMINDER_PDF_WORKERS = 2
+
+
+def reminder_invoice_dto(invoice: Invoice, customer: Customer) -> InvoiceDTO:
+    """
+    Invoice DTO for reminders: header fields only, no lines nor credit notes.
+    
+    Args:
+        invoice: Invoice
+        customer: Invoice customer
+    
+    Returns:
+        InvoiceDTO
+    """
+    return InvoiceDTO(
+        id=invoice.id,
+        number=invoice.number,
+        order_id=invoice.order_id,
+        order_number=None,
+        customer_id=invoice.customer_id,
+        customer_code=getattr(customer, 'code', None),
+        customer_name=customer.company_name or customer.name,
+        invoice_date=invoice.invoice_date,
+        due_date=invoice.due_date,
+        status=invoice.status,
+        subtotal=invoice.subtotal,
+        discount_percent=invoice.discount_percent,
+        discount_amount=invoice.discount_amount,
+        tax_amount=invoice.tax_amount,
+        total=invoice.total,
+        paid_amount=invoice.paid_amount,
+        remaining_amount=invoice.remaining_amount,
+        vat_number=invoice.vat_number,
+        siret=invoice.siret,
+        legal_mention=invoice.legal_mention,
+        notes=invoice.notes,
+        internal_notes=invoice.internal_notes,
+        sent_at=invoice.sent_at,
+        sent_by=invoice.sent_by,
+        sent_by_name=None,
+        email_sent=invoice.email_sent,
+        validated_at=invoice.validated_at,
+        validated_by=invoice.validated_by,
+        validated_by_name=None,
+        created_by=invoice.created_by,
+        created_by_name=None,
+        created_at=invoice.created_at,
+        updated_at=invoice.updated_at,
+        lines=[],
+        credit_notes=[]
+    )
+
+
+class PaymentReminderBatchService:
+    """
+    Sends the automatic payment reminders of a day in batches.
+    
+    Candidates of all reminder levels come from one query. Each batch then:
+    
+    1. loads its invoices and customers with one query;
+    2. claims its reminders (sent_at empty) and commits - the checkpoint: an
+       invoice with a reminder of its level claimed that day is not selected
+       again, so a run restarted after a crash does not resend. The unique
+       (invoice, level) constraint makes concurrent runs skip each other's
+       claims; unsent claims of earlier days are taken over;
+    3. renders the PDFs in the process pool;
+    4. sends them through the email send queue (one pooled connection per
+       batch, rate limited and retried by the transport);
+    5. marks the sent reminders, deletes those that failed (retried by the
+       next run) and commits. Invoice statuses are left to the daily overdue
+       transition (InvoiceStateService).
+    """
+    
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        pdf_workers: Optional[int] = None
+    ):
+        """
+        Initialize the service.
+        
+        Args:
+            batch_size: Invoices per batch (defaults to REMINDER_BATCH_SIZE config)
+            pdf_workers: PDF rendering processes (defaults to REMINDER_PDF_WORKERS config)
+        """
+        config = current_app.config
+        self.batch_size = batch_size or config.get('REMINDER_BATCH_SIZE', REMINDER_BATCH_SIZE)
+        self.pdf_workers = pdf_workers if pdf_workers is not None else config.get(
+            'REMINDER_PDF_WORKERS', REMINDER_PDF_WORKERS
+        )
+        self.email_service = PaymentReminderEmailService()
+    
+    def run(self, reminder_date: Optional[date] = None) -> Dict[str, List[dict]]:
+        """
+        Send the reminders due on a date.
+        
+        Args:
+            reminder_date: Reference date (defaults to today)
+        
+        Returns:
+            Dict with 'sent', 'failed' and 'skipped' lists of invoice entries
+        """
+        reminder_date = reminder_date or date.today()
+        results = {
+            'sent': [],
+            'failed': [],
+            'skipped': []
+        }
+        
+        with get_session() as session:
+            candidates = PaymentReminderService(session=session).get_reminder_candidates(reminder_date)
+        if not candidates:
+            return results
+        
+        send_queue = self.email_service.email_service.send_queue(batch_size=self.batch_size)
+        with PDFRenderPool(self.pdf_workers) as render_pool:
+            for start in range(0, len(candidates), self.batch_size):
+                self._process_batch(
+                    candidates[start:start + self.batch_size],
+                    reminder_date, render_pool, send_queue, results
+                )
+        
+        return results
+    
+    def _process_batch(
+        self,
+        candidates: List[Tuple[int, str]],
+        reminder_date: date,
+        render_pool: PDFRenderPool,
+        send_queue: EmailSendQueue,
+        results: Dict[str, List[dict]]
+    ):
+        """Claim, render, send and checkpoint one batch of (invoice ID, reminder type)."""
+        reminder_types = dict(candidates)
+        
+        # 1-2. Load invoices and customers, claim the reminders
+        jobs = []
+        with get_session() as session:
+            rows = session.execute(
+                select(Invoice, Customer)
+                .join(Customer, Customer.id == Invoice.customer_id)
+                .where(
+                    Invoice.id.in_(reminder_types),
+                    Invoice.status.in_(REMINDABLE_STATUSES),
+                    Invoice.remaining_amount > 0
+                )
+                .order_by(Invoice.id)
+            ).all()
+            
+            to_claim = []
+            for invoice, customer in rows:
+                if not customer.email:
+                    results['skipped'].append({
+                        'invoice_id': invoice.id,
+                        'invoice_number': invoice.number,
+                        'reason': 'Customer email not found'
+                    })
+                    continue
+                to_claim.append((invoice, customer))
+            
+            reminder_ids = self._claim(
+                session, [(invoice.id, reminder_types[invoice.id]) for invoice, _ in to_claim], reminder_date
+            )
+            for invoice, customer in to_claim:
+                if invoice.id not in reminder_ids:
+                    results['skipped'].append({
+                        'invoice_id': invoice.id,
+                        'invoice_number': invoice.number,
+                        'reason': 'Reminder claimed by another run'
+                    })
+                    continue
+                jobs.append((reminder_ids[invoice.id], reminder_invoice_dto(invoice, customer), customer.email))
+            session.commit()
+        
+        if not jobs:
+            return
+        
+        # 3. Render the PDFs
+        pdfs = render_pool.render_many(
+            ('reminder', (invoice_dto, reminder_types[invoice_dto.id])) for _, invoice_dto, _ in jobs
+        )
+        
+        # 4. Send
+        entries = {}
+        failed_reminder_ids = []
+        for (reminder_id, invoice_dto, email), pdf_content in zip(jobs, pdfs, strict=True):
+            reminder_type = reminder_types[invoice_dto.id]
+            entry = {
+                'invoice_id': invoice_dto.id,
+                'invoice_number': invoice_dto.number,
+                'reminder_type': reminder_type
+            }
+            if pdf_content is None:
+                failed_reminder_ids.append(reminder_id)
+                results['failed'].append({**entry, 'reason': 'PDF generation failed'})
+                continue
+            
+            try:
+                msg, recipients = self.email_service.build_reminder(
+                    invoice_dto=invoice_dto,
+                    reminder_type=reminder_type,
+                    recipient_email=email,
+                    include_pdf=True,
+                    pdf_content=pdf_content
+                )
+            except Exception as e:
+                failed_reminder_ids.append(reminder_id)
+                results['failed'].append({**entry, 'reason': str(e)})
+                current_app.logger.error(
+                    f"Error building payment reminder for invoice {invoice_dto.id}: {str(e)}",
+                    exc_info=True
+                )
+                continue
+            send_queue.put(msg, recipients, key=reminder_id)
+            entries[reminder_id] = {**entry, 'customer_email': email}
+        
+        sent_reminder_ids = []
+        for send_result in send_queue.flush():
+            entry = entries[send_result.key]
+            if send_result.success:
+                sent_reminder_ids.append(send_result.key)
+                results['sent'].append(entry)
+            else:
+                failed_reminder_ids.append(send_result.key)
+                entry.pop('customer_email')
+                results['failed'].append({**entry, 'reason': send_result.error})
+                current_app.logger.error(
+                    f"Error sending payment reminder for invoice {entry['invoice_id']}: {send_result.error}"
+                )
+        
+        # 5. Checkpoint the outcome
+        with get_session() as session:
+            if sent_reminder_ids:
+                session.execute(
+                    update(PaymentReminder)
+                    .where(PaymentReminder.id.in_(sent_reminder_ids))
+                    .values(sent_at=datetime.now(), email_sent=True)
+                )
+            if failed_reminder_ids:
+                session.execute(
+                    delete(PaymentReminder).where(PaymentReminder.id.in_(failed_reminder_ids))
+                )
+            session.commit()
+    
+    @staticmethod
+    def _claim(session: Session, levels: List[Tuple[int, str]], reminder_date: date) -> Dict[int, int]:
+        """
+        Claim the reminders of a batch.
+        
+        Unsent reminders of the level from earlier days (stale claims) are
+        taken over; other reminders are inserted, skipping those another run
+        inserted in the meantime (unique invoice / level constraint).
+        
+        Args:
+            session: Database session
+            levels: (invoice ID, reminder type) pairs
+            reminder_date: Date of the run
+        
+        Returns:
+            Reminder ID by claimed invoice ID
+        """
+        if not levels:
+            return {}
+        
+        claimed = dict(session.execute(
+            update(PaymentReminder)
+            .where(
+                tuple_(PaymentReminder.invoice_id, PaymentReminder.reminder_type).in_(levels),
+                PaymentReminder.sent_at.is_(None),
+                PaymentReminder.reminder_date < reminder_date
+            )
+            .values(reminder_date=reminder_date)
+            .returning(PaymentReminder.invoice_id, PaymentReminder.id)
+            .execution_options(synchronize_session=False)
+        ).all())
+        
+        new_levels = [
+            {'invoice_id': invoice_id, 'reminder_type': reminder_type, 'reminder_date': reminder_date}
+            for invoice_id, reminder_type in levels
+            if invoice_id not in claimed
+        ]
+        if new_levels:
+            dialect = sqlite if session.get_bind().dialect.name == 'sqlite' else postgresql
+            claimed.update(session.execute(
+                dialect.insert(PaymentReminder)
+                .values(new_levels)
+                .on_conflict_do_nothing(index_elements=['invoice_id', 'reminder_type'])
+                .returning(PaymentReminder.invoice_id, PaymentReminder.id)
+            ).all())
+        return claimed
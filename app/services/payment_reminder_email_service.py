@@ -1,8 +1,9 @@
 """Service for sending payment reminder emails."""
+from email.mime.multipart import MIMEMultipart
 from io import BytesIO
-from typing import Optional
+from typing import List, Optional, Tuple
 from flask import current_app, render_template_string
-from app.services.email_service import EmailService
+from app.services.email_service import EmailService, SMTPConnection
 from app.services.payment_reminder_pdf_service import PaymentReminderPDFService
 from app.application.billing.invoices.queries.invoice_dto import InvoiceDTO
 
@@ -21,7 +22,9 @@ class PaymentReminderEmailService:
         recipient_email: str,
         subject: Optional[str] = None,
         message: Optional[str] = None,
-        include_pdf: bool = True
+        include_pdf: bool = True,
+        pdf_content: Optional[bytes] = None,
+        connection: Optional[SMTPConnection] = None
     ) -> bool:
         """
         Send a payment reminder email.
@@ -33,13 +36,60 @@ class PaymentReminderEmailService:
             subject: Optional custom email subject
             message: Optional custom email message
             include_pdf: Whether to include PDF attachment
+            pdf_content: Optional PDF already rendered (generated here otherwise)
+            connection: Optional open SMTP connection to send on
             
         Returns:
             True if email sent successfully, False otherwise
         """
+        return self.email_service.send_email(
+            **self._reminder_email(
+                invoice_dto, reminder_type, recipient_email, subject, message, include_pdf, pdf_content
+            ),
+            connection=connection
+        )
+    
+    def build_reminder(
+        self,
+        invoice_dto: InvoiceDTO,
+        reminder_type: str,
+        recipient_email: str,
+        subject: Optional[str] = None,
+        message: Optional[str] = None,
+        include_pdf: bool = True,
+        pdf_content: Optional[bytes] = None
+    ) -> Tuple[MIMEMultipart, List[str]]:
+        """
+        Build a payment reminder email without sending it (for send queues).
+        
+        Args:
+            See send_reminder
+            
+        Returns:
+            Tuple of (message, recipient addresses)
+        """
+        return self.email_service.build_message(
+            **self._reminder_email(
+                invoice_dto, reminder_type, recipient_email, subject, message, include_pdf, pdf_content
+            )
+        )
+    
+    def _reminder_email(
+        self,
+        invoice_dto: InvoiceDTO,
+        reminder_type: str,
+        recipient_email: str,
+        subject: Optional[str],
+        message: Optional[str],
+        include_pdf: bool,
+        pdf_content: Optional[bytes]
+    ) -> dict:
+        """Email arguments (to, subject, bodies, attachments) of a reminder."""
         # Generate PDF if needed
         pdf_buffer = None
-        if include_pdf:
+        if include_pdf and pdf_content is not None:
+            pdf_buffer = BytesIO(pdf_content)
+        elif include_pdf:
             pdf_buffer = self.pdf_service.generate_reminder_pdf(invoice_dto, reminder_type)
         
         # Prepare email subject
@@ -62,14 +112,13 @@ class PaymentReminderEmailService:
                 'content': pdf_buffer
             })
         
-        # Send email
-        return self.email_service.send_email(
-            to=recipient_email,
-            subject=subject,
-            body_text=message,
-            body_html=html_body,
-            attachments=attachments
-        )
+        return {
+            'to': recipient_email,
+            'subject': subject,
+            'body_text': message,
+            'body_html': html_body,
+            'attachments': attachments
+        }
     
     def _generate_subject(self, invoice_dto: InvoiceDTO, reminder_type: str) -> str:
         """Generate email subject based on reminder type."""
@@ -164,8 +213,8 @@ L'équipe GMFlow"""
                 <p><strong>Facture:</strong> {{ invoice.number }}</p>
                 <p><strong>Date de facturation:</strong> {{ invoice.invoice_date.strftime('%d/%m/%Y') }}</p>
                 <p><strong>Date d'échéance:</strong> {{ invoice.due_date.strftime('%d/%m/%Y') }}</p>
-                <p><strong>Montant TTC:</strong> {{ invoice.total:,.2f }} €</p>
-                <p><strong>Montant restant:</strong> <span class="amount">{{ invoice.remaining_amount:,.2f }} €</span></p>
+                <p><strong>Montant TTC:</strong> {{ '{:,.2f}'.format(invoice.total) }} €</p>
+                <p><strong>Montant restant:</strong> <span class="amount">{{ '{:,.2f}'.format(invoice.remaining_amount) }} €</span></p>
                 {% if days_overdue > 0 %}
                 <p class="overdue">Jours de retard: {{ days_overdue }} jour(s)</p>
                 {% endif %}
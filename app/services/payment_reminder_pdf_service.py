@@ -9,7 +9,7 @@ from reportlab.lib.units import mm
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_RIGHT, TA_LEFT, TA_CENTER
+from reportlab.lib.enums import TA_LEFT, TA_CENTER
 
 from app.application.billing.invoices.queries.invoice_dto import InvoiceDTO
 from app.services.pdf_service import PDFService
@@ -18,8 +18,9 @@ from app.services.pdf_service import PDFService
 class PaymentReminderPDFService(PDFService):
     """Service for generating payment reminder PDFs."""
     
-    def __init__(self):
-        super().__init__()
+    def _setup_custom_styles(self):
+        """Setup the common styles plus the payment reminder ones (built once per class, see PDFService)."""
+        super()._setup_custom_styles()
         self._setup_reminder_styles()
     
     def _setup_reminder_styles(self):
@@ -128,7 +129,7 @@ class PaymentReminderPDFService(PDFService):
         
         company_table = Table(company_data, colWidths=[150*mm])
         company_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), TA_LEFT),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
             ('VALIGN', (0, 0), (-1, -1), 'TOP'),
             ('FONTSIZE', (0, 0), (0, 0), 16),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
@@ -138,7 +139,7 @@ class PaymentReminderPDFService(PDFService):
         reminder_badge = Paragraph(f"<b>{reminder_label}</b>", self.styles['ReminderTypeBadge'])
         reminder_table = Table([[reminder_badge]], colWidths=[150*mm])
         reminder_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), TA_CENTER),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
         ]))
         
@@ -189,8 +190,8 @@ Pour toute question concernant cette facture, n'hésitez pas à nous contacter."
         
         table = Table(data, colWidths=[60*mm, 90*mm])
         table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), TA_LEFT),
-            ('ALIGN', (1, 0), (1, -1), TA_RIGHT),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
             ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
             ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
@@ -1,12 +1,46 @@
 """Service for managing payment reminders."""
 from decimal import Decimal
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import case, exists, or_, select
 from sqlalchemy.orm import Session
 from app.domain.models.invoice import Invoice
 from app.domain.models.payment import PaymentReminder
 from app.infrastructure.db import get_session
 
+# Reminder levels: (minimum days overdue, reminder type), lowest level first
+REMINDER_SCHEDULE = (
+    (7, 'first'),    # J+7: First reminder
+    (15, 'second'),  # J+15: Second reminder
+    (30, 'third'),   # J+30: Third reminder
+    (60, 'final'),   # J+60: Final reminder
+)
+
+# Invoice statuses that can be reminded
+REMINDABLE_STATUSES = ("sent", "partially_paid", "overdue")
+
+
+def level_reminded(reminder_type, reminder_date: date):
+    """
+    Clause matching invoices that have a reminder of a level: sent, or
+    claimed by a run on reminder_date and still being sent.
+    
+    Unsent reminders of earlier days are stale claims (the run stopped before
+    its checkpoint) and do not count: the next run takes them over.
+    
+    Args:
+        reminder_type: Reminder level (value or SQL expression)
+        reminder_date: Date of the current run
+    
+    Returns:
+        EXISTS clause correlated to Invoice
+    """
+    return exists().where(
+        PaymentReminder.invoice_id == Invoice.id,
+        PaymentReminder.reminder_type == reminder_type,
+        or_(PaymentReminder.sent_at.isnot(None), PaymentReminder.reminder_date >= reminder_date)
+    )
+
 
 class PaymentReminderService:
     """Service for managing payment reminders."""
@@ -55,26 +89,71 @@ class PaymentReminderService:
         today = date.today()
         cutoff_date = today - timedelta(days=days_overdue)
         
-        # Get overdue invoices
-        invoices = session.query(Invoice).filter(
-            Invoice.status.in_(["sent", "partially_paid", "overdue"]),
+        # Overdue invoices that haven't received this type of reminder yet
+        already_reminded = level_reminded(reminder_type, today)
+        return session.query(Invoice).filter(
+            Invoice.status.in_(REMINDABLE_STATUSES),
             Invoice.due_date <= cutoff_date,
-            Invoice.remaining_amount > 0
-        ).all()
+            Invoice.remaining_amount > 0,
+            ~already_reminded
+        ).order_by(Invoice.id).all()
+    
+    def get_reminder_candidates(
+        self,
+        reminder_date: Optional[date] = None,
+        schedule: Sequence[Tuple[int, str]] = REMINDER_SCHEDULE
+    ) -> List[Tuple[int, str]]:
+        """
+        Get the invoices due for a reminder, all reminder levels at once.
+        
+        Each overdue invoice gets the highest level its days overdue reach,
+        unless a reminder of that level was sent or is being sent (see
+        level_reminded). Lower levels that were never sent are not sent
+        afterwards: the customer gets one reminder, the most recent one.
         
-        # Filter invoices that haven't received this type of reminder yet
-        result = []
-        for invoice in invoices:
-            # Check if invoice already has this type of reminder
-            existing_reminder = session.query(PaymentReminder).filter(
-                PaymentReminder.invoice_id == invoice.id,
-                PaymentReminder.reminder_type == reminder_type
-            ).first()
+        Args:
+            reminder_date: Reference date (defaults to today)
+            schedule: (minimum days overdue, reminder type) pairs, lowest level first
             
-            if not existing_reminder:
-                result.append(invoice)
+        Returns:
+            List of (invoice ID, reminder type), by invoice ID
+        """
+        if not self.session:
+            with get_session() as session:
+                return self._get_reminder_candidates_impl(session, reminder_date, schedule)
+        else:
+            return self._get_reminder_candidates_impl(self.session, reminder_date, schedule)
+    
+    def _get_reminder_candidates_impl(
+        self,
+        session: Session,
+        reminder_date: Optional[date],
+        schedule: Sequence[Tuple[int, str]]
+    ) -> List[Tuple[int, str]]:
+        """Internal implementation."""
+        today = reminder_date or date.today()
+        levels = sorted(schedule, reverse=True)
         
-        return result
+        # Highest level reached by the due date
+        reminder_type = case(
+            *[
+                (Invoice.due_date <= today - timedelta(days=days_overdue), level)
+                for days_overdue, level in levels
+            ],
+            else_=None
+        )
+        already_reminded = level_reminded(reminder_type, today)
+        rows = session.execute(
+            select(Invoice.id, reminder_type)
+            .where(
+                Invoice.status.in_(REMINDABLE_STATUSES),
+                Invoice.due_date <= today - timedelta(days=levels[-1][0]),
+                Invoice.remaining_amount > 0,
+                ~already_reminded
+            )
+            .order_by(Invoice.id)
+        ).all()
+        return [(invoice_id, level) for invoice_id, level in rows]
     
     def create_reminder(
         self,
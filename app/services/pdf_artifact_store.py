@@ -0,0 +1,314 @@
+"""Content-addressed store of generated PDFs for documents that no longer change."""
+import contextlib
+import dataclasses
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+from io import BytesIO
+from typing import Any, Dict, Optional, Union
+from flask import current_app
+
+from app.services.pdf_render_pool import PDF_RENDERERS, render_pdf_job
+from app.services.pdf_service import PDFService
+from app.services.pdf_service_helper import get_company_info
+
+# Statuses from which a document no longer changes, per document kind
+# (other documents, e.g. drafts, are rendered on every request)
+CACHEABLE_STATUSES = {
+    'invoice': ('validated', 'sent', 'partially_paid', 'paid', 'overdue', 'canceled'),
+    'quote': ('sent', 'accepted', 'rejected', 'expired', 'canceled'),
+    'receipt': ('validated', 'cancelled'),
+}
+
+# Cache size limit, least recently used files evicted beyond it
+PDF_ARTIFACTS_MAX_MB = 512
+
+# Stored files between two size checks (a check walks the whole cache)
+PDF_ARTIFACTS_EVICT_EVERY = 50
+
+# Document fields no renderer lays out (bookkeeping only): left out of the
+# version, so touching them does not re-render the PDF
+NON_RENDERED_FIELDS = frozenset({
+    'updated_at', 'internal_notes', 'email_sent',
+    'created_by', 'created_by_name', 'sent_by', 'sent_by_name',
+})
+
+# Template hash per renderer class, computed once per process
+_template_hashes: Dict[type, str] = {}
+
+
+def _rendered_fields(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        value = dataclasses.asdict(value)
+    if isinstance(value, dict):
+        return {
+            key: _rendered_fields(item) for key, item in value.items()
+            if key not in NON_RENDERED_FIELDS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_rendered_fields(item) for item in value]
+    return value
+
+
+def template_hash(service_class: type) -> str:
+    """
+    Hash of the code laying out a renderer's PDFs (the source files of the
+    class and its PDFService bases): a deployed template change gives new keys.
+    
+    Args:
+        service_class: PDF service class
+    
+    Returns:
+        Hex digest (12 characters)
+    """
+    digest = _template_hashes.get(service_class)
+    if digest is None:
+        sha = hashlib.sha256()
+        for cls in service_class.__mro__:
+            if issubclass(cls, PDFService):
+                with open(inspect.getsourcefile(cls), 'rb') as source:
+                    sha.update(source.read())
+        digest = _template_hashes[service_class] = sha.hexdigest()[:12]
+    return digest
+
+
+def document_version(document: Any, *args: Any) -> str:
+    """
+    Hash of what a PDF shows: the rendered document data (DTO or dict,
+    without NON_RENDERED_FIELDS), the other generate arguments and the
+    company information of the header.
+    
+    Args:
+        document: Document DTO or data dict
+        *args: Other arguments of the generate method
+    
+    Returns:
+        Hex digest (16 characters)
+    """
+    payload = json.dumps(
+        _rendered_fields({'document': document, 'args': args, 'company': get_company_info()}),
+        default=str,
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _document_status(document: Any) -> Optional[str]:
+    if isinstance(document, dict):
+        return document.get('status')
+    return getattr(document, 'status', None)
+
+
+class PDFArtifactStore:
+    """
+    Generated PDFs kept on the local filesystem, so documents that no longer
+    change are rendered once (at validation or send time) and later
+    downloads and email attachments read the file.
+    
+    Files are named `<kind>/<id>-<version>-<template hash>.pdf`. The version
+    hashes the rendered data and the company settings, so any change to the
+    document, the company settings or the PDF code maps to a new file; the
+    stale ones are never read again and age out of the cache.
+    
+    Each hit refreshes the file modification time. Every
+    PDF_ARTIFACTS_EVICT_EVERY stored files, the store checks its size and
+    deletes the least recently used files beyond the limit.
+    """
+    
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None,
+                 evict_every: Optional[int] = None):
+        """
+        Initialize the store.
+        
+        Args:
+            root: Directory of the files (defaults to PDF_ARTIFACTS_DIR config)
+            max_bytes: Cache size limit (defaults to PDF_ARTIFACTS_MAX_MB config)
+            evict_every: Stored files between two size checks
+                (defaults to PDF_ARTIFACTS_EVICT_EVERY config)
+        """
+        config = current_app.config
+        self.root = root or config.get('PDF_ARTIFACTS_DIR') or os.path.join(
+            tempfile.gettempdir(), 'pdf_artifacts'
+        )
+        self.max_bytes = max_bytes or config.get('PDF_ARTIFACTS_MAX_MB', PDF_ARTIFACTS_MAX_MB) * 1024 * 1024
+        self.evict_every = evict_every or config.get('PDF_ARTIFACTS_EVICT_EVERY', PDF_ARTIFACTS_EVICT_EVERY)
+        self._writes = 0
+        self._lock = threading.Lock()
+    
+    def is_cacheable(self, kind: str, document: Any) -> bool:
+        """Whether a document no longer changes (its PDF can be kept)."""
+        return _document_status(document) in CACHEABLE_STATUSES.get(kind, ())
+    
+    def artifact_path(self, kind: str, doc_id: int, document: Any, *args: Any) -> str:
+        """
+        Path of a document's PDF file.
+        
+        Args:
+            kind: Document kind (key of PDF_RENDERERS)
+            doc_id: Document ID
+            document: Document DTO or data dict
+            *args: Other arguments of the generate method
+        
+        Returns:
+            File path (the file may not exist yet)
+        
+        Raises:
+            ValueError: If the kind is unknown
+        """
+        if kind not in PDF_RENDERERS:
+            raise ValueError(f"Unknown PDF kind '{kind}'. Expected one of: {', '.join(PDF_RENDERERS)}")
+        service_class, _ = PDF_RENDERERS[kind]
+        filename = f"{doc_id}-{document_version(document, *args)}-{template_hash(service_class)}.pdf"
+        return os.path.join(self.root, kind, filename)
+    
+    def get_or_render(self, kind: str, doc_id: int, document: Any, *args: Any) -> Optional[str]:
+        """
+        Path of a document's PDF, rendered and stored on the first request.
+        
+        Args:
+            kind: Document kind (key of PDF_RENDERERS)
+            doc_id: Document ID
+            document: Document DTO or data dict
+            *args: Other arguments of the generate method
+        
+        Returns:
+            File path, or None if the document can still change (not stored)
+        """
+        if not self.is_cacheable(kind, document):
+            return None
+        path = self.artifact_path(kind, doc_id, document, *args)
+        try:
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+        
+        content = render_pdf_job(kind, (document, *args))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename: concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.evict_every == 0
+        if due:
+            self.evict()
+        return path
+    
+    def open(self, kind: str, doc_id: int, document: Any, *args: Any) -> Union[str, BytesIO]:
+        """
+        PDF of a document for `send_file`: the stored file path (served
+        without copying it through Python), or a rendered buffer for
+        documents that can still change.
+        
+        Args:
+            kind: Document kind (key of PDF_RENDERERS)
+            doc_id: Document ID
+            document: Document DTO or data dict
+            *args: Other arguments of the generate method
+        
+        Returns:
+            File path or BytesIO
+        """
+        path = self.get_or_render(kind, doc_id, document, *args)
+        if path is None:
+            return BytesIO(render_pdf_job(kind, (document, *args)))
+        return path
+    
+    def read(self, kind: str, doc_id: int, document: Any, *args: Any) -> bytes:
+        """
+        PDF bytes of a document (e.g. for an email attachment).
+        
+        Args:
+            kind: Document kind (key of PDF_RENDERERS)
+            doc_id: Document ID
+            document: Document DTO or data dict
+            *args: Other arguments of the generate method
+        
+        Returns:
+            PDF bytes
+        """
+        pdf = self.open(kind, doc_id, document, *args)
+        if isinstance(pdf, BytesIO):
+            return pdf.getvalue()
+        with open(pdf, 'rb') as pdf_file:
+            return pdf_file.read()
+    
+    def warm(self, kind: str, doc_id: int, document: Any, *args: Any) -> Optional[str]:
+        """
+        Render and store a document's PDF ahead of its first download
+        (validation or send time). Failures are logged, not raised.
+        
+        Returns:
+            File path, or None if not stored
+        """
+        try:
+            return self.get_or_render(kind, doc_id, document, *args)
+        except Exception:
+            current_app.logger.exception(f"PDF artifact generation failed ({kind} {doc_id})")
+            return None
+    
+    def evict(self) -> int:
+        """
+        Delete the least recently used files beyond the size limit.
+        
+        Returns:
+            Number of files deleted
+        """
+        with self._lock:
+            files = []
+            total = 0
+            for dirpath, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    if not filename.endswith('.pdf'):
+                        continue
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+            if total <= self.max_bytes:
+                return 0
+            
+            deleted = 0
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
+                total -= size
+                deleted += 1
+            return deleted
+    
+    def clear(self) -> None:
+        """Delete every stored file."""
+        with self._lock:
+            for dirpath, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    if filename.endswith('.pdf'):
+                        os.unlink(os.path.join(dirpath, filename))
+
+
+def get_pdf_artifact_store() -> PDFArtifactStore:
+    """
+    Artifact store of the current app.
+    
+    Returns:
+        PDFArtifactStore
+    """
+    app = current_app._get_current_object()
+    store = app.extensions.get('pdf_artifact_store')
+    if store is None:
+        store = app.extensions.setdefault('pdf_artifact_store', PDFArtifactStore())
+    return store
@@ -0,0 +1,215 @@
+"""Process pool rendering PDFs off the calling process, with a bounded queue."""
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from flask import Flask, current_app
+
+from app.services.invoice_pdf_service import InvoicePDFService
+from app.services.payment_reminder_pdf_service import PaymentReminderPDFService
+from app.services.pdf_service import PDFService
+from app.services.pdf_service_helper import get_company_info, prime_company_info
+from app.services.purchase_receipt_pdf_service import PurchaseReceiptPDFService
+
+# Document kinds: kind -> (service class, generate method)
+PDF_RENDERERS = {
+    'invoice': (InvoicePDFService, 'generate_invoice_pdf'),
+    'reminder': (PaymentReminderPDFService, 'generate_reminder_pdf'),
+    'receipt': (PurchaseReceiptPDFService, 'generate_receipt_pdf'),
+    'quote': (PDFService, 'generate_quote_pdf'),
+    'order': (PDFService, 'generate_order_pdf'),
+    'delivery_note': (PDFService, 'generate_delivery_note_pdf'),
+}
+
+# Render processes (0 or 1: render in the calling process)
+PDF_RENDER_WORKERS = 2
+
+# A render job: (kind, generate method arguments)
+PDFJob = Tuple[str, tuple]
+
+# Service instances of this process, one per class
+_services: Dict[type, PDFService] = {}
+
+
+def render_pdf_job(kind: str, args: tuple) -> bytes:
+    """
+    Render a PDF in the current process (app context required).
+    
+    Args:
+        kind: Document kind (key of PDF_RENDERERS)
+        args: Arguments of the generate method
+    
+    Returns:
+        PDF bytes
+    
+    Raises:
+        ValueError: If the kind is unknown
+    """
+    if kind not in PDF_RENDERERS:
+        raise ValueError(f"Unknown PDF kind '{kind}'. Expected one of: {', '.join(PDF_RENDERERS)}")
+    service_class, method = PDF_RENDERERS[kind]
+    service = _services.get(service_class)
+    if service is None:
+        service = _services[service_class] = service_class()
+    return getattr(service, method)(*args).getvalue()
+
+
+def _safe_render(kind: str, args: tuple) -> Optional[bytes]:
+    """Render a PDF; None (logged) if rendering failed."""
+    try:
+        return render_pdf_job(kind, args)
+    except Exception:
+        current_app.logger.exception(f"PDF rendering failed ({kind})")
+        return None
+
+
+def _init_worker(company_config: Dict):
+    """Render process initializer: app context with the company settings."""
+    app = Flask(__name__)
+    app.config.update(company_config)
+    app.app_context().push()
+
+
+def _worker_render(kind: str, args: tuple, company_info: Dict[str, str]) -> Optional[bytes]:
+    """Render a PDF in a pool process, with the company info of the caller."""
+    prime_company_info(company_info)
+    return _safe_render(kind, args)
+
+
+class PDFRenderPool:
+    """
+    Renders PDFs in a pool of processes, keeping the web or Celery worker
+    free for I/O. Each render process builds its stylesheets once.
+    
+    Workers are capped to the CPU count. Rendering falls back to the calling
+    process when that leaves one worker or less, or when the pool cannot run
+    (e.g. inside a daemonic Celery worker process).
+    
+    Usage:
+        with PDFRenderPool() as pool:
+            for pdf in pool.render_many(('invoice', (dto,)) for dto in dtos):
+                ...
+    """
+    
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            workers: Render processes (defaults to PDF_RENDER_WORKERS config)
+            max_pending: Jobs queued in the pool at once (defaults to 4 per worker)
+        """
+        if workers is None:
+            workers = current_app.config.get('PDF_RENDER_WORKERS', PDF_RENDER_WORKERS)
+        self.workers = min(workers, os.cpu_count() or 1)
+        self.max_pending = max_pending or max(1, self.workers) * 4
+        self._executor = None
+        if self.workers > 1:
+            company_config = {
+                key: value for key, value in current_app.config.items() if key.startswith('COMPANY_')
+            }
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(company_config,)
+            )
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    @property
+    def in_process(self) -> bool:
+        """Whether PDFs are rendered in the calling process."""
+        return self._executor is None
+    
+    def render(self, kind: str, *args) -> Optional[bytes]:
+        """
+        Render one PDF.
+        
+        Args:
+            kind: Document kind (key of PDF_RENDERERS)
+            *args: Arguments of the generate method
+        
+        Returns:
+            PDF bytes, or None if rendering failed
+        """
+        return next(self.render_many([(kind, args)]))
+    
+    def render_many(self, jobs: Iterable[PDFJob]) -> Iterator[Optional[bytes]]:
+        """
+        Render PDFs, yielded in job order.
+        
+        At most max_pending jobs wait in the pool: jobs are pulled from the
+        iterable as results are consumed, so memory stays bounded whatever
+        the number of documents.
+        
+        Args:
+            jobs: (kind, generate method arguments) pairs
+        
+        Yields:
+            PDF bytes per job (None where rendering failed)
+        """
+        company_info = get_company_info()
+        pending = deque()
+        for kind, args in jobs:
+            if len(pending) >= self.max_pending:
+                yield self._result(*pending.popleft())
+            pending.append((self._submit(kind, args, company_info), kind, args))
+        while pending:
+            yield self._result(*pending.popleft())
+    
+    def _submit(self, kind: str, args: tuple, company_info: Dict[str, str]) -> Optional[Future]:
+        """Queue a job in the pool (None when rendering in process)."""
+        if self._executor is None:
+            return None
+        try:
+            return self._executor.submit(_worker_render, kind, args, company_info)
+        except (BrokenProcessPool, AssertionError, OSError, RuntimeError) as e:
+            current_app.logger.warning(f"PDF render pool unavailable, rendering in process: {e}")
+            self.close()
+            return None
+    
+    def _result(self, future: Optional[Future], kind: str, args: tuple) -> Optional[bytes]:
+        """Result of a job, rendered in process if it was not pooled or the pool broke."""
+        if future is not None:
+            try:
+                return future.result()
+            except BrokenProcessPool as e:
+                current_app.logger.warning(f"PDF render pool broken, rendering in process: {e}")
+                self.close()
+        return _safe_render(kind, args)
+    
+    def close(self):
+        """Shut the render processes down."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+_pool_lock = threading.Lock()
+
+
+def get_pdf_render_pool() -> PDFRenderPool:
+    """
+    Render pool of the current app, started on first use and reused by the
+    process (batch renders and mailings share its render processes).
+    
+    Returns:
+        PDFRenderPool
+    """
+    app = current_app._get_current_object()
+    pool = app.extensions.get('pdf_render_pool')
+    if pool is None:
+        with _pool_lock:
+            pool = app.extensions.get('pdf_render_pool')
+            if pool is None:
+                pool = PDFRenderPool()
+                app.extensions['pdf_render_pool'] = pool
+    return pool
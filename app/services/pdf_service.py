@@ -12,13 +12,22 @@ from reportlab.lib.enums import TA_RIGHT, TA_LEFT, TA_CENTER
 from reportlab.pdfgen import canvas
 from datetime import datetime, date
 
+# Stylesheets built per service class, shared by its instances (read-only once built)
+_stylesheets = {}
+
 
 class PDFService:
     """Service for generating PDF documents using ReportLab."""
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        # Building the stylesheet is costly: do it once per class and process
+        styles = _stylesheets.get(type(self))
+        if styles is None:
+            self.styles = getSampleStyleSheet()
+            self._setup_custom_styles()
+            _stylesheets[type(self)] = self.styles
+        else:
+            self.styles = styles
     
     def _setup_custom_styles(self):
         """Setup custom paragraph styles."""
@@ -1,5 +1,6 @@
 """Helper functions for PDF generation."""
-from typing import Dict
+import time
+from typing import Dict, Optional
 from reportlab.lib import colors
 from reportlab.platypus import Paragraph
 from reportlab.lib.styles import ParagraphStyle
@@ -76,15 +77,28 @@ def create_status_badge(status: str, styles) -> Paragraph:
     return Paragraph(f"<b>{status_text}</b>", badge_para_style)
 
 
+# Company settings of the PDF headers, cached per process for this many seconds
+COMPANY_INFO_TTL_SECONDS = 60
+
+_company_info_cache = {'info': None, 'expires_at': 0.0}
+
+
 def get_company_info() -> Dict[str, str]:
-    """Get company information for PDF header from database settings."""
+    """
+    Get company information for PDF header from database settings.
+    
+    The settings are cached per process (COMPANY_INFO_TTL_SECONDS, cleared
+    by invalidate_company_info when they are updated).
+    """
+    if _company_info_cache['info'] is not None and time.monotonic() < _company_info_cache['expires_at']:
+        return dict(_company_info_cache['info'])
     try:
         from app.application.common.mediator import mediator
         from app.application.settings.queries.queries import GetCompanySettingsQuery
         
         company_settings = mediator.dispatch(GetCompanySettingsQuery())
         
-        return {
+        info = {
             'name': company_settings.name or 'CommerceFlow',
             'address': company_settings.address or '',
             'postal_code': company_settings.postal_code or '',
@@ -95,7 +109,7 @@ def get_company_info() -> Dict[str, str]:
             'website': company_settings.website or ''
         }
     except Exception:
-        # Fallback to defaults if settings not available
+        # Fallback to defaults if settings not available (not cached)
         return {
             'name': 'CommerceFlow',
             'address': '',
@@ -106,3 +120,24 @@ def get_company_info() -> Dict[str, str]:
             'email': '',
             'website': ''
         }
+    prime_company_info(info, ttl=COMPANY_INFO_TTL_SECONDS)
+    return dict(info)
+
+
+def prime_company_info(info: Dict[str, str], ttl: Optional[float] = None) -> None:
+    """
+    Set the cached company information (e.g. in PDF render processes, which
+    get it from the parent instead of the database).
+    
+    Args:
+        info: Company information as returned by get_company_info
+        ttl: Seconds before reloading from the settings (None: never)
+    """
+    _company_info_cache['info'] = dict(info)
+    _company_info_cache['expires_at'] = time.monotonic() + ttl if ttl is not None else float('inf')
+
+
+def invalidate_company_info() -> None:
+    """Drop the cached company information (after a settings update)."""
+    _company_info_cache['info'] = None
+    _company_info_cache['expires_at'] = 0.0
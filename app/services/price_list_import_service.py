@@ -0,0 +1,303 @@
+"""Bulk price list import: streaming tariff files, diffing and bulk apply."""
+import csv
+import io
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.orm import Session
+
+from app.domain.models.product import Product, ProductPriceList, ProductPriceHistory
+
+logger = logging.getLogger(__name__)
+
+# Accepted header names (case-insensitive) for the product code and price columns
+CODE_HEADERS = ('code', 'product_code', 'reference', 'ref', 'sku')
+PRICE_HEADERS = ('price', 'prix', 'unit_price', 'tarif')
+
+# Number of values per IN (...) / bulk statement
+BATCH_SIZE = 1000
+
+# Number of changes returned in the summary (counts always cover every row)
+MAX_REPORTED_CHANGES = 200
+
+
+@dataclass
+class PriceListChange:
+    """One change applied (or to be applied) to a price list."""
+    action: str  # 'insert', 'update', 'delete'
+    product_id: int
+    product_code: Optional[str]
+    old_price: Optional[Decimal]
+    new_price: Optional[Decimal]
+
+
+@dataclass
+class PriceListImportSummary:
+    """Change summary of a price list import."""
+    price_list_id: int
+    dry_run: bool
+    rows_read: int = 0
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    changes: List[PriceListChange] = field(default_factory=list)
+
+
+class PriceListImportService:
+    """
+    Loads a full supplier tariff file into a price list.
+
+    The file is streamed row by row (csv reader, openpyxl read-only mode), the
+    result is diffed against the existing ProductPriceList rows loaded in one
+    query, and inserts, updates, deletes and price history rows are written with
+    bulk statements instead of one command per product.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize the price list import service.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        self.session = session
+
+    # ==================== File Reading ====================
+
+    @staticmethod
+    def iter_rows(stream: BinaryIO, filename: str) -> Iterator[Tuple[int, Any, Any]]:
+        """
+        Stream (row number, code, price) tuples from a CSV or XLSX file.
+
+        Args:
+            stream: Binary file object
+            filename: File name, used to detect the format
+
+        Returns:
+            Iterator of (row_number, code, price) with raw cell values
+
+        Raises:
+            ValueError: If the format is not supported or the columns are missing
+        """
+        name = (filename or '').lower()
+        if name.endswith('.csv'):
+            return PriceListImportService._iter_csv(stream)
+        if name.endswith('.xlsx'):
+            return PriceListImportService._iter_xlsx(stream)
+        raise ValueError("Unsupported file format. Please use CSV or XLSX files.")
+
+    @staticmethod
+    def _find_columns(headers: List[Any]) -> Tuple[int, int]:
+        """Locate the code and price columns in a header row."""
+        normalized = [str(h).strip().lower() if h is not None else '' for h in headers]
+        code_idx = next((i for i, h in enumerate(normalized) if h in CODE_HEADERS), None)
+        price_idx = next((i for i, h in enumerate(normalized) if h in PRICE_HEADERS), None)
+        if code_idx is None or price_idx is None:
+            raise ValueError("File must have a product code column and a price column.")
+        return code_idx, price_idx
+
+    @staticmethod
+    def _iter_csv(stream: BinaryIO) -> Iterator[Tuple[int, Any, Any]]:
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(text, dialect)
+        code_idx, price_idx = PriceListImportService._find_columns(next(reader, []))
+        for row_number, row in enumerate(reader, start=2):
+            if not any(row):
+                continue
+            code = row[code_idx] if code_idx < len(row) else None
+            price = row[price_idx] if price_idx < len(row) else None
+            yield row_number, code, price
+
+    @staticmethod
+    def _iter_xlsx(stream: BinaryIO) -> Iterator[Tuple[int, Any, Any]]:
+        try:
+            import openpyxl
+        except ImportError as e:
+            raise ImportError(
+                "openpyxl is required for Excel import. Install it with: pip install openpyxl"
+            ) from e
+
+        wb = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            code_idx, price_idx = PriceListImportService._find_columns(list(next(rows, ())))
+            for row_number, row in enumerate(rows, start=2):
+                if not row or all(value is None for value in row):
+                    continue
+                code = row[code_idx] if code_idx < len(row) else None
+                price = row[price_idx] if price_idx < len(row) else None
+                yield row_number, code, price
+        finally:
+            wb.close()
+
+    # ==================== Import ====================
+
+    def import_price_list(
+        self,
+        price_list_id: int,
+        rows: Iterable[Tuple[int, Any, Any]],
+        replace_missing: bool = False,
+        dry_run: bool = False,
+        changed_by: Optional[int] = None
+    ) -> PriceListImportSummary:
+        """
+        Diff the tariff rows against the price list and apply the changes in bulk.
+
+        The caller commits the session (nothing is written in dry-run mode).
+
+        Args:
+            price_list_id: Target price list
+            rows: (row_number, code, price) tuples, e.g. from iter_rows()
+            replace_missing: Delete price list entries whose product is not in the file
+            dry_run: Compute the summary without writing anything
+            changed_by: User recorded in the price history
+
+        Returns:
+            PriceListImportSummary
+        """
+        summary = PriceListImportSummary(price_list_id=price_list_id, dry_run=dry_run)
+
+        # 1. Parse and de-duplicate the file (last occurrence of a code wins)
+        prices_by_code: Dict[str, Decimal] = {}
+        row_by_code: Dict[str, int] = {}
+        for row_number, code, price in rows:
+            summary.rows_read += 1
+            code = str(code).strip() if code is not None else ''
+            if not code:
+                summary.errors.append({'row': row_number, 'code': '', 'error': 'Missing product code'})
+                continue
+            try:
+                parsed = Decimal(str(price).strip().replace(',', '.'))
+                if not parsed.is_finite():  # NaN / Infinity
+                    raise InvalidOperation(price)
+                parsed = parsed.quantize(Decimal('0.01'))
+            except (InvalidOperation, ValueError):
+                summary.errors.append({'row': row_number, 'code': code, 'error': f'Invalid price: {price}'})
+                continue
+            if parsed < 0:
+                summary.errors.append({'row': row_number, 'code': code, 'error': 'Price must be non-negative'})
+                continue
+            prices_by_code[code] = parsed
+            row_by_code[code] = row_number
+
+        # 2. Resolve product codes in batches
+        product_ids = self._resolve_codes(list(prices_by_code.keys()))
+        new_prices: Dict[int, Decimal] = {}
+        codes_by_product: Dict[int, str] = {}
+        for code, price in prices_by_code.items():
+            product_id = product_ids.get(code)
+            if product_id is None:
+                summary.errors.append({'row': row_by_code[code], 'code': code, 'error': 'Unknown product code'})
+                continue
+            new_prices[product_id] = price
+            codes_by_product[product_id] = code
+
+        # 3. Load the existing price list in one query and diff
+        existing = {
+            product_id: (entry_id, price)
+            for entry_id, product_id, price in self.session.execute(
+                select(ProductPriceList.id, ProductPriceList.product_id, ProductPriceList.price)
+                .where(ProductPriceList.price_list_id == price_list_id)
+            ).all()
+        }
+
+        inserts: List[Dict[str, Any]] = []
+        updates: List[Dict[str, Any]] = []
+        history: List[Dict[str, Any]] = []
+        for product_id, price in new_prices.items():
+            current = existing.get(product_id)
+            if current is None:
+                inserts.append({'price_list_id': price_list_id, 'product_id': product_id, 'price': price})
+                self._record(summary, 'insert', product_id, codes_by_product, None, price)
+            elif Decimal(str(current[1])) != price:
+                updates.append({'id': current[0], 'price': price})
+                self._record(summary, 'update', product_id, codes_by_product, current[1], price)
+            else:
+                summary.unchanged += 1
+                continue
+            history.append({
+                'product_id': product_id,
+                'price_list_id': price_list_id,
+                'old_price': current[1] if current else None,
+                'new_price': price,
+                'changed_by': changed_by,
+                'reason': 'Price list import'
+            })
+
+        deletes: List[int] = []
+        if replace_missing:
+            for product_id, (entry_id, price) in existing.items():
+                if product_id not in new_prices:
+                    deletes.append(entry_id)
+                    self._record(summary, 'delete', product_id, codes_by_product, price, None)
+
+        summary.inserted = len(inserts)
+        summary.updated = len(updates)
+        summary.deleted = len(deletes)
+
+        # 4. Apply in bulk
+        if not dry_run:
+            for batch in _batches(inserts):
+                self.session.execute(insert(ProductPriceList), batch)
+            for batch in _batches(updates):
+                self.session.execute(update(ProductPriceList), batch)
+            for batch in _batches(deletes):
+                self.session.execute(
+                    delete(ProductPriceList).where(ProductPriceList.id.in_(batch)),
+                    execution_options={'synchronize_session': False}
+                )
+            for batch in _batches(history):
+                self.session.execute(insert(ProductPriceHistory), batch)
+            self.session.flush()
+
+        logger.info(
+            "Price list %s import%s: %s rows, %s inserted, %s updated, %s deleted, %s unchanged, %s errors",
+            price_list_id, ' (dry run)' if dry_run else '', summary.rows_read, summary.inserted,
+            summary.updated, summary.deleted, summary.unchanged, len(summary.errors)
+        )
+        return summary
+
+    def _resolve_codes(self, codes: List[str]) -> Dict[str, int]:
+        """Map product codes to product IDs, one query per batch of codes."""
+        product_ids: Dict[str, int] = {}
+        for batch in _batches(codes):
+            product_ids.update(self.session.execute(
+                select(Product.code, Product.id).where(Product.code.in_(batch))
+            ).all())
+        return product_ids
+
+    @staticmethod
+    def _record(
+        summary: PriceListImportSummary,
+        action: str,
+        product_id: int,
+        codes_by_product: Dict[int, str],
+        old_price: Optional[Decimal],
+        new_price: Optional[Decimal]
+    ) -> None:
+        """Add a change to the summary, up to MAX_REPORTED_CHANGES."""
+        if len(summary.changes) < MAX_REPORTED_CHANGES:
+            summary.changes.append(PriceListChange(
+                action=action,
+                product_id=product_id,
+                product_code=codes_by_product.get(product_id),
+                old_price=old_price,
+                new_price=new_price
+            ))
+
+
+def _batches(items: List[Any], size: int = BATCH_SIZE) -> Iterator[List[Any]]:
+    """Split a list into consecutive batches."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from app.domain.models.product import Product, ProductPromotionalPrice, ProductVolumePricing, ProductPriceList
 from app.domain.models.customer import Customer, CommercialConditions
 from app.domain.models.quote import Quote, QuoteLine
+from app.services.customer_sales_aggregate_service import CustomerSalesAggregateService
 
 
 @dataclass
@@ -287,7 +288,52 @@ class PricingService:
                     current_value=Decimal(0),
                     threshold_value=Decimal(0)
                 ))
-        
+
+        # Suggestions from the customer's rolling 12-month aggregates (one row, no order scan)
+        aggregate = CustomerSalesAggregateService(self.session).get_aggregate(quote.customer_id)
+        revenue_12m = Decimal(str(aggregate.revenue_12m or 0))
+
+        # Suggestion: Loyalty discount on 12-month revenue (highest tier reached, else next tier)
+        loyalty_tiers = [
+            (Decimal('50000'), Decimal('5')),
+            (Decimal('20000'), Decimal('3')),
+            (Decimal('5000'), Decimal('1')),
+        ]
+        reached = next(((t, d) for t, d in loyalty_tiers if revenue_12m >= t), None)
+        if reached:
+            threshold, discount = reached
+            suggestions.append(DiscountSuggestion(
+                type='loyalty',
+                description=f"Remise fidélité de {discount}%",
+                discount_percent=discount,
+                condition=f"CA 12 mois de {revenue_12m:.2f} € (seuil {threshold:.2f} €)",
+                current_value=revenue_12m,
+                threshold_value=threshold
+            ))
+        else:
+            threshold, discount = loyalty_tiers[-1]
+            suggestions.append(DiscountSuggestion(
+                type='loyalty_threshold',
+                description=f"Remise fidélité de {discount}%",
+                discount_percent=discount,
+                condition=f"Encore {threshold - revenue_12m:.2f} € de CA sur 12 mois pour atteindre le seuil",
+                current_value=revenue_12m,
+                threshold_value=threshold
+            ))
+
+        # Suggestion: Frequency discount for customers ordering at least monthly
+        frequency_threshold = Decimal('12')
+        if aggregate.order_count_12m >= frequency_threshold:
+            suggestions.append(DiscountSuggestion(
+                type='frequency',
+                description="Remise client régulier de 1%",
+                discount_percent=Decimal('1'),
+                condition=f"{aggregate.order_count_12m} commandes sur 12 mois "
+                          f"(panier moyen {aggregate.average_basket:.2f} €)",
+                current_value=Decimal(aggregate.order_count_12m),
+                threshold_value=frequency_threshold
+            ))
+
         # Suggestion: Volume discount thresholds (future)
         # Example: "Vous êtes à 50€ du seuil pour une remise de 5%"
         volume_thresholds = [
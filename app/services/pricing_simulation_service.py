@@ -0,0 +1,538 @@
+"""Pricing simulation service: what-if re-pricing of historical order lines."""
+import logging
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.domain.models.customer import Customer, CommercialConditions
+from app.domain.models.order import Order, OrderLine
+from app.domain.models.product import Product, ProductPriceList, ProductVolumePricing, product_categories
+from app.utils.period import date_range_filter
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - pure-Python fallback without numpy
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Order statuses counted as revenue (same as the analytics service)
+SOLD_ORDER_STATUSES = ('confirmed', 'ready', 'shipped', 'delivered', 'invoiced')
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Largest number of breakdowns kept per product, customer and category
+MAX_SIMULATION_TOP = 1000
+
+_CENT = Decimal('0.01')
+
+
+def _to_cents(amount) -> int:
+    """Round an amount (Decimal, float or None) to integer cents."""
+    return round((amount or 0) * 100)
+
+
+def _to_decimal_sums(sums: List[int]) -> Tuple[int, int, Decimal, Decimal, Decimal, Decimal]:
+    """Convert (lines, repriced, quantity in thousandths, current, simulated, cost in cents) to Decimals."""
+    lines, repriced, quantity, current, simulated, cost = sums
+    return (
+        lines,
+        repriced,
+        Decimal(quantity).scaleb(-3),
+        Decimal(current).scaleb(-2),
+        Decimal(simulated).scaleb(-2),
+        Decimal(cost).scaleb(-2)
+    )
+
+
+@dataclass
+class VolumeTierRule:
+    """Candidate volume pricing tier."""
+    min_quantity: Decimal
+    max_quantity: Optional[Decimal]  # None = unlimited
+    price: Decimal
+
+
+@dataclass
+class PricingRuleSet:
+    """
+    Candidate pricing rules held in memory.
+
+    Rules follow the PricingService priority: a matching volume tier wins over
+    the price list price. Lines not covered by any rule keep their historical price.
+    The historical line discount is applied on top of the simulated unit price.
+    """
+    product_prices: Dict[int, Decimal] = field(default_factory=dict)
+    volume_tiers: Dict[int, List[VolumeTierRule]] = field(default_factory=dict)
+    customer_ids: Optional[Set[int]] = None  # Price list scope; None = all customers
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PricingRuleSet':
+        """
+        Build a rule set from an API payload.
+
+        Args:
+            data: Dict with 'product_prices' ({product_id: price}), 'volume_tiers'
+                ({product_id: [{min_quantity, max_quantity, price}]}) and optional 'customer_ids'
+
+        Returns:
+            PricingRuleSet
+
+        Raises:
+            ValueError: If a price or quantity is invalid
+        """
+        try:
+            product_prices = {
+                int(product_id): Decimal(str(price))
+                for product_id, price in (data.get('product_prices') or {}).items()
+            }
+            volume_tiers = {
+                int(product_id): [
+                    VolumeTierRule(
+                        min_quantity=Decimal(str(tier['min_quantity'])),
+                        max_quantity=(
+                            Decimal(str(tier['max_quantity']))
+                            if tier.get('max_quantity') is not None else None
+                        ),
+                        price=Decimal(str(tier['price']))
+                    )
+                    for tier in tiers
+                ]
+                for product_id, tiers in (data.get('volume_tiers') or {}).items()
+            }
+        except (KeyError, TypeError, ArithmeticError) as e:
+            raise ValueError(f"Invalid pricing rule set: {e}") from e
+
+        customer_ids = data.get('customer_ids')
+        rule_set = cls(
+            product_prices=product_prices,
+            volume_tiers=volume_tiers,
+            customer_ids=set(int(c) for c in customer_ids) if customer_ids is not None else None
+        )
+        rule_set.validate()
+        return rule_set
+
+    @classmethod
+    def from_price_list(
+        cls,
+        session: Session,
+        price_list_id: int,
+        include_volume_tiers: bool = False,
+        all_customers: bool = False
+    ) -> 'PricingRuleSet':
+        """
+        Build a rule set from a stored (possibly unpublished) price list.
+
+        Args:
+            session: SQLAlchemy session
+            price_list_id: Price list to evaluate
+            include_volume_tiers: Also use the current volume tiers of the listed products
+            all_customers: Apply the list to every customer instead of its assigned customers
+
+        Returns:
+            PricingRuleSet
+        """
+        product_prices = dict(session.execute(
+            select(ProductPriceList.product_id, ProductPriceList.price)
+            .where(ProductPriceList.price_list_id == price_list_id)
+        ).all())
+
+        volume_tiers: Dict[int, List[VolumeTierRule]] = defaultdict(list)
+        if include_volume_tiers and product_prices:
+            rows = session.execute(
+                select(
+                    ProductVolumePricing.product_id,
+                    ProductVolumePricing.min_quantity,
+                    ProductVolumePricing.max_quantity,
+                    ProductVolumePricing.price
+                ).where(ProductVolumePricing.product_id.in_(list(product_prices.keys())))
+            ).all()
+            for product_id, min_quantity, max_quantity, price in rows:
+                volume_tiers[product_id].append(VolumeTierRule(min_quantity, max_quantity, price))
+
+        customer_ids = None
+        if not all_customers:
+            customer_ids = set(session.execute(
+                select(Customer.id)
+                .join(CommercialConditions, CommercialConditions.customer_id == Customer.id)
+                .where(CommercialConditions.price_list_id == price_list_id)
+            ).scalars().all())
+
+        return cls(product_prices=product_prices, volume_tiers=dict(volume_tiers), customer_ids=customer_ids)
+
+    def validate(self) -> None:
+        """
+        Validate the candidate rules.
+
+        Raises:
+            ValueError: If a price is negative or a tier range is invalid
+        """
+        for product_id, price in self.product_prices.items():
+            if price < 0:
+                raise ValueError(f"Price for product {product_id} cannot be negative")
+        for product_id, tiers in self.volume_tiers.items():
+            for tier in tiers:
+                if tier.price < 0:
+                    raise ValueError(f"Volume tier price for product {product_id} cannot be negative")
+                if tier.max_quantity is not None and tier.max_quantity < tier.min_quantity:
+                    raise ValueError(
+                        f"Volume tier max_quantity must be >= min_quantity for product {product_id}"
+                    )
+
+    @property
+    def product_ids(self) -> Set[int]:
+        """Products affected by the rule set."""
+        return set(self.product_prices) | set(self.volume_tiers)
+
+
+@dataclass
+class SimulationBreakdown:
+    """Revenue and margin deltas for one product, customer or category."""
+    key: Optional[int]
+    line_count: int
+    repriced_line_count: int
+    quantity: Decimal
+    current_revenue: Decimal
+    simulated_revenue: Decimal
+    revenue_delta: Decimal
+    current_margin: Decimal
+    simulated_margin: Decimal
+    margin_delta: Decimal
+
+
+@dataclass
+class PricingSimulationResult:
+    """Result of a pricing simulation."""
+    date_from: date
+    date_to: date
+    line_count: int
+    repriced_line_count: int
+    totals: SimulationBreakdown
+    by_product: List[SimulationBreakdown]
+    by_customer: List[SimulationBreakdown]
+    by_category: List[SimulationBreakdown]
+    elapsed_ms: float
+
+
+class _Accumulator:
+    """Running Decimal sums for one aggregation key."""
+    __slots__ = ('lines', 'repriced', 'quantity', 'current', 'simulated', 'cost')
+
+    def __init__(self):
+        self.lines = 0
+        self.repriced = 0
+        self.quantity = Decimal(0)
+        self.current = Decimal(0)
+        self.simulated = Decimal(0)
+        self.cost = Decimal(0)
+
+    def add(self, lines: int, repriced: int, quantity: Decimal, current: Decimal, simulated: Decimal, cost: Decimal):
+        self.lines += lines
+        self.repriced += repriced
+        self.quantity += quantity
+        self.current += current
+        self.simulated += simulated
+        self.cost += cost
+
+    def to_breakdown(self, key: Optional[int]) -> SimulationBreakdown:
+        current = self.current.quantize(_CENT)
+        simulated = self.simulated.quantize(_CENT)
+        cost = self.cost.quantize(_CENT)
+        return SimulationBreakdown(
+            key=key,
+            line_count=self.lines,
+            repriced_line_count=self.repriced,
+            quantity=self.quantity.quantize(Decimal('0.001')),
+            current_revenue=current,
+            simulated_revenue=simulated,
+            revenue_delta=simulated - current,
+            current_margin=current - cost,
+            simulated_margin=simulated - cost,
+            margin_delta=simulated - current
+        )
+
+
+class PricingSimulationService:
+    """
+    Re-prices historical order lines under a candidate rule set.
+
+    Lines are streamed from the database in chunks (only the columns needed),
+    grouped by product, and each product group is re-priced in one vectorized
+    pass (NumPy when available, a bisect-based loop otherwise) instead of one
+    PricingService.get_price_for_customer() call per line.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize the pricing simulation service.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        self.session = session
+
+    def simulate(
+        self,
+        rule_set: PricingRuleSet,
+        date_from: date,
+        date_to: date,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        top: Optional[int] = None
+    ) -> PricingSimulationResult:
+        """
+        Simulate a rule set against the order lines of a period.
+
+        Only products covered by the rule set are read.
+
+        Args:
+            rule_set: Candidate pricing rules
+            date_from: First order date (inclusive)
+            date_to: Last order date (inclusive)
+            chunk_size: Number of lines fetched per chunk
+            top: Keep only the N breakdowns with the largest absolute revenue delta
+
+        Returns:
+            PricingSimulationResult
+        """
+        started = time.perf_counter()
+        rule_set.validate()
+
+        totals = _Accumulator()
+        by_product: Dict[int, _Accumulator] = defaultdict(_Accumulator)
+        by_customer: Dict[int, _Accumulator] = defaultdict(_Accumulator)
+        by_category: Dict[Optional[int], _Accumulator] = defaultdict(_Accumulator)
+
+        product_ids = rule_set.product_ids
+        category_by_product = self._get_product_categories(product_ids)
+        tier_tables = {
+            product_id: self._build_tier_table(tiers)
+            for product_id, tiers in rule_set.volume_tiers.items()
+        }
+
+        for chunk in self._stream_lines(product_ids, date_from, date_to, chunk_size):
+            groups: Dict[int, List[Tuple]] = defaultdict(list)
+            for row in chunk:
+                groups[row[0]].append(row)
+
+            for product_id, rows in groups.items():
+                simulated, repriced = self._reprice_group(
+                    rows,
+                    rule_set.product_prices.get(product_id),
+                    tier_tables.get(product_id),
+                    rule_set.customer_ids
+                )
+                group_totals = self._aggregate_by_customer(rows, simulated, repriced)
+                category_id = category_by_product.get(product_id)
+                for customer_id, sums in group_totals.items():
+                    for acc in (totals, by_product[product_id], by_customer[customer_id], by_category[category_id]):
+                        acc.add(*sums)
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        logger.info(
+            "Pricing simulation over %s lines (%s repriced) in %.1f ms",
+            totals.lines, totals.repriced, elapsed_ms
+        )
+
+        return PricingSimulationResult(
+            date_from=date_from,
+            date_to=date_to,
+            line_count=totals.lines,
+            repriced_line_count=totals.repriced,
+            totals=totals.to_breakdown(None),
+            by_product=self._breakdowns(by_product, top),
+            by_customer=self._breakdowns(by_customer, top),
+            by_category=self._breakdowns(by_category, top),
+            elapsed_ms=elapsed_ms
+        )
+
+    def _stream_lines(
+        self,
+        product_ids: Iterable[int],
+        date_from: date,
+        date_to: date,
+        chunk_size: int
+    ) -> Iterable[List[Tuple]]:
+        """
+        Stream (product_id, customer_id, quantity, unit_price, discount_percent,
+        line_total_ht, cost) rows in chunks.
+        """
+        product_ids = list(product_ids)
+        if not product_ids:
+            return
+
+        stmt = (
+            select(
+                OrderLine.product_id,
+                Order.customer_id,
+                OrderLine.quantity,
+                OrderLine.unit_price,
+                OrderLine.discount_percent,
+                OrderLine.line_total_ht,
+                Product.cost
+            )
+            .join(Order, Order.id == OrderLine.order_id)
+            .join(Product, Product.id == OrderLine.product_id)
+            .where(
+                Order.status.in_(SOLD_ORDER_STATUSES),
+                date_range_filter(Order.created_at, date_from, date_to),
+                OrderLine.product_id.in_(product_ids)
+            )
+            .execution_options(yield_per=chunk_size)
+        )
+        for partition in self.session.execute(stmt).partitions(chunk_size):
+            yield partition
+
+    def _get_product_categories(self, product_ids: Iterable[int]) -> Dict[int, int]:
+        """Map each product to its first category (lowest id)."""
+        product_ids = list(product_ids)
+        if not product_ids:
+            return {}
+        rows = self.session.execute(
+            select(product_categories.c.product_id, func.min(product_categories.c.category_id))
+            .where(product_categories.c.product_id.in_(product_ids))
+            .group_by(product_categories.c.product_id)
+        ).all()
+        return dict(rows)
+
+    @staticmethod
+    def _build_tier_table(tiers: List[VolumeTierRule]) -> Tuple[List[float], List[float], List[float]]:
+        """Sort tiers by min_quantity into parallel (mins, maxs, prices) lists; inf = unlimited."""
+        ordered = sorted(tiers, key=lambda t: t.min_quantity)
+        return (
+            [float(t.min_quantity) for t in ordered],
+            [float(t.max_quantity) if t.max_quantity is not None else float('inf') for t in ordered],
+            [float(t.price) for t in ordered]
+        )
+
+    @staticmethod
+    def _reprice_group(
+        rows: List[Tuple],
+        list_price: Optional[Decimal],
+        tier_table: Optional[Tuple[List[float], List[float], List[float]]],
+        customer_ids: Optional[Set[int]]
+    ) -> Tuple[List[int], List[bool]]:
+        """
+        Re-price all lines of one product.
+
+        Returns:
+            Tuple (simulated line totals HT in cents, repriced flags), aligned with rows
+        """
+        if np is not None:
+            return PricingSimulationService._reprice_group_numpy(rows, list_price, tier_table, customer_ids)
+
+        simulated: List[int] = []
+        repriced: List[bool] = []
+        for _, customer_id, quantity, _, discount_percent, line_total, _ in rows:
+            quantity = float(quantity)
+            price = None
+            if tier_table is not None:
+                mins, maxs, prices = tier_table
+                idx = bisect_right(mins, quantity) - 1
+                if idx >= 0 and quantity <= maxs[idx]:
+                    price = prices[idx]
+            if price is None and list_price is not None and (customer_ids is None or customer_id in customer_ids):
+                price = float(list_price)
+
+            if price is None:
+                simulated.append(_to_cents(line_total))
+                repriced.append(False)
+            else:
+                simulated.append(round(quantity * price * (1 - float(discount_percent or 0) / 100) * 100))
+                repriced.append(True)
+        return simulated, repriced
+
+    @staticmethod
+    def _reprice_group_numpy(
+        rows: List[Tuple],
+        list_price: Optional[Decimal],
+        tier_table: Optional[Tuple[List[float], List[float], List[float]]],
+        customer_ids: Optional[Set[int]]
+    ) -> Tuple[List[int], List[bool]]:
+        """NumPy implementation of _reprice_group."""
+        quantities = np.array([float(r[2]) for r in rows])
+        discounts = np.array([float(r[4] or 0) for r in rows])
+        current = np.array([_to_cents(r[5]) for r in rows], dtype=np.int64)
+
+        prices = np.full(len(rows), np.nan)
+        if list_price is not None:
+            if customer_ids is None:
+                prices[:] = float(list_price)
+            else:
+                in_scope = np.array([r[1] in customer_ids for r in rows], dtype=bool)
+                prices[in_scope] = float(list_price)
+
+        if tier_table is not None:
+            mins, maxs, tier_prices = (np.array(values) for values in tier_table)
+            idx = np.searchsorted(mins, quantities, side='right') - 1
+            safe_idx = np.clip(idx, 0, None)
+            matched = (idx >= 0) & (quantities <= maxs[safe_idx])
+            prices = np.where(matched, tier_prices[safe_idx], prices)
+
+        repriced = ~np.isnan(prices)
+        simulated = np.where(
+            repriced,
+            np.rint(quantities * np.nan_to_num(prices) * (1 - discounts / 100) * 100).astype(np.int64),
+            current
+        )
+        return simulated.tolist(), repriced.tolist()
+
+    @staticmethod
+    def _aggregate_by_customer(
+        rows: List[Tuple],
+        simulated: List[int],
+        repriced: List[bool]
+    ) -> Dict[int, Tuple[int, int, Decimal, Decimal, Decimal, Decimal]]:
+        """
+        Sum one product group per customer.
+
+        Amounts are summed exactly as integer cents (quantities as thousandths),
+        each line cost being rounded to the cent like the line totals.
+
+        Returns:
+            Dict customer_id -> (lines, repriced lines, quantity, current revenue,
+            simulated revenue, cost)
+        """
+        if np is not None:
+            customers = np.array([r[1] for r in rows])
+            quantities = np.array([float(r[2]) for r in rows])
+            columns = np.column_stack((
+                np.ones(len(rows), dtype=np.int64),
+                np.asarray(repriced, dtype=np.int64),
+                np.rint(quantities * 1000).astype(np.int64),
+                np.array([_to_cents(r[5]) for r in rows], dtype=np.int64),
+                np.asarray(simulated, dtype=np.int64),
+                np.rint(quantities * np.array([float(r[6] or 0) for r in rows]) * 100).astype(np.int64)
+            ))
+            keys, inverse = np.unique(customers, return_inverse=True)
+            sums = np.zeros((len(keys), columns.shape[1]), dtype=np.int64)
+            np.add.at(sums, inverse.ravel(), columns)
+            return {
+                int(key): _to_decimal_sums(entry)
+                for key, entry in zip(keys.tolist(), sums.tolist(), strict=True)
+            }
+
+        sums: Dict[int, List[int]] = {}
+        for row, new_total, is_repriced in zip(rows, simulated, repriced, strict=True):
+            _, customer_id, quantity, _, _, line_total, cost = row
+            entry = sums.setdefault(customer_id, [0, 0, 0, 0, 0, 0])
+            entry[0] += 1
+            entry[1] += is_repriced
+            entry[2] += round(quantity * 1000)
+            entry[3] += _to_cents(line_total)
+            entry[4] += new_total
+            entry[5] += _to_cents(quantity * (cost or 0))
+        return {customer_id: _to_decimal_sums(entry) for customer_id, entry in sums.items()}
+
+    @staticmethod
+    def _breakdowns(accumulators: Dict[Any, _Accumulator], top: Optional[int]) -> List[SimulationBreakdown]:
+        """Convert accumulators to breakdowns sorted by absolute revenue delta."""
+        breakdowns = [acc.to_breakdown(key) for key, acc in accumulators.items()]
+        breakdowns.sort(key=lambda b: abs(b.revenue_delta), reverse=True)
+        return breakdowns[:top] if top else breakdowns
@@ -18,8 +18,9 @@ from app.services.pdf_service import PDFService
 class PurchaseReceiptPDFService(PDFService):
     """Service for generating purchase receipt PDFs using the same template as invoices and orders."""
     
-    def __init__(self):
-        super().__init__()  # Initialize PDFService to get styles and helpers
+    def _setup_custom_styles(self):
+        """Setup the common styles plus the purchase receipt ones (built once per class, see PDFService)."""
+        super()._setup_custom_styles()
         self._setup_receipt_styles()
     
     def _setup_receipt_styles(self):
@@ -0,0 +1,400 @@
+"""Replenishment planning: demand-driven reorder points and draft purchase requests."""
+import hashlib
+import logging
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_CEILING
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select, insert, update, func
+from sqlalchemy.orm import Session
+
+from app.domain.models.product import Product
+from app.domain.models.purchase import PurchaseOrder, PurchaseOrderLine, PurchaseRequest, PurchaseRequestLine
+from app.domain.models.replenishment import ReplenishmentSkuState
+from app.domain.models.stock import StockItem
+from app.domain.models.supplier import SupplierConditions
+from app.services.forecast_engine import DemandMatrix, forecast
+from app.services.sales_fact_service import SalesFactService
+
+logger = logging.getLogger(__name__)
+
+# Purchase orders whose remaining quantities are still expected
+OPEN_PURCHASE_ORDER_STATUSES = ('draft', 'sent', 'confirmed', 'partially_received')
+
+# Purchase requests whose quantities count as already requested
+OPEN_PURCHASE_REQUEST_STATUSES = ('draft', 'pending_approval', 'approved')
+
+# Lead time used when a product has no supplier conditions (days)
+DEFAULT_LEAD_TIME_DAYS = 7
+
+# Safety factor applied to the demand deviation (1.65 ≈ 95% service level)
+SERVICE_LEVEL_FACTOR = 1.65
+
+# Rows per bulk insert / update statement
+BATCH_SIZE = 1000
+
+
+@dataclass
+class ReplenishmentNeed:
+    """Quantity to reorder for one product."""
+    product_id: int
+    product_code: str
+    product_name: str
+    supplier_id: Optional[int]
+    lead_time_days: int
+    available_quantity: Decimal  # Physical minus reserved stock
+    on_order_quantity: Decimal  # Open purchase orders and requests
+    daily_demand: Decimal
+    safety_stock: Decimal
+    reorder_point: Decimal
+    suggested_quantity: Decimal
+    unit_price_estimate: Optional[Decimal] = None
+
+
+@dataclass
+class ReplenishmentRunResult:
+    """Outcome of a replenishment planning run."""
+    evaluated: int = 0  # Products whose inputs changed (planned again)
+    skipped: int = 0  # Products whose inputs did not change since the last run
+    needs: List[ReplenishmentNeed] = field(default_factory=list)
+    purchase_request_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class _SkuInputs:
+    product_id: int
+    code: str
+    name: str
+    unit_price: Optional[Decimal]
+    physical: float = 0.0
+    reserved: float = 0.0
+    on_order: float = 0.0
+    min_stock: Optional[float] = None
+    max_stock: Optional[float] = None
+    reorder_point: Optional[float] = None
+    reorder_quantity: Optional[float] = None
+    supplier_id: Optional[int] = None
+    lead_time_days: int = DEFAULT_LEAD_TIME_DAYS
+    daily_demand: float = 0.0
+    demand_deviation: float = 0.0
+
+    def fingerprint(self, cover_days: int) -> str:
+        """Hash of every input the plan of the product depends on."""
+        values = (
+            self.physical, self.reserved, self.on_order, self.min_stock, self.max_stock,
+            self.reorder_point, self.reorder_quantity, self.supplier_id, self.lead_time_days,
+            round(self.daily_demand, 4), round(self.demand_deviation, 4), cover_days
+        )
+        return hashlib.sha256(repr(values).encode('utf-8')).hexdigest()
+
+
+def _float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _quantity(value: float) -> Decimal:
+    """Quantity rounded up to a whole unit."""
+    return Decimal(str(value)).quantize(Decimal('1'), rounding=ROUND_CEILING)
+
+
+def _batches(items: List[Any], size: int = BATCH_SIZE) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class ReplenishmentService:
+    """
+    Plans replenishment for all products at once.
+
+    Inputs are loaded with one grouped query each (stock, quantities on
+    order, preferred supplier and lead time, daily demand), demand velocity
+    and deviation come from the forecasting engine, and the reorder point is
+
+        daily demand × lead time + SERVICE_LEVEL_FACTOR × deviation × √lead time
+
+    (or the stock item reorder point / minimum stock when higher). Products
+    whose available plus on-order quantity is at or below their reorder point
+    are ordered up to the reorder point plus cover_days of demand (or up to
+    the maximum stock), grouped by preferred supplier into draft purchase
+    requests. Products whose inputs did not change since the last run are
+    skipped.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize the replenishment service.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        self.session = session
+
+    def run(
+        self,
+        requested_by: int,
+        as_of: Optional[date] = None,
+        product_ids: Optional[Sequence[int]] = None,
+        history_days: int = 90,
+        cover_days: int = 30,
+        method: Optional[str] = None,
+        force: bool = False,
+        dry_run: bool = False
+    ) -> ReplenishmentRunResult:
+        """
+        Run a replenishment planning pass.
+
+        The caller commits the session.
+
+        Args:
+            requested_by: User ID recorded on the purchase requests
+            as_of: Planning day (default: today); demand history ends the day before
+            product_ids: Products to plan (None = all active products)
+            history_days: Days of sales history used for demand velocity
+            cover_days: Days of demand ordered beyond the reorder point
+            method: Forecasting method for the daily demand (see
+                forecast_engine.forecast); None uses the historical daily average
+            force: Plan every product, even when its inputs did not change
+            dry_run: Compute the needs without creating requests or saving state
+
+        Returns:
+            ReplenishmentRunResult
+        """
+        as_of = as_of or date.today()
+        inputs = self._load_inputs(as_of, product_ids, history_days, method)
+        result = ReplenishmentRunResult()
+
+        previous = dict(self.session.execute(
+            select(ReplenishmentSkuState.product_id, ReplenishmentSkuState.input_hash)
+        ).all())
+        planned: Dict[int, str] = {}
+        for sku in inputs:
+            fingerprint = sku.fingerprint(cover_days)
+            if not force and previous.get(sku.product_id) == fingerprint:
+                result.skipped += 1
+                continue
+            planned[sku.product_id] = fingerprint
+            result.evaluated += 1
+            need = self._plan_sku(sku, cover_days)
+            if need is not None:
+                result.needs.append(need)
+
+        if dry_run:
+            return result
+
+        request_by_product = self._emit_requests(result, requested_by, as_of)
+        self._save_states(inputs, planned, previous, result.needs, request_by_product)
+        logger.info(
+            "Replenishment run: %s evaluated, %s skipped, %s needs, %s purchase requests",
+            result.evaluated, result.skipped, len(result.needs), len(result.purchase_request_ids)
+        )
+        return result
+
+    # ==================== Inputs ====================
+
+    def _load_inputs(
+        self,
+        as_of: date,
+        product_ids: Optional[Sequence[int]],
+        history_days: int,
+        method: Optional[str]
+    ) -> List[_SkuInputs]:
+        products_stmt = select(
+            Product.id, Product.code, Product.name, Product.cost, Product.price
+        ).where(Product.status == 'active').order_by(Product.id)
+        if product_ids is not None:
+            products_stmt = products_stmt.where(Product.id.in_(list(product_ids)))
+        skus = {
+            product_id: _SkuInputs(product_id, code, name, cost or price or None)
+            for product_id, code, name, cost, price in self.session.execute(products_stmt).all()
+        }
+        if not skus:
+            return []
+
+        # Stock and stock settings, summed over locations
+        for product_id, physical, reserved, min_stock, max_stock, reorder_point, reorder_quantity in self.session.execute(
+            select(
+                StockItem.product_id,
+                func.sum(StockItem.physical_quantity),
+                func.sum(StockItem.reserved_quantity),
+                func.sum(StockItem.min_stock),
+                func.sum(StockItem.max_stock),
+                func.sum(StockItem.reorder_point),
+                func.sum(StockItem.reorder_quantity)
+            ).group_by(StockItem.product_id)
+        ).all():
+            sku = skus.get(product_id)
+            if sku is not None:
+                sku.physical = float(physical or 0)
+                sku.reserved = float(reserved or 0)
+                sku.min_stock = _float(min_stock)
+                sku.max_stock = _float(max_stock)
+                sku.reorder_point = _float(reorder_point)
+                sku.reorder_quantity = _float(reorder_quantity)
+
+        # Quantities still expected from open purchase orders, or already requested
+        on_order_stmts = (
+            select(
+                PurchaseOrderLine.product_id,
+                func.sum(PurchaseOrderLine.quantity - func.coalesce(PurchaseOrderLine.quantity_received, 0))
+            ).join(PurchaseOrder, PurchaseOrder.id == PurchaseOrderLine.purchase_order_id)
+            .where(PurchaseOrder.status.in_(OPEN_PURCHASE_ORDER_STATUSES))
+            .group_by(PurchaseOrderLine.product_id),
+            select(
+                PurchaseRequestLine.product_id, func.sum(PurchaseRequestLine.quantity)
+            ).join(PurchaseRequest, PurchaseRequest.id == PurchaseRequestLine.purchase_request_id)
+            .where(PurchaseRequest.status.in_(OPEN_PURCHASE_REQUEST_STATUSES))
+            .group_by(PurchaseRequestLine.product_id),
+        )
+        for stmt in on_order_stmts:
+            for product_id, quantity in self.session.execute(stmt).all():
+                sku = skus.get(product_id)
+                if sku is not None:
+                    sku.on_order += max(float(quantity or 0), 0.0)
+
+        # Preferred supplier: supplier of the latest purchase order of the product
+        latest_order = (
+            select(
+                PurchaseOrderLine.product_id.label('product_id'),
+                func.max(PurchaseOrderLine.purchase_order_id).label('purchase_order_id')
+            ).join(PurchaseOrder, PurchaseOrder.id == PurchaseOrderLine.purchase_order_id)
+            .where(PurchaseOrder.status != 'cancelled')
+            .group_by(PurchaseOrderLine.product_id)
+            .subquery()
+        )
+        for product_id, supplier_id, lead_time in self.session.execute(
+            select(latest_order.c.product_id, PurchaseOrder.supplier_id, SupplierConditions.delivery_lead_time_days)
+            .join(PurchaseOrder, PurchaseOrder.id == latest_order.c.purchase_order_id)
+            .outerjoin(SupplierConditions, SupplierConditions.supplier_id == PurchaseOrder.supplier_id)
+        ).all():
+            sku = skus.get(product_id)
+            if sku is not None:
+                sku.supplier_id = supplier_id
+                if lead_time is not None:
+                    sku.lead_time_days = lead_time
+
+        # Demand velocity and deviation of every product at once
+        end_date = as_of - timedelta(days=1)
+        start_date = as_of - timedelta(days=history_days)
+        records = SalesFactService(self.session).get_daily_demand(
+            start_date, end_date, measure='quantity', product_ids=product_ids
+        )
+        matrix = DemandMatrix.from_records(records, start_date, end_date, keys=list(skus))
+        batch = forecast(matrix, method or 'moving_average')
+        velocity = batch.level if method else batch.mean
+        for index, sku in enumerate(skus.values()):
+            sku.daily_demand = max(velocity[index], 0.0)
+            sku.demand_deviation = batch.std_dev[index]
+        return list(skus.values())
+
+    # ==================== Planning ====================
+
+    @staticmethod
+    def _plan_sku(sku: _SkuInputs, cover_days: int) -> Optional[ReplenishmentNeed]:
+        """Need of a product, or None if its position covers the reorder point."""
+        lead_time = max(sku.lead_time_days, 0)
+        safety_stock = SERVICE_LEVEL_FACTOR * sku.demand_deviation * math.sqrt(lead_time)
+        reorder_point = max(
+            sku.daily_demand * lead_time + safety_stock,
+            sku.reorder_point or 0.0,
+            sku.min_stock or 0.0
+        )
+        if reorder_point <= 0:
+            return None
+        available = sku.physical - sku.reserved
+        position = available + sku.on_order
+        if position > reorder_point:
+            return None
+
+        target = sku.max_stock if sku.max_stock else reorder_point + sku.daily_demand * cover_days
+        quantity = max(target - position, sku.reorder_quantity or 0.0)
+        if quantity <= 0:
+            return None
+        return ReplenishmentNeed(
+            product_id=sku.product_id,
+            product_code=sku.code,
+            product_name=sku.name,
+            supplier_id=sku.supplier_id,
+            lead_time_days=lead_time,
+            available_quantity=Decimal(str(round(available, 3))),
+            on_order_quantity=Decimal(str(round(sku.on_order, 3))),
+            daily_demand=Decimal(str(round(sku.daily_demand, 4))),
+            safety_stock=Decimal(str(round(safety_stock, 3))),
+            reorder_point=Decimal(str(round(reorder_point, 3))),
+            suggested_quantity=_quantity(quantity),
+            unit_price_estimate=sku.unit_price
+        )
+
+    # ==================== Output ====================
+
+    def _emit_requests(self, result: ReplenishmentRunResult, requested_by: int, as_of: date) -> Dict[int, int]:
+        """Create one draft purchase request per supplier; returns request ID per product."""
+        by_supplier: Dict[Optional[int], List[ReplenishmentNeed]] = defaultdict(list)
+        for need in result.needs:
+            by_supplier[need.supplier_id].append(need)
+
+        request_by_product: Dict[int, int] = {}
+        for supplier_id, needs in by_supplier.items():
+            request = PurchaseRequest.create(
+                requested_by=requested_by,
+                required_date=as_of + timedelta(days=max(need.lead_time_days for need in needs)),
+                supplier_id=supplier_id,
+                notes=f"Replenishment run of {as_of.isoformat()}"
+            )
+            self.session.add(request)
+            self.session.flush()
+
+            lines = [
+                {
+                    'purchase_request_id': request.id,
+                    'product_id': need.product_id,
+                    'quantity': need.suggested_quantity,
+                    'unit_price_estimate': need.unit_price_estimate,
+                    'sequence': sequence
+                }
+                for sequence, need in enumerate(needs, 1)
+            ]
+            for batch in _batches(lines):
+                self.session.execute(insert(PurchaseRequestLine), batch)
+            self.session.expire(request, ['lines'])
+
+            result.purchase_request_ids.append(request.id)
+            for need in needs:
+                request_by_product[need.product_id] = request.id
+        return request_by_product
+
+    def _save_states(
+        self,
+        inputs: List[_SkuInputs],
+        planned: Dict[int, str],
+        previous: Dict[int, str],
+        needs: List[ReplenishmentNeed],
+        request_by_product: Dict[int, int]
+    ) -> None:
+        """Record the fingerprint and outcome of every planned product."""
+        now = datetime.now()
+        need_by_product = {need.product_id: need for need in needs}
+        inserts, updates = [], []
+        for sku in inputs:
+            if sku.product_id not in planned:
+                continue
+            need = need_by_product.get(sku.product_id)
+            row = {
+                'product_id': sku.product_id,
+                'input_hash': planned[sku.product_id],
+                'supplier_id': sku.supplier_id,
+                'daily_demand': Decimal(str(round(sku.daily_demand, 4))),
+                'reorder_point': need.reorder_point if need else Decimal(0),
+                'suggested_quantity': need.suggested_quantity if need else Decimal(0),
+                'purchase_request_id': request_by_product.get(sku.product_id),
+                'planned_at': now
+            }
+            (updates if sku.product_id in previous else inserts).append(row)
+
+        for batch in _batches(inserts):
+            self.session.execute(insert(ReplenishmentSkuState), batch)
+        for batch in _batches(updates):
+            self.session.execute(update(ReplenishmentSkuState), batch)
+        self.session.flush()
@@ -1,11 +1,14 @@
 """Report builder service for building custom reports with column selection, filters, and calculated fields."""
 from typing import List, Dict, Any, Optional
-from decimal import Decimal
-from datetime import date
+from datetime import date, timedelta
 from dataclasses import dataclass
 
 from app.services.report_service import ReportService, ReportData
+from app.services.report_frame import ReportFrame
+from app.services.report_formula import compile_formula
+from app.services.report_query_planner import ReportQueryPlanner, ReportPlan
 from app.domain.models.report import ReportTemplate
+from app.infrastructure.db import get_session
 
 
 @dataclass
@@ -47,15 +50,26 @@ class CalculatedField:
     """Calculated field definition."""
     name: str
     label: str
-    formula: str  # Simple formula like "revenue - cost" or "margin / revenue * 100"
+    formula: str  # Arithmetic formula like "revenue - cost" or "margin / revenue * 100" (see report_formula)
     type: str = 'number'  # 'number', 'currency', 'percent'
 
 
 class ReportBuilderService:
-    """Service for building custom reports with column selection, filters, and calculated fields."""
+    """
+    Service for building custom reports with column selection, filters, and calculated fields.
+    
+    Rows are processed as a columnar ReportFrame: filters are evaluated as masks
+    over whole columns, grouping uses hashed group codes and sorting an argsort
+    over per-column keys.
+    
+    Reports built from a template whose type has a SQL source are planned
+    first: the filters, grouping and sorting that can be translated run in
+    the database and only the rest is processed in memory.
+    """
     
     def __init__(self):
         self.report_service = ReportService()
+        self.query_planner = ReportQueryPlanner()
     
     def build_report(
         self,
@@ -80,269 +94,87 @@ class ReportBuilderService:
         Returns:
             Modified ReportData object
         """
-        # Start with a copy of the data
-        filtered_data = list(report_data.data)
+        # Transpose the rows once into a columnar frame
+        frame = ReportFrame.from_records(report_data.data)
         
         # Apply filters
         if filters:
-            filtered_data = self._apply_filters(filtered_data, filters)
+            frame = frame.filter(filters)
         
         # Add calculated fields
         if calculated_fields:
-            filtered_data = self._add_calculated_fields(filtered_data, calculated_fields)
+            frame = self._add_calculated_fields(frame, calculated_fields)
         
-        # Apply grouping
-        if grouping:
-            filtered_data = self._apply_grouping(filtered_data, grouping)
+        # Apply grouping (first grouping field, aggregated when an aggregate is set)
+        if grouping and grouping[0].aggregate:
+            frame = frame.group_by(grouping[0].field, grouping[0].aggregate)
         
-        # Apply sorting
+        # Apply sorting (first sort definition is the primary key)
         if sorting:
-            filtered_data = self._apply_sorting(filtered_data, sorting)
+            frame = frame.sort(sorting)
         
         # Filter columns
-        if columns:
-            filtered_data = self._filter_columns(filtered_data, columns)
+        visible_columns = [c.field for c in columns if c.visible] if columns else None
+        filtered_data = frame.to_records(visible_columns or None)
         
         # Update report data
         report_data.data = filtered_data
         
         # Update metadata
-        report_data.metadata.update({
+        report_data.metadata.update(
+            self._definitions_metadata(columns, filters, sorting, grouping, calculated_fields)
+        )
+        
+        return report_data
+    
+    @staticmethod
+    def _definitions_metadata(
+        columns: Optional[List[ColumnDefinition]],
+        filters: Optional[List[FilterCondition]],
+        sorting: Optional[List[SortDefinition]],
+        grouping: Optional[List[GroupDefinition]],
+        calculated_fields: Optional[List[CalculatedField]]
+    ) -> Dict[str, Any]:
+        """Report metadata describing the builder definitions."""
+        return {
             'columns': [{'field': c.field, 'label': c.label, 'type': c.type} for c in columns] if columns else None,
             'filters': [{'field': f.field, 'operator': f.operator, 'value': f.value} for f in filters] if filters else None,
             'sorting': [{'field': s.field, 'direction': s.direction} for s in sorting] if sorting else None,
             'grouping': [{'field': g.field, 'label': g.label, 'aggregate': g.aggregate} for g in grouping] if grouping else None,
             'calculated_fields': [{'name': cf.name, 'label': cf.label, 'formula': cf.formula} for cf in calculated_fields] if calculated_fields else None
-        })
-        
-        return report_data
-    
-    def _apply_filters(
-        self,
-        data: List[Dict[str, Any]],
-        filters: List[FilterCondition]
-    ) -> List[Dict[str, Any]]:
-        """Apply filter conditions to data."""
-        filtered = data
-        
-        for filter_cond in filters:
-            field = filter_cond.field
-            operator = filter_cond.operator
-            value = filter_cond.value
-            value2 = filter_cond.value2
-            
-            if operator == 'equals':
-                filtered = [row for row in filtered if row.get(field) == value]
-            elif operator == 'not_equals':
-                filtered = [row for row in filtered if row.get(field) != value]
-            elif operator == 'contains':
-                filtered = [row for row in filtered if str(value).lower() in str(row.get(field, '')).lower()]
-            elif operator == 'greater_than':
-                filtered = [row for row in filtered if self._compare_values(row.get(field), value) > 0]
-            elif operator == 'less_than':
-                filtered = [row for row in filtered if self._compare_values(row.get(field), value) < 0]
-            elif operator == 'between':
-                if value2 is not None:
-                    filtered = [row for row in filtered if 
-                                self._compare_values(row.get(field), value) >= 0 and
-                                self._compare_values(row.get(field), value2) <= 0]
-            elif operator == 'in':
-                if isinstance(value, list):
-                    filtered = [row for row in filtered if row.get(field) in value]
-        
-        return filtered
-    
-    def _compare_values(self, val1: Any, val2: Any) -> int:
-        """Compare two values, handling different types."""
-        try:
-            # Try numeric comparison
-            if isinstance(val1, (int, float, Decimal)) and isinstance(val2, (int, float, Decimal)):
-                if Decimal(str(val1)) > Decimal(str(val2)):
-                    return 1
-                elif Decimal(str(val1)) < Decimal(str(val2)):
-                    return -1
-                else:
-                    return 0
-            # String comparison
-            elif isinstance(val1, str) and isinstance(val2, str):
-                if val1 > val2:
-                    return 1
-                elif val1 < val2:
-                    return -1
-                else:
-                    return 0
-            # Date comparison
-            elif isinstance(val1, date) and isinstance(val2, (date, str)):
-                if isinstance(val2, str):
-                    val2 = date.fromisoformat(val2)
-                if val1 > val2:
-                    return 1
-                elif val1 < val2:
-                    return -1
-                else:
-                    return 0
-            else:
-                # Fallback to string comparison
-                return 1 if str(val1) > str(val2) else (-1 if str(val1) < str(val2) else 0)
-        except:
-            return 0
+        }
     
     def _add_calculated_fields(
         self,
-        data: List[Dict[str, Any]],
+        frame: ReportFrame,
         calculated_fields: List[CalculatedField]
-    ) -> List[Dict[str, Any]]:
-        """Add calculated fields to data."""
-        result = []
-        
-        for row in data:
-            new_row = dict(row)
-            
-            for calc_field in calculated_fields:
-                try:
-                    # Simple formula evaluation (replace field names with values)
-                    formula = calc_field.formula
-                    for key, val in row.items():
-                        # Replace field names in formula
-                        formula = formula.replace(key, str(val))
-                    
-                    # Evaluate formula (simple arithmetic only)
-                    # Note: In production, use a proper formula parser for security
-                    value = eval(formula)  # WARNING: eval is unsafe, use a proper parser in production
-                    
-                    new_row[calc_field.name] = value
-                except Exception as e:
-                    # If calculation fails, set to None
-                    new_row[calc_field.name] = None
-            
-            result.append(new_row)
-        
-        return result
-    
-    def _apply_grouping(
-        self,
-        data: List[Dict[str, Any]],
-        grouping: List[GroupDefinition]
-    ) -> List[Dict[str, Any]]:
-        """Apply grouping to data."""
-        if not grouping:
-            return data
-        
-        # Group by first grouping field
-        group_field = grouping[0].field
-        aggregate = grouping[0].aggregate
-        
-        # Group data
-        groups = {}
-        for row in data:
-            group_key = row.get(group_field)
-            if group_key not in groups:
-                groups[group_key] = []
-            groups[group_key].append(row)
-        
-        # Aggregate if specified
-        if aggregate:
-            result = []
-            for group_key, group_rows in groups.items():
-                # Create aggregated row
-                aggregated_row = {group_field: group_key}
-                
-                # Aggregate numeric fields
-                for field in group_rows[0].keys():
-                    if field != group_field:
-                        try:
-                            values = [row.get(field) for row in group_rows if row.get(field) is not None]
-                            if values:
-                                if aggregate == 'sum':
-                                    aggregated_row[field] = sum(Decimal(str(v)) if not isinstance(v, Decimal) else v for v in values)
-                                elif aggregate == 'avg':
-                                    aggregated_row[field] = sum(Decimal(str(v)) if not isinstance(v, Decimal) else v for v in values) / len(values)
-                                elif aggregate == 'count':
-                                    aggregated_row[field] = len(values)
-                                elif aggregate == 'min':
-                                    aggregated_row[field] = min(values)
-                                elif aggregate == 'max':
-                                    aggregated_row[field] = max(values)
-                                else:
-                                    aggregated_row[field] = values[0] if values else None
-                            else:
-                                aggregated_row[field] = None
-                        except:
-                            aggregated_row[field] = group_rows[0].get(field)
-                
-                result.append(aggregated_row)
-            
-            return result
-        else:
-            # Return grouped data as-is (nested structure)
-            return data
-    
-    def _apply_sorting(
-        self,
-        data: List[Dict[str, Any]],
-        sorting: List[SortDefinition]
-    ) -> List[Dict[str, Any]]:
-        """Apply sorting to data."""
-        if not sorting:
-            return data
-        
-        # Sort by first sort definition
-        sort_def = sorting[0]
-        field = sort_def.field
-        direction = sort_def.direction
-        
-        def sort_key(row):
-            value = row.get(field)
-            # Handle None values
-            if value is None:
-                return (0, '') if direction == 'asc' else (1, '')
-            # Handle different types
-            if isinstance(value, (int, float, Decimal)):
-                return (1, float(value))
-            elif isinstance(value, date):
-                return (1, value.isoformat())
-            else:
-                return (1, str(value))
+    ) -> ReportFrame:
+        """
+        Add calculated fields to the frame.
         
-        sorted_data = sorted(data, key=sort_key, reverse=(direction == 'desc'))
+        Each formula is compiled once (and cached) and evaluated over whole
+        columns; a calculated field can use the fields calculated before it.
+        Rows where a formula cannot be computed get None.
         
-        # Apply additional sorts if specified
-        for sort_def in sorting[1:]:
-            field = sort_def.field
-            direction = sort_def.direction
+        Args:
+            frame: Report frame
+            calculated_fields: Calculated field definitions
             
-            def secondary_sort_key(row):
-                value = row.get(field)
-                if value is None:
-                    return (0, '') if direction == 'asc' else (1, '')
-                if isinstance(value, (int, float, Decimal)):
-                    return (1, float(value))
-                elif isinstance(value, date):
-                    return (1, value.isoformat())
-                else:
-                    return (1, str(value))
+        Returns:
+            Frame with one column per calculated field
             
-            sorted_data = sorted(sorted_data, key=secondary_sort_key, reverse=(direction == 'desc'))
-        
-        return sorted_data
-    
-    def _filter_columns(
-        self,
-        data: List[Dict[str, Any]],
-        columns: List[ColumnDefinition]
-    ) -> List[Dict[str, Any]]:
-        """Filter data to only include specified columns."""
-        visible_columns = [c.field for c in columns if c.visible]
-        
-        if not visible_columns:
-            return data
-        
-        result = []
-        for row in data:
-            filtered_row = {field: row.get(field) for field in visible_columns if field in row}
-            result.append(filtered_row)
-        
-        return result
+        Raises:
+            FormulaError: If a formula is invalid
+        """
+        calculated: Dict[str, List[Any]] = {}
+        for calc_field in calculated_fields:
+            formula = compile_formula(calc_field.formula)
+            columns = {
+                name: calculated[name] if name in calculated else frame.column(name).values
+                for name in formula.fields
+            }
+            calculated[calc_field.name] = formula.evaluate(columns, len(frame))
+        return frame.with_columns(calculated)
     
     def build_from_template(
         self,
@@ -361,13 +193,6 @@ class ReportBuilderService:
         Returns:
             ReportData object
         """
-        # Generate base report
-        base_report = self.report_service.generate_custom_report(
-            template.id,
-            start_date,
-            end_date
-        )
-        
         # Convert template configuration to builder definitions
         columns = None
         if template.columns:
@@ -426,6 +251,37 @@ class ReportBuilderService:
                 for cf in template.calculated_fields
             ]
         
+        # Push the translatable definitions down to SQL for known report sources
+        plan = self.query_planner.plan(
+            template.report_type,
+            columns=columns,
+            filters=filters,
+            sorting=sorting,
+            grouping=grouping,
+            calculated_fields=calculated_fields
+        )
+        if plan is not None:
+            report = self.build_report(
+                self._run_plan(plan, start_date, end_date),
+                columns=columns,
+                filters=plan.memory_filters or None,
+                sorting=plan.memory_sorting or None,
+                grouping=plan.memory_grouping,
+                calculated_fields=calculated_fields
+            )
+            report.metadata.update(
+                self._definitions_metadata(columns, filters, sorting, grouping, calculated_fields)
+            )
+            report.metadata['sql_pushdown'] = plan.describe()
+            return report
+        
+        # Generate base report
+        base_report = self.report_service.generate_custom_report(
+            template.id,
+            start_date,
+            end_date
+        )
+        
         # Build report with template configuration
         return self.build_report(
             base_report,
@@ -435,4 +291,31 @@ class ReportBuilderService:
             grouping=grouping,
             calculated_fields=calculated_fields
         )
-
+    
+    def _run_plan(
+        self,
+        plan: ReportPlan,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> ReportData:
+        """Base report data of a planned report (only the rows the plan selects)."""
+        # Default to last 30 days, as for base custom reports
+        end_date = end_date or date.today()
+        start_date = start_date or (end_date - timedelta(days=30))
+        
+        with get_session() as session:
+            data = plan.execute(session, start_date, end_date)
+            summary = plan.source.summary(session, start_date, end_date)
+        
+        if not plan.source.dated:
+            start_date = end_date = date.today()
+        
+        return ReportData(
+            title=plan.source.title,
+            report_type=plan.source.report_type,
+            period_start=start_date,
+            period_end=end_date,
+            data=data,
+            summary=summary,
+            metadata={}
+        )
@@ -1,16 +1,30 @@
 """Report export service for exporting reports to Excel, PDF, and CSV."""
-from io import BytesIO, StringIO
-from typing import List, Dict, Any, Optional
+from io import BytesIO
+from typing import List, Dict, Any, Optional, Iterator, Callable, Tuple, BinaryIO
 from decimal import Decimal
 from datetime import date, datetime
-import csv
 
 from app.services.report_service import ReportData
 from app.services.pdf_service import PDFService
+from app.services.streaming_export import (
+    WIDTH_SAMPLE_ROWS, iter_csv, estimate_column_widths, peek, write_only_workbook, set_column_widths
+)
+
+# Summary entries holding nested lists, not exported
+NESTED_SUMMARY_KEYS = ('top_products', 'top_customers', 'suppliers_summary')
+
+# Data rows per PDF table
+PDF_TABLE_ROWS = 500
 
 
 class ReportExportService:
-    """Service for exporting reports to Excel, PDF, and CSV formats."""
+    """
+    Service for exporting reports to Excel, PDF, and CSV formats.
+    
+    CSV is produced as a stream of chunks and Excel with an openpyxl
+    write-only workbook, so exports do not build the whole document as
+    cells or a single string.
+    """
     
     def __init__(self):
         self.pdf_service = PDFService()
@@ -30,98 +44,78 @@ class ReportExportService:
         Returns:
             Excel file bytes
         """
-        try:
-            import openpyxl
-            from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-            from openpyxl.utils import get_column_letter
-        except ImportError:
-            raise ImportError("openpyxl is required for Excel export. Install it with: pip install openpyxl")
+        output = BytesIO()
+        self.write_excel(report_data, output)
+        return output.getvalue()
+    
+    def write_excel(self, report_data: ReportData, output: BinaryIO) -> None:
+        """
+        Write report to an Excel file in write-only mode.
+        
+        Rows are streamed to the workbook instead of being kept as cells, and
+        column widths are estimated from the first rows before writing, so
+        memory does not grow with the number of rows.
         
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = report_data.title[:31]  # Excel sheet name limit
+        Args:
+            report_data: ReportData object to export
+            output: Binary file to write the workbook to
+        """
+        wb = write_only_workbook()
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
         
-        # Header style
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        header_alignment = Alignment(horizontal="center", vertical="center")
+        ws = wb.create_sheet(report_data.title[:31])  # Excel sheet name limit
+        headers = list(report_data.data[0].keys()) if report_data.data else []
+        rows = (self._row_values(row_data, headers, _excel_value) for row_data in report_data.data or [])
+        sample, rows = peek(rows, WIDTH_SAMPLE_ROWS)
+        if headers:
+            set_column_widths(ws, estimate_column_widths(headers, sample))
+        
+        def styled(value: Any, **styles: Any) -> Any:
+            cell = WriteOnlyCell(ws, value=value)
+            for name, style in styles.items():
+                setattr(cell, name, style)
+            return cell
         
         # Title row
-        ws.merge_cells(f'A1:{get_column_letter(len(report_data.data[0]) if report_data.data else 1)}1')
-        title_cell = ws['A1']
-        title_cell.value = report_data.title
-        title_cell.font = Font(bold=True, size=14)
-        title_cell.alignment = Alignment(horizontal="center")
+        ws.append([styled(report_data.title, font=Font(bold=True, size=14), alignment=Alignment(horizontal="center"))])
         
         # Period info
         if report_data.period_start and report_data.period_end:
-            ws['A2'] = f"Period: {report_data.period_start} to {report_data.period_end}"
-            ws['A2'].font = Font(size=10, italic=True)
+            ws.append([styled(
+                f"Period: {report_data.period_start} to {report_data.period_end}", font=Font(size=10, italic=True)
+            )])
+        else:
+            ws.append([])
         
         # Data headers
-        if report_data.data:
-            headers = list(report_data.data[0].keys())
-            ws.append(headers)
-            
-            # Style headers
-            for col_idx, header in enumerate(headers, 1):
-                cell = ws.cell(row=3, column=col_idx)
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = header_alignment
-                cell.border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
+        if headers:
+            side = Side(style='thin')
+            header_styles = {
+                'fill': PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+                'font': Font(bold=True, color="FFFFFF", size=11),
+                'alignment': Alignment(horizontal="center", vertical="center"),
+                'border': Border(left=side, right=side, top=side, bottom=side),
+            }
+            ws.append([styled(header, **header_styles) for header in headers])
             
             # Data rows
-            for row_data in report_data.data:
-                row = []
-                for header in headers:
-                    value = row_data.get(header)
-                    # Format values
-                    if isinstance(value, Decimal):
-                        row.append(float(value))
-                    elif isinstance(value, (date, datetime)):
-                        row.append(value.isoformat())
-                    else:
-                        row.append(value)
+            for row in rows:
                 ws.append(row)
-            
-            # Auto-adjust column widths
-            for col_idx, header in enumerate(headers, 1):
-                max_length = len(str(header))
-                column_letter = get_column_letter(col_idx)
-                for row in ws.iter_rows(min_row=4, max_row=ws.max_row, min_col=col_idx, max_col=col_idx):
-                    for cell in row:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
         
         # Summary section
-        if report_data.summary:
-            summary_row = len(report_data.data) + 5 if report_data.data else 5
-            ws.cell(row=summary_row, column=1).value = "Summary"
-            ws.cell(row=summary_row, column=1).font = Font(bold=True, size=12)
-            
-            summary_row += 1
-            for key, value in report_data.summary.items():
-                if key not in ['top_products', 'top_customers', 'suppliers_summary']:  # Skip nested summaries
-                    ws.cell(row=summary_row, column=1).value = str(key).replace('_', ' ').title()
-                    ws.cell(row=summary_row, column=1).font = Font(bold=True)
-                    if isinstance(value, (int, float, Decimal)):
-                        ws.cell(row=summary_row, column=2).value = float(value)
-                    else:
-                        ws.cell(row=summary_row, column=2).value = str(value)
-                    summary_row += 1
+        summary = self._summary_items(report_data)
+        if summary:
+            ws.append([])
+            ws.append([styled("Summary", font=Font(bold=True, size=12))])
+            bold = Font(bold=True)
+            for label, value in summary:
+                ws.append([
+                    styled(label, font=bold),
+                    float(value) if isinstance(value, (int, float, Decimal)) else str(value)
+                ])
         
-        # Save to bytes
-        output = BytesIO()
         wb.save(output)
-        output.seek(0)
-        return output.read()
     
     def export_to_pdf(
         self,
@@ -169,29 +163,14 @@ class ReportExportService:
             story.append(Paragraph(period_text, styles['Normal']))
             story.append(Spacer(1, 6*mm))
         
-        # Data table
+        # Data table, split in fixed-size tables: a single huge table is re-split
+        # (and copied) at every page break, which is quadratic in the row count
         if report_data.data:
-            # Prepare table data
             headers = list(report_data.data[0].keys())
-            table_data = [headers]
-            
-            for row_data in report_data.data:
-                row = []
-                for header in headers:
-                    value = row_data.get(header)
-                    if isinstance(value, Decimal):
-                        row.append(f"{value:,.2f}")
-                    elif isinstance(value, (date, datetime)):
-                        row.append(value.strftime('%Y-%m-%d'))
-                    elif value is None:
-                        row.append('')
-                    else:
-                        row.append(str(value))
-                table_data.append(row)
-            
-            # Create table
-            table = Table(table_data, repeatRows=1)
-            table.setStyle(TableStyle([
+            sample = [self._row_values(row_data, headers, _pdf_value) for row_data in report_data.data[:WIDTH_SAMPLE_ROWS]]
+            widths = estimate_column_widths(headers, sample)
+            col_widths = [doc.width * width / sum(widths) for width in widths]
+            table_style = TableStyle([
                 # Header row
                 ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
@@ -209,9 +188,17 @@ class ReportExportService:
                 ('FONTSIZE', (0, 1), (-1, -1), 9),
                 ('GRID', (0, 0), (-1, -1), 1, colors.grey),
                 ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
-            ]))
+            ])
             
-            story.append(table)
+            for offset in range(0, len(report_data.data), PDF_TABLE_ROWS):
+                table_data = [headers]
+                table_data.extend(
+                    self._row_values(row_data, headers, _pdf_value)
+                    for row_data in report_data.data[offset:offset + PDF_TABLE_ROWS]
+                )
+                table = Table(table_data, colWidths=col_widths, repeatRows=1)
+                table.setStyle(table_style)
+                story.append(table)
             story.append(Spacer(1, 12*mm))
         
         # Summary section
@@ -220,12 +207,11 @@ class ReportExportService:
             story.append(Spacer(1, 6*mm))
             
             summary_data = []
-            for key, value in report_data.summary.items():
-                if key not in ['top_products', 'top_customers', 'suppliers_summary']:
-                    if isinstance(value, (int, float, Decimal)):
-                        summary_data.append([str(key).replace('_', ' ').title(), f"{float(value):,.2f}"])
-                    else:
-                        summary_data.append([str(key).replace('_', ' ').title(), str(value)])
+            for label, value in self._summary_items(report_data):
+                if isinstance(value, (int, float, Decimal)):
+                    summary_data.append([label, f"{float(value):,.2f}"])
+                else:
+                    summary_data.append([label, str(value)])
             
             if summary_data:
                 summary_table = Table(summary_data, colWidths=[80*mm, 80*mm])
@@ -258,46 +244,89 @@ class ReportExportService:
         Returns:
             CSV string
         """
-        output = StringIO()
-        writer = csv.writer(output)
+        return ''.join(self.stream_csv(report_data))
+    
+    def stream_csv(self, report_data: ReportData) -> Iterator[str]:
+        """
+        Export report to CSV, yielding chunks of rows.
         
+        Args:
+            report_data: ReportData object to export
+            
+        Yields:
+            CSV text chunks
+        """
+        return iter_csv(self._csv_rows(report_data))
+    
+    def _csv_rows(self, report_data: ReportData) -> Iterator[List[Any]]:
+        """CSV rows of a report: title, period, data and summary."""
         # Title
-        writer.writerow([report_data.title])
+        yield [report_data.title]
         if report_data.period_start and report_data.period_end:
-            writer.writerow([f"Period: {report_data.period_start} to {report_data.period_end}"])
-        writer.writerow([])  # Empty row
+            yield [f"Period: {report_data.period_start} to {report_data.period_end}"]
+        yield []  # Empty row
         
         # Headers
         if report_data.data:
             headers = list(report_data.data[0].keys())
-            writer.writerow(headers)
+            yield headers
             
             # Data rows
             for row_data in report_data.data:
-                row = []
-                for header in headers:
-                    value = row_data.get(header)
-                    if isinstance(value, Decimal):
-                        row.append(str(value))
-                    elif isinstance(value, (date, datetime)):
-                        row.append(value.isoformat())
-                    elif value is None:
-                        row.append('')
-                    else:
-                        row.append(str(value))
-                writer.writerow(row)
+                yield self._row_values(row_data, headers, _csv_value)
             
-            writer.writerow([])  # Empty row
+            yield []  # Empty row
         
         # Summary
-        if report_data.summary:
-            writer.writerow(['Summary'])
-            for key, value in report_data.summary.items():
-                if key not in ['top_products', 'top_customers', 'suppliers_summary']:
-                    if isinstance(value, (int, float, Decimal)):
-                        writer.writerow([str(key).replace('_', ' ').title(), f"{float(value):,.2f}"])
-                    else:
-                        writer.writerow([str(key).replace('_', ' ').title(), str(value)])
-        
-        return output.getvalue()
+        summary = self._summary_items(report_data)
+        if summary:
+            yield ['Summary']
+            for label, value in summary:
+                if isinstance(value, (int, float, Decimal)):
+                    yield [label, f"{float(value):,.2f}"]
+                else:
+                    yield [label, str(value)]
+    
+    @staticmethod
+    def _row_values(row_data: Dict[str, Any], headers: List[str], convert: Callable[[Any], Any]) -> List[Any]:
+        """Values of a report row in header order."""
+        return [convert(row_data.get(header)) for header in headers]
+    
+    @staticmethod
+    def _summary_items(report_data: ReportData) -> List[Tuple[str, Any]]:
+        """Labelled scalar summary values (nested summaries are skipped)."""
+        if not report_data.summary:
+            return []
+        return [
+            (str(key).replace('_', ' ').title(), value)
+            for key, value in report_data.summary.items()
+            if key not in NESTED_SUMMARY_KEYS
+        ]
+
+
+def _excel_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value: Any) -> str:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if value is None:
+        return ''
+    return str(value)
+
 
+def _pdf_value(value: Any) -> str:
+    if isinstance(value, Decimal):
+        return f"{value:,.2f}"
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%Y-%m-%d')
+    if value is None:
+        return ''
+    return str(value)
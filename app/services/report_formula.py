@@ -0,0 +1,246 @@
+"""Safe formula engine for report calculated fields."""
+import ast
+import operator
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Sequence
+
+# Longest accepted formula (characters)
+MAX_FORMULA_LENGTH = 500
+
+# Deepest accepted expression nesting
+MAX_FORMULA_DEPTH = 32
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+# Function name -> (minimum, maximum) number of arguments (None = unbounded)
+FUNCTIONS = {
+    'abs': (1, 1),
+    'round': (1, 2),
+    'min': (2, None),
+    'max': (2, None),
+    'coalesce': (1, None),
+}
+
+Values = List[Optional[Decimal]]
+Evaluator = Callable[[Mapping[str, Sequence[Any]], int], Values]
+
+
+class FormulaError(ValueError):
+    """Raised when a formula is not valid."""
+
+
+def _operand(value: Any) -> Optional[Decimal]:
+    """Decimal from a row value (None if null or not numeric)."""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return Decimal(str(value))
+    if isinstance(value, str):
+        try:
+            return Decimal(value.strip())
+        except InvalidOperation:
+            return None
+    return None
+
+
+def _checked(op: Callable[..., Decimal], *args: Optional[Decimal]) -> Optional[Decimal]:
+    """op(*args), None when an argument is null or the operation fails (division by zero)."""
+    if None in args:
+        return None
+    try:
+        return op(*args)
+    except ArithmeticError:
+        return None
+
+
+def _vectorized(op: Callable[..., Decimal], *columns: Values) -> Values:
+    """Apply op element-wise over whole columns, falling back to null-safe calls on failure."""
+    try:
+        return list(map(op, *columns))
+    except (TypeError, ArithmeticError):
+        return list(map(partial(_checked, op), *columns))
+
+
+def _round(value: Decimal, places: int = 0) -> Decimal:
+    return round(value, places)
+
+
+def _min(*values: Decimal) -> Decimal:
+    return min(values)
+
+
+def _max(*values: Decimal) -> Decimal:
+    return max(values)
+
+
+def _coalesce(*values: Optional[Decimal]) -> Optional[Decimal]:
+    for value in values:
+        if value is not None:
+            return value
+    return None
+
+
+class CompiledFormula:
+    """
+    Formula parsed and compiled to a column evaluator.
+
+    The formula is evaluated for all rows at once: field columns are converted
+    to Decimal once, then each operator is applied element-wise over whole
+    columns. Nulls, non-numeric values and failed operations (division by
+    zero) yield None for the affected rows.
+    """
+
+    def __init__(self, formula: str, fields: FrozenSet[str], evaluator: Evaluator):
+        self.formula = formula
+        self.fields = fields
+        self._evaluator = evaluator
+
+    def evaluate(self, columns: Mapping[str, Sequence[Any]], length: int) -> Values:
+        """
+        Evaluate the formula for every row.
+
+        Args:
+            columns: Field name -> row values (missing fields are null)
+            length: Number of rows
+
+        Returns:
+            List of Decimal (or None) values, one per row
+        """
+        return self._evaluator(columns, length)
+
+
+@lru_cache(maxsize=256)
+def compile_formula(formula: str) -> CompiledFormula:
+    """
+    Parse and compile a calculated field formula.
+
+    Formulas are arithmetic expressions over field names and numbers
+    (+ - * / %, parentheses) with the functions abs, round, min, max
+    and coalesce. Compiled formulas are cached by formula text.
+
+    Args:
+        formula: Formula, e.g. "(revenue - cost) / revenue * 100"
+
+    Returns:
+        CompiledFormula
+
+    Raises:
+        FormulaError: If the formula is empty, too long or uses anything
+            outside the whitelist
+    """
+    if not isinstance(formula, str) or not formula.strip():
+        raise FormulaError("Formula is required.")
+    if len(formula) > MAX_FORMULA_LENGTH:
+        raise FormulaError(f"Formula is longer than {MAX_FORMULA_LENGTH} characters.")
+    try:
+        tree = ast.parse(formula.strip(), mode='eval')
+    except SyntaxError as e:
+        raise FormulaError(f"Invalid formula syntax: {e.msg}") from e
+
+    fields: set = set()
+    evaluator = _compile(tree.body, fields, 1)
+    return CompiledFormula(formula, frozenset(fields), evaluator)
+
+
+def validate_calculated_fields(calculated_fields: Optional[List[Dict[str, Any]]]) -> None:
+    """
+    Validate (and compile into the cache) saved calculated field definitions.
+
+    Args:
+        calculated_fields: Definitions with 'name' and 'formula' keys
+
+    Raises:
+        FormulaError: If a definition has no name or an invalid formula
+    """
+    for definition in calculated_fields or []:
+        name = definition.get('name')
+        if not name:
+            raise FormulaError("Calculated field name is required.")
+        try:
+            compile_formula(definition.get('formula', ''))
+        except FormulaError as e:
+            raise FormulaError(f"Calculated field '{name}': {e}") from e
+
+
+def _compile(node: ast.AST, fields: set, depth: int) -> Evaluator:
+    """Compile an AST node to a column evaluator, rejecting anything outside the whitelist."""
+    if depth > MAX_FORMULA_DEPTH:
+        raise FormulaError("Formula is nested too deeply.")
+
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise FormulaError(f"Unsupported constant: {node.value!r}")
+        constant = Decimal(str(node.value))
+        return lambda columns, length: [constant] * length
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        fields.add(name)
+
+        def field(columns: Mapping[str, Sequence[Any]], length: int) -> Values:
+            values = columns.get(name)
+            if values is None:
+                return [None] * length
+            return list(map(_operand, values))
+        return field
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        op = _BINARY_OPERATORS[type(node.op)]
+        left = _compile(node.left, fields, depth + 1)
+        right = _compile(node.right, fields, depth + 1)
+        return lambda columns, length: _vectorized(op, left(columns, length), right(columns, length))
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        op = _UNARY_OPERATORS[type(node.op)]
+        operand = _compile(node.operand, fields, depth + 1)
+        return lambda columns, length: _vectorized(op, operand(columns, length))
+
+    if isinstance(node, ast.Call):
+        return _compile_call(node, fields, depth)
+
+    raise FormulaError(f"Unsupported expression: {type(node).__name__}")
+
+
+def _compile_call(node: ast.Call, fields: set, depth: int) -> Evaluator:
+    """Compile a whitelisted function call."""
+    if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+        raise FormulaError(f"Unknown function. Allowed: {', '.join(sorted(FUNCTIONS))}")
+    name = node.func.id
+    if node.keywords:
+        raise FormulaError(f"{name}() does not accept keyword arguments.")
+    minimum, maximum = FUNCTIONS[name]
+    if len(node.args) < minimum or (maximum is not None and len(node.args) > maximum):
+        raise FormulaError(f"Wrong number of arguments for {name}().")
+
+    if name == 'round':
+        places = 0
+        if len(node.args) == 2:
+            literal = node.args[1]
+            if not (isinstance(literal, ast.Constant) and type(literal.value) is int):
+                raise FormulaError("round() places must be an integer literal.")
+            places = literal.value
+        value = _compile(node.args[0], fields, depth + 1)
+        op = partial(_round, places=places)
+        return lambda columns, length: _vectorized(op, value(columns, length))
+
+    arguments = [_compile(arg, fields, depth + 1) for arg in node.args]
+    if name == 'coalesce':
+        # Nulls are expected arguments: never short-circuit them to None
+        return lambda columns, length: list(map(_coalesce, *(arg(columns, length) for arg in arguments)))
+
+    op = {'abs': abs, 'min': _min, 'max': _max}[name]
+    return lambda columns, length: _vectorized(op, *(arg(columns, length) for arg in arguments))
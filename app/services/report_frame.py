@@ -0,0 +1,785 @@
+"""Columnar in-memory frame used by the report builder to filter, group and sort rows."""
+import operator
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - pure-Python fallback without numpy
+    np = None
+
+# Column kinds
+INTEGER = 'integer'  # int values, aggregated exactly
+DECIMAL = 'decimal'  # int / Decimal values, aggregated exactly
+FLOAT = 'float'  # numbers including floats
+DATE = 'date'
+STRING = 'string'
+OBJECT = 'object'  # mixed or other types
+
+NUMERIC_KINDS = (INTEGER, DECIMAL, FLOAT)
+
+# Sums of float columns are rounded to this number of places before conversion to Decimal
+FLOAT_SUM_PLACES = 10
+
+# String comparison -> (rank comparison, bisection giving the rank threshold)
+_RANK_COMPARISONS = {
+    operator.gt: (operator.ge, bisect_right),
+    operator.ge: (operator.ge, bisect_left),
+    operator.lt: (operator.lt, bisect_left),
+    operator.le: (operator.lt, bisect_right),
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+def _to_mask(values: Iterable[bool]):
+    """Boolean mask from an iterable (NumPy array when available, list otherwise)."""
+    if np is not None:
+        return np.fromiter(values, dtype=bool)
+    return list(values)
+
+
+def _full_mask(length: int, value: bool):
+    if np is not None:
+        return np.full(length, value, dtype=bool)
+    return [value] * length
+
+
+def _and(left, right):
+    if np is not None:
+        return left & right
+    return [a and b for a, b in zip(left, right, strict=True)]
+
+
+def _not(mask):
+    if np is not None:
+        return ~mask
+    return [not a for a in mask]
+
+
+def _typed(values: List[Any], typecode: str):
+    """Typed numeric array ('d' float64, 'q' int64)."""
+    if np is not None:
+        return np.array(values, dtype=np.float64 if typecode == 'd' else np.int64)
+    return array(typecode, values)
+
+
+def _take(values, indices: Sequence[int]):
+    """Select items by position from a list, array or NumPy array."""
+    if np is not None:
+        if isinstance(values, np.ndarray):
+            return values[np.asarray(indices, dtype=np.intp)]
+        if isinstance(indices, np.ndarray):
+            indices = indices.tolist()
+    taken = map(values.__getitem__, indices)
+    if isinstance(values, array):
+        return array(values.typecode, taken)
+    return list(taken)
+
+
+def _to_decimal(value: Any) -> Optional[Decimal]:
+    """Decimal from a number or numeric string (None if not numeric)."""
+    if _is_number(value):
+        return value if isinstance(value, Decimal) else Decimal(str(value))
+    if isinstance(value, str):
+        try:
+            return Decimal(value.strip())
+        except InvalidOperation:
+            return None
+    return None
+
+
+def _compare_objects(left: Any, right: Any) -> int:
+    """Three-way comparison of loosely typed values (numbers, strings, dates, str() fallback)."""
+    try:
+        if _is_number(left) and _is_number(right):
+            left, right = Decimal(str(left)), Decimal(str(right))
+        elif isinstance(left, date) and isinstance(right, str):
+            right = date.fromisoformat(right)
+        elif not (isinstance(left, str) and isinstance(right, str)) and not (
+            isinstance(left, date) and isinstance(right, date)
+        ):
+            left, right = str(left), str(right)
+        return (left > right) - (left < right)
+    except (TypeError, ValueError, InvalidOperation):
+        return 0
+
+
+class FrameColumn:
+    """
+    One column of a ReportFrame.
+
+    values keeps the original Python objects (returned unchanged in records);
+    numeric and date columns also get a typed array (float64 values, or date
+    ordinals), built on first use, for vectorized masks, sort keys and
+    aggregates. Null positions hold 0 in the typed array and are tracked in
+    nulls. A column taken from another one selects its typed arrays at once
+    but its values only on first use.
+    """
+
+    __slots__ = (
+        '_values', '_pending', 'length', 'kind', '_data', '_nulls', '_sort_key', '_distinct', '_lowered'
+    )
+
+    def __init__(self, values: Optional[List[Any]], kind: str, data=None, nulls=None, pending=None):
+        """
+        Args:
+            values: Python values (None when pending is given)
+            kind: Column kind
+            data: Typed array, if already built
+            nulls: Null mask, if already built
+            pending: (source values, row positions) selected on first use of values
+        """
+        self._values = values
+        self._pending = pending
+        self.length = len(values) if values is not None else len(pending[1])
+        self.kind = kind
+        self._data = data
+        self._nulls = nulls
+        self._sort_key = None
+        self._distinct = None
+        self._lowered = None
+
+    @classmethod
+    def from_values(cls, values: List[Any]) -> 'FrameColumn':
+        """Build a column, inferring its kind from the value types."""
+        types = set(map(type, values))
+        types.discard(type(None))
+
+        if types == {int}:
+            kind = INTEGER
+        elif types and types <= {int, Decimal}:
+            kind = DECIMAL
+        elif types and types <= {int, float, Decimal}:
+            kind = FLOAT
+        elif types == {date}:
+            kind = DATE
+        elif types == {str}:
+            kind = STRING
+        else:
+            kind = OBJECT
+        return cls(values, kind)
+
+    @classmethod
+    def empty(cls, length: int) -> 'FrameColumn':
+        """All-null column (used for fields missing from the rows)."""
+        return cls([None] * length, OBJECT, nulls=_full_mask(length, True))
+
+    @property
+    def values(self) -> List[Any]:
+        """Python values of the column."""
+        if self._values is None:
+            source, positions = self._pending
+            self._values = _take(source, positions)
+            self._pending = None
+        return self._values
+
+    @property
+    def nulls(self):
+        """Boolean mask of null values."""
+        if self._nulls is None:
+            if np is not None and self.kind in NUMERIC_KINDS:
+                _ = self.data  # Computes both
+            else:
+                self._nulls = _to_mask(map(operator.is_, self.values, repeat(None)))
+        return self._nulls
+
+    @property
+    def has_nulls(self) -> bool:
+        """Whether the column contains null values."""
+        nulls = self.nulls
+        return bool(nulls.any() if np is not None else any(nulls))
+
+    @property
+    def data(self):
+        """Typed array of numeric / date columns (None for other kinds)."""
+        if self._data is None:
+            values = self.values
+            if self.kind in NUMERIC_KINDS:
+                if np is not None:
+                    data = np.array(values, dtype=np.float64)  # None -> nan
+                    if self._nulls is None:
+                        self._nulls = np.isnan(data)
+                    data[self._nulls] = 0.0
+                    self._data = data
+                else:
+                    self._data = _typed([0.0 if v is None else float(v) for v in values], 'd')
+            elif self.kind == DATE:
+                if self.has_nulls:
+                    values = [0 if v is None else v.toordinal() for v in values]
+                else:
+                    values = list(map(date.toordinal, values))
+                self._data = _typed(values, 'q')
+        return self._data
+
+    def __len__(self) -> int:
+        return self.length
+
+    def take(self, indices: Sequence[int]) -> 'FrameColumn':
+        """Column restricted to the given row positions (values are selected on first use)."""
+        data = _take(self._data, indices) if self._data is not None else None
+        nulls = _take(self._nulls, indices) if self._nulls is not None else None
+        if self._values is not None:
+            pending = (self._values, indices)
+        else:
+            # Compose the positions rather than chaining selections of values
+            source, previous = self._pending
+            pending = (source, _take(previous, indices))
+        column = FrameColumn(None, self.kind, data, nulls, pending=pending)
+        if self._sort_key is not None and self._sort_key is not self._data:
+            # Ranks of the distinct values stay ordered on a subset of the rows
+            column._sort_key = _take(self._sort_key, indices)
+            column._distinct = self._distinct
+        return column
+
+    # ==================== Masks ====================
+
+    def equals(self, value: Any):
+        """Mask of rows equal to value."""
+        if value is None:
+            return self.nulls
+        if self.kind in NUMERIC_KINDS and _is_number(value):
+            return _and(self._apply(operator.eq, float(value)), _not(self.nulls))
+        if self.kind == DATE and type(value) is date:
+            return _and(self._apply(operator.eq, value.toordinal()), _not(self.nulls))
+        return _to_mask(v == value for v in self.values)
+
+    def compare(self, op: Callable[[Any, Any], bool], value: Any):
+        """Mask of non-null rows where op(row value, value) holds."""
+        if value is None:
+            return _full_mask(len(self), False)
+        if self.kind in NUMERIC_KINDS:
+            threshold = _to_decimal(value)
+            if threshold is not None:
+                return _and(self._apply(op, float(threshold)), _not(self.nulls))
+        if self.kind == DATE:
+            try:
+                threshold = date.fromisoformat(value) if isinstance(value, str) else value
+            except ValueError:
+                return _full_mask(len(self), False)
+            if type(threshold) is date:
+                return _and(self._apply(op, threshold.toordinal()), _not(self.nulls))
+        if self.kind == STRING and isinstance(value, str):
+            if np is not None and op in _RANK_COMPARISONS:
+                # Compare the ranks of the sorted distinct values to the rank of value
+                rank_op, bisect = _RANK_COMPARISONS[op]
+                ranks = self.sort_key()
+                return _and(rank_op(ranks, bisect(self._distinct, value)), _not(self.nulls))
+            return _to_mask(v is not None and op(v, value) for v in self.values)
+        return _to_mask(v is not None and op(_compare_objects(v, value), 0) for v in self.values)
+
+    def contains(self, value: Any):
+        """Mask of rows whose text contains value (case-insensitive)."""
+        if self._lowered is None:
+            self._lowered = ['' if v is None else str(v).lower() for v in self.values]
+        return _to_mask(map(operator.contains, self._lowered, repeat(str(value).lower())))
+
+    def isin(self, candidates: List[Any]):
+        """Mask of rows whose value is one of candidates."""
+        try:
+            allowed = set(candidates)
+        except TypeError:
+            allowed = candidates
+        return _to_mask(map(allowed.__contains__, self.values))
+
+    def _apply(self, op: Callable[[Any, Any], Any], threshold: Any):
+        if np is not None:
+            return op(self.data, threshold)
+        return [op(x, threshold) for x in self.data]
+
+    # ==================== Sort keys ====================
+
+    def sort_key(self):
+        """
+        Numeric key per row preserving the value order: numbers by value, dates
+        by ordinal (0 at null positions), text by rank of the distinct values
+        (-1 at null positions).
+        """
+        if self._sort_key is None:
+            if self.data is not None:
+                self._sort_key = self.data
+            else:
+                distinct = set(self.values)
+                distinct.discard(None)
+                if self.kind == STRING:
+                    ordered = sorted(distinct)
+                else:
+                    ordered = sorted(distinct, key=self._object_key)
+                rank = dict(zip(ordered, range(len(ordered)), strict=True))
+                rank[None] = -1
+                ranks = map(rank.__getitem__, self.values)
+                if np is not None:
+                    self._sort_key = np.fromiter(ranks, dtype=np.int64, count=len(self.values))
+                    if self._nulls is None:
+                        self._nulls = self._sort_key < 0
+                else:
+                    self._sort_key = array('q', ranks)
+                self._distinct = ordered
+        return self._sort_key
+
+    @staticmethod
+    def _object_key(value: Any):
+        """Sort key of a value in a mixed column: numbers, then dates, then text."""
+        if _is_number(value):
+            return (0, float(value), '')
+        if isinstance(value, date):
+            return (1, 0.0, value.isoformat())
+        return (2, 0.0, str(value))
+
+
+class ReportFrame:
+    """
+    Columnar table of report rows.
+
+    Columns are extracted from the source row dicts on first use (fields that
+    are never filtered, sorted or grouped on are not transposed); filters are
+    evaluated as boolean masks over whole columns, sorting uses an argsort over
+    per-column keys (NumPy lexsort, or successive stable index sorts without
+    NumPy), and grouping hashes the group values to integer codes before
+    aggregating each column. Filtered and sorted frames return the original
+    row dicts; new dicts are built only for projections and aggregates.
+    """
+
+    def __init__(
+        self,
+        fields: List[str],
+        length: int,
+        columns: Optional[Dict[str, FrameColumn]] = None,
+        records: Optional[List[Dict[str, Any]]] = None,
+        uniform: bool = False
+    ):
+        """
+        Args:
+            fields: Field names, in order
+            length: Number of rows
+            columns: Extracted columns
+            records: Source row dicts in frame order (None for derived frames)
+            uniform: Whether every source row has exactly the given fields
+        """
+        self.fields = fields
+        self.length = length
+        self._columns = columns if columns is not None else {}
+        self._records = records
+        self._uniform = uniform
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> 'ReportFrame':
+        """
+        Build a frame over row dicts (fields missing from a row are null).
+
+        Args:
+            records: Rows
+
+        Returns:
+            ReportFrame with the fields of all rows, in first-seen order
+        """
+        records = list(records)
+        if not records:
+            return cls([], 0, records=records, uniform=True)
+        fields = list(records[0])
+        uniform = set(map(len, records)) == {len(fields)}
+        if not uniform:
+            seen: Dict[str, None] = {}
+            for row in records:
+                seen.update(dict.fromkeys(row))
+            fields = list(seen)
+        return cls(fields, len(records), records=records, uniform=uniform)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List[Any]]) -> 'ReportFrame':
+        """Build a derived frame from column value lists of equal length."""
+        length = len(next(iter(columns.values()))) if columns else 0
+        return cls(
+            list(columns), length,
+            columns={name: FrameColumn.from_values(values) for name, values in columns.items()}
+        )
+
+    def __len__(self) -> int:
+        return self.length
+
+    def column(self, field: str) -> FrameColumn:
+        """Column of a field (all-null if the field does not exist)."""
+        column = self._columns.get(field)
+        if column is None:
+            if field not in self.fields:
+                return FrameColumn.empty(self.length)
+            column = FrameColumn.from_values(self._values(field))
+            self._columns[field] = column
+        return column
+
+    def _values(self, field: str) -> List[Any]:
+        """Values of a field, extracted from the source rows."""
+        if self._uniform:
+            try:
+                return list(map(operator.itemgetter(field), self._records))
+            except KeyError:
+                self._uniform = False
+        return [row.get(field) for row in self._records]
+
+    def to_records(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Rows of the frame.
+
+        Args:
+            fields: Fields to include, in order (default: all fields)
+
+        Returns:
+            List of row dicts (the source dicts when no projection is needed)
+        """
+        if fields is None:
+            if self._records is not None:
+                return list(self._records)
+            fields = self.fields
+        names = [name for name in fields if name in self.fields]
+        if not names:
+            return [{} for _ in range(self.length)]
+        if self._records is not None and not self._uniform:
+            # Keep only the fields present in each row
+            return [{name: row[name] for name in names if name in row} for row in self._records]
+        columns = [self.column(name).values for name in names]
+        return list(map(dict, map(zip, repeat(names), zip(*columns, strict=True))))
+
+    def take(self, indices: Sequence[int]) -> 'ReportFrame':
+        """Frame restricted to the given row positions, in that order."""
+        return ReportFrame(
+            self.fields,
+            len(indices),
+            columns={name: column.take(indices) for name, column in self._columns.items()},
+            records=_take(self._records, indices) if self._records is not None else None,
+            uniform=self._uniform
+        )
+
+    def with_columns(self, columns: Dict[str, List[Any]]) -> 'ReportFrame':
+        """
+        Frame with added (or replaced) columns.
+
+        Args:
+            columns: Field name -> values, one per row
+
+        Returns:
+            Derived ReportFrame (rows are rebuilt from columns on output)
+        """
+        if not columns:
+            return self
+        fields = self.fields + [name for name in columns if name not in self.fields]
+        derived = {name: self.column(name) for name in self.fields if name not in columns}
+        derived.update({name: FrameColumn.from_values(values) for name, values in columns.items()})
+        return ReportFrame(fields, self.length, columns=derived)
+
+    # ==================== Filtering ====================
+
+    def filter(self, conditions: Iterable[Any]) -> 'ReportFrame':
+        """
+        Keep the rows matching every condition.
+
+        Args:
+            conditions: FilterCondition objects (field, operator, value, value2)
+
+        Returns:
+            Filtered ReportFrame
+        """
+        mask = _full_mask(self.length, True)
+        for condition in conditions:
+            mask = _and(mask, self.mask(condition))
+        if np is not None:
+            return self.take(np.flatnonzero(mask))
+        return self.take([i for i, keep in enumerate(mask) if keep])
+
+    def mask(self, condition: Any):
+        """
+        Boolean mask of one filter condition.
+
+        Null values never match comparison operators. Unknown operators (and
+        'between' without value2, 'in' without a list) match every row.
+        """
+        column = self.column(condition.field)
+        value = condition.value
+        op = condition.operator
+        if op == 'equals':
+            return column.equals(value)
+        if op == 'not_equals':
+            return _not(column.equals(value))
+        if op == 'contains':
+            return column.contains(value)
+        if op == 'greater_than':
+            return column.compare(operator.gt, value)
+        if op == 'less_than':
+            return column.compare(operator.lt, value)
+        if op == 'between' and condition.value2 is not None:
+            return _and(column.compare(operator.ge, value), column.compare(operator.le, condition.value2))
+        if op == 'in' and isinstance(value, list):
+            return column.isin(value)
+        return _full_mask(self.length, True)
+
+    # ==================== Sorting ====================
+
+    def sort(self, sorting: Sequence[Any]) -> 'ReportFrame':
+        """
+        Sort on several keys, the first sort definition being the primary key.
+
+        Null values come first in ascending order and last in descending order;
+        rows with equal keys keep their order.
+
+        Args:
+            sorting: SortDefinition objects (field, direction)
+
+        Returns:
+            Sorted ReportFrame
+        """
+        if not sorting or self.length < 2:
+            return self
+
+        if np is not None:
+            keys = []
+            for definition in reversed(sorting):
+                column = self.column(definition.field)
+                if definition.direction == 'desc':
+                    keys.extend([-column.sort_key(), column.nulls])
+                else:
+                    keys.extend([column.sort_key(), ~column.nulls])
+            return self.take(np.lexsort(keys))
+
+        order = list(range(self.length))
+        for definition in reversed(sorting):
+            column = self.column(definition.field)
+            key, nulls = column.sort_key(), column.nulls
+            order.sort(key=lambda i: (not nulls[i], key[i]), reverse=definition.direction == 'desc')
+        return self.take(order)
+
+    # ==================== Grouping ====================
+
+    def group_by(self, field: str, aggregate: str) -> 'ReportFrame':
+        """
+        Aggregate every other column per distinct value of field.
+
+        Groups are returned in order of first appearance. 'sum' and 'avg' apply
+        to numeric columns (as Decimal) and take the first row value of the
+        group for other columns; 'count' counts non-null values; 'min' and
+        'max' return the smallest / largest non-null value; any other
+        aggregate takes the first non-null value.
+
+        Args:
+            field: Group field
+            aggregate: 'sum', 'avg', 'count', 'min', 'max'
+
+        Returns:
+            ReportFrame with one row per group
+        """
+        values = self.column(field).values
+        try:
+            # Distinct values in order of first appearance, then one code per row
+            lookup: Dict[Any, Any] = dict.fromkeys(values)
+            keys = list(lookup)
+            lookup.update(zip(keys, range(len(keys)), strict=True))
+            codes = map(lookup.__getitem__, values)
+            if np is not None:
+                codes = np.fromiter(codes, dtype=np.intp, count=len(values))
+            else:
+                codes = list(codes)
+        except TypeError:
+            # Unhashable group values are grouped by their repr
+            reprs = list(map(repr, values))
+            lookup = dict.fromkeys(reprs)
+            lookup.update(zip(lookup, range(len(lookup)), strict=True))
+            codes = list(map(lookup.__getitem__, reprs))
+            first_rows: Dict[int, int] = {}
+            for position, code in enumerate(codes):
+                first_rows.setdefault(code, position)
+            keys = [values[position] for position in first_rows.values()]
+        group_count = len(keys)
+
+        grouping = _Grouping(codes, group_count)
+        columns = {field: keys}
+        for name in self.fields:
+            if name == field:
+                continue
+            if aggregate in ('sum', 'avg') and self._is_text(name):
+                # Not numeric: only the first row of each group is needed, no need to extract the column
+                columns[name] = [self._records[i].get(name) for i in grouping.first()]
+            else:
+                columns[name] = grouping.aggregate(self.column(name), aggregate)
+        return ReportFrame.from_columns(columns)
+
+    def _is_text(self, field: str) -> bool:
+        """Whether a not yet extracted field holds text in the first row (so is not a numeric column)."""
+        if not self._records or field in self._columns:
+            return False
+        return isinstance(self._records[0].get(field), str)
+
+
+class _Grouping:
+    """
+    Group codes of a frame.
+
+    Row positions sorted by group (stable, so rows keep their order within a
+    group) and the start offset of each group are computed on demand, so the
+    values of a group are a contiguous slice of the reordered column.
+    """
+
+    def __init__(self, codes: List[int], group_count: int):
+        self.group_count = group_count
+        self.codes = np.asarray(codes, dtype=np.intp) if np is not None else codes
+        self._order = None
+        self._bounds = None
+        self._first = None
+
+    def order(self) -> List[int]:
+        """Row positions sorted by group code."""
+        if self._order is None:
+            if np is not None:
+                order = np.argsort(self.codes, kind='stable')
+                counts = np.bincount(self.codes, minlength=self.group_count)
+                self._order = order.tolist()
+                self._bounds = [0] + np.cumsum(counts).tolist()
+            else:
+                buckets: List[List[int]] = [[] for _ in range(self.group_count)]
+                for position, code in enumerate(self.codes):
+                    buckets[code].append(position)
+                self._order = [position for bucket in buckets for position in bucket]
+                self._bounds = [0]
+                for bucket in buckets:
+                    self._bounds.append(self._bounds[-1] + len(bucket))
+        return self._order
+
+    def groups(self) -> Iterator[List[int]]:
+        """Row positions of each group, in group order."""
+        order = self.order()
+        bounds = self._bounds
+        for group in range(self.group_count):
+            yield order[bounds[group]:bounds[group + 1]]
+
+    def slices(self, values: List[Any]) -> Iterator[List[Any]]:
+        """Values of each group, in group order."""
+        ordered = _take(values, self.order())
+        bounds = self._bounds
+        for group in range(self.group_count):
+            yield ordered[bounds[group]:bounds[group + 1]]
+
+    def first(self) -> List[int]:
+        """Position of the first row of each group."""
+        if self._first is None:
+            if np is not None:
+                # Assigning the positions backwards leaves the first one of each group
+                first = np.empty(self.group_count, dtype=np.intp)
+                first[self.codes[::-1]] = np.arange(len(self.codes) - 1, -1, -1)
+                self._first = first.tolist()
+            else:
+                first_rows: Dict[int, int] = {}
+                for position, code in enumerate(self.codes):
+                    first_rows.setdefault(code, position)
+                self._first = [first_rows[group] for group in range(self.group_count)]
+        return self._first
+
+    def aggregate(self, column: FrameColumn, aggregate: str) -> List[Any]:
+        """Aggregated value of each group for one column."""
+        if aggregate == 'count':
+            return self._count(column)
+        if aggregate in ('sum', 'avg'):
+            if column.kind not in NUMERIC_KINDS:
+                return [column.values[i] for i in self.first()]
+            return self._sum(column, average=aggregate == 'avg')
+        if aggregate in ('min', 'max'):
+            return self._extreme(column, largest=aggregate == 'max')
+        return self._first_non_null(column)
+
+    def _count(self, column: FrameColumn) -> List[Optional[int]]:
+        if np is not None:
+            counts = np.bincount(self.codes, weights=~column.nulls, minlength=self.group_count)
+            return [int(count) if count else None for count in counts]
+        counts = [0] * self.group_count
+        for code, is_null in zip(self.codes, column.nulls, strict=True):
+            if not is_null:
+                counts[code] += 1
+        return [count or None for count in counts]
+
+    def _sum(self, column: FrameColumn, average: bool) -> List[Optional[Decimal]]:
+        if column.kind == FLOAT and np is not None:
+            sums = np.bincount(self.codes, weights=column.data, minlength=self.group_count)
+            counts = np.bincount(self.codes, weights=~column.nulls, minlength=self.group_count)
+            result = []
+            for total, count in zip(sums.tolist(), counts.tolist(), strict=True):
+                if not count:
+                    result.append(None)
+                    continue
+                total = Decimal(str(round(total, FLOAT_SUM_PLACES)))
+                result.append(total / int(count) if average else total)
+            return result
+
+        if column.kind == INTEGER and np is not None:
+            sums = self._integer_sum(column)
+            if sums is not None:
+                totals, counts = sums
+                result = []
+                for total, count in zip(totals.tolist(), counts.tolist(), strict=True):
+                    if not count:
+                        result.append(None)
+                        continue
+                    result.append(Decimal(total) / int(count) if average else Decimal(total))
+                return result
+
+        # Exact Decimal arithmetic (int / Decimal columns, or no NumPy)
+        has_nulls = column.has_nulls
+        result = []
+        for present in self.slices(column.values):
+            if has_nulls:
+                present = [v for v in present if v is not None]
+            if not present:
+                result.append(None)
+                continue
+            if column.kind == FLOAT:
+                total = Decimal(str(round(sum(map(float, present)), FLOAT_SUM_PLACES)))
+            else:
+                total = sum(present, Decimal(0))
+            result.append(total / len(present) if average else total)
+        return result
+
+    def _integer_sum(self, column: FrameColumn):
+        """Exact int64 sums and non-null counts of an int column (None if the sums could overflow int64)."""
+        values = column.values
+        try:
+            try:
+                data = np.fromiter(values, dtype=np.int64, count=len(values))
+                counts = np.bincount(self.codes, minlength=self.group_count)
+            except TypeError:  # Null values
+                data = np.fromiter((0 if v is None else v for v in values), dtype=np.int64, count=len(values))
+                counts = np.bincount(self.codes, weights=~column.nulls, minlength=self.group_count)
+        except OverflowError:
+            return None
+        if max(abs(int(data.min())), abs(int(data.max()))) * len(data) >= 2 ** 63:
+            return None
+        totals = np.zeros(self.group_count, dtype=np.int64)
+        np.add.at(totals, self.codes, data)
+        return totals, counts
+
+    def _extreme(self, column: FrameColumn, largest: bool) -> List[Any]:
+        key, values = column.sort_key(), column.values
+        if np is not None:
+            # Extreme key of each group over non-null rows, then the first row holding it
+            bound = -np.inf if largest else np.inf
+            keys = np.where(column.nulls, bound, key.astype(np.float64))
+            extremes = np.full(self.group_count, bound)
+            (np.maximum if largest else np.minimum).at(extremes, self.codes, keys)
+            hits = np.flatnonzero((keys == extremes[self.codes]) & ~column.nulls)
+            first_hit = np.full(self.group_count, -1, dtype=np.intp)
+            first_hit[self.codes[hits][::-1]] = hits[::-1]
+            return [values[i] if i >= 0 else None for i in first_hit.tolist()]
+        result = []
+        for group in self.groups():
+            present = [i for i in group if values[i] is not None]
+            if not present:
+                result.append(None)
+                continue
+            pick = max if largest else min
+            result.append(values[pick(present, key=lambda i: key[i])])
+        return result
+
+    def _first_non_null(self, column: FrameColumn) -> List[Any]:
+        if not column.has_nulls:
+            return [column.values[i] for i in self.first()]
+        return [next((v for v in group if v is not None), None) for group in self.slices(column.values)]
@@ -0,0 +1,275 @@
+"""Background report jobs: submission, execution and result caching."""
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.application.reports.queries.queries import (
+    GetSalesReportQuery, GetMarginReportQuery, GetStockReportQuery,
+    GetCustomerReportQuery, GetPurchaseReportQuery, GetCustomReportQuery
+)
+from app.config import Config
+from app.domain.models.report_job import ReportJob
+
+logger = logging.getLogger(__name__)
+
+# Report types that can run as jobs, and their queries
+REPORT_QUERIES = {
+    'sales': GetSalesReportQuery,
+    'margins': GetMarginReportQuery,
+    'stock': GetStockReportQuery,
+    'customers': GetCustomerReportQuery,
+    'purchases': GetPurchaseReportQuery,
+    'custom': GetCustomReportQuery,
+}
+
+# Output formats: file extension and mimetype (None = JSON result stored in the job)
+REPORT_FORMATS = {
+    'json': None,
+    'excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'pdf': ('pdf', 'application/pdf'),
+    'csv': ('csv', 'text/csv'),
+}
+
+# Jobs that can answer a new request with the same cache key
+REUSABLE_STATUSES = ('pending', 'running', 'completed')
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _to_json(value: Any) -> Any:
+    """Value converted to plain JSON types (Decimal as string, dates as ISO strings)."""
+    return json.loads(json.dumps(value, default=_json_default))
+
+
+class ReportJobService:
+    """
+    Runs report queries as background jobs and caches their results.
+
+    A job is keyed by a hash of the report type, format, normalized query
+    parameters and the current day. Submitting a report whose key matches a
+    pending, running or unexpired completed job returns that job instead of
+    starting a new one, so repeat requests are served from the cache.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize the report job service.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        self.session = session
+
+    # ==================== Submission ====================
+
+    @staticmethod
+    def normalize_parameters(report_type: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Keep the query fields of a report type, as JSON values.
+
+        Args:
+            report_type: Report type (see REPORT_QUERIES)
+            parameters: Request parameters
+
+        Returns:
+            Parameters dict (None values dropped, dates as ISO strings)
+
+        Raises:
+            ValueError: If the report type is unknown
+        """
+        query_class = REPORT_QUERIES.get(report_type)
+        if query_class is None:
+            raise ValueError(f"Unsupported report type: {report_type}")
+        names = {f.name for f in dataclasses.fields(query_class)}
+        return _to_json({
+            name: value for name, value in sorted(parameters.items())
+            if name in names and value is not None
+        })
+
+    @staticmethod
+    def cache_key(report_type: str, output_format: str, parameters: Dict[str, Any]) -> str:
+        """
+        Cache key of a report request.
+
+        The current day is part of the key: reports without explicit dates
+        cover a period relative to today.
+        """
+        payload = json.dumps(
+            {'type': report_type, 'format': output_format, 'parameters': parameters, 'day': date.today().isoformat()},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def submit(
+        self,
+        report_type: str,
+        parameters: Dict[str, Any],
+        output_format: str = 'json',
+        created_by: Optional[int] = None
+    ) -> Tuple[ReportJob, bool]:
+        """
+        Find a cached job for the request or create a new pending job.
+
+        The caller commits the session, then starts new jobs with
+        `run_report_job_task` (see `enqueue`).
+
+        Args:
+            report_type: Report type (see REPORT_QUERIES)
+            parameters: Query parameters
+            output_format: Output format (see REPORT_FORMATS)
+            created_by: Optional user ID
+
+        Returns:
+            (job, created) tuple; created is False for a cache hit
+
+        Raises:
+            ValueError: If the report type or format is unknown
+        """
+        if output_format not in REPORT_FORMATS:
+            raise ValueError(f"Unsupported format: {output_format}")
+        parameters = self.normalize_parameters(report_type, parameters)
+        key = self.cache_key(report_type, output_format, parameters)
+
+        now = datetime.now()
+        for job in self.session.query(ReportJob).filter(
+            ReportJob.cache_key == key,
+            ReportJob.status.in_(REUSABLE_STATUSES)
+        ).order_by(ReportJob.created_at.desc()).all():
+            if job.status == 'completed' and job.expires_at and job.expires_at > now:
+                return job, False
+            if job.status != 'completed' and job.created_at > now - self.ttl():
+                return job, False
+
+        job = ReportJob(
+            id=uuid.uuid4().hex,
+            cache_key=key,
+            report_type=report_type,
+            format=output_format,
+            parameters=parameters,
+            status='pending',
+            progress=0,
+            created_by=created_by,
+            created_at=now
+        )
+        self.session.add(job)
+        self.session.flush()
+        return job, True
+
+    @staticmethod
+    def enqueue(job_id: str) -> None:
+        """Start a committed job: inline when REPORT_JOBS_EAGER, otherwise through Celery."""
+        from app.tasks.report_tasks import run_report_job_task
+        if Config.REPORT_JOBS_EAGER:
+            run_report_job_task.apply(args=[job_id])
+        else:
+            run_report_job_task.delay(job_id)
+
+    @staticmethod
+    def ttl() -> timedelta:
+        """Lifetime of cached results."""
+        return timedelta(seconds=Config.REPORT_JOB_TTL_SECONDS)
+
+    # ==================== Execution ====================
+
+    def build_query(self, job: ReportJob):
+        """Report query of a job, rebuilt from its stored parameters."""
+        query_class = REPORT_QUERIES[job.report_type]
+        values = {}
+        for query_field in dataclasses.fields(query_class):
+            if query_field.name not in job.parameters:
+                continue
+            value = job.parameters[query_field.name]
+            if query_field.name.endswith('_date'):
+                value = date.fromisoformat(value)
+            elif query_field.name in ('min_margin_percent', 'fast_moving_threshold'):
+                value = Decimal(str(value))
+            values[query_field.name] = value
+        return query_class(**values)
+
+    def start(self, job: ReportJob) -> None:
+        """Mark a job as running."""
+        job.status = 'running'
+        job.progress = 10
+        job.started_at = datetime.now()
+        job.error = None
+
+    def complete(self, job: ReportJob, report_dto: Any) -> None:
+        """
+        Store the result of a job and mark it completed.
+
+        Args:
+            job: Running job
+            report_dto: ReportDataDTO returned by the report query
+        """
+        if job.format == 'json':
+            job.result = _to_json(dataclasses.asdict(report_dto))
+        else:
+            job.file_path, job.file_name = self._export(job, report_dto)
+        job.status = 'completed'
+        job.progress = 100
+        job.completed_at = datetime.now()
+        job.expires_at = job.completed_at + self.ttl()
+
+    def fail(self, job: ReportJob, error: Exception) -> None:
+        """Mark a job as failed."""
+        job.status = 'failed'
+        job.error = str(error)
+        job.completed_at = datetime.now()
+
+    def _export(self, job: ReportJob, report_dto: Any) -> Tuple[str, str]:
+        """Write the exported report file of a job."""
+        from app.services.report_export_service import ReportExportService
+
+        extension, _ = REPORT_FORMATS[job.format]
+        os.makedirs(Config.REPORT_JOBS_DIR, exist_ok=True)
+        path = os.path.join(Config.REPORT_JOBS_DIR, f"{job.id}.{extension}")
+        export_service = ReportExportService()
+        if job.format == 'excel':
+            with open(path, 'wb') as output:
+                export_service.write_excel(report_dto, output)
+        elif job.format == 'pdf':
+            with open(path, 'wb') as output:
+                output.write(export_service.export_to_pdf(report_dto).getvalue())
+        else:
+            with open(path, 'w', encoding='utf-8', newline='') as output:
+                output.writelines(export_service.stream_csv(report_dto))
+        return path, f"{report_dto.title.replace(' ', '_')}.{extension}"
+
+    # ==================== Cleanup ====================
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired and failed jobs and their files.
+
+        The caller commits the session.
+
+        Returns:
+            Number of deleted jobs
+        """
+        now = datetime.now()
+        jobs = self.session.query(ReportJob).filter(
+            (ReportJob.expires_at < now) |
+            ((ReportJob.status == 'failed') & (ReportJob.completed_at < now - self.ttl()))
+        ).all()
+        for job in jobs:
+            if job.file_path and os.path.exists(job.file_path):
+                try:
+                    os.remove(job.file_path)
+                except OSError as e:
+                    logger.warning("Could not delete report job file %s: %s", job.file_path, e)
+            self.session.delete(job)
+        return len(jobs)
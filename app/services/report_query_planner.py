@@ -0,0 +1,417 @@
+"""Query planner pushing custom report filters, grouping and sorting down to SQL."""
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import select, func, and_, or_, false
+from sqlalchemy.orm import Session
+
+from app.domain.models.product import Product
+from app.domain.models.purchase import PurchaseOrder
+from app.domain.models.stock import StockItem
+from app.domain.models.supplier import Supplier
+from app.utils.period import date_range_filter
+
+# Source field kinds
+NUMBER = 'number'  # numeric columns, returned as float like the base reports
+INTEGER = 'integer'  # ID and count columns, returned as int like the base reports
+STRING = 'string'
+DATE = 'date'  # date columns, returned as ISO strings like the base reports
+NUMERIC_KINDS = (NUMBER, INTEGER)
+
+# Aggregates the planner can translate
+SQL_AGGREGATES = ('sum', 'avg', 'count', 'min', 'max')
+
+# Purchase order statuses included in the purchase report
+PURCHASE_REPORT_STATUSES = ('confirmed', 'partially_received', 'received')
+
+
+@dataclass(frozen=True)
+class SourceField:
+    """Report field backed by a SQL expression."""
+    expression: Any
+    kind: str = STRING
+
+
+@dataclass
+class ReportSource:
+    """
+    Row-level report source expressed in SQL.
+
+    The fields are the base report columns; `where` restricts the rows of the
+    base report for a period and `summary` computes the base report summary.
+    """
+    report_type: str
+    title: str
+    fields: Dict[str, SourceField]
+    select_from: Callable[[Any], Any]
+    where: Callable[[date, date], Any]
+    summary: Callable[[Session, date, date], Dict[str, Any]]
+    dated: bool = True
+
+
+def _stock_summary(session: Session, start_date: date, end_date: date) -> Dict[str, Any]:
+    fields = STOCK_SOURCE.fields
+    total_value, count = session.execute(
+        STOCK_SOURCE.select_from(select(
+            func.coalesce(func.sum(fields['stock_value'].expression), 0),
+            func.count(StockItem.id)
+        )).where(STOCK_SOURCE.where(start_date, end_date))
+    ).one()
+    return {
+        'total_stock_value': float(total_value),
+        'products_count': count,
+        'report_date': str(date.today())
+    }
+
+
+def _purchase_summary(session: Session, start_date: date, end_date: date) -> Dict[str, Any]:
+    rows = session.execute(
+        PURCHASE_SOURCE.select_from(select(
+            PurchaseOrder.supplier_id,
+            Supplier.name,
+            func.sum(PurchaseOrder.subtotal_ht),
+            func.count(PurchaseOrder.id)
+        )).where(PURCHASE_SOURCE.where(start_date, end_date)).group_by(PurchaseOrder.supplier_id, Supplier.name)
+    ).all()
+    suppliers_summary = [
+        {'supplier_id': supplier_id, 'supplier_name': name, 'total_ht': float(total), 'orders_count': count}
+        for supplier_id, name, total, count in rows
+    ]
+    return {
+        'total_purchases': float(sum((Decimal(str(total)) for _, _, total, _ in rows), Decimal(0))),
+        'total_orders': sum(count for _, _, _, count in rows),
+        'suppliers_count': len(suppliers_summary),
+        'suppliers_summary': suppliers_summary,
+        'period_start': str(start_date),
+        'period_end': str(end_date)
+    }
+
+
+STOCK_SOURCE = ReportSource(
+    report_type='stock',
+    title='Stock Report',
+    fields={
+        'product_id': SourceField(StockItem.product_id, INTEGER),
+        'product_code': SourceField(Product.code),
+        'product_name': SourceField(Product.name),
+        'location_id': SourceField(StockItem.location_id, INTEGER),
+        'physical_quantity': SourceField(StockItem.physical_quantity, NUMBER),
+        'reserved_quantity': SourceField(StockItem.reserved_quantity, NUMBER),
+        'available_quantity': SourceField(StockItem.physical_quantity - StockItem.reserved_quantity, NUMBER),
+        'unit_cost': SourceField(func.coalesce(Product.cost, 0), NUMBER),
+        'stock_value': SourceField(StockItem.physical_quantity * func.coalesce(Product.cost, 0), NUMBER),
+        # Unset (or zero) thresholds are null, as in the base report
+        'min_stock': SourceField(func.nullif(StockItem.min_stock, 0), NUMBER),
+        'max_stock': SourceField(func.nullif(StockItem.max_stock, 0), NUMBER),
+    },
+    select_from=lambda stmt: stmt.select_from(StockItem).join(Product, Product.id == StockItem.product_id),
+    where=lambda start_date, end_date: Product.status == 'active',
+    summary=_stock_summary,
+    dated=False
+)
+
+PURCHASE_SOURCE = ReportSource(
+    report_type='purchases',
+    title='Purchase Report',
+    fields={
+        'purchase_order_id': SourceField(PurchaseOrder.id, INTEGER),
+        'purchase_order_number': SourceField(PurchaseOrder.number),
+        'supplier_id': SourceField(PurchaseOrder.supplier_id, INTEGER),
+        'supplier_name': SourceField(Supplier.name),
+        'order_date': SourceField(PurchaseOrder.order_date, DATE),
+        'expected_delivery_date': SourceField(PurchaseOrder.expected_delivery_date, DATE),
+        'status': SourceField(PurchaseOrder.status),
+        'total_ht': SourceField(PurchaseOrder.subtotal_ht, NUMBER),
+        'total_ttc': SourceField(PurchaseOrder.total_ttc, NUMBER),
+    },
+    select_from=lambda stmt: stmt.select_from(PurchaseOrder).join(Supplier, Supplier.id == PurchaseOrder.supplier_id),
+    where=lambda start_date, end_date: and_(
+        PurchaseOrder.status.in_(PURCHASE_REPORT_STATUSES),
+        date_range_filter(PurchaseOrder.created_at, start_date, end_date)
+    ),
+    summary=_purchase_summary
+)
+
+# Report types whose base rows can be queried directly with the custom report definitions
+REPORT_SOURCES = {source.report_type: source for source in (STOCK_SOURCE, PURCHASE_SOURCE)}
+
+
+@dataclass
+class ReportPlan:
+    """
+    Split of a custom report definition between SQL and in-memory processing.
+
+    sql_* parts are applied by the query; memory_* parts are left to the
+    ReportBuilderService on the returned rows.
+    """
+    source: ReportSource
+    fields: List[str]
+    sql_filters: List[Any] = field(default_factory=list)
+    memory_filters: List[Any] = field(default_factory=list)
+    sql_grouping: Optional[Any] = None
+    memory_grouping: Optional[List[Any]] = None
+    sql_sorting: List[Any] = field(default_factory=list)
+    memory_sorting: List[Any] = field(default_factory=list)
+
+    def statement(self, start_date: date, end_date: date):
+        """
+        SELECT statement of the planned rows.
+
+        Args:
+            start_date: Start of the report period
+            end_date: End of the report period
+
+        Returns:
+            SQLAlchemy Select
+        """
+        fields = self.source.fields
+        conditions = [self.source.where(start_date, end_date)]
+        conditions.extend(_condition(fields[f.field], f) for f in self.sql_filters)
+
+        if self.sql_grouping is not None:
+            group = self.sql_grouping
+            key = fields[group.field].expression
+            columns = {group.field: key.label(group.field)}
+            columns.update({
+                name: _aggregate(fields[name].expression, group.aggregate).label(name)
+                for name in self.fields if name != group.field
+            })
+            stmt = self.source.select_from(select(*columns.values())).where(*conditions).group_by(key)
+            order_by = [_order(columns[s.field], s.direction) for s in self.sql_sorting]
+            return stmt.order_by(*(order_by or [key]))
+
+        stmt = self.source.select_from(select(*(fields[name].expression.label(name) for name in self.fields)))
+        stmt = stmt.where(*conditions)
+        if self.sql_sorting:
+            stmt = stmt.order_by(*(_order(fields[s.field].expression, s.direction) for s in self.sql_sorting))
+        return stmt
+
+    def execute(self, session: Session, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """
+        Run the planned query.
+
+        Args:
+            session: SQLAlchemy session
+            start_date: Start of the report period
+            end_date: End of the report period
+
+        Returns:
+            Report rows (base report value types; aggregates as Decimal / int)
+        """
+        result = session.execute(self.statement(start_date, end_date))
+        names = list(result.keys())
+        group_field = self.sql_grouping.field if self.sql_grouping is not None else None
+        converters = [
+            _aggregate_converter(self.source.fields[name], self.sql_grouping.aggregate)
+            if group_field is not None and name != group_field else _row_converter(self.source.fields[name])
+            for name in names
+        ]
+        return [
+            {name: convert(value) for name, convert, value in zip(names, converters, row, strict=True)}
+            for row in result
+        ]
+
+    def describe(self) -> Dict[str, Any]:
+        """What was pushed down to SQL, for the report metadata."""
+        return {
+            'source': self.source.report_type,
+            'filters': [f.field for f in self.sql_filters],
+            'grouping': self.sql_grouping.field if self.sql_grouping is not None else None,
+            'sorting': [s.field for s in self.sql_sorting],
+        }
+
+
+class ReportQueryPlanner:
+    """
+    Translates custom report definitions into SQL for known report sources.
+
+    Filters are pushed down when the field is a source column and the value
+    matches its type; grouping when every filter was pushed down, there are
+    no calculated fields and each output column has a SQL aggregate; sorting
+    when the grouping (if any) was pushed down and every key is a source (or
+    grouped) column. Everything else is left to in-memory processing, which
+    keeps the ReportFrame semantics (nulls never match comparisons, nulls
+    first in ascending order).
+    """
+
+    def plan(
+        self,
+        report_type: str,
+        columns: Optional[List[Any]] = None,
+        filters: Optional[List[Any]] = None,
+        sorting: Optional[List[Any]] = None,
+        grouping: Optional[List[Any]] = None,
+        calculated_fields: Optional[List[Any]] = None
+    ) -> Optional[ReportPlan]:
+        """
+        Plan a custom report.
+
+        Args:
+            report_type: Template report type
+            columns: ColumnDefinition list
+            filters: FilterCondition list
+            sorting: SortDefinition list
+            grouping: GroupDefinition list
+            calculated_fields: CalculatedField list
+
+        Returns:
+            ReportPlan, or None if the report type has no SQL source
+        """
+        source = REPORT_SOURCES.get(report_type)
+        if source is None:
+            return None
+
+        calculated = {cf.name for cf in calculated_fields or []}
+        plan = ReportPlan(source=source, fields=list(source.fields))
+
+        for condition in filters or []:
+            if condition.field not in calculated and _condition(source.fields.get(condition.field), condition) is not None:
+                plan.sql_filters.append(condition)
+            else:
+                plan.memory_filters.append(condition)
+
+        visible = [c.field for c in columns if c.visible] if columns else []
+        grouped = bool(grouping and grouping[0].aggregate)
+        if grouped:
+            group = grouping[0]
+            output = [name for name in (visible or source.fields) if name in source.fields]
+            if (
+                not plan.memory_filters and not calculated and group.field in source.fields
+                and set(visible) <= set(source.fields) and group.aggregate in SQL_AGGREGATES
+                and all(_aggregate_supported(source.fields[name], group.aggregate)
+                        for name in output if name != group.field)
+            ):
+                plan.sql_grouping = group
+                plan.fields = [group.field] + [name for name in output if name != group.field]
+            else:
+                plan.memory_grouping = grouping
+
+        if sorting:
+            available = set(plan.fields) - calculated
+            if (not grouped or plan.sql_grouping is not None) and all(s.field in available for s in sorting):
+                plan.sql_sorting = list(sorting)
+            else:
+                plan.memory_sorting = list(sorting)
+
+        return plan
+
+
+# ==================== SQL translation ====================
+
+def _typed_value(source_field: SourceField, value: Any) -> Any:
+    """Filter value converted to the field type (None if it cannot be compared in SQL)."""
+    if source_field.kind in NUMERIC_KINDS:
+        if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            return Decimal(str(value))
+        if isinstance(value, str):
+            try:
+                return Decimal(value.strip())
+            except InvalidOperation:
+                return None
+        return None
+    if source_field.kind == DATE:
+        if isinstance(value, date):
+            return value
+        if isinstance(value, str):
+            try:
+                return date.fromisoformat(value)
+            except ValueError:
+                return None
+        return None
+    return value if isinstance(value, str) else None
+
+
+def _condition(source_field: Optional[SourceField], condition: Any):
+    """SQL expression of a filter condition, or None if it must be evaluated in memory."""
+    if source_field is None:
+        return None
+    expr = source_field.expression
+    op = condition.operator
+
+    if op in ('equals', 'not_equals'):
+        if condition.value is None:
+            return expr.is_(None) if op == 'equals' else expr.isnot(None)
+        if source_field.kind in NUMERIC_KINDS and isinstance(condition.value, str):
+            # In memory, numeric columns never equal strings
+            return None
+        value = _typed_value(source_field, condition.value)
+        if value is None:
+            return None
+        return expr == value if op == 'equals' else or_(expr != value, expr.is_(None))
+
+    if op == 'contains':
+        if source_field.kind != STRING or condition.value in (None, ''):
+            return None
+        return func.lower(expr).contains(str(condition.value).lower(), autoescape=True)
+
+    if op in ('greater_than', 'less_than', 'between'):
+        if source_field.kind == STRING:
+            # String ordering depends on the database collation
+            return None
+        value = _typed_value(source_field, condition.value)
+        if value is None:
+            return None
+        if op == 'greater_than':
+            return expr > value
+        if op == 'less_than':
+            return expr < value
+        if condition.value2 is None:
+            return None
+        value2 = _typed_value(source_field, condition.value2)
+        if value2 is None:
+            return None
+        return and_(expr >= value, expr <= value2)
+
+    if op == 'in' and isinstance(condition.value, list):
+        values = [_typed_value(source_field, v) for v in condition.value]
+        if any(v is None for v in values):
+            return None
+        return expr.in_(values) if values else false()
+
+    return None
+
+
+def _aggregate_supported(source_field: SourceField, aggregate: str) -> bool:
+    """Whether an aggregate of this field matches the in-memory semantics."""
+    if aggregate == 'count':
+        return True
+    if aggregate in ('sum', 'avg'):
+        # Non-numeric columns take the first row value of the group in memory
+        return source_field.kind in NUMERIC_KINDS
+    # min / max: string ordering depends on the database collation
+    return source_field.kind != STRING
+
+
+def _aggregate(expr: Any, aggregate: str):
+    if aggregate == 'count':
+        # Groups without values are null, as in memory
+        return func.nullif(func.count(expr), 0)
+    return {'sum': func.sum, 'avg': func.avg, 'min': func.min, 'max': func.max}[aggregate](expr)
+
+
+def _order(expr: Any, direction: str):
+    """Sort key with nulls first ascending and last descending, as in memory."""
+    if direction == 'desc':
+        return expr.desc().nulls_last()
+    return expr.asc().nulls_first()
+
+
+def _row_converter(source_field: SourceField) -> Callable[[Any], Any]:
+    if source_field.kind == NUMBER:
+        return lambda value: float(value) if value is not None else None
+    if source_field.kind == INTEGER:
+        return lambda value: int(value) if value is not None else None
+    if source_field.kind == DATE:
+        return lambda value: str(value) if value is not None else None
+    return lambda value: value
+
+
+def _aggregate_converter(source_field: SourceField, aggregate: str) -> Callable[[Any], Any]:
+    if aggregate == 'count':
+        return lambda value: int(value) if value is not None else None
+    if aggregate in ('sum', 'avg') and source_field.kind in NUMERIC_KINDS:
+        return lambda value: Decimal(str(value)) if value is not None else None
+    # min / max pick a row value
+    return _row_converter(source_field)
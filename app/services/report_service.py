@@ -8,6 +8,7 @@ from app.services.analytics_service import AnalyticsService
 from app.services.forecast_service import ForecastService
 from app.domain.models.report import ReportTemplate
 from app.infrastructure.db import get_session
+from app.utils.period import date_range_filter
 
 
 @dataclass
@@ -347,7 +348,6 @@ class ReportService:
         """
         from app.domain.models.purchase import PurchaseOrder, PurchaseOrderLine
         from app.domain.models.supplier import Supplier
-        from sqlalchemy import func
         
         with get_session() as session:
             # Get purchase orders with supplier info
@@ -358,8 +358,7 @@ class ReportService:
                 Supplier, Supplier.id == PurchaseOrder.supplier_id
             ).filter(
                 PurchaseOrder.status.in_(['confirmed', 'partially_received', 'received']),
-                func.date(PurchaseOrder.created_at) >= start_date,
-                func.date(PurchaseOrder.created_at) <= end_date
+                date_range_filter(PurchaseOrder.created_at, start_date, end_date)
             ).all()
             
             purchase_data = []
@@ -0,0 +1,694 @@
+"""Sales fact service: maintenance and queries of the sales star-schema read model."""
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, insert, delete, func, and_, or_, desc, false
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.domain.models.customer import Customer
+from app.domain.models.order import Order, OrderLine
+from app.domain.models.product import Product
+from app.domain.models.sales_fact import SalesDailyFact, SalesDailyOrderFact, SalesPeriodRollup
+from app.utils.period import day_range
+
+logger = logging.getLogger(__name__)
+
+# Order statuses counted as revenue (dashboard and analytics)
+REVENUE_ORDER_STATUSES = ('confirmed', 'ready', 'shipped', 'delivered', 'invoiced')
+
+_MEASURES = ('order_count', 'order_total', 'revenue_ht', 'quantity', 'cost_amount')
+
+
+@dataclass
+class SalesTotals:
+    """Summed sales measures for a period."""
+    order_count: int = 0
+    order_total: Decimal = Decimal(0)
+    revenue_ht: Decimal = Decimal(0)
+    quantity: Decimal = Decimal(0)
+    cost_amount: Decimal = Decimal(0)
+
+    def add(self, row) -> None:
+        self.order_count += int(row.order_count or 0)
+        self.order_total += Decimal(str(row.order_total or 0))
+        self.revenue_ht += Decimal(str(row.revenue_ht or 0))
+        self.quantity += Decimal(str(row.quantity or 0))
+        self.cost_amount += Decimal(str(row.cost_amount or 0))
+
+
+@dataclass
+class ProductSalesFact:
+    """Sales of one product over a period."""
+    product_id: int
+    product_code: str
+    product_name: str
+    quantity: Decimal
+    revenue_ht: Decimal
+    cost_amount: Decimal
+    order_count: int
+
+
+@dataclass
+class CustomerSalesFact:
+    """Sales of one customer over a period."""
+    customer_id: int
+    customer_name: str
+    order_total: Decimal
+    order_count: int
+    last_order_date: Optional[date]
+
+
+def week_start(day: date) -> date:
+    """First day (Sunday) of the week containing day."""
+    return day - timedelta(days=(day.weekday() + 1) % 7)
+
+
+def period_bounds(period_type: str, day: date) -> Tuple[date, date]:
+    """
+    Inclusive (start, end) of the period of the given type containing day.
+
+    Args:
+        period_type: 'day', 'week', 'month' or 'year'
+        day: Any day of the period
+    """
+    if period_type == 'day':
+        return day, day
+    if period_type == 'week':
+        start = week_start(day)
+        return start, start + timedelta(days=6)
+    if period_type == 'month':
+        start = day.replace(day=1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return start, next_month - timedelta(days=1)
+    if period_type == 'year':
+        return day.replace(month=1, day=1), day.replace(month=12, day=31)
+    raise ValueError(f"Unknown period type: {period_type}")
+
+
+def _zero_measures() -> Dict[str, Decimal]:
+    return {measure: Decimal(0) for measure in _MEASURES}
+
+
+def _to_date(value) -> date:
+    """Normalize a DATE result (date, datetime or ISO string on SQLite)."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class SalesFactService:
+    """
+    Service for the sales star-schema read model.
+
+    Facts are rebuilt per (day, customer) slice when an order of that slice
+    changes, so late corrections to old orders are reflected; the difference
+    between the new and old slice totals is then added to the day, week and
+    month rollups containing the slice with an upsert, so concurrent order
+    events of one period add up instead of overwriting each other. Backfills
+    recompute the rollups of their range from the facts.
+    Queries read rollups (KPIs, trends) or facts (top products and customers)
+    with plain date-range filters instead of scanning orders and order lines.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize the sales fact service.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        self.session = session
+
+    # ==================== Maintenance ====================
+
+    def refresh_order(self, order_id: int) -> Optional[date]:
+        """
+        Rebuild the facts of the (day, customer) slice an order belongs to.
+
+        Args:
+            order_id: Order ID
+
+        Returns:
+            Sale date of the order, or None if the order does not exist
+        """
+        row = self.session.execute(
+            select(Order.created_at, Order.customer_id).where(Order.id == order_id)
+        ).first()
+        if row is None or row.created_at is None:
+            return None
+        sale_date = _to_date(row.created_at)
+        self.refresh_slice(sale_date, row.customer_id)
+        return sale_date
+
+    def refresh_slice(self, sale_date: date, customer_id: int) -> None:
+        """
+        Rebuild the facts of one customer for one day, then add the change
+        of the slice totals to the affected rollups.
+
+        The customer row is locked first: concurrent refreshes of one
+        customer would otherwise read the same old slice totals.
+
+        Args:
+            sale_date: Day to rebuild
+            customer_id: Customer ID
+        """
+        self.session.execute(select(Customer.id).where(Customer.id == customer_id).with_for_update())
+        before = self._day_totals(sale_date, sale_date, customer_id=customer_id)
+        self._rebuild_facts(sale_date, sale_date, customer_id=customer_id)
+        after = self._day_totals(sale_date, sale_date, customer_id=customer_id)
+
+        deltas = {}
+        for key in before.keys() | after.keys():
+            delta = {measure: after[key][measure] - before[key][measure] for measure in _MEASURES}
+            if any(delta.values()):
+                deltas[key] = delta
+        self.apply_rollup_deltas(deltas)
+
+    def backfill(self, date_from: date, date_to: date) -> Dict[str, int]:
+        """
+        Rebuild every fact and rollup of a date range from the source orders.
+
+        Args:
+            date_from: First day (inclusive)
+            date_to: Last day (inclusive)
+
+        Returns:
+            Dict with the number of line facts, order facts and rollups written
+        """
+        if date_from > date_to:
+            raise ValueError("date_from must be before or equal to date_to.")
+
+        line_facts, order_facts = self._rebuild_facts(date_from, date_to)
+        days = [date_from + timedelta(days=i) for i in range((date_to - date_from).days + 1)]
+        rollups = self.refresh_rollups(days)
+
+        logger.info(
+            "Sales facts backfilled from %s to %s: %s line facts, %s order facts, %s rollups",
+            date_from, date_to, line_facts, order_facts, rollups
+        )
+        return {'line_facts': line_facts, 'order_facts': order_facts, 'rollups': rollups}
+
+    def _rebuild_facts(
+        self,
+        date_from: date,
+        date_to: date,
+        customer_id: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """Delete and re-insert facts of a date range (optionally one customer) with INSERT ... SELECT."""
+        range_start, range_end = day_range(date_from, date_to)
+
+        line_where = [SalesDailyFact.sale_date >= date_from, SalesDailyFact.sale_date <= date_to]
+        order_where = [SalesDailyOrderFact.sale_date >= date_from, SalesDailyOrderFact.sale_date <= date_to]
+        source_where = [Order.created_at >= range_start, Order.created_at < range_end]
+        if customer_id is not None:
+            line_where.append(SalesDailyFact.customer_id == customer_id)
+            order_where.append(SalesDailyOrderFact.customer_id == customer_id)
+            source_where.append(Order.customer_id == customer_id)
+
+        self.session.execute(delete(SalesDailyFact).where(*line_where), execution_options={'synchronize_session': False})
+        self.session.execute(delete(SalesDailyOrderFact).where(*order_where), execution_options={'synchronize_session': False})
+
+        sale_date = func.date(Order.created_at)
+        line_select = (
+            select(
+                sale_date,
+                OrderLine.product_id,
+                Order.customer_id,
+                Order.status,
+                func.sum(OrderLine.quantity),
+                func.sum(OrderLine.line_total_ht),
+                func.sum(OrderLine.quantity * func.coalesce(Product.cost, 0)),
+                func.count(OrderLine.id),
+                func.count(Order.id.distinct())
+            )
+            .select_from(OrderLine)
+            .join(Order, Order.id == OrderLine.order_id)
+            .join(Product, Product.id == OrderLine.product_id)
+            .where(*source_where)
+            .group_by(sale_date, OrderLine.product_id, Order.customer_id, Order.status)
+        )
+        line_result = self.session.execute(
+            insert(SalesDailyFact).from_select(
+                ['sale_date', 'product_id', 'customer_id', 'status', 'quantity', 'revenue_ht',
+                 'cost_amount', 'line_count', 'order_count'],
+                line_select
+            )
+        )
+
+        order_select = (
+            select(
+                sale_date,
+                Order.customer_id,
+                Order.status,
+                func.count(Order.id),
+                func.sum(Order.subtotal),
+                func.sum(Order.total)
+            )
+            .where(*source_where)
+            .group_by(sale_date, Order.customer_id, Order.status)
+        )
+        order_result = self.session.execute(
+            insert(SalesDailyOrderFact).from_select(
+                ['sale_date', 'customer_id', 'status', 'order_count', 'order_subtotal', 'order_total'],
+                order_select
+            )
+        )
+        return max(line_result.rowcount or 0, 0), max(order_result.rowcount or 0, 0)
+
+    def refresh_rollups(self, days: Iterable[date]) -> int:
+        """
+        Recompute the day, week and month rollups containing the given days
+        (replaces the rows: for backfills, not concurrent order events).
+
+        Day totals are read from the facts with two grouped queries over the
+        smallest range covering every affected period; weeks and months are
+        summed from those day totals.
+
+        Args:
+            days: Days whose facts changed
+
+        Returns:
+            Number of rollup rows written
+        """
+        periods = {
+            (period_type, period_bounds(period_type, day))
+            for day in set(days)
+            for period_type in ('day', 'week', 'month')
+        }
+        if not periods:
+            return 0
+        range_start = min(bounds[0] for _, bounds in periods)
+        range_end = max(bounds[1] for _, bounds in periods)
+
+        day_totals = self._day_totals(range_start, range_end)
+
+        buckets: Dict[Tuple[str, Tuple[date, date], str], Dict[str, Decimal]] = defaultdict(_zero_measures)
+        for (day, status), totals in day_totals.items():
+            for period_type in ('day', 'week', 'month'):
+                period = (period_type, period_bounds(period_type, day))
+                if period in periods:
+                    bucket = buckets[period + (status,)]
+                    for measure in _MEASURES:
+                        bucket[measure] += totals[measure]
+
+        rows = [
+            {
+                'period_type': period_type,
+                'period_start': period_start,
+                'period_end': period_end,
+                'status': status,
+                'order_count': int(totals['order_count']),
+                'order_total': totals['order_total'],
+                'revenue_ht': totals['revenue_ht'],
+                'quantity': totals['quantity'],
+                'cost_amount': totals['cost_amount']
+            }
+            for (period_type, (period_start, period_end), status), totals in buckets.items()
+        ]
+
+        for period_type in ('day', 'week', 'month'):
+            starts = [bounds[0] for p_type, bounds in periods if p_type == period_type]
+            self.session.execute(
+                delete(SalesPeriodRollup).where(
+                    SalesPeriodRollup.period_type == period_type,
+                    SalesPeriodRollup.period_start.in_(starts)
+                ),
+                execution_options={'synchronize_session': False}
+            )
+        if rows:
+            self.session.execute(insert(SalesPeriodRollup), rows)
+        self.session.flush()
+        return len(rows)
+
+    def apply_rollup_deltas(self, deltas: Dict[Tuple[date, str], Dict[str, Decimal]]) -> int:
+        """
+        Add measure changes of days to the day, week and month rollups
+        containing them, with one INSERT ... ON CONFLICT DO UPDATE adding
+        to the stored values (rows missing for a period are created).
+
+        Args:
+            deltas: Measure changes by (day, order status)
+
+        Returns:
+            Number of rollup rows upserted
+        """
+        buckets: Dict[Tuple[str, Tuple[date, date], str], Dict[str, Decimal]] = defaultdict(_zero_measures)
+        for (day, status), delta in deltas.items():
+            for period_type in ('day', 'week', 'month'):
+                bucket = buckets[(period_type, period_bounds(period_type, day), status)]
+                for measure in _MEASURES:
+                    bucket[measure] += delta[measure]
+        if not buckets:
+            return 0
+
+        rows = [
+            {
+                'period_type': period_type,
+                'period_start': period_start,
+                'period_end': period_end,
+                'status': status,
+                'order_count': int(totals['order_count']),
+                'order_total': totals['order_total'],
+                'revenue_ht': totals['revenue_ht'],
+                'quantity': totals['quantity'],
+                'cost_amount': totals['cost_amount']
+            }
+            for (period_type, (period_start, period_end), status), totals in sorted(buckets.items())
+        ]
+        dialect = sqlite if self.session.get_bind().dialect.name == 'sqlite' else postgresql
+        stmt = dialect.insert(SalesPeriodRollup).values(rows)
+        columns = SalesPeriodRollup.__table__.c
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['period_type', 'period_start', 'status'],
+            set_={
+                **{measure: columns[measure] + stmt.excluded[measure] for measure in _MEASURES},
+                'updated_at': func.now()
+            }
+        )
+        self.session.execute(stmt)
+        return len(rows)
+
+    def _day_totals(
+        self,
+        date_from: date,
+        date_to: date,
+        customer_id: Optional[int] = None
+    ) -> Dict[Tuple[date, str], Dict[str, Decimal]]:
+        """Measures of the facts of a date range (optionally one customer) by (day, order status)."""
+        order_where = [SalesDailyOrderFact.sale_date >= date_from, SalesDailyOrderFact.sale_date <= date_to]
+        line_where = [SalesDailyFact.sale_date >= date_from, SalesDailyFact.sale_date <= date_to]
+        if customer_id is not None:
+            order_where.append(SalesDailyOrderFact.customer_id == customer_id)
+            line_where.append(SalesDailyFact.customer_id == customer_id)
+
+        day_totals: Dict[Tuple[date, str], Dict[str, Decimal]] = defaultdict(_zero_measures)
+        order_rows = self.session.execute(
+            select(
+                SalesDailyOrderFact.sale_date,
+                SalesDailyOrderFact.status,
+                func.sum(SalesDailyOrderFact.order_count),
+                func.sum(SalesDailyOrderFact.order_total)
+            )
+            .where(*order_where)
+            .group_by(SalesDailyOrderFact.sale_date, SalesDailyOrderFact.status)
+        ).all()
+        for sale_date, status, order_count, order_total in order_rows:
+            totals = day_totals[(_to_date(sale_date), status)]
+            totals['order_count'] += Decimal(order_count or 0)
+            totals['order_total'] += Decimal(str(order_total or 0))
+
+        line_rows = self.session.execute(
+            select(
+                SalesDailyFact.sale_date,
+                SalesDailyFact.status,
+                func.sum(SalesDailyFact.revenue_ht),
+                func.sum(SalesDailyFact.quantity),
+                func.sum(SalesDailyFact.cost_amount)
+            )
+            .where(*line_where)
+            .group_by(SalesDailyFact.sale_date, SalesDailyFact.status)
+        ).all()
+        for sale_date, status, revenue_ht, quantity, cost_amount in line_rows:
+            totals = day_totals[(_to_date(sale_date), status)]
+            totals['revenue_ht'] += Decimal(str(revenue_ht or 0))
+            totals['quantity'] += Decimal(str(quantity or 0))
+            totals['cost_amount'] += Decimal(str(cost_amount or 0))
+        return day_totals
+
+    # ==================== Queries ====================
+
+    def get_totals(
+        self,
+        start_date: date,
+        end_date: date,
+        statuses: Optional[Sequence[str]] = REVENUE_ORDER_STATUSES
+    ) -> SalesTotals:
+        """
+        Sum the sales measures of a date range from the rollups.
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            statuses: Order statuses to include (None = all statuses)
+
+        Returns:
+            SalesTotals
+        """
+        totals = SalesTotals()
+        for row in self._covering_rollups(start_date, end_date, 'month', statuses):
+            totals.add(row)
+        return totals
+
+    def get_series(
+        self,
+        start_date: date,
+        end_date: date,
+        group_by: str = 'day',
+        statuses: Optional[Sequence[str]] = REVENUE_ORDER_STATUSES
+    ) -> List[Tuple[date, SalesTotals]]:
+        """
+        Sales measures of a date range grouped by period, from the rollups.
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            group_by: 'day', 'week', 'month' or 'year'
+            statuses: Order statuses to include (None = all statuses)
+
+        Returns:
+            List of (period start, SalesTotals) ordered by period
+        """
+        rollup_type = 'month' if group_by == 'year' else group_by
+        if rollup_type not in ('day', 'week', 'month'):
+            rollup_type, group_by = 'day', 'day'
+
+        buckets: Dict[date, SalesTotals] = defaultdict(SalesTotals)
+        for row in self._covering_rollups(start_date, end_date, rollup_type, statuses):
+            buckets[period_bounds(group_by, _to_date(row.period_start))[0]].add(row)
+        return sorted(buckets.items())
+
+    def covering_condition(self, start_date: date, end_date: date, period_type: str = 'month'):
+        """
+        Condition selecting the rollup rows that exactly cover a date range:
+        whole periods of period_type inside the range, and day rows for the
+        partial periods at the edges.
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            period_type: Largest rollup granularity to use ('day', 'week', 'month')
+
+        Returns:
+            SQL boolean expression on SalesPeriodRollup (always false for an empty range)
+        """
+        if start_date > end_date:
+            return false()
+
+        first_full = period_bounds(period_type, start_date)
+        if first_full[0] < start_date:
+            first_full = period_bounds(period_type, first_full[1] + timedelta(days=1))
+        last_full = period_bounds(period_type, end_date)
+        if last_full[1] > end_date:
+            last_full = period_bounds(period_type, last_full[0] - timedelta(days=1))
+
+        conditions = []
+        if period_type != 'day' and first_full[0] <= last_full[0]:
+            conditions.append(and_(
+                SalesPeriodRollup.period_type == period_type,
+                SalesPeriodRollup.period_start >= first_full[0],
+                SalesPeriodRollup.period_start <= last_full[0]
+            ))
+            day_ranges = [(start_date, first_full[0] - timedelta(days=1)), (last_full[1] + timedelta(days=1), end_date)]
+        else:
+            day_ranges = [(start_date, end_date)]
+        for day_from, day_to in day_ranges:
+            if day_from <= day_to:
+                conditions.append(and_(
+                    SalesPeriodRollup.period_type == 'day',
+                    SalesPeriodRollup.period_start >= day_from,
+                    SalesPeriodRollup.period_start <= day_to
+                ))
+        return or_(*conditions)
+
+    def _covering_rollups(
+        self,
+        start_date: date,
+        end_date: date,
+        period_type: str,
+        statuses: Optional[Sequence[str]]
+    ) -> List[SalesPeriodRollup]:
+        """Rollup rows exactly covering a date range (see covering_condition)."""
+        if start_date > end_date:
+            return []
+
+        stmt = select(SalesPeriodRollup).where(self.covering_condition(start_date, end_date, period_type))
+        if statuses is not None:
+            stmt = stmt.where(SalesPeriodRollup.status.in_(list(statuses)))
+        return list(self.session.execute(stmt).scalars().all())
+
+    def get_top_products(
+        self,
+        start_date: date,
+        end_date: date,
+        limit: Optional[int] = 10,
+        statuses: Sequence[str] = REVENUE_ORDER_STATUSES
+    ) -> List[ProductSalesFact]:
+        """
+        Products ordered by revenue over a date range, from the daily facts.
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            limit: Number of products to return (None = all)
+            statuses: Order statuses to include
+
+        Returns:
+            List of ProductSalesFact
+        """
+        revenue = func.sum(SalesDailyFact.revenue_ht)
+        stmt = (
+            select(
+                Product.id,
+                Product.code,
+                Product.name,
+                func.sum(SalesDailyFact.quantity),
+                revenue,
+                func.sum(SalesDailyFact.cost_amount),
+                func.sum(SalesDailyFact.order_count)
+            )
+            .join(Product, Product.id == SalesDailyFact.product_id)
+            .where(
+                SalesDailyFact.sale_date >= start_date,
+                SalesDailyFact.sale_date <= end_date,
+                SalesDailyFact.status.in_(list(statuses))
+            )
+            .group_by(Product.id, Product.code, Product.name)
+            .order_by(desc(revenue))
+        )
+        if limit:
+            stmt = stmt.limit(limit)
+
+        return [
+            ProductSalesFact(
+                product_id=product_id,
+                product_code=code,
+                product_name=name,
+                quantity=Decimal(str(quantity or 0)),
+                revenue_ht=Decimal(str(revenue_ht or 0)),
+                cost_amount=Decimal(str(cost_amount or 0)),
+                order_count=int(order_count or 0)
+            )
+            for product_id, code, name, quantity, revenue_ht, cost_amount, order_count
+            in self.session.execute(stmt).all()
+        ]
+
+    def get_daily_demand(
+        self,
+        start_date: date,
+        end_date: date,
+        measure: str = 'quantity',
+        product_ids: Optional[Sequence[int]] = None,
+        by_product: bool = True,
+        statuses: Sequence[str] = REVENUE_ORDER_STATUSES
+    ) -> List[Tuple[Optional[int], date, float]]:
+        """
+        Daily sales of a measure over a date range, from the daily facts.
+
+        One grouped query for all products; days without sales are absent
+        (see DemandMatrix.from_records to fill them). Values are floats, as
+        consumed by the forecasting engine.
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            measure: 'quantity' or 'revenue_ht'
+            product_ids: Products to include (None = all products)
+            by_product: Group by product and day (False = by day, product None)
+            statuses: Order statuses to include
+
+        Returns:
+            List of (product ID or None, day, value)
+
+        Raises:
+            ValueError: If the measure is unknown
+        """
+        if measure not in ('quantity', 'revenue_ht'):
+            raise ValueError(f"Unknown demand measure: {measure}")
+        product = SalesDailyFact.product_id if by_product else None
+        group = [SalesDailyFact.sale_date] if product is None else [product, SalesDailyFact.sale_date]
+        stmt = (
+            select(*group, func.sum(getattr(SalesDailyFact, measure)))
+            .where(
+                SalesDailyFact.sale_date >= start_date,
+                SalesDailyFact.sale_date <= end_date,
+                SalesDailyFact.status.in_(list(statuses))
+            )
+            .group_by(*group)
+        )
+        if product_ids is not None:
+            stmt = stmt.where(SalesDailyFact.product_id.in_(list(product_ids)))
+
+        if product is None:
+            return [(None, _to_date(day), float(value or 0)) for day, value in self.session.execute(stmt).all()]
+        return [
+            (product_id, _to_date(day), float(value or 0))
+            for product_id, day, value in self.session.execute(stmt).all()
+        ]
+
+    def get_top_customers(
+        self,
+        start_date: date,
+        end_date: date,
+        limit: Optional[int] = 10,
+        statuses: Sequence[str] = REVENUE_ORDER_STATUSES
+    ) -> List[CustomerSalesFact]:
+        """
+        Customers ordered by order total over a date range, from the daily order facts.
+
+        Args:
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
+            limit: Number of customers to return (None = all)
+            statuses: Order statuses to include
+
+        Returns:
+            List of CustomerSalesFact
+        """
+        total = func.sum(SalesDailyOrderFact.order_total)
+        stmt = (
+            select(
+                Customer.id,
+                Customer.name,
+                total,
+                func.sum(SalesDailyOrderFact.order_count),
+                func.max(SalesDailyOrderFact.sale_date)
+            )
+            .join(Customer, Customer.id == SalesDailyOrderFact.customer_id)
+            .where(
+                SalesDailyOrderFact.sale_date >= start_date,
+                SalesDailyOrderFact.sale_date <= end_date,
+                SalesDailyOrderFact.status.in_(list(statuses))
+            )
+            .group_by(Customer.id, Customer.name)
+            .order_by(desc(total))
+        )
+        if limit:
+            stmt = stmt.limit(limit)
+
+        return [
+            CustomerSalesFact(
+                customer_id=customer_id,
+                customer_name=name,
+                order_total=Decimal(str(order_total or 0)),
+                order_count=int(order_count or 0),
+                last_order_date=_to_date(last_date) if last_date else None
+            )
+            for customer_id, name, order_total, order_count, last_date in self.session.execute(stmt).all()
+        ]
@@ -1,10 +1,11 @@
 """Stock service for complex stock management operations."""
-from typing import List, Optional, Dict, Any
+from collections import defaultdict
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from decimal import Decimal
 from dataclasses import dataclass
 from datetime import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from sqlalchemy import and_, or_, func
 
 from app.domain.models.stock import StockItem, StockMovement, Location
@@ -285,8 +286,120 @@ class StockService:
             availability = self.get_global_availability(product_id, variant_id)
             return availability.total_available >= quantity
     
+    def get_available_quantities(
+        self,
+        keys: Iterable[Tuple[int, Optional[int]]]
+    ) -> Dict[Tuple[int, Optional[int]], Decimal]:
+        """
+        Get available quantity (physical - reserved) for several products in one grouped query.
+        
+        Args:
+            keys: (product_id, variant_id) pairs
+            
+        Returns:
+            Dictionary mapping (product_id, variant_id) to total available quantity
+            across all locations. Missing keys have no stock item.
+        """
+        keys = set(keys)
+        if not keys:
+            return {}
+        
+        rows = self.session.query(
+            StockItem.product_id,
+            StockItem.variant_id,
+            func.sum(StockItem.physical_quantity - StockItem.reserved_quantity)
+        ).filter(
+            StockItem.product_id.in_({product_id for product_id, _ in keys})
+        ).group_by(StockItem.product_id, StockItem.variant_id).all()
+        
+        return {
+            (product_id, variant_id): Decimal(str(available or 0))
+            for product_id, variant_id, available in rows
+            if (product_id, variant_id) in keys
+        }
+    
     # ==================== Reservation Methods ====================
     
+    def reserve_stock_for_lines(
+        self,
+        order_lines: List[Dict[str, Any]]
+    ) -> Dict[Any, List[ReservationResult]]:
+        """
+        Reserve stock for several order lines, loading every candidate stock item
+        in a single locked query instead of one query per line.
+        
+        Uses the same strategy as reserve_stock_for_order: locations with the most
+        available stock are used first.
+        
+        Args:
+            order_lines: List of order line dictionaries with:
+                - line_id: Key used to group the results (usually the order line ID)
+                - product_id: Product ID
+                - quantity: Quantity to reserve
+                - variant_id: Optional variant ID
+                
+        Returns:
+            Dictionary mapping line_id to its ReservationResult list
+        """
+        product_ids = {line['product_id'] for line in order_lines}
+        if not product_ids:
+            return {}
+        
+        available_expr = StockItem.physical_quantity - StockItem.reserved_quantity
+        stock_items = self.session.query(StockItem).filter(
+            StockItem.product_id.in_(product_ids),
+            available_expr > 0
+        ).order_by(StockItem.product_id, available_expr.desc(), StockItem.id).with_for_update().all()
+        
+        items_by_key = defaultdict(list)
+        for stock_item in stock_items:
+            items_by_key[(stock_item.product_id, stock_item.variant_id)].append(stock_item)
+        
+        results: Dict[Any, List[ReservationResult]] = {}
+        for line in order_lines:
+            line_results = results.setdefault(line['line_id'], [])
+            remaining = Decimal(str(line.get('quantity', 0)))
+            
+            for stock_item in items_by_key.get((line['product_id'], line.get('variant_id')), []):
+                if remaining <= 0:
+                    break
+                
+                to_reserve = min(remaining, stock_item.available_quantity)
+                if to_reserve <= 0:
+                    continue
+                
+                try:
+                    stock_item.reserve(to_reserve)
+                    self.validate_stock_rules(stock_item, 'reserve')
+                    
+                    line_results.append(ReservationResult(
+                        stock_item_id=stock_item.id,
+                        location_id=stock_item.location_id,
+                        quantity_reserved=to_reserve,
+                        success=True,
+                        message="Réservation réussie"
+                    ))
+                    remaining -= to_reserve
+                except ValueError as e:
+                    line_results.append(ReservationResult(
+                        stock_item_id=stock_item.id,
+                        location_id=stock_item.location_id,
+                        quantity_reserved=Decimal('0'),
+                        success=False,
+                        message=str(e)
+                    ))
+            
+            if remaining > 0:
+                line_results.append(ReservationResult(
+                    stock_item_id=0,
+                    location_id=0,
+                    quantity_reserved=Decimal('0'),
+                    success=False,
+                    message=f"Stock insuffisant: {remaining} unités manquantes"
+                ))
+        
+        return results
+    
     def reserve_stock_for_order(
         self, 
         order_id: int, 
@@ -664,7 +777,10 @@ class StockService:
         Returns:
             List of ReorderNeed objects sorted by urgency
         """
-        query = self.session.query(StockItem).join(Product).join(Location)
+        # Product and location come from the joins (no lazy load per item)
+        query = self.session.query(StockItem).join(Product).join(Location).options(
+            contains_eager(StockItem.product), contains_eager(StockItem.location)
+        )
         
         if location_id:
             query = query.filter(StockItem.location_id == location_id)
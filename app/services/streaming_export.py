@@ -0,0 +1,114 @@
+"""Helpers for streaming CSV / Excel exports in constant memory."""
+import csv
+import io
+from itertools import islice
+from tempfile import SpooledTemporaryFile
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Rows written per CSV chunk yielded to the response
+CSV_CHUNK_ROWS = 1000
+
+# Rows sampled to estimate Excel column widths
+WIDTH_SAMPLE_ROWS = 200
+
+# Excel column width bounds (characters)
+MIN_COLUMN_WIDTH = 8
+MAX_COLUMN_WIDTH = 50
+
+# Exports larger than this are spooled to a temporary file instead of memory (bytes)
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def iter_csv(rows: Iterable[Sequence[Any]], chunk_rows: int = CSV_CHUNK_ROWS) -> Iterator[str]:
+    """
+    Encode rows as CSV, yielding one string per chunk of rows.
+
+    Args:
+        rows: Row value sequences (may be a generator)
+        chunk_rows: Rows per yielded chunk
+
+    Yields:
+        CSV text chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if not chunk:
+            return
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def estimate_column_widths(headers: Sequence[Any], sample_rows: Iterable[Sequence[Any]]) -> List[int]:
+    """
+    Excel column widths estimated from the headers and a sample of rows.
+
+    Write-only worksheets need their widths before the first row is written,
+    so cells are not measured after the fact.
+
+    Args:
+        headers: Header values
+        sample_rows: First rows of the export
+
+    Returns:
+        One width per column
+    """
+    widths = [len(str(header)) for header in headers]
+    for row in sample_rows:
+        for index, value in enumerate(row[:len(widths)]):
+            if value is not None and value != '':
+                widths[index] = max(widths[index], len(str(value)))
+    return [max(MIN_COLUMN_WIDTH, min(width + 2, MAX_COLUMN_WIDTH)) for width in widths]
+
+
+def peek(rows: Iterable[Any], count: int) -> Tuple[List[Any], Iterator[Any]]:
+    """
+    First rows of an iterable, and an iterator over all rows.
+
+    Args:
+        rows: Rows (may be a generator)
+        count: Number of rows to peek
+
+    Returns:
+        (first rows, iterator yielding every row including the first ones)
+    """
+    rows = iter(rows)
+    head = list(islice(rows, count))
+    return head, _chain(head, rows)
+
+
+def _chain(head: List[Any], rest: Iterator[Any]) -> Iterator[Any]:
+    yield from head
+    yield from rest
+
+
+def write_only_workbook():
+    """
+    New openpyxl workbook in write-only mode (rows are streamed to disk).
+
+    Raises:
+        ImportError: If openpyxl is not installed
+    """
+    try:
+        import openpyxl
+    except ImportError as e:
+        raise ImportError(
+            "openpyxl is required for Excel export. Install it with: pip install openpyxl"
+        ) from e
+    return openpyxl.Workbook(write_only=True)
+
+
+def set_column_widths(worksheet: Any, widths: Sequence[int]) -> None:
+    """Set the column widths of a (write-only) worksheet."""
+    from openpyxl.utils import get_column_letter
+    for index, width in enumerate(widths, 1):
+        worksheet.column_dimensions[get_column_letter(index)].width = width
+
+
+def spooled_file(max_size: Optional[int] = None) -> SpooledTemporaryFile:
+    """Binary file kept in memory up to max_size bytes, then on disk."""
+    return SpooledTemporaryFile(max_size=max_size or SPOOL_MAX_SIZE, mode='w+b')
@@ -17,10 +17,38 @@ celery_app.conf.beat_schedule = {
         'task': 'app.tasks.pricing_tasks.expire_promotional_prices',
         'schedule': crontab(hour=0, minute=0),  # Run daily at midnight
     },
+    'mark-overdue-invoices': {
+        'task': 'app.tasks.invoicing_tasks.mark_overdue_invoices_task',
+        'schedule': crontab(hour=0, minute=30),  # Run daily at 0:30 AM, before the payment reminders
+    },
     'send-payment-reminders': {
         'task': 'app.tasks.payment_reminders.send_payment_reminders_task',
         'schedule': crontab(hour=9, minute=0),  # Run daily at 9 AM
     },
+    'reconcile-credit-exposure': {
+        'task': 'app.tasks.credit_tasks.reconcile_credit_exposure_task',
+        'schedule': crontab(hour=2, minute=0),  # Run nightly at 2 AM
+    },
+    'refresh-customer-sales-aggregates': {
+        'task': 'app.tasks.customer_tasks.refresh_customer_sales_aggregates_task',
+        'schedule': crontab(hour=2, minute=30),  # Run nightly at 2:30 AM
+    },
+    'resync-recent-sales-facts': {
+        'task': 'app.tasks.sales_fact_tasks.resync_recent_sales_facts_task',
+        'schedule': crontab(hour=3, minute=0),  # Run nightly at 3 AM
+    },
+    'refresh-dashboard-counters': {
+        'task': 'app.tasks.dashboard_tasks.refresh_dashboard_counters_task',
+        'schedule': 300.0,  # Run every 5 minutes
+    },
+    'purge-expired-report-jobs': {
+        'task': 'app.tasks.report_tasks.purge_expired_report_jobs_task',
+        'schedule': crontab(minute=15),  # Run hourly
+    },
+    'plan-replenishment': {
+        'task': 'app.tasks.replenishment_tasks.plan_replenishment_task',
+        'schedule': crontab(hour=3, minute=30),  # Run nightly at 3:30 AM, after the sales facts resync
+    },
 }
 
 celery_app.conf.timezone = 'UTC'
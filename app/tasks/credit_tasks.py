@@ -0,0 +1,31 @@
+"""Celery tasks for customer credit exposure maintenance."""
+import logging
+from app.tasks.outbox_worker import celery_app
+from app.infrastructure.db import get_session
+from app.services.credit_service import CreditService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, max_retries=3)
+def reconcile_credit_exposure_task(self):
+    """
+    Reconcile the customer_credit_exposure read model against orders and invoices.
+    This task should be scheduled to run nightly; drifted rows are corrected and logged.
+    """
+    with get_session() as session:
+        credit_service = CreditService(session)
+        drifts = credit_service.reconcile_exposures(fix=True)
+        
+        for drift in drifts:
+            logger.warning(
+                "Credit exposure drift for customer %s: open orders %s -> %s, unpaid invoices %s -> %s",
+                drift.customer_id,
+                drift.stored_open_order_amount,
+                drift.actual_open_order_amount,
+                drift.stored_unpaid_invoice_amount,
+                drift.actual_unpaid_invoice_amount
+            )
+        
+        session.commit()
+        return f"Reconciled credit exposure, {len(drifts)} customers corrected"
@@ -0,0 +1,20 @@
+"""Celery tasks for customer read model maintenance."""
+import logging
+from app.tasks.outbox_worker import celery_app
+from app.infrastructure.db import get_session
+from app.services.customer_sales_aggregate_service import CustomerSalesAggregateService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, max_retries=3)
+def refresh_customer_sales_aggregates_task(self):
+    """
+    Rebuild the customer_sales_aggregates read model over the rolling 12-month window.
+    This task should be scheduled to run nightly so orders older than the window expire.
+    """
+    with get_session() as session:
+        count = CustomerSalesAggregateService(session).refresh_all()
+        session.commit()
+        logger.info("Refreshed sales aggregates for %s customers", count)
+        return f"Refreshed sales aggregates for {count} customers"
@@ -0,0 +1,19 @@
+"""Celery tasks for the dashboard read models."""
+import logging
+from app.tasks.outbox_worker import celery_app
+from app.infrastructure.db import get_session
+from app.services.dashboard_kpi_service import DashboardKPIService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, max_retries=3)
+def refresh_dashboard_counters_task(self):
+    """
+    Recompute the cached dashboard counters.
+    This task should be scheduled every few minutes so dashboard reads rarely hit stale counters.
+    """
+    with get_session() as session:
+        values = DashboardKPIService(session).refresh_counters()
+        session.commit()
+        return f"Refreshed dashboard counters: {values}"
@@ -1,9 +1,10 @@
 """Celery tasks for sending emails."""
+from io import BytesIO
 from celery import Task
 from flask import current_app
 from app.tasks.outbox_worker import celery_app
 from app.services.email_service import email_service
-from app.services.pdf_service import pdf_service
+from app.services.pdf_artifact_store import get_pdf_artifact_store
 from app.application.common.mediator import mediator
 from app.application.sales.quotes.queries.queries import GetQuoteByIdQuery
 from app.infrastructure.db import get_session
@@ -83,7 +84,7 @@ def send_quote_email_task(self, quote_id: int, recipient_email: str, locale: str
         }
         
         # Generate PDF
-        quote_pdf = pdf_service.generate_quote_pdf(quote_data)
+        quote_pdf = BytesIO(get_pdf_artifact_store().read('quote', quote_id, quote_data))
         
         # Send email
         email_service.send_quote_email(
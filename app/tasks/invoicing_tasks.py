@@ -0,0 +1,59 @@
+"""Celery tasks for batch invoicing and invoice status transitions."""
+import logging
+from datetime import date
+from app.tasks.outbox_worker import celery_app
+from app.infrastructure.db import get_session
+from app.services.bulk_invoicing_service import BulkInvoicingService
+from app.services.invoice_state_service import InvoiceStateService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True)
+def invoice_delivered_orders_task(
+    self,
+    invoice_date: str,
+    created_by: int,
+    customer_category: str = None,
+    delivered_from: str = None,
+    delivered_to: str = None
+):
+    """
+    Month-end invoicing run: one draft invoice per delivered order not invoiced yet.
+    Each chunk of orders is committed on its own, so a failed run can simply be
+    queued again: orders already invoiced are not selected twice.
+    
+    Args:
+        invoice_date: Invoice date (ISO format)
+        created_by: User ID recorded on the invoices
+        customer_category: Restrict to a customer group
+        delivered_from: First delivery date (ISO format)
+        delivered_to: Last delivery date (ISO format)
+    """
+    with get_session() as session:
+        service = BulkInvoicingService(session)
+        order_ids = service.find_orders_to_invoice(
+            customer_category=customer_category,
+            delivered_from=date.fromisoformat(delivered_from) if delivered_from else None,
+            delivered_to=date.fromisoformat(delivered_to) if delivered_to else None
+        )
+        result = service.invoice_orders(
+            order_ids, invoice_date=date.fromisoformat(invoice_date), created_by=created_by
+        )
+        for skipped in result.skipped:
+            logger.warning(f"Order {skipped.order_number} not invoiced: {skipped.reason}")
+        return (
+            f"Invoicing run: {result.invoice_count} invoices created ({result.total} total), "
+            f"{len(result.skipped)} orders skipped"
+        )
+
+
+@celery_app.task(bind=True)
+def mark_overdue_invoices_task(self):
+    """
+    Move every unpaid invoice past its due date to 'overdue' in one statement.
+    Scheduled daily before the payment reminders, which read the overdue status.
+    """
+    with get_session() as session:
+        events = InvoiceStateService(session).mark_overdue_invoices()
+        return f"{len(events)} invoices marked overdue"
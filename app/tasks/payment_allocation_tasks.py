@@ -0,0 +1,30 @@
+"""Celery tasks for batch payment allocation."""
+import logging
+from app.tasks.outbox_worker import celery_app
+from app.infrastructure.db import get_session
+from app.services.payment_auto_allocation_service import PaymentAutoAllocationService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, max_retries=3)
+def allocate_payments_task(self, strategy: str = 'fifo', payment_ids: list = None, created_by: int = None):
+    """
+    Allocate imported payments to their customers' open invoices.
+    This task should be queued after a treasury import.
+    
+    Args:
+        strategy: 'fifo' or 'proportional'
+        payment_ids: Payments to allocate (None = every payment with an unallocated amount)
+        created_by: User ID recorded on the allocations
+    """
+    with get_session() as session:
+        result = PaymentAutoAllocationService(session).allocate_payments(
+            strategy=strategy, payment_ids=payment_ids, created_by=created_by
+        )
+        session.commit()
+        partial = sum(1 for payment in result.payments if payment.status != 'allocated')
+        return (
+            f"Payments allocated: {len(result.payments)} payments, {result.allocation_count} allocations, "
+            f"{result.allocated_total} allocated, {partial} not fully allocated"
+        )
@@ -0,0 +1,31 @@
+"""Celery tasks for replenishment planning."""
+import logging
+from app.tasks.outbox_worker import celery_app
+from app.infrastructure.db import get_session
+from app.config import Config
+from app.services.replenishment_service import ReplenishmentService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, max_retries=3)
+def plan_replenishment_task(self, requested_by: int = None, force: bool = False):
+    """
+    Run the replenishment planner and create draft purchase requests.
+    This task should be scheduled to run nightly, after the sales facts resync.
+    
+    Args:
+        requested_by: User ID recorded on the requests (default: Config.REPLENISHMENT_USER_ID)
+        force: Plan every product, even when its inputs did not change
+    """
+    requested_by = requested_by or Config.REPLENISHMENT_USER_ID
+    if not requested_by:
+        return "Replenishment planning skipped: REPLENISHMENT_USER_ID is not set"
+    
+    with get_session() as session:
+        result = ReplenishmentService(session).run(requested_by, force=force)
+        session.commit()
+        return (
+            f"Replenishment planned: {result.evaluated} evaluated, {result.skipped} skipped, "
+            f"{len(result.needs)} needs in {len(result.purchase_request_ids)} purchase requests"
+        )
@@ -0,0 +1,57 @@
+"""Celery tasks for background report jobs."""
+import logging
+from app.tasks.outbox_worker import celery_app
+from app.infrastructure.db import get_session
+from app.application.common.mediator import mediator
+from app.domain.models.report_job import ReportJob
+from app.services.report_job_service import ReportJobService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, max_retries=3)
+def run_report_job_task(self, job_id: str):
+    """
+    Run a report job and store its result.
+
+    Progress is committed at each step so the job status endpoint can
+    report it while the query runs.
+    
+    Args:
+        job_id: ReportJob ID
+    """
+    with get_session() as session:
+        job = session.get(ReportJob, job_id)
+        if not job or job.status == 'completed':
+            return f"Report job {job_id} has nothing to run"
+        ReportJobService(session).start(job)
+    
+    try:
+        with get_session() as session:
+            query = ReportJobService(session).build_query(session.get(ReportJob, job_id))
+        report_dto = mediator.dispatch(query)
+        
+        with get_session() as session:
+            job = session.get(ReportJob, job_id)
+            job.progress = 70
+            session.commit()
+            ReportJobService(session).complete(job, report_dto)
+    except Exception as e:
+        logger.exception("Report job %s failed", job_id)
+        with get_session() as session:
+            ReportJobService(session).fail(session.get(ReportJob, job_id), e)
+        return f"Report job {job_id} failed: {e}"
+    
+    return f"Report job {job_id} completed"
+
+
+@celery_app.task(bind=True, max_retries=3)
+def purge_expired_report_jobs_task(self):
+    """
+    Delete expired report job results and files.
+    This task should be scheduled to run periodically (e.g., hourly).
+    """
+    with get_session() as session:
+        count = ReportJobService(session).purge_expired()
+        session.commit()
+        return f"Purged {count} report jobs"
@@ -0,0 +1,22 @@
+"""Celery tasks for the sales fact read model."""
+import logging
+from datetime import date, timedelta
+from app.tasks.outbox_worker import celery_app
+from app.infrastructure.db import get_session
+from app.services.sales_fact_service import SalesFactService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, max_retries=3)
+def resync_recent_sales_facts_task(self, days: int = 7):
+    """
+    Rebuild the sales facts and rollups of the last days from the orders.
+    This task should be scheduled to run nightly as a safety net for missed order events.
+    """
+    date_to = date.today()
+    date_from = date_to - timedelta(days=days)
+    with get_session() as session:
+        counts = SalesFactService(session).backfill(date_from, date_to)
+        session.commit()
+        return f"Resynced sales facts from {date_from} to {date_to}: {counts}"
@@ -0,0 +1,46 @@
+"""Date range helpers for filtering timestamp columns."""
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, true
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def day_range(start: date, end: date) -> Tuple[datetime, datetime]:
+    """
+    Half-open timestamp range covering the inclusive date range [start, end].
+
+    Args:
+        start: First day
+        end: Last day (inclusive)
+
+    Returns:
+        (start 00:00, end + 1 day 00:00)
+    """
+    return datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min)
+
+
+def date_range_filter(column, start: Optional[date] = None, end: Optional[date] = None) -> ColumnElement:
+    """
+    Filter a timestamp column on an inclusive date range.
+
+    Compares the raw column to [start 00:00, end + 1 day 00:00) instead of
+    wrapping it in func.date(), so indexes on the column (alone or after an
+    equality column such as status) can be used for a range scan.
+
+    Args:
+        column: DateTime column, e.g. Order.created_at
+        start: First day (None for no lower bound)
+        end: Last day, inclusive (None for no upper bound)
+
+    Returns:
+        SQL boolean expression
+    """
+    conditions = []
+    if start is not None:
+        conditions.append(column >= datetime.combine(start, time.min))
+    if end is not None:
+        conditions.append(column < datetime.combine(end + timedelta(days=1), time.min))
+    if not conditions:
+        return true()
+    return and_(*conditions)
@@ -0,0 +1,38 @@
+"""Add customer_credit_exposure read model table
+
+Revision ID: 0015_add_customer_credit_exposure
+Revises: 0014_add_report_templates_table
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+# revision identifiers, used by Alembic.
+revision = '0015_add_customer_credit_exposure'
+down_revision = '0014_add_report_templates_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create customer_credit_exposure table (one row per customer)
+    op.create_table(
+        'customer_credit_exposure',
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('open_order_amount', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('unpaid_invoice_amount', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('last_payment_id', sa.Integer(), nullable=True),
+        sa.Column('last_payment_date', sa.Date(), nullable=True),
+        sa.Column('last_payment_amount', sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column('reconciled_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=func.now()),
+        
+        sa.PrimaryKeyConstraint('customer_id', name='pk_customer_credit_exposure'),
+        sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], name='fk_customer_credit_exposure_customer_id'),
+        sa.ForeignKeyConstraint(['last_payment_id'], ['payments.id'], name='fk_customer_credit_exposure_last_payment_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('customer_credit_exposure')
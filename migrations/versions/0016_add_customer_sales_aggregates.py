@@ -0,0 +1,36 @@
+"""Add customer_sales_aggregates read model table
+
+Revision ID: 0016_add_customer_sales_aggregates
+Revises: 0015_add_customer_credit_exposure
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+# revision identifiers, used by Alembic.
+revision = '0016_add_customer_sales_aggregates'
+down_revision = '0015_add_customer_credit_exposure'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create customer_sales_aggregates table (one row per customer)
+    op.create_table(
+        'customer_sales_aggregates',
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('revenue_12m', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('order_count_12m', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_order_date', sa.Date(), nullable=True),
+        sa.Column('window_start', sa.Date(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=func.now()),
+        
+        sa.PrimaryKeyConstraint('customer_id', name='pk_customer_sales_aggregates'),
+        sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], name='fk_customer_sales_aggregates_customer_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('customer_sales_aggregates')
@@ -0,0 +1,51 @@
+"""Add price_list_id to product_price_history
+
+Revision ID: 0017_add_price_list_id_to_price_history
+Revises: 0016_add_customer_sales_aggregates
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0017_add_price_list_id_to_price_history'
+down_revision = '0016_add_customer_sales_aggregates'
+branch_labels = None
+depends_on = None
+
+
+def _price_list_column_state():
+    """Return (table exists, column exists) for product_price_history.price_list_id."""
+    # product_price_history is created by create_all (app/scripts/create_tables.py),
+    # which already includes the new column on fresh databases
+    inspector = sa.inspect(op.get_bind())
+    if 'product_price_history' not in inspector.get_table_names():
+        return False, False
+    columns = [c['name'] for c in inspector.get_columns('product_price_history')]
+    return True, 'price_list_id' in columns
+
+
+def upgrade() -> None:
+    table_exists, column_exists = _price_list_column_state()
+    if not table_exists or column_exists:
+        return
+    
+    # Price list price changes (bulk imports) are recorded alongside base price changes
+    # Use batch mode for SQLite compatibility when adding columns
+    with op.batch_alter_table("product_price_history", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("price_list_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_product_price_history_price_list_id", "price_lists", ["price_list_id"], ["id"]
+        )
+        batch_op.create_index("ix_product_price_history_price_list_id", ["price_list_id"])
+
+
+def downgrade() -> None:
+    table_exists, column_exists = _price_list_column_state()
+    if not table_exists or not column_exists:
+        return
+    
+    with op.batch_alter_table("product_price_history", schema=None) as batch_op:
+        batch_op.drop_index("ix_product_price_history_price_list_id")
+        batch_op.drop_constraint("fk_product_price_history_price_list_id", type_="foreignkey")
+        batch_op.drop_column("price_list_id")
@@ -0,0 +1,86 @@
+"""Add sales fact read model tables (daily facts and period rollups)
+
+Revision ID: 0018_add_sales_fact_tables
+Revises: 0017_add_price_list_id_to_price_history
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+# revision identifiers, used by Alembic.
+revision = '0018_add_sales_fact_tables'
+down_revision = '0017_add_price_list_id_to_price_history'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Line measures per day x product x customer x order status
+    op.create_table(
+        'sales_daily_fact',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sale_date', sa.Date(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('quantity', sa.Numeric(precision=14, scale=3), nullable=False, server_default='0'),
+        sa.Column('revenue_ht', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('cost_amount', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('line_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('order_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=func.now()),
+        
+        sa.PrimaryKeyConstraint('id', name='pk_sales_daily_fact'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], name='fk_sales_daily_fact_product_id'),
+        sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], name='fk_sales_daily_fact_customer_id'),
+        sa.UniqueConstraint('sale_date', 'product_id', 'customer_id', 'status', name='uq_sales_daily_fact_grain')
+    )
+    op.create_index('ix_sales_daily_fact_customer_date', 'sales_daily_fact', ['customer_id', 'sale_date'])
+    op.create_index('ix_sales_daily_fact_product_date', 'sales_daily_fact', ['product_id', 'sale_date'])
+    
+    # Order header measures per day x customer x order status
+    op.create_table(
+        'sales_daily_order_fact',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sale_date', sa.Date(), nullable=False),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('order_subtotal', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('order_total', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=func.now()),
+        
+        sa.PrimaryKeyConstraint('id', name='pk_sales_daily_order_fact'),
+        sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], name='fk_sales_daily_order_fact_customer_id'),
+        sa.UniqueConstraint('sale_date', 'customer_id', 'status', name='uq_sales_daily_order_fact_grain')
+    )
+    op.create_index('ix_sales_daily_order_fact_customer_date', 'sales_daily_order_fact', ['customer_id', 'sale_date'])
+    
+    # Day / week / month rollups per order status
+    op.create_table(
+        'sales_period_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('period_type', sa.String(length=10), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('period_end', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('order_total', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('revenue_ht', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('quantity', sa.Numeric(precision=14, scale=3), nullable=False, server_default='0'),
+        sa.Column('cost_amount', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=func.now()),
+        
+        sa.PrimaryKeyConstraint('id', name='pk_sales_period_rollup'),
+        sa.UniqueConstraint('period_type', 'period_start', 'status', name='uq_sales_period_rollup_grain')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('sales_period_rollup')
+    op.drop_index('ix_sales_daily_order_fact_customer_date', table_name='sales_daily_order_fact')
+    op.drop_table('sales_daily_order_fact')
+    op.drop_index('ix_sales_daily_fact_product_date', table_name='sales_daily_fact')
+    op.drop_index('ix_sales_daily_fact_customer_date', table_name='sales_daily_fact')
+    op.drop_table('sales_daily_fact')
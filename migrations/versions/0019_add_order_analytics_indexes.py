@@ -0,0 +1,49 @@
+"""Add covering indexes for order analytics
+
+Revision ID: 0019_add_order_analytics_indexes
+Revises: 0018_add_sales_fact_tables
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0019_add_order_analytics_indexes'
+down_revision = '0018_add_sales_fact_tables'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns, INCLUDE columns on PostgreSQL)
+INDEXES = (
+    ('ix_orders_status_created_at', 'orders', ['status', 'created_at'], ['total']),
+    ('ix_order_lines_product_order', 'order_lines', ['product_id', 'order_id'], ['quantity', 'line_total_ht']),
+)
+
+
+def _existing_indexes(table_name):
+    """Return the index names of a table, or None if the table does not exist."""
+    # orders and order_lines are created by create_all (app/scripts/create_tables.py),
+    # which already creates these indexes on fresh databases
+    inspector = sa.inspect(op.get_bind())
+    if table_name not in inspector.get_table_names():
+        return None
+    return {index['name'] for index in inspector.get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    for name, table_name, columns, include in INDEXES:
+        existing = _existing_indexes(table_name)
+        if existing is None or name in existing:
+            continue
+        # Range filters on created_at after the status equality; total / line measures are
+        # read from the index (index-only scans) on PostgreSQL, plain composite index elsewhere
+        op.create_index(name, table_name, columns, postgresql_include=include)
+
+
+def downgrade() -> None:
+    for name, table_name, _, _ in INDEXES:
+        existing = _existing_indexes(table_name)
+        if existing is None or name not in existing:
+            continue
+        op.drop_index(name, table_name=table_name)
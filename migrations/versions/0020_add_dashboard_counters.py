@@ -0,0 +1,29 @@
+"""Add dashboard counters table
+
+Revision ID: 0020_add_dashboard_counters
+Revises: 0019_add_order_analytics_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0020_add_dashboard_counters'
+down_revision = '0019_add_order_analytics_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Cached entity counts for the dashboard KPIs (recomputed when stale)
+    op.create_table(
+        'dashboard_counters',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dashboard_counters')
@@ -0,0 +1,46 @@
+"""Add report jobs table
+
+Revision ID: 0021_add_report_jobs
+Revises: 0020_add_dashboard_counters
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+# revision identifiers, used by Alembic.
+revision = '0021_add_report_jobs'
+down_revision = '0020_add_dashboard_counters'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Background report jobs; completed jobs cache their result until expires_at
+    op.create_table(
+        'report_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('report_type', sa.String(length=50), nullable=False),
+        sa.Column('format', sa.String(length=10), nullable=False, server_default='json'),
+        sa.Column('parameters', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('file_name', sa.String(length=255), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=func.now()),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_report_jobs_cache_key_status', 'report_jobs', ['cache_key', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_report_jobs_cache_key_status', table_name='report_jobs')
+    op.drop_table('report_jobs')
@@ -0,0 +1,47 @@
+"""Add replenishment planning state and purchase request supplier
+
+Revision ID: 0022_add_replenishment_planning
+Revises: 0021_add_report_jobs
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+# revision identifiers, used by Alembic.
+revision = '0022_add_replenishment_planning'
+down_revision = '0021_add_report_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Supplier suggested for a purchase request (replenishment groups needs by supplier)
+    op.add_column('purchase_requests', sa.Column('supplier_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_purchase_requests_supplier_id', 'purchase_requests', 'suppliers', ['supplier_id'], ['id']
+    )
+
+    # Inputs and outcome of the last planning run per product (incremental runs)
+    op.create_table(
+        'replenishment_sku_states',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('input_hash', sa.String(length=64), nullable=False),
+        sa.Column('supplier_id', sa.Integer(), nullable=True),
+        sa.Column('daily_demand', sa.Numeric(precision=14, scale=4), nullable=False, server_default='0'),
+        sa.Column('reorder_point', sa.Numeric(precision=14, scale=3), nullable=False, server_default='0'),
+        sa.Column('suggested_quantity', sa.Numeric(precision=14, scale=3), nullable=False, server_default='0'),
+        sa.Column('purchase_request_id', sa.Integer(), nullable=True),
+        sa.Column('planned_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=func.now()),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.ForeignKeyConstraint(['supplier_id'], ['suppliers.id']),
+        sa.ForeignKeyConstraint(['purchase_request_id'], ['purchase_requests.id']),
+        sa.PrimaryKeyConstraint('product_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('replenishment_sku_states')
+    op.drop_constraint('fk_purchase_requests_supplier_id', 'purchase_requests', type_='foreignkey')
+    op.drop_column('purchase_requests', 'supplier_id')
@@ -0,0 +1,34 @@
+"""Add aging summary snapshots table
+
+Revision ID: 0023_add_aging_summary_snapshots
+Revises: 0022_add_replenishment_planning
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0023_add_aging_summary_snapshots'
+down_revision = '0022_add_replenishment_planning'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Cached receivables aging summary (marked stale by invoice and payment events)
+    op.create_table(
+        'aging_summary_snapshots',
+        sa.Column('key', sa.String(length=50), nullable=False),
+        sa.Column('as_of_date', sa.Date(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('stale', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+    # Aging aggregation filters open invoices on status and groups on due date
+    op.create_index('ix_invoices_status_due_date', 'invoices', ['status', 'due_date'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_status_due_date', table_name='invoices')
+    op.drop_table('aging_summary_snapshots')
@@ -0,0 +1,22 @@
+"""Add invoice date / number index for the FEC export
+
+Revision ID: 0024_add_invoice_date_number_index
+Revises: 0023_add_aging_summary_snapshots
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0024_add_invoice_date_number_index'
+down_revision = '0023_add_aging_summary_snapshots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # FEC export reads invoices in keyset chunks ordered by (invoice_date, number)
+    op.create_index('ix_invoices_invoice_date_number', 'invoices', ['invoice_date', 'number'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_invoice_date_number', table_name='invoices')
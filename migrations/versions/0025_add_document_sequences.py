@@ -0,0 +1,29 @@
+"""Add document numbering sequences
+
+Revision ID: 0025_add_document_sequences
+Revises: 0024_add_invoice_date_number_index
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0025_add_document_sequences'
+down_revision = '0024_add_invoice_date_number_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Last invoice number issued per year, locked to take blocks of gap-free numbers
+    op.create_table(
+        'document_sequences',
+        sa.Column('prefix', sa.String(length=10), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('last_value', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('prefix', 'year')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('document_sequences')
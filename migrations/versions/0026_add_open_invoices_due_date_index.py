@@ -0,0 +1,40 @@
+"""Add partial index on the due date of open invoices
+
+Revision ID: 0026_add_open_invoices_due_date_index
+Revises: 0025_add_document_sequences
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0026_add_open_invoices_due_date_index'
+down_revision = '0025_add_document_sequences'
+branch_labels = None
+depends_on = None
+
+OPEN_INVOICES = sa.text("status IN ('validated', 'sent', 'partially_paid')")
+
+
+def upgrade() -> None:
+    # Invoices that can still become overdue, scanned by the daily overdue transition
+    op.create_index(
+        'ix_invoices_open_due_date',
+        'invoices',
+        ['due_date'],
+        postgresql_where=OPEN_INVOICES,
+        sqlite_where=OPEN_INVOICES
+    )
+    
+    # Overdue lists read the stored status: move the invoices already past
+    # due now rather than at the first scheduled run (no events, as a backfill)
+    op.execute(
+        "UPDATE invoices SET status = 'overdue' "
+        "WHERE status IN ('validated', 'sent', 'partially_paid') "
+        "AND due_date < CURRENT_DATE AND remaining_amount > 0"
+    )
+
+
+def downgrade() -> None:
+    # Statuses moved to overdue are kept (a status the application sets too)
+    op.drop_index('ix_invoices_open_due_date', table_name='invoices')
@@ -0,0 +1,44 @@
+"""Backfill the sales fact read model from existing orders
+
+Revision ID: 0027_backfill_sales_facts
+Revises: 0026_add_open_invoices_due_date_index
+Create Date: 2026-10-19
+"""
+from datetime import date, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from app.services.sales_fact_service import SalesFactService
+
+# revision identifiers, used by Alembic.
+revision = '0027_backfill_sales_facts'
+down_revision = '0026_add_open_invoices_due_date_index'
+branch_labels = None
+depends_on = None
+
+# Days rebuilt per statement batch (same chunking as app/scripts/backfill_sales_facts.py)
+CHUNK_DAYS = 31
+
+
+def upgrade() -> None:
+    # Order events only maintain the facts of orders changed after deploy:
+    # build the facts and rollups of the existing orders once
+    session = Session(bind=op.get_bind())
+    first_order = session.execute(sa.text("SELECT MIN(created_at) FROM orders")).scalar()
+    if first_order is not None:
+        service = SalesFactService(session)
+        chunk_start = date.fromisoformat(str(first_order)[:10])
+        date_to = date.today()
+        while chunk_start <= date_to:
+            chunk_end = min(chunk_start + timedelta(days=CHUNK_DAYS - 1), date_to)
+            service.backfill(chunk_start, chunk_end)
+            chunk_start = chunk_end + timedelta(days=1)
+    session.flush()
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM sales_period_rollup")
+    op.execute("DELETE FROM sales_daily_order_fact")
+    op.execute("DELETE FROM sales_daily_fact")
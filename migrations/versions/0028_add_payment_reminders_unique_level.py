@@ -0,0 +1,39 @@
+"""Add unique constraint on the payment reminder level of an invoice
+
+Revision ID: 0028_add_payment_reminders_unique_level
+Revises: 0027_backfill_sales_facts
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0028_add_payment_reminders_unique_level'
+down_revision = '0027_backfill_sales_facts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep one reminder per (invoice, level): the sent one if any, else the oldest
+    op.execute(
+        "DELETE FROM payment_reminders "
+        "WHERE EXISTS ("
+        "SELECT 1 FROM payment_reminders kept "
+        "WHERE kept.invoice_id = payment_reminders.invoice_id "
+        "AND kept.reminder_type = payment_reminders.reminder_type "
+        "AND ("
+        "(kept.sent_at IS NOT NULL AND payment_reminders.sent_at IS NULL) "
+        "OR ((kept.sent_at IS NULL) = (payment_reminders.sent_at IS NULL) AND kept.id < payment_reminders.id)"
+        "))"
+    )
+
+    # Batch runs claim a level by inserting its reminder: concurrent runs conflict
+    with op.batch_alter_table('payment_reminders') as batch_op:
+        batch_op.create_unique_constraint(
+            'uq_payment_reminders_invoice_type', ['invoice_id', 'reminder_type']
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('payment_reminders') as batch_op:
+        batch_op.drop_constraint('uq_payment_reminders_invoice_type', type_='unique')
@@ -1,4 +1,6 @@
 """Pytest configuration and fixtures."""
+import socketserver
+import threading
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -17,6 +19,13 @@ from app.domain.models.stock import StockItem, Location, Site  # Import Stock mo
 from app.domain.models.settings import AppSettings, CompanySettings  # Import Settings models to ensure tables are created
 from app.domain.models.invoice import Invoice, InvoiceLine  # Import Invoice models to ensure tables are created
 from app.domain.models.payment import Payment, PaymentAllocation, PaymentReminder  # Import Payment models to ensure tables are created
+from app.domain.models.credit_exposure import CustomerCreditExposure  # Import credit exposure read model to ensure table is created
+from app.domain.models.customer_sales_aggregate import CustomerSalesAggregate  # Import sales aggregates read model to ensure table is created
+from app.domain.models.sales_fact import SalesDailyFact, SalesDailyOrderFact, SalesPeriodRollup  # Import sales fact read model to ensure tables are created
+from app.domain.models.dashboard_counter import DashboardCounter  # Import dashboard counters to ensure table is created
+from app.domain.models.report_job import ReportJob  # Import report jobs to ensure table is created
+from app.domain.models.replenishment import ReplenishmentSkuState  # Import replenishment state to ensure table is created
+from app.domain.models.receivables_aging import AgingSummarySnapshot  # Import aging summary cache to ensure table is created
 
 
 @pytest.fixture(scope="function")
@@ -252,3 +261,61 @@ def sample_volume_pricing(db_session, sample_product):
     db_session.commit()
     db_session.refresh(tier)
     return tier
+
+
+class _SMTPStandInHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: records accepted messages."""
+    
+    def handle(self):
+        self.server.connections += 1
+        self.wfile.write(b"220 localhost stand-in\r\n")
+        recipients = []
+        received = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.wfile.write(b"250 localhost\r\n")
+            elif command.startswith("RCPT"):
+                recipients.append(line.decode().split(":", 1)[1].strip().strip("<>"))
+                self.wfile.write(b"250 OK\r\n")
+            elif command == "DATA":
+                self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                data = b"".join(iter(self.rfile.readline, b".\r\n"))
+                reply = self.server.data_replies.pop(0) if self.server.data_replies else 250
+                if reply == 250:
+                    self.server.messages.append((recipients, data))
+                    received += 1
+                self.wfile.write(f"{reply} {'OK' if reply == 250 else 'Refused'}\r\n".encode())
+                recipients = []
+                if self.server.drop_after and received >= self.server.drop_after:
+                    return  # Server side disconnection
+            elif command == "QUIT":
+                self.wfile.write(b"221 Bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 OK\r\n")
+
+
+@pytest.fixture
+def smtp_server():
+    """
+    Local SMTP stand-in on a free port.
+    
+    Attributes: messages (recipients, data), connections count,
+    data_replies (reply codes to DATA, 250 once exhausted) and drop_after
+    (messages after which a connection is dropped, 0: never).
+    """
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPStandInHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.messages = []
+    server.data_replies = []
+    server.drop_after = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,146 @@
+"""Unit tests for the receivables aging service."""
+import pytest
+from decimal import Decimal
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert
+from app import create_app
+from app.application.common.domain_event_dispatcher import domain_event_dispatcher
+from app.domain.models.customer import Customer
+from app.domain.models.invoice import Invoice, InvoiceStatus, InvoiceValidatedDomainEvent
+from app.domain.models.receivables_aging import AgingSummarySnapshot
+from app.services.aging_service import AgingService, AgingSummary
+
+
+@pytest.fixture
+def aging_customer(db_session, sample_user):
+    """Customer with five open invoices due 10, 20, 40, 70 and 100 days ago."""
+    customer = Customer.create(
+        type="B2B",
+        name="Aging Customer",
+        email="aging@example.com",
+        company_name="Aging Customer SARL"
+    )
+    customer.code = "AGING-001"
+    db_session.add(customer)
+    db_session.flush()
+    
+    today = date.today()
+    for index, days in enumerate((10, 20, 40, 70, 100), 1):
+        invoice = Invoice.create(
+            customer_id=customer.id,
+            order_id=None,
+            invoice_date=today - timedelta(days=days + 30),
+            due_date=today - timedelta(days=days),
+            created_by=sample_user.id
+        )
+        invoice.number = f"AGING-INV-{index:03d}"
+        invoice.status = InvoiceStatus.SENT.value
+        invoice.total = Decimal("100.00") * index
+        invoice.paid_amount = Decimal("0.00")
+        invoice.remaining_amount = Decimal("100.00") * index
+        db_session.add(invoice)
+    db_session.commit()
+    return customer
+
+
+class TestAgingService:
+    """Tests for AgingService."""
+    
+    def test_custom_bucket_boundaries(self, db_session, aging_customer):
+        """Buckets follow the requested boundaries."""
+        [customer] = AgingService(db_session).customer_aging(date.today(), boundaries=(15, 45))
+        
+        buckets = {bucket.name: bucket for bucket in customer.buckets}
+        assert set(buckets) == {'0-15', '16-45', '45+'}
+        assert buckets['0-15'].total_amount == Decimal("100.00")
+        assert buckets['16-45'].invoice_count == 2
+        assert buckets['16-45'].total_amount == Decimal("500.00")
+        assert buckets['45+'].total_amount == Decimal("900.00")
+        assert customer.total_outstanding == Decimal("1500.00")
+    
+    def test_invalid_boundaries(self, db_session):
+        """Boundaries must be increasing."""
+        with pytest.raises(ValueError):
+            AgingService(db_session).customer_aging(date.today(), boundaries=(60, 30))
+    
+    def test_invoice_keyset_pages(self, db_session, aging_customer):
+        """Pages follow (due_date, id) order without gaps or repeats."""
+        service = AgingService(db_session)
+        numbers = []
+        cursor = None
+        pages = 0
+        while True:
+            invoices, cursor = service.invoice_page(
+                date.today(), customer_id=aging_customer.id, after=cursor, limit=2
+            )
+            numbers.extend(invoice.invoice_number for invoice in invoices)
+            pages += 1
+            if cursor is None:
+                break
+        
+        assert pages == 3
+        assert numbers == [f"AGING-INV-{index:03d}" for index in (5, 4, 3, 2, 1)]
+    
+    def test_cached_summary_until_stale(self, db_session, aging_customer):
+        """The snapshot is served until marked stale."""
+        service = AgingService(db_session)
+        summary = service.cached_summary()
+        assert summary.total_outstanding == Decimal("1500.00")
+        assert summary.overdue_count == 5
+        
+        invoice = db_session.query(Invoice).filter(Invoice.number == "AGING-INV-005").one()
+        invoice.remaining_amount = Decimal("0.00")
+        invoice.status = InvoiceStatus.PAID.value
+        db_session.flush()
+        
+        assert service.cached_summary().total_outstanding == Decimal("1500.00")
+        
+        service.mark_summaries_stale()
+        db_session.flush()
+        assert db_session.get(AgingSummarySnapshot, '30,60,90').stale is True
+        
+        refreshed = service.cached_summary()
+        assert refreshed.total_outstanding == Decimal("1000.00")
+        assert refreshed.overdue_count == 4
+        assert AgingSummary.from_json(refreshed.to_json()) == refreshed
+    
+    def test_cached_summary_created_concurrently(self, db_session, aging_customer, monkeypatch):
+        """A snapshot inserted by a concurrent first request is refreshed instead of failing."""
+        db_session.execute(insert(AgingSummarySnapshot).values(
+            key='30,60,90',
+            as_of_date=date.today() - timedelta(days=1),
+            payload={},
+            stale=True,
+            refreshed_at=datetime.now() - timedelta(days=1)
+        ))
+        get = db_session.get
+        calls = []
+        
+        def racing_get(entity, ident, **kwargs):
+            # The first lookup runs before the concurrent insert is visible
+            calls.append(ident)
+            return None if len(calls) == 1 else get(entity, ident, **kwargs)
+        
+        monkeypatch.setattr(db_session, 'get', racing_get)
+        summary = AgingService(db_session).cached_summary()
+        db_session.commit()
+        
+        assert summary.total_outstanding == Decimal("1500.00")
+        assert len(calls) == 2
+        snapshot = db_session.query(AgingSummarySnapshot).one()
+        assert snapshot.stale is False
+        assert snapshot.as_of_date == date.today()
+        assert AgingSummary.from_json(snapshot.payload) == summary
+    
+    def test_invoice_event_marks_summary_stale(self, db_session, aging_customer):
+        """Invoice validation dispatched through the application marks the snapshot stale."""
+        create_app()
+        AgingService(db_session).cached_summary()
+        db_session.commit()
+        
+        domain_event_dispatcher.dispatch(InvoiceValidatedDomainEvent(
+            invoice_id=1, invoice_number="AGING-INV-006", customer_id=aging_customer.id, amount_due=Decimal("100.00")
+        ))
+        
+        db_session.expire_all()
+        assert db_session.get(AgingSummarySnapshot, '30,60,90').stale is True
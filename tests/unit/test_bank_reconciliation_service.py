@@ -0,0 +1,193 @@
+"""Unit tests for bank statement parsing and reconciliation matching."""
+import pytest
+from io import BytesIO
+from decimal import Decimal
+from datetime import date
+from app.application.common.domain_event_dispatcher import domain_event_dispatcher
+from app.domain.models.customer import Customer
+from app.domain.models.payment import Payment, PaymentMethod, PaymentReconciledDomainEvent, PaymentStatus
+from app.services.bank_reconciliation_service import BankReconciliationService
+from app.services.bank_statement_parser import iter_statement_transactions, parse_amount
+
+BANK_ACCOUNT = "FR7630001007941234567890185"
+
+
+@pytest.fixture
+def bank_payments(db_session, sample_user):
+    """Confirmed, unreconciled transfers on the same bank account."""
+    customer = Customer.create(
+        type="B2B", name="Bank Customer", email="bank@example.com", company_name="Bank Customer SAS"
+    )
+    customer.code = "BANK-001"
+    db_session.add(customer)
+    db_session.flush()
+    
+    payments = {}
+    for reference, amount, day in (
+        ("VIR-2026-001", "150.00", 3),
+        ("VIR-2026-002", "80.00", 4),
+        ("VIR-2026-003", "120.00", 4),
+        ("CHQ 778812", "45.50", 5),
+        (None, "999.99", 6),
+        ("VIR-2026-004", "10.00", 6),
+        ("VIR-2026-005", "10.00", 7),
+    ):
+        payment = Payment.create(
+            customer_id=customer.id,
+            payment_method=PaymentMethod.BANK_TRANSFER,
+            amount=Decimal(amount),
+            payment_date=date(2026, 3, day),
+            reference=reference,
+            created_by=sample_user.id
+        )
+        payment.status = PaymentStatus.CONFIRMED
+        payment.bank_account = BANK_ACCOUNT
+        db_session.add(payment)
+        payments[reference or amount] = payment
+    db_session.commit()
+    return payments
+
+
+class TestBankReconciliationService:
+    """Tests for BankReconciliationService.reconcile_statement."""
+    
+    def test_matching_passes(self, db_session, bank_payments):
+        """Exact, grouped, fuzzy and amount/date matches; ambiguous amounts stay unmatched."""
+        transactions = [
+            {'reference': 'vir 2026 001', 'amount': '150.00', 'date': '2026-03-03'},
+            {'reference': 'VIR-2026-002 VIR-2026-003', 'amount': 200, 'date': '2026-03-05'},
+            {'reference': 'CHQ778B12', 'amount': 45.5, 'date': '2026-03-06'},
+            {'reference': 'UNKNOWN', 'amount': '999.99', 'date': '2026-03-08'},
+            {'reference': 'SUBSCRIPTION', 'amount': '10.00', 'date': '2026-03-06'},
+            {'reference': 'FEES', 'amount': '-12.00', 'date': '2026-03-06'},
+        ]
+        
+        result = BankReconciliationService(db_session).reconcile_statement(
+            BANK_ACCOUNT, date(2026, 3, 31), iter(transactions), imported_by=None
+        )
+        
+        by_reference = {match['transaction']['reference']: match for match in result['matched']}
+        assert by_reference['vir 2026 001']['matched_by'] == 'reference'
+        assert by_reference['vir 2026 001']['payment_id'] == bank_payments['VIR-2026-001'].id
+        assert by_reference['VIR-2026-002 VIR-2026-003']['matched_by'] == 'reference_group'
+        assert sorted(by_reference['VIR-2026-002 VIR-2026-003']['payment_ids']) == sorted(
+            [bank_payments['VIR-2026-002'].id, bank_payments['VIR-2026-003'].id]
+        )
+        assert by_reference['CHQ778B12']['matched_by'] == 'fuzzy_reference'
+        assert by_reference['UNKNOWN']['matched_by'] == 'amount_date'
+        assert [t['reference'] for t in result['unmatched_transactions']] == ['FEES', 'SUBSCRIPTION']
+        assert len(result['unmatched_payments']) == 2
+        
+        reconciled = db_session.query(Payment).filter(Payment.reconciled.is_(True)).all()
+        assert len(reconciled) == 5
+        assert all(payment.status == PaymentStatus.RECONCILED for payment in reconciled)
+        assert bank_payments['VIR-2026-002'].bank_reference == 'VIR-2026-002 VIR-2026-003'
+    
+    def test_exact_reference_wins_over_earlier_fuzzy_candidate(self, db_session, bank_payments):
+        """A loose match never takes a payment another transaction references exactly."""
+        transactions = [
+            {'reference': 'NOREF', 'amount': '80.00', 'date': '2026-03-04'},
+            {'reference': 'VIR-2026-002', 'amount': '80.00', 'date': '2026-03-20'},
+        ]
+        
+        result = BankReconciliationService(db_session).reconcile_statement(
+            BANK_ACCOUNT, date(2026, 3, 31), transactions
+        )
+        
+        assert [match['transaction']['reference'] for match in result['matched']] == ['VIR-2026-002']
+    
+    def test_partial_reference_is_not_a_full_match(self, db_session, bank_payments):
+        """A reference merely containing or contained in a payment reference stays ambiguous."""
+        transactions = [
+            {'reference': 'PAYMENTFORVIR2026004INVOICE', 'amount': '10.00', 'date': '2026-03-06'},
+            {'reference': 'VIR', 'amount': '10.00', 'date': '2026-03-06'},
+        ]
+        
+        result = BankReconciliationService(db_session).reconcile_statement(
+            BANK_ACCOUNT, date(2026, 3, 31), transactions
+        )
+        
+        assert result['matched'] == []
+        assert [t['reference'] for t in result['unmatched_transactions']] == [
+            'PAYMENTFORVIR2026004INVOICE', 'VIR'
+        ]
+    
+    def test_non_finite_amounts_left_unmatched(self, db_session, bank_payments):
+        """NaN / Infinity amounts are reported unmatched instead of aborting the import."""
+        transactions = [
+            {'reference': 'VIR-2026-001', 'amount': 'NaN', 'date': '2026-03-03'},
+            {'reference': 'VIR-2026-002', 'amount': 'Infinity', 'date': '2026-03-04'},
+            {'reference': 'VIR-2026-003', 'amount': '120,00', 'date': '2026-03-04'},
+        ]
+        
+        result = BankReconciliationService(db_session).reconcile_statement(
+            BANK_ACCOUNT, date(2026, 3, 31), transactions
+        )
+        
+        assert [match['transaction']['reference'] for match in result['matched']] == ['VIR-2026-003']
+        assert [t['reference'] for t in result['unmatched_transactions']] == ['VIR-2026-001', 'VIR-2026-002']
+    
+    def test_reconciled_events_dispatched_on_commit(self, db_session, bank_payments, monkeypatch):
+        """PaymentReconciledDomainEvent are dispatched in one batch when the caller commits."""
+        batches = []
+        monkeypatch.setattr(domain_event_dispatcher, 'dispatch_all', batches.append)
+        transactions = [
+            {'reference': 'VIR-2026-001', 'amount': '150.00', 'date': '2026-03-03'},
+            {'reference': 'VIR-2026-002 VIR-2026-003', 'amount': '200.00', 'date': '2026-03-05'},
+        ]
+        service = BankReconciliationService(db_session)
+        
+        service.reconcile_statement(BANK_ACCOUNT, date(2026, 3, 31), transactions)
+        db_session.rollback()
+        db_session.commit()
+        assert batches == []
+        
+        service.reconcile_statement(BANK_ACCOUNT, date(2026, 3, 31), transactions)
+        assert batches == []
+        db_session.commit()
+        
+        assert len(batches) == 1
+        assert all(isinstance(event, PaymentReconciledDomainEvent) for event in batches[0])
+        assert sorted(event.payment_id for event in batches[0]) == sorted(
+            bank_payments[reference].id for reference in ('VIR-2026-001', 'VIR-2026-002', 'VIR-2026-003')
+        )
+        assert {event.bank_reference for event in batches[0]} == {'VIR-2026-001', 'VIR-2026-002 VIR-2026-003'}
+    
+    def test_parse_amount(self):
+        """Decimal separator is the last of ',' and '.'; non-finite values are rejected."""
+        assert parse_amount('1,234.56') == Decimal('1234.56')
+        assert parse_amount('1.234,56') == Decimal('1234.56')
+        assert parse_amount('1 234,56') == Decimal('1234.56')
+        assert parse_amount('-12,00') == Decimal('-12.00')
+        assert parse_amount('45.5') == Decimal('45.5')
+        assert parse_amount(200) == Decimal('200')
+        for value in ('NaN', 'Infinity', '-inf', 'sNaN', float('nan'), Decimal('Infinity'), '', 'abc', None):
+            assert parse_amount(value) is None
+    
+    def test_parse_csv_and_camt_statements(self):
+        """CSV and CAMT.053 XML statements are parsed into transaction dicts."""
+        csv_file = BytesIO(
+            "Date;Libellé;Débit;Crédit\n"
+            "03/03/2026;VIR-2026-001;;1 150,00\n"
+            "04/03/2026;FRAIS;12,00;\n".encode('utf-8')
+        )
+        csv_transactions = list(iter_statement_transactions(csv_file, 'statement.csv'))
+        assert csv_transactions[0]['reference'] == 'VIR-2026-001'
+        assert csv_transactions[0]['amount'] == Decimal('1150.00')
+        assert csv_transactions[0]['date'] == date(2026, 3, 3)
+        assert csv_transactions[1]['amount'] == Decimal('-12.00')
+        
+        xml_file = BytesIO(b"""<?xml version="1.0" encoding="UTF-8"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02"><BkToCstmrStmt><Stmt>
+  <Ntry><Amt Ccy="EUR">150.00</Amt><CdtDbtInd>CRDT</CdtDbtInd><BookgDt><Dt>2026-03-03</Dt></BookgDt>
+    <NtryDtls><TxDtls><Refs><EndToEndId>NOTPROVIDED</EndToEndId></Refs>
+    <RmtInf><Ustrd>VIR-2026-001</Ustrd></RmtInf></TxDtls></NtryDtls></Ntry>
+  <Ntry><Amt Ccy="EUR">12.00</Amt><CdtDbtInd>DBIT</CdtDbtInd><BookgDt><Dt>2026-03-04</Dt></BookgDt>
+    <AcctSvcrRef>FEES-0304</AcctSvcrRef></Ntry>
+</Stmt></BkToCstmrStmt></Document>""")
+        xml_transactions = list(iter_statement_transactions(xml_file, 'statement'))
+        assert xml_transactions[0] == {
+            'reference': 'VIR-2026-001', 'amount': Decimal('150.00'), 'date': date(2026, 3, 3), 'description': ''
+        }
+        assert xml_transactions[1]['reference'] == 'FEES-0304'
+        assert xml_transactions[1]['amount'] == Decimal('-12.00')
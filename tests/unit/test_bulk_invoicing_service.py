@@ -0,0 +1,176 @@
+"""Unit tests for bulk invoicing and block invoice numbering."""
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from sqlalchemy import event
+from app.application.billing.invoices.commands.commands import CreateInvoiceCommand
+from app.application.billing.invoices.commands.handlers import CreateInvoiceHandler
+from app.application.common.domain_event_dispatcher import domain_event_dispatcher
+from app.domain.models.customer import Customer
+from app.domain.models.invoice import Invoice, InvoiceCreatedDomainEvent
+from app.domain.models.order import Order, OrderLine, OrderStatus
+from app.services.bulk_invoicing_service import BulkInvoicingService
+from app.services.invoice_numbering_service import InvoiceNumberingService
+
+YEAR = date.today().year
+
+
+@pytest.fixture
+def dispatched_events(monkeypatch):
+    """Domain events dispatched in batch by the invoicing run."""
+    events = []
+    monkeypatch.setattr(domain_event_dispatcher, 'dispatch_all', events.extend)
+    return events
+
+
+@pytest.fixture
+def delivered_orders(db_session, sample_user, sample_product):
+    """Delivered orders: two for a VIP customer, one for a standard customer, one already invoiced."""
+    vip = Customer.create(type="B2B", name="VIP", email="vip@example.com", company_name="VIP SARL")
+    vip.category = "VIP"
+    vip.vat_number = "FR12345678901"
+    standard = Customer.create(type="B2B", name="Standard", email="std@example.com", company_name="Standard SARL")
+    standard.category = "Standard"
+    db_session.add_all([vip, standard])
+    db_session.flush()
+    
+    orders = []
+    for index, (customer, delivered) in enumerate(((vip, True), (vip, False), (standard, True), (vip, True))):
+        order = Order.create(customer_id=customer.id, created_by=sample_user.id, number=f"BULK-ORD-{index}")
+        db_session.add(order)
+        db_session.flush()
+        order.add_line(
+            product_id=sample_product.id,
+            quantity=Decimal("10"),
+            unit_price=Decimal("100.00"),
+            discount_percent=Decimal("5"),
+            tax_rate=Decimal("20")
+        )
+        order.add_line(product_id=sample_product.id, quantity=Decimal("2"), unit_price=Decimal("25.00"))
+        order.status = OrderStatus.DELIVERED.value
+        order.delivery_date_actual = date.today()
+        for line in order.lines:
+            # Order 1 predates quantity_delivered tracking: the ordered quantity is invoiced
+            line.quantity_delivered = line.quantity if delivered else Decimal(0)
+        orders.append(order)
+    db_session.flush()
+    
+    existing = Invoice.create(
+        customer_id=vip.id,
+        order_id=orders[3].id,
+        invoice_date=date.today(),
+        due_date=date.today() + timedelta(days=30),
+        created_by=sample_user.id,
+        number=f"FA-{YEAR}-00007"
+    )
+    db_session.add(existing)
+    db_session.commit()
+    return orders
+
+
+class TestInvoiceNumbering:
+    """Tests for block invoice numbering."""
+    
+    def test_reserve_block_after_existing_numbers(self, db_session, delivered_orders):
+        """A block continues after the highest number issued, and the next one after it."""
+        numbering = InvoiceNumberingService(db_session)
+        
+        assert numbering.reserve_invoice_numbers(3, YEAR) == [
+            f"FA-{YEAR}-00008", f"FA-{YEAR}-00009", f"FA-{YEAR}-00010"
+        ]
+        assert numbering.generate_invoice_number(YEAR) == f"FA-{YEAR}-00011"
+        assert numbering.reserve_invoice_numbers(0, YEAR) == []
+
+
+class TestBulkInvoicingService:
+    """Tests for BulkInvoicingService."""
+    
+    def test_invoice_orders(self, db_session, sample_user, delivered_orders, dispatched_events):
+        """Each delivered order not yet invoiced gets a draft invoice with contiguous numbers."""
+        service = BulkInvoicingService(db_session, chunk_size=2)
+        order_ids = service.find_orders_to_invoice()
+        assert order_ids == [order.id for order in delivered_orders[:3]]
+        
+        result = service.invoice_orders(order_ids, invoice_date=date.today(), created_by=sample_user.id)
+        
+        assert result.invoice_count == 3
+        assert result.invoice_numbers == [f"FA-{YEAR}-{value:05d}" for value in (8, 9, 10)]
+        assert not result.skipped
+        
+        invoices = db_session.query(Invoice).filter(Invoice.id.in_(result.invoice_ids)).order_by(Invoice.id).all()
+        for invoice, order in zip(invoices, delivered_orders[:3], strict=True):
+            assert invoice.order_id == order.id
+            assert invoice.status == "draft"
+            assert invoice.due_date == date.today() + timedelta(days=30)
+            assert [line.sequence for line in invoice.lines] == [1, 2]
+            assert invoice.lines[0].line_total_ht == Decimal("950.00")
+            assert invoice.lines[0].line_total_ttc == Decimal("1140.00")
+            assert invoice.subtotal == Decimal("1000.00")
+            assert invoice.tax_amount == Decimal("200.00")
+            assert invoice.total == invoice.remaining_amount == Decimal("1200.00")
+        assert invoices[0].vat_number == "FR12345678901"
+        assert result.total == Decimal("3600.00")
+        
+        order_lines = db_session.query(OrderLine).filter(OrderLine.order_id == delivered_orders[1].id).all()
+        assert all(line.quantity_invoiced == line.quantity_delivered == line.quantity for line in order_lines)
+        
+        assert [type(event) for event in dispatched_events] == [InvoiceCreatedDomainEvent] * 3
+        assert [event.invoice_id for event in dispatched_events] == result.invoice_ids
+        
+        # Orders are not invoiced twice
+        assert service.find_orders_to_invoice() == []
+        rerun = service.invoice_orders(order_ids, invoice_date=date.today(), created_by=sample_user.id)
+        assert rerun.invoice_count == 0
+        assert len(rerun.skipped) == 3
+    
+    def test_customer_group_filter(self, db_session, delivered_orders, dispatched_events):
+        """Orders can be restricted to a customer group."""
+        service = BulkInvoicingService(db_session)
+        
+        assert service.find_orders_to_invoice(customer_category="Standard") == [delivered_orders[2].id]
+    
+    def test_single_invoice_continues_sequence(
+        self, db_session, sample_user, delivered_orders, dispatched_events
+    ):
+        """Invoices created one at a time take their number from the same sequence."""
+        service = BulkInvoicingService(db_session)
+        service.invoice_orders([delivered_orders[0].id], invoice_date=date.today(), created_by=sample_user.id)
+        
+        invoice_id = CreateInvoiceHandler().handle(CreateInvoiceCommand(
+            order_id=delivered_orders[2].id,
+            customer_id=delivered_orders[2].customer_id,
+            invoice_date=date.today(),
+            due_date=date.today() + timedelta(days=30),
+            created_by=sample_user.id
+        ))
+        
+        assert db_session.get(Invoice, invoice_id).number == f"FA-{YEAR}-00009"
+    
+    def test_single_invoice_locks_sequence_before_checks(
+        self, db_session, sample_user, delivered_orders, dispatched_events
+    ):
+        """The sequence is locked before the order and its existing invoices are read."""
+        command = CreateInvoiceCommand(
+            order_id=delivered_orders[0].id,
+            customer_id=delivered_orders[0].customer_id,
+            invoice_date=date.today(),
+            due_date=date.today() + timedelta(days=30),
+            created_by=sample_user.id
+        )
+        statements = []
+        
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            CreateInvoiceHandler().handle(command)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        
+        def first(fragment):
+            return next(index for index, statement in enumerate(statements) if fragment in statement)
+        
+        assert first("FROM document_sequences") < first("FROM orders")
+        assert first("FROM document_sequences") < first("FROM invoices")
@@ -0,0 +1,171 @@
+"""Unit tests for CreditService and the customer credit exposure read model."""
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from app.services.credit_service import CreditService
+from app.application.customers.events.credit_exposure_handler import CreditExposureDomainEventHandler
+from app.domain.models.credit_exposure import CustomerCreditExposure
+from app.domain.models.order import (
+    Order, OrderConfirmedDomainEvent, OrderCanceledDomainEvent, OrderStatusChangedDomainEvent
+)
+from app.domain.models.invoice import Invoice, InvoiceValidatedDomainEvent
+from app.domain.models.payment import PaymentCreatedDomainEvent, PaymentAllocatedDomainEvent
+
+
+def _add_order(db_session, customer_id, user_id, number, status, total):
+    order = Order(
+        number=number,
+        customer_id=customer_id,
+        created_by=user_id,
+        status=status,
+        subtotal=total,
+        tax_amount=Decimal("0"),
+        total=total
+    )
+    db_session.add(order)
+    db_session.flush()
+    return order
+
+
+@pytest.fixture
+def customer_with_orders(db_session, sample_b2b_customer, sample_user):
+    """B2B customer (credit limit 10000) with open, draft and canceled orders."""
+    _add_order(db_session, sample_b2b_customer.id, sample_user.id, "CMD-T-001", "confirmed", Decimal("1000.00"))
+    _add_order(db_session, sample_b2b_customer.id, sample_user.id, "CMD-T-002", "shipped", Decimal("500.00"))
+    _add_order(db_session, sample_b2b_customer.id, sample_user.id, "CMD-T-003", "draft", Decimal("300.00"))
+    _add_order(db_session, sample_b2b_customer.id, sample_user.id, "CMD-T-004", "canceled", Decimal("200.00"))
+
+    invoice = Invoice.create(
+        customer_id=sample_b2b_customer.id,
+        order_id=None,
+        invoice_date=date.today() - timedelta(days=10),
+        due_date=date.today() + timedelta(days=20),
+        created_by=sample_user.id,
+        number="FA-T-001"
+    )
+    invoice.status = "sent"
+    invoice.total = Decimal("400.00")
+    invoice.remaining_amount = Decimal("250.00")
+    db_session.add(invoice)
+    db_session.commit()
+    return sample_b2b_customer
+
+
+class TestCreditExposure:
+    """Tests for the credit exposure read model."""
+
+    def test_exposure_built_from_source_on_first_use(self, db_session, customer_with_orders):
+        service = CreditService(db_session)
+
+        assert service.calculate_current_debt(customer_with_orders.id) == Decimal("1500.00")
+
+        exposure = db_session.get(CustomerCreditExposure, customer_with_orders.id)
+        assert exposure is not None
+        assert exposure.open_order_amount == Decimal("1500.00")
+        assert exposure.unpaid_invoice_amount == Decimal("250.00")
+        assert exposure.total_exposure == Decimal("1750.00")
+
+    def test_credit_check_reads_exposure_row(self, db_session, customer_with_orders):
+        service = CreditService(db_session)
+        service.get_exposure(customer_with_orders.id)
+        service.apply_exposure_delta(customer_with_orders.id, open_order_delta=Decimal("9000.00"))
+        db_session.commit()
+
+        result = service.validate_credit_for_order(customer_with_orders.id, Decimal("100.00"))
+
+        assert result.valid is False
+        assert result.current_debt == Decimal("10500.00")
+
+    def test_credit_summary_includes_invoices(self, db_session, customer_with_orders):
+        summary = CreditService(db_session).get_credit_summary(customer_with_orders.id)
+
+        assert summary.current_debt == Decimal("1500.00")
+        assert summary.available_credit == Decimal("8500.00")
+        assert summary.unpaid_invoice_amount == Decimal("250.00")
+
+    def test_reconcile_detects_and_fixes_drift(self, db_session, customer_with_orders):
+        service = CreditService(db_session)
+        service.get_exposure(customer_with_orders.id)
+        service.apply_exposure_delta(
+            customer_with_orders.id,
+            open_order_delta=Decimal("42.00"),
+            unpaid_invoice_delta=Decimal("-50.00")
+        )
+        db_session.commit()
+
+        drifts = service.reconcile_exposures(fix=True)
+        db_session.commit()
+
+        assert len(drifts) == 1
+        assert drifts[0].stored_open_order_amount == Decimal("1542.00")
+        assert drifts[0].actual_open_order_amount == Decimal("1500.00")
+        assert drifts[0].actual_unpaid_invoice_amount == Decimal("250.00")
+
+        db_session.expire_all()
+        exposure = db_session.get(CustomerCreditExposure, customer_with_orders.id)
+        assert exposure.open_order_amount == Decimal("1500.00")
+        assert exposure.unpaid_invoice_amount == Decimal("250.00")
+        assert service.reconcile_exposures() == []
+
+
+class TestCreditExposureDomainEventHandler:
+    """Tests for incremental exposure maintenance from domain events."""
+
+    @pytest.fixture
+    def exposure(self, db_session, customer_with_orders):
+        exposure = CreditService(db_session).get_exposure(customer_with_orders.id)
+        db_session.commit()
+        return exposure
+
+    def _reload(self, db_session, customer_id):
+        db_session.expire_all()
+        return db_session.get(CustomerCreditExposure, customer_id)
+
+    def test_order_lifecycle_events(self, db_session, customer_with_orders, exposure):
+        handler = CreditExposureDomainEventHandler()
+        customer_id = customer_with_orders.id
+
+        handler.handle(OrderConfirmedDomainEvent(
+            order_id=99, customer_id=customer_id, order_total=Decimal("300.00")
+        ))
+        assert self._reload(db_session, customer_id).open_order_amount == Decimal("1800.00")
+
+        # confirmed -> in_preparation leaves the open statuses
+        handler.handle(OrderStatusChangedDomainEvent(
+            order_id=99, customer_id=customer_id, order_total=Decimal("300.00"),
+            old_status="confirmed", new_status="in_preparation"
+        ))
+        assert self._reload(db_session, customer_id).open_order_amount == Decimal("1500.00")
+
+        # ready -> shipped stays open: no change
+        handler.handle(OrderStatusChangedDomainEvent(
+            order_id=98, customer_id=customer_id, order_total=Decimal("500.00"),
+            old_status="ready", new_status="shipped"
+        ))
+        assert self._reload(db_session, customer_id).open_order_amount == Decimal("1500.00")
+
+        handler.handle(OrderCanceledDomainEvent(
+            order_id=97, customer_id=customer_id, order_total=Decimal("1000.00"),
+            previous_status="confirmed"
+        ))
+        assert self._reload(db_session, customer_id).open_order_amount == Decimal("500.00")
+
+    def test_invoice_and_payment_events(self, db_session, customer_with_orders, exposure):
+        handler = CreditExposureDomainEventHandler()
+        customer_id = customer_with_orders.id
+
+        handler.handle(InvoiceValidatedDomainEvent(
+            invoice_id=50, customer_id=customer_id, amount_due=Decimal("600.00")
+        ))
+        handler.handle(PaymentAllocatedDomainEvent(
+            payment_id=7, invoice_id=50, customer_id=customer_id, allocated_amount=Decimal("100.00")
+        ))
+        handler.handle(PaymentCreatedDomainEvent(
+            payment_id=7, customer_id=customer_id, amount=Decimal("100.00"),
+            payment_method="bank_transfer", payment_date=date.today()
+        ))
+
+        reloaded = self._reload(db_session, customer_id)
+        assert reloaded.unpaid_invoice_amount == Decimal("750.00")
+        assert reloaded.last_payment_amount == Decimal("100.00")
+        assert reloaded.last_payment_date == date.today()
@@ -0,0 +1,121 @@
+"""Unit tests for CustomerSalesAggregateService and quote suggestions built on it."""
+import pytest
+from decimal import Decimal
+from datetime import date, datetime, timedelta
+from app import create_app
+from app.application.common.domain_event_dispatcher import domain_event_dispatcher
+from app.services.customer_sales_aggregate_service import CustomerSalesAggregateService
+from app.services.pricing_service import PricingService
+from app.application.customers.events.sales_aggregate_handler import CustomerSalesAggregateDomainEventHandler
+from app.domain.models.customer_sales_aggregate import CustomerSalesAggregate
+from app.domain.models.order import Order, OrderConfirmedDomainEvent
+from app.domain.models.quote import Quote, QuoteLine
+
+
+def _add_order(db_session, customer_id, user_id, number, status, total, created_at=None):
+    order = Order(
+        number=number,
+        customer_id=customer_id,
+        created_by=user_id,
+        status=status,
+        subtotal=total,
+        tax_amount=Decimal("0"),
+        total=total,
+        created_at=created_at or datetime.now()
+    )
+    db_session.add(order)
+    db_session.flush()
+    return order
+
+
+@pytest.fixture
+def customer_with_history(db_session, sample_b2b_customer, sample_user):
+    """Customer with two orders in the window, one draft and one older than 12 months."""
+    _add_order(db_session, sample_b2b_customer.id, sample_user.id, "CMD-AGG-001", "delivered", Decimal("4000.00"))
+    _add_order(db_session, sample_b2b_customer.id, sample_user.id, "CMD-AGG-002", "confirmed", Decimal("2000.00"))
+    _add_order(db_session, sample_b2b_customer.id, sample_user.id, "CMD-AGG-003", "draft", Decimal("900.00"))
+    _add_order(db_session, sample_b2b_customer.id, sample_user.id, "CMD-AGG-004", "invoiced", Decimal("7000.00"),
+               created_at=datetime.now() - timedelta(days=400))
+    db_session.commit()
+    return sample_b2b_customer
+
+
+class TestCustomerSalesAggregateService:
+    """Tests for the customer sales aggregates read model."""
+
+    def test_aggregate_built_from_window_orders(self, db_session, customer_with_history):
+        aggregate = CustomerSalesAggregateService(db_session).get_aggregate(customer_with_history.id)
+
+        assert aggregate.revenue_12m == Decimal("6000.00")
+        assert aggregate.order_count_12m == 2
+        assert aggregate.average_basket == Decimal("3000.00")
+        assert aggregate.last_order_date == date.today()
+
+    def test_confirmed_order_event_increments_aggregate(self, db_session, customer_with_history):
+        CustomerSalesAggregateService(db_session).get_aggregate(customer_with_history.id)
+        db_session.commit()
+
+        CustomerSalesAggregateDomainEventHandler().handle(OrderConfirmedDomainEvent(
+            order_id=99, customer_id=customer_with_history.id, order_total=Decimal("500.00")
+        ))
+
+        db_session.expire_all()
+        aggregate = db_session.get(CustomerSalesAggregate, customer_with_history.id)
+        assert aggregate.revenue_12m == Decimal("6500.00")
+        assert aggregate.order_count_12m == 3
+
+    def test_confirmed_order_event_dispatched_to_aggregate(self, db_session, customer_with_history):
+        create_app()
+        CustomerSalesAggregateService(db_session).get_aggregate(customer_with_history.id)
+        db_session.commit()
+
+        domain_event_dispatcher.dispatch(OrderConfirmedDomainEvent(
+            order_id=99, customer_id=customer_with_history.id, order_total=Decimal("500.00")
+        ))
+
+        db_session.expire_all()
+        aggregate = db_session.get(CustomerSalesAggregate, customer_with_history.id)
+        assert aggregate.revenue_12m == Decimal("6500.00")
+        assert aggregate.order_count_12m == 3
+
+    def test_stale_aggregate_served_without_write(self, db_session, customer_with_history):
+        service = CustomerSalesAggregateService(db_session)
+        aggregate = service.get_aggregate(customer_with_history.id)
+        aggregate.window_start = date.today() - timedelta(days=400)
+        aggregate.revenue_12m = Decimal("1.00")
+        db_session.commit()
+
+        aggregate = service.get_aggregate(customer_with_history.id)
+
+        assert aggregate.revenue_12m == Decimal("1.00")
+        assert not db_session.dirty and not db_session.new
+
+    def test_refresh_all_expires_and_corrects(self, db_session, customer_with_history):
+        service = CustomerSalesAggregateService(db_session)
+        service.get_aggregate(customer_with_history.id)
+        service.apply_order_delta(customer_with_history.id, Decimal("123.00"), 5)
+        db_session.commit()
+
+        assert service.refresh_all() == 1
+        db_session.commit()
+
+        db_session.expire_all()
+        aggregate = db_session.get(CustomerSalesAggregate, customer_with_history.id)
+        assert aggregate.revenue_12m == Decimal("6000.00")
+        assert aggregate.order_count_12m == 2
+
+    def test_quote_suggestions_use_loyalty_tier(self, db_session, customer_with_history, sample_product):
+        quote = Quote(customer_id=customer_with_history.id, discount_percent=Decimal("0"))
+        quote.lines.append(QuoteLine(
+            product_id=sample_product.id,
+            quantity=Decimal("1"),
+            unit_price=Decimal("100.00"),
+            line_total_ht=Decimal("100.00")
+        ))
+
+        suggestions = PricingService(db_session).suggest_discounts(quote)
+
+        loyalty = [s for s in suggestions if s.type == 'loyalty']
+        assert len(loyalty) == 1
+        assert loyalty[0].discount_percent == Decimal("1")
+        assert loyalty[0].current_value == Decimal("6000.00")
@@ -0,0 +1,64 @@
+"""Unit tests for DashboardKPIService."""
+import pytest
+from decimal import Decimal
+from datetime import date, datetime, timedelta
+from app.services.dashboard_kpi_service import DashboardKPIService, KPI_NAMES
+from app.services.sales_fact_service import SalesFactService
+from app.domain.models.customer import Customer
+from app.domain.models.dashboard_counter import DashboardCounter
+from app.domain.models.order import Order
+
+
+@pytest.fixture
+def dashboard_orders(db_session, sample_b2b_customer, sample_user):
+    """January: confirmed 100; February: confirmed 300, invoiced 200, draft 50."""
+    for number, status, created_at, total in (
+        ("CMD-K-1", "confirmed", datetime(2026, 1, 15, 10, 0), "100.00"),
+        ("CMD-K-2", "confirmed", datetime(2026, 2, 3, 10, 0), "300.00"),
+        ("CMD-K-3", "invoiced", datetime(2026, 2, 27, 18, 0), "200.00"),
+        ("CMD-K-4", "draft", datetime(2026, 2, 28, 9, 0), "50.00"),
+    ):
+        db_session.add(Order(
+            number=number, customer_id=sample_b2b_customer.id, created_by=sample_user.id,
+            status=status, total=Decimal(total), subtotal=Decimal(total), created_at=created_at
+        ))
+    db_session.commit()
+    SalesFactService(db_session).backfill(date(2026, 1, 1), date(2026, 2, 28))
+    db_session.commit()
+
+
+class TestDashboardKPIService:
+    """Tests for composable dashboard KPIs and cached counters."""
+
+    def test_sales_kpis_compare_current_and_previous_period(self, db_session, dashboard_orders):
+        kpis = DashboardKPIService(db_session).compute(
+            ['total_revenue', 'total_orders'],
+            date(2026, 2, 1), date(2026, 2, 28), date(2026, 1, 4), date(2026, 1, 31)
+        )
+
+        assert set(kpis) == {'total_revenue', 'total_orders'}
+        assert kpis['total_revenue'].value == Decimal("500.00")
+        assert kpis['total_revenue'].previous == Decimal("100.00")
+        assert kpis['total_revenue'].change_percent == Decimal("400")
+        assert (kpis['total_orders'].value, kpis['total_orders'].previous) == (3, 1)
+
+    def test_unknown_kpi_is_rejected(self, db_session):
+        with pytest.raises(ValueError, match="Unknown KPIs: margin"):
+            DashboardKPIService(db_session).compute(['margin'], date.today(), date.today(), date.today(), date.today())
+        assert DashboardKPIService.validate_kpis(None) == list(KPI_NAMES)
+
+    def test_counters_are_cached_until_stale(self, db_session, sample_b2b_customer, dashboard_orders):
+        service = DashboardKPIService(db_session)
+
+        first = service.get_counters(['active_customers', 'active_orders_count'])
+        db_session.commit()
+        assert first == {'active_customers': 1, 'active_orders_count': 2}
+        assert db_session.query(DashboardCounter).count() == 2
+
+        db_session.add(Customer.create(
+            type="B2C", name="Jane Doe", email="jane@example.com", first_name="Jane", last_name="Doe"
+        ))
+        db_session.commit()
+
+        assert service.get_counters(['active_customers'])['active_customers'] == 1
+        assert service.get_counters(['active_customers'], max_age=timedelta(0))['active_customers'] == 2
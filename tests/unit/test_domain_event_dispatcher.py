@@ -0,0 +1,85 @@
+"""Unit tests for domain event handler registration."""
+import pytest
+from app import create_app
+from app.application.common.domain_event_dispatcher import DomainEventDispatcher, domain_event_dispatcher
+from app.application.billing.payments.events.aging_summary_handler import AgingSummaryDomainEventHandler
+from app.application.customers.events.credit_exposure_handler import CreditExposureDomainEventHandler
+from app.application.customers.events.sales_aggregate_handler import CustomerSalesAggregateDomainEventHandler
+from app.application.sales.orders.events.order_canceled_handler import OrderCanceledDomainEventHandler
+from app.application.sales.orders.events.order_confirmed_handler import OrderConfirmedDomainEventHandler
+from app.application.sales.orders.events.sales_fact_handler import SalesFactDomainEventHandler
+from app.domain.models.invoice import (
+    CreditNoteCreatedDomainEvent, InvoicePaidDomainEvent, InvoiceSentDomainEvent, InvoiceValidatedDomainEvent
+)
+from app.domain.models.order import (
+    OrderCanceledDomainEvent, OrderConfirmedDomainEvent, OrderCreatedDomainEvent, OrderStatusChangedDomainEvent
+)
+from app.domain.models.payment import PaymentAllocatedDomainEvent, PaymentCreatedDomainEvent
+
+
+def registered_handler_classes(event_type):
+    """Classes of the handlers registered for an event type, in registration order."""
+    return [handler.__self__.__class__ for handler in domain_event_dispatcher._handlers.get(event_type, [])]
+
+
+@pytest.fixture
+def app(db_session):
+    """Application built twice, as test suites and workers do."""
+    create_app()
+    return create_app()
+
+
+class TestDomainEventDispatcher:
+    """Tests for DomainEventDispatcher."""
+    
+    def test_handler_classes_sharing_a_method_name(self):
+        """Handlers of different classes are all kept; a second instance of the same class is not."""
+        class FirstHandler:
+            def handle(self, event):
+                pass
+        
+        class SecondHandler:
+            def handle(self, event):
+                pass
+        
+        dispatcher = DomainEventDispatcher()
+        for handler in (FirstHandler().handle, SecondHandler().handle, FirstHandler().handle):
+            dispatcher.register_handler(OrderConfirmedDomainEvent, handler)
+        
+        assert [h.__self__.__class__ for h in dispatcher._handlers[OrderConfirmedDomainEvent]] == [
+            FirstHandler, SecondHandler
+        ]
+    
+    def test_create_app_registers_every_handler(self, app):
+        """Every handler subscribed to an event type is registered once."""
+        assert registered_handler_classes(OrderConfirmedDomainEvent)[:2] == [
+            OrderConfirmedDomainEventHandler, CreditExposureDomainEventHandler
+        ]
+        assert registered_handler_classes(OrderCanceledDomainEvent)[:2] == [
+            OrderCanceledDomainEventHandler, CreditExposureDomainEventHandler
+        ]
+        for event_type in (
+            OrderStatusChangedDomainEvent,
+            InvoiceValidatedDomainEvent,
+            PaymentCreatedDomainEvent,
+            PaymentAllocatedDomainEvent,
+        ):
+            assert registered_handler_classes(event_type).count(CreditExposureDomainEventHandler) == 1
+        for event_type in (OrderConfirmedDomainEvent, OrderCanceledDomainEvent):
+            assert registered_handler_classes(event_type).count(CustomerSalesAggregateDomainEventHandler) == 1
+        for event_type in (
+            OrderCreatedDomainEvent,
+            OrderConfirmedDomainEvent,
+            OrderCanceledDomainEvent,
+            OrderStatusChangedDomainEvent,
+        ):
+            assert registered_handler_classes(event_type).count(SalesFactDomainEventHandler) == 1
+        for event_type in (
+            InvoiceValidatedDomainEvent,
+            InvoiceSentDomainEvent,
+            InvoicePaidDomainEvent,
+            CreditNoteCreatedDomainEvent,
+            PaymentCreatedDomainEvent,
+            PaymentAllocatedDomainEvent,
+        ):
+            assert registered_handler_classes(event_type).count(AgingSummaryDomainEventHandler) == 1
@@ -0,0 +1,141 @@
+"""Unit tests for the email transports and send queue."""
+import smtplib
+import time
+import pytest
+from flask import Flask
+from app.infrastructure.mail import (
+    EmailSendQueue, EmailTransport, MemoryTransport, RateLimiter, SMTPTransport, get_email_transport
+)
+from app.services.email_service import EmailService
+
+
+def _transport(smtp_server, **kwargs):
+    options = dict(
+        host="127.0.0.1",
+        port=smtp_server.server_address[1],
+        use_tls=False,
+        retry_backoff=0
+    )
+    options.update(kwargs)
+    return SMTPTransport(**options)
+
+
+def _message(number=1):
+    app = Flask(__name__)
+    app.config.update(MAIL_DEFAULT_SENDER="noreply@example.com")
+    with app.app_context():
+        return EmailService().build_message(
+            to=f"customer{number}@example.com",
+            subject=f"Message {number}",
+            body_text="Hello"
+        )
+
+
+class TestSMTPTransport:
+    """Tests for SMTPTransport and its connection pool."""
+    
+    def test_pool_keeps_connection_open(self, smtp_server):
+        """Successive sends reuse the pooled connection."""
+        transport = _transport(smtp_server)
+        
+        for number in range(3):
+            transport.send(*_message(number))
+        transport.close()
+        
+        assert smtp_server.connections == 1
+        assert [recipients for recipients, _ in smtp_server.messages] == [
+            ["customer0@example.com"], ["customer1@example.com"], ["customer2@example.com"]
+        ]
+        metrics = transport.metrics.snapshot()
+        assert metrics['sent'] == 3
+        assert metrics['connections_opened'] == 1
+    
+    def test_reconnects_after_server_disconnect(self, smtp_server):
+        """A connection dropped by the server is reopened."""
+        smtp_server.drop_after = 1
+        transport = _transport(smtp_server)
+        
+        transport.send(*_message(1))
+        transport.send(*_message(2))
+        
+        assert len(smtp_server.messages) == 2
+        assert smtp_server.connections == 2
+    
+    def test_retries_transient_errors(self, smtp_server):
+        """4xx replies are retried, 5xx replies are not."""
+        smtp_server.data_replies = [451]
+        transport = _transport(smtp_server)
+        
+        transport.send(*_message(1))
+        
+        assert len(smtp_server.messages) == 1
+        assert transport.metrics.snapshot()['retries'] == 1
+        
+        smtp_server.data_replies = [550]
+        with pytest.raises(smtplib.SMTPDataError):
+            transport.send(*_message(2))
+        assert transport.metrics.snapshot()['failed'] == 1
+        assert transport.metrics.snapshot()['retries'] == 1
+    
+    def test_send_queue_batches_per_connection(self, smtp_server):
+        """Each batch goes out on one connection; failures are reported per message."""
+        smtp_server.data_replies = [250, 550]
+        transport = _transport(smtp_server, pool_size=2)
+        queue = EmailSendQueue(transport, batch_size=2, workers=2)
+        for number in range(5):
+            queue.put(*_message(number), key=number)
+        
+        results = queue.flush()
+        
+        assert [result.key for result in results] == [0, 1, 2, 3, 4]
+        assert [result.success for result in results].count(False) == 1
+        assert len(smtp_server.messages) == 4
+        assert smtp_server.connections <= 2
+        assert len(queue) == 0
+
+
+class TestEmailBackends:
+    """Tests for backend selection and the rate limiter."""
+    
+    def test_memory_backend(self):
+        """MAIL_BACKEND='memory' keeps messages in the transport outbox."""
+        app = Flask(__name__)
+        app.config.update(MAIL_BACKEND="memory", MAIL_DEFAULT_SENDER="noreply@example.com")
+        with app.app_context():
+            assert EmailService().send_email(to="a@example.com", subject="Hi", body_text="Hello")
+            transport = get_email_transport()
+        
+        assert isinstance(transport, MemoryTransport)
+        [(msg, recipients)] = transport.outbox
+        assert msg['Subject'] == "Hi"
+        assert recipients == ["a@example.com"]
+    
+    def test_file_backend(self, tmp_path):
+        """MAIL_BACKEND='file' writes .eml files."""
+        app = Flask(__name__)
+        app.config.update(
+            MAIL_BACKEND="file", MAIL_FILE_PATH=str(tmp_path), MAIL_DEFAULT_SENDER="noreply@example.com"
+        )
+        with app.app_context():
+            EmailService().send_email(to="a@example.com", subject="Hi", body_text="Hello")
+        
+        [eml] = tmp_path.glob("*.eml")
+        assert b"Subject: Hi" in eml.read_bytes()
+    
+    def test_transports_must_implement_send(self):
+        """EmailTransport is abstract: a backend without send() cannot be built."""
+        class NoSendTransport(EmailTransport):
+            pass
+        
+        with pytest.raises(TypeError):
+            EmailTransport()
+        with pytest.raises(TypeError):
+            NoSendTransport()
+    
+    def test_rate_limiter(self):
+        """Sends are spaced to the configured rate."""
+        limiter = RateLimiter(rate=50)
+        started_at = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        assert time.monotonic() - started_at >= 0.09
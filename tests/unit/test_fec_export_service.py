@@ -0,0 +1,138 @@
+"""Unit tests for the streaming FEC export."""
+import pytest
+from decimal import Decimal
+from datetime import date, datetime
+from app import create_app
+from app.domain.models.customer import Customer
+from app.domain.models.invoice import Invoice, InvoiceStatus, CreditNote
+from app.services.fec_export_service import FECExportService
+from app.services import fec_export_service
+
+
+@pytest.fixture
+def fec_documents(db_session, sample_user):
+    """Three invoices in January 2026 and a credit note between the first two."""
+    customer = Customer.create(
+        type="B2B",
+        name="FEC Customer",
+        email="fec@example.com",
+        company_name="FEC Customer SARL"
+    )
+    customer.code = "FEC-001"
+    db_session.add(customer)
+    db_session.flush()
+    
+    invoices = []
+    for index, day in enumerate((5, 20, 20), 1):
+        invoice = Invoice.create(
+            customer_id=customer.id,
+            order_id=None,
+            invoice_date=date(2026, 1, day),
+            due_date=date(2026, 2, day),
+            created_by=sample_user.id
+        )
+        invoice.number = f"FA-2026-{index:05d}"
+        invoice.status = InvoiceStatus.SENT.value
+        invoice.subtotal = Decimal("100.00")
+        invoice.tax_amount = Decimal("20.00")
+        invoice.total = Decimal("120.00")
+        db_session.add(invoice)
+        invoices.append(invoice)
+    db_session.flush()
+    
+    credit_note = CreditNote(
+        number="AV-2026-00001",
+        invoice_id=invoices[0].id,
+        customer_id=customer.id,
+        reason="Returned goods",
+        total_amount=Decimal("50.00"),
+        tax_amount=Decimal("10.00"),
+        total_ttc=Decimal("60.00"),
+        status="validated",
+        created_by=sample_user.id,
+        created_at=datetime(2026, 1, 10, 14, 30)
+    )
+    db_session.add(credit_note)
+    db_session.commit()
+    return invoices, credit_note
+
+
+@pytest.fixture
+def accountant_client(db_session, sample_user):
+    """Test client logged in as an admin."""
+    app = create_app()
+    app.config['TESTING'] = True
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = sample_user.id
+        sess['username'] = sample_user.username
+        sess['role'] = 'admin'
+    return client
+
+
+class TestFECExportService:
+    """Tests for FECExportService."""
+    
+    def test_keyset_chunks_cover_all_invoices(self, db_session, fec_documents):
+        """Invoices read in small chunks come out once each, in (date, number) order."""
+        service = FECExportService(db_session)
+        
+        documents = list(service.iter_invoice_entries(date(2026, 1, 1), date(2026, 1, 31), chunk_size=2))
+        
+        assert [entries[0][2] for entries in documents] == ["FA-2026-00001", "FA-2026-00002", "FA-2026-00003"]
+        assert documents[0][0][6] == "FEC-001"
+        assert documents[0][0][7] == "FEC Customer SARL"
+    
+    def test_credit_notes_merged_in_date_order(self, db_session, fec_documents):
+        """Credit note entries are merged between invoices by entry date."""
+        service = FECExportService(db_session)
+        
+        lines = list(service.iter_fec_lines(date(2026, 1, 1), date(2026, 1, 31)))
+        
+        assert lines[0] == "\t".join(FECExportService.FEC_COLUMNS) + "\n"
+        rows = [line.rstrip("\n").split("\t") for line in lines[1:]]
+        assert [row[2] for row in rows[::3]] == [
+            "FA-2026-00001", "AV-2026-00001", "FA-2026-00002", "FA-2026-00003"
+        ]
+        entry_dates = [row[3] for row in rows]
+        assert entry_dates == sorted(entry_dates)
+    
+    def test_invoice_export_matches_stream(self, db_session, fec_documents):
+        """The BytesIO export holds the invoice-only stream."""
+        service = FECExportService(db_session)
+        
+        exported = service.export_invoices_to_fec(date(2026, 1, 1), date(2026, 1, 31)).getvalue()
+        streamed = b"".join(service.stream_fec(date(2026, 1, 1), date(2026, 1, 31), include_credit_notes=False))
+        
+        assert exported == streamed
+        assert exported.decode('utf-8').count("\n") == 1 + 3 * 3
+        assert b"AV-2026-00001" not in exported
+
+
+class TestFECExportRoute:
+    """Tests for the FEC download route."""
+    
+    def test_export_sends_complete_file(self, accountant_client, fec_documents):
+        """The file is sent once fully written."""
+        response = accountant_client.get('/invoices-fec?date_from=2026-01-01&date_to=2026-01-31')
+        
+        assert response.status_code == 200
+        assert response.headers['Content-Disposition'] == 'attachment; filename=FEC_2026-01-01_2026-01-31.txt'
+        assert response.data.decode('utf-8').count("\n") == 1 + 4 * 3
+    
+    def test_export_failure_sends_no_file(self, accountant_client, fec_documents, monkeypatch):
+        """A failure mid-export redirects with an error instead of a truncated 200 response."""
+        monkeypatch.setattr(fec_export_service, 'FEC_WRITE_LINES', 1)
+        stream_fec = FECExportService.stream_fec
+        
+        def failing_stream(self, *args, **kwargs):
+            chunks = stream_fec(self, *args, **kwargs)
+            yield next(chunks)
+            raise RuntimeError("database connection lost")
+        
+        monkeypatch.setattr(FECExportService, 'stream_fec', failing_stream)
+        
+        response = accountant_client.get('/invoices-fec?date_from=2026-01-01&date_to=2026-01-31')
+        
+        assert response.status_code == 302
+        assert 'Content-Disposition' not in response.headers
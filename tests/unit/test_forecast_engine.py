@@ -0,0 +1,104 @@
+"""Unit tests for the batch forecasting engine and ForecastService."""
+import statistics
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from app.domain.models.product import Product
+from app.domain.models.sales_fact import SalesDailyFact
+from app.domain.models.stock import Location, StockItem
+from app.services.forecast_engine import DemandMatrix, forecast
+from app.services.forecast_service import ForecastService
+
+START = date(2026, 3, 1)
+END = date(2026, 3, 10)
+
+
+def _matrix():
+    # Product 1 sells every other day with an upward trend, product 2 only on the 9th
+    records = [(1, START + timedelta(days=day), day + 1) for day in range(0, 10, 2)]
+    records += [(2, date(2026, 3, 9), 4), (2, date(2026, 3, 9), 1), (3, date(2026, 4, 1), 7)]
+    return DemandMatrix.from_records(records, START, END)
+
+
+class TestForecastEngine:
+    """Tests for the dense demand matrix and the batch forecasts."""
+
+    def test_matrix_fills_missing_days(self):
+        matrix = _matrix()
+
+        assert matrix.keys == [1, 2] and matrix.days == 10
+        assert matrix.row(1) == [1.0, 0.0, 3.0, 0.0, 5.0, 0.0, 7.0, 0.0, 9.0, 0.0]
+        assert matrix.row(2)[8] == 5.0 and matrix.row(99) == [0.0] * 10
+        assert matrix.totals() == [25.0, 5.0]
+        assert matrix.active_days() == [5, 1]
+        assert DemandMatrix.from_records([], START, END, keys=[5]).row(5) == [0.0] * 10
+
+    def test_methods_match_reference_formulas(self):
+        matrix = _matrix()
+        history = matrix.row(1)
+
+        moving = forecast(matrix, 'moving_average')
+        assert moving.level[0] == pytest.approx(statistics.mean(history[-3:]))
+        assert moving.std_dev[0] == pytest.approx(statistics.stdev(history))
+        assert moving.points(0, 2)[1][0] == END + timedelta(days=2)
+
+        smoothed = forecast(matrix, 'exponential_smoothing')
+        level = history[0]
+        for value in history[1:]:
+            level = 0.3 * value + 0.7 * level
+        assert smoothed.level[0] == pytest.approx(level)
+
+        regression = forecast(matrix, 'linear_regression')
+        slope, intercept = statistics.linear_regression(range(10), history)
+        assert regression.slope[0] == pytest.approx(slope)
+        assert regression.value(0, 3) == pytest.approx(max(0.0, intercept + slope * 13))
+        assert regression.totals(2)[0] == pytest.approx(sum(regression.value(0, step) for step in range(2)))
+        assert regression.trend(0) == 'decreasing' and regression.trend(1) == 'decreasing'
+
+
+class TestForecastService:
+    """Tests for forecasts read from the sales facts."""
+
+    @pytest.fixture
+    def sales(self, db_session, sample_product, sample_b2c_customer):
+        other = Product(code="FC-2", name="Other", price=Decimal("5.00"))
+        location = Location(code="FC-LOC", name="Forecast", type="warehouse")
+        db_session.add_all([other, location])
+        db_session.flush()
+        db_session.add(StockItem(product_id=sample_product.id, location_id=location.id,
+                                 physical_quantity=Decimal("30")))
+        for offset in range(0, 90, 3):
+            db_session.add(SalesDailyFact(
+                sale_date=END - timedelta(days=offset), product_id=sample_product.id,
+                customer_id=sample_b2c_customer.id, status='delivered',
+                quantity=Decimal("3"), revenue_ht=Decimal("30.00")
+            ))
+        db_session.add(SalesDailyFact(
+            sale_date=END, product_id=sample_product.id, customer_id=sample_b2c_customer.id,
+            status='draft', quantity=Decimal("100"), revenue_ht=Decimal("1000.00")
+        ))
+        db_session.commit()
+        return sample_product, other
+
+    def test_stock_needs_for_all_products(self, db_session, sales):
+        product, other = sales
+
+        forecasts = ForecastService().forecast_stock_needs_batch(as_of=END, forecast_days=30)
+
+        by_product = {f.product_id: f for f in forecasts}
+        assert by_product[product.id].forecast_demand == Decimal("30")  # 1 unit/day
+        assert by_product[product.id].days_until_out_of_stock == 30
+        assert by_product[product.id].recommended_reorder_quantity == Decimal("45.0")
+        assert by_product[other.id].forecast_demand == 0 and by_product[other.id].days_until_out_of_stock is None
+
+    def test_sales_forecast_from_facts(self, db_session, sales):
+        product, _ = sales
+
+        result = ForecastService().forecast_sales(END - timedelta(days=29), END, forecast_periods=5,
+                                                  product_id=product.id)
+
+        assert result.product_code == product.code
+        assert result.historical_average == Decimal("10")
+        assert [point.forecast_value for point in result.forecast_periods] == [Decimal("10")] * 5
+        assert result.forecast_periods[0].date == END + timedelta(days=1)
+        assert ForecastService().forecast_sales(END, END, product_id=999).forecast_periods == []
@@ -0,0 +1,122 @@
+"""Unit tests for scheduled invoice status transitions."""
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from sqlalchemy import event
+from app.application.common.domain_event_dispatcher import domain_event_dispatcher
+from app.domain.models.customer import Customer
+from app.domain.models.invoice import Invoice, InvoiceOverdueDomainEvent
+from app.services.invoice_state_service import InvoiceStateService
+
+
+@pytest.fixture
+def dispatched_events(monkeypatch):
+    """Domain events dispatched in batch by the transition."""
+    events = []
+    monkeypatch.setattr(domain_event_dispatcher, 'dispatch_all', events.extend)
+    return events
+
+
+@pytest.fixture
+def invoices(db_session, sample_user):
+    """Invoices by (status, days past due, remaining amount)."""
+    customer = Customer.create(type="B2B", name="Late", email="late@example.com", company_name="Late SARL")
+    db_session.add(customer)
+    db_session.flush()
+    
+    today = date.today()
+    invoices = []
+    for index, (status, days_late, remaining) in enumerate((
+        ("sent", 10, Decimal("120.00")),
+        ("validated", 40, Decimal("240.00")),
+        ("partially_paid", 5, Decimal("60.00")),
+        ("sent", 0, Decimal("120.00")),  # Due today
+        ("sent", -10, Decimal("120.00")),  # Not due yet
+        ("draft", 10, Decimal("120.00")),
+        ("paid", 10, Decimal("0")),
+        ("sent", 10, Decimal("0")),
+        ("overdue", 30, Decimal("120.00")),  # Already overdue
+    )):
+        invoice = Invoice.create(
+            customer_id=customer.id,
+            order_id=None,
+            invoice_date=today - timedelta(days=60),
+            due_date=today - timedelta(days=days_late),
+            created_by=sample_user.id,
+            number=f"FA-STATE-{index:03d}"
+        )
+        invoice.status = status
+        invoice.total = Decimal("120.00")
+        invoice.remaining_amount = remaining
+        invoices.append(invoice)
+    db_session.add_all(invoices)
+    db_session.commit()
+    return invoices
+
+
+class TestInvoiceStateService:
+    """Tests for InvoiceStateService."""
+    
+    def test_mark_overdue_invoices(self, db_session, invoices, dispatched_events):
+        """Unpaid invoices past their due date move to overdue in one statement."""
+        updates = []
+        
+        def count_updates(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE invoices"):
+                updates.append(statement)
+        
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count_updates)
+        try:
+            events = InvoiceStateService(db_session).mark_overdue_invoices()
+        finally:
+            event.remove(engine, "before_cursor_execute", count_updates)
+        
+        assert len(updates) == 1
+        db_session.expire_all()
+        assert [invoice.status for invoice in invoices] == [
+            "overdue", "overdue", "overdue", "sent", "sent", "draft", "paid", "sent", "overdue"
+        ]
+        
+        assert dispatched_events == events
+        assert sorted(event.invoice_id for event in events) == [invoice.id for invoice in invoices[:3]]
+        first = next(event for event in events if event.invoice_id == invoices[1].id)
+        assert isinstance(first, InvoiceOverdueDomainEvent)
+        assert first.invoice_number == "FA-STATE-001"
+        assert first.customer_id == invoices[1].customer_id
+        assert first.due_date == date.today() - timedelta(days=40)
+        assert first.remaining_amount == Decimal("240.00")
+        
+        # Nothing left to move
+        assert InvoiceStateService(db_session).mark_overdue_invoices() == []
+        assert len(dispatched_events) == 3
+    
+    def test_mark_overdue_as_of(self, db_session, invoices, dispatched_events):
+        """The reference date decides which invoices are past due."""
+        events = InvoiceStateService(db_session).mark_overdue_invoices(as_of=date.today() - timedelta(days=20))
+        
+        assert [event.invoice_id for event in events] == [invoices[1].id]
+    
+    def test_events_discarded_on_rollback(self, db_session, invoices, dispatched_events):
+        """Events are queued on the session: a rolled back transition dispatches nothing."""
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(db_session, 'commit', db_session.flush)
+            events = InvoiceStateService(db_session).mark_overdue_invoices()
+        assert len(events) == 3
+        
+        db_session.rollback()
+        db_session.commit()
+        
+        assert dispatched_events == []
+        assert [invoice.status for invoice in invoices[:3]] == ["sent", "validated", "partially_paid"]
+    
+    def test_invoice_mark_overdue(self, invoices):
+        """A single invoice follows the same rule and raises the same event."""
+        late, _, _, due_today, _, draft, paid, _, _ = invoices
+        for invoice in (late, due_today, draft, paid):
+            invoice.clear_domain_events()
+            invoice.mark_overdue()
+        
+        assert [invoice.status for invoice in (late, due_today, draft, paid)] == ["overdue", "sent", "draft", "paid"]
+        assert [type(event) for event in late.get_domain_events()] == [InvoiceOverdueDomainEvent]
+        assert due_today.get_domain_events() == []
@@ -0,0 +1,106 @@
+"""Unit tests for OrderConfirmationService."""
+import pytest
+from decimal import Decimal
+from app.services.order_confirmation_service import OrderConfirmationService
+from app.domain.models.order import Order, OrderLine, OrderConfirmedDomainEvent
+from app.domain.models.stock import StockItem, Location
+
+
+@pytest.fixture
+def locations(db_session):
+    """Create two warehouse locations."""
+    result = []
+    for code in ("WH-A", "WH-B"):
+        location = Location.create(code=code, name=f"Warehouse {code}", type="warehouse", is_active=True)
+        db_session.add(location)
+        result.append(location)
+    db_session.commit()
+    return result
+
+
+@pytest.fixture
+def stocked_product(db_session, sample_product, locations):
+    """Product with 8 units at WH-A and 5 units (1 reserved) at WH-B."""
+    item_a = StockItem.create(
+        product_id=sample_product.id, location_id=locations[0].id, physical_quantity=Decimal("8")
+    )
+    item_b = StockItem.create(
+        product_id=sample_product.id, location_id=locations[1].id, physical_quantity=Decimal("5")
+    )
+    item_b.reserved_quantity = Decimal("1")
+    db_session.add_all([item_a, item_b])
+    db_session.commit()
+    return sample_product
+
+
+def _draft_order(db_session, customer, user, product, quantities):
+    order = Order(
+        number="CMD-TEST-00001",
+        customer_id=customer.id,
+        created_by=user.id,
+        status="draft",
+        discount_percent=Decimal("0")
+    )
+    db_session.add(order)
+    db_session.flush()
+    for sequence, quantity in enumerate(quantities, start=1):
+        line = OrderLine(
+            order_id=order.id,
+            product_id=product.id,
+            quantity=Decimal(quantity),
+            unit_price=Decimal("10.00"),
+            discount_percent=Decimal("0"),
+            tax_rate=Decimal("20.0"),
+            sequence=sequence
+        )
+        line.calculate_totals()
+        order.lines.append(line)
+    order.calculate_totals()
+    db_session.commit()
+    return order
+
+
+class TestOrderConfirmationService:
+    """Tests for the order confirmation fast path."""
+
+    def test_confirm_reserves_stock_in_same_transaction(
+        self, db_session, sample_b2b_customer, sample_user, stocked_product
+    ):
+        order = _draft_order(db_session, sample_b2b_customer, sample_user, stocked_product, ["6", "4"])
+
+        result = OrderConfirmationService(db_session).confirm(order, sample_user.id)
+
+        assert order.status == "confirmed"
+        assert result.reserved_lines == 2
+        assert set(result.timings_ms) == {"stock", "credit", "confirm", "reserve"}
+        assert any(isinstance(e, OrderConfirmedDomainEvent) for e in order.get_domain_events())
+
+        reserved = sum(r.quantity for r in order.stock_reservations)
+        assert reserved == Decimal("10")
+        items = db_session.query(StockItem).filter(StockItem.product_id == stocked_product.id).all()
+        assert sum(item.reserved_quantity for item in items) == Decimal("11")
+
+    def test_stock_validation_groups_lines_of_same_product(
+        self, db_session, sample_b2b_customer, sample_user, stocked_product
+    ):
+        # 7 + 6 = 13 units required, only 12 available across locations
+        order = _draft_order(db_session, sample_b2b_customer, sample_user, stocked_product, ["7", "6"])
+
+        validation = OrderConfirmationService(db_session).validate_stock(order)
+
+        assert validation['valid'] is False
+        assert "required 13" in validation['issues'][0]
+        assert "available 12" in validation['issues'][0]
+
+    def test_confirm_rejects_credit_exceeded(
+        self, db_session, sample_b2b_customer, sample_user, stocked_product
+    ):
+        sample_b2b_customer.commercial_conditions.credit_limit = Decimal("50.00")
+        db_session.commit()
+        order = _draft_order(db_session, sample_b2b_customer, sample_user, stocked_product, ["6"])
+
+        with pytest.raises(ValueError, match="Credit limit would be exceeded"):
+            OrderConfirmationService(db_session).confirm(order, sample_user.id)
+
+        assert order.status == "draft"
+        assert not order.stock_reservations
@@ -2,11 +2,17 @@
 import pytest
 from decimal import Decimal
 from datetime import date, timedelta
-from app.services.payment_auto_allocation_service import PaymentAutoAllocationService
-from app.domain.models.invoice import Invoice, InvoiceLine, InvoiceStatus
+from app.services.payment_auto_allocation_service import (
+    PaymentAutoAllocationService, allocate_proportional_cents
+)
+from app.application.common.domain_event_dispatcher import domain_event_dispatcher
+from app.domain.models.invoice import Invoice, InvoiceLine, InvoicePaidDomainEvent, InvoiceStatus
 from app.domain.models.customer import Customer, CommercialConditions
 from app.domain.models.product import Product
 from app.domain.models.category import Category
+from app.domain.models.payment import (
+    Payment, PaymentAllocation, PaymentAllocatedDomainEvent, PaymentMethod, PaymentStatus
+)
 
 
 @pytest.fixture
@@ -331,4 +337,112 @@ class TestPaymentAutoAllocationService:
         for alloc in allocations:
             invoice = db_session.query(Invoice).filter(Invoice.id == alloc['invoice_id']).first()
             assert alloc['amount'] <= invoice.remaining_amount
-
+    
+    def _confirmed_payment(self, db_session, customer, amount, days_ago):
+        payment = Payment.create(
+            customer_id=customer.id,
+            payment_method=PaymentMethod.BANK_TRANSFER,
+            amount=Decimal(amount),
+            payment_date=date.today() - timedelta(days=days_ago)
+        )
+        payment.status = PaymentStatus.CONFIRMED
+        db_session.add(payment)
+        db_session.flush()
+        return payment
+    
+    def test_allocate_payments_batch_fifo(self, db_session, sample_customer_with_invoices):
+        """Batch FIFO: later payments of a customer continue where earlier ones stopped."""
+        customer, invoices = sample_customer_with_invoices
+        first = self._confirmed_payment(db_session, customer, "600.00", days_ago=2)
+        second = self._confirmed_payment(db_session, customer, "350.00", days_ago=1)
+        db_session.commit()
+        
+        result = PaymentAutoAllocationService(db_session).allocate_payments(strategy='fifo', created_by=None)
+        db_session.commit()
+        
+        assert [payment.payment_id for payment in result.payments] == [first.id, second.id]
+        assert [(a.invoice_id, a.amount) for a in result.payments[0].allocations] == [
+            (invoices[0].id, Decimal("500.00")), (invoices[1].id, Decimal("100.00"))
+        ]
+        assert [(a.invoice_id, a.amount) for a in result.payments[1].allocations] == [
+            (invoices[1].id, Decimal("200.00")), (invoices[2].id, Decimal("150.00"))
+        ]
+        assert result.payments[1].status == 'allocated'
+        assert result.allocation_count == 4
+        
+        for invoice in invoices:
+            db_session.refresh(invoice)
+        assert [invoice.status for invoice in invoices] == ["paid", "paid", "partially_paid"]
+        assert invoices[2].remaining_amount == Decimal("50.00")
+        assert invoices[2].paid_amount == Decimal("190.00")
+        assert db_session.query(PaymentAllocation).count() == 4
+        
+        # Fully allocated payments are not picked up again
+        assert PaymentAutoAllocationService(db_session).allocate_payments().payments == []
+    
+    def test_allocate_payments_events_dispatched_on_commit(
+        self, db_session, sample_customer_with_invoices, monkeypatch
+    ):
+        """The bulk run raises the events of single allocations, dispatched when the caller commits."""
+        customer, invoices = sample_customer_with_invoices
+        payment = self._confirmed_payment(db_session, customer, "600.00", days_ago=1)
+        db_session.commit()
+        dispatched = []
+        monkeypatch.setattr(domain_event_dispatcher, 'dispatch_all', dispatched.extend)
+        
+        PaymentAutoAllocationService(db_session).allocate_payments(strategy='fifo')
+        assert dispatched == []
+        db_session.commit()
+        
+        allocated = [event for event in dispatched if isinstance(event, PaymentAllocatedDomainEvent)]
+        assert [(event.payment_id, event.invoice_id, event.allocated_amount, event.customer_id) for event in allocated] == [
+            (payment.id, invoices[0].id, Decimal("500.00"), customer.id),
+            (payment.id, invoices[1].id, Decimal("100.00"), customer.id),
+        ]
+        paid = [event for event in dispatched if isinstance(event, InvoicePaidDomainEvent)]
+        assert [(event.invoice_id, event.paid_amount) for event in paid] == [(invoices[0].id, invoices[0].total)]
+    
+    def test_allocate_payments_dry_run_and_excess(self, db_session, sample_customer_with_invoices):
+        """A dry run writes nothing; amounts beyond the open invoices stay unallocated."""
+        customer, invoices = sample_customer_with_invoices
+        payment = self._confirmed_payment(db_session, customer, "1200.00", days_ago=1)
+        db_session.commit()
+        
+        result = PaymentAutoAllocationService(db_session).allocate_payments(
+            strategy='proportional', payment_ids=[payment.id], dry_run=True
+        )
+        
+        assert result.payments[0].allocated == Decimal("1000.00")
+        assert result.payments[0].unallocated == Decimal("200.00")
+        assert result.payments[0].status == 'partial'
+        assert db_session.query(PaymentAllocation).count() == 0
+    
+    def test_allocate_payments_locks_payments_and_invoices(self, db_session, sample_customer_with_invoices, monkeypatch):
+        """Payments and invoices are read FOR UPDATE before allocation, but not in a dry run."""
+        customer, invoices = sample_customer_with_invoices
+        self._confirmed_payment(db_session, customer, "600.00", days_ago=1)
+        db_session.commit()
+        locked_tables = []
+        execute = db_session.execute
+        
+        def record_locks(statement, *args, **kwargs):
+            if getattr(statement, '_for_update_arg', None) is not None:
+                locked_tables.append(statement.get_final_froms()[0].name)
+            return execute(statement, *args, **kwargs)
+        
+        monkeypatch.setattr(db_session, 'execute', record_locks)
+        service = PaymentAutoAllocationService(db_session)
+        
+        service.allocate_payments(dry_run=True)
+        assert locked_tables == []
+        
+        result = service.allocate_payments()
+        assert locked_tables == ['payments', 'invoices']
+        assert result.allocated_total == Decimal("600.00")
+    
+    def test_proportional_cents_rounding(self):
+        """Proportional shares add up to the amount exactly, cent by cent."""
+        assert allocate_proportional_cents([10000, 10000, 10000], 10000) == [3334, 3333, 3333]
+        assert allocate_proportional_cents([1, 2, 7], 5) == [1, 1, 3]
+        assert sum(allocate_proportional_cents([333, 667, 12345], 9999)) == 9999
+        assert allocate_proportional_cents([500, 300], 900) == [500, 300]
@@ -15,6 +15,7 @@ from app.domain.models.customer import Customer, CommercialConditions
 from app.domain.models.product import Product
 from app.domain.models.category import Category
 from app.domain.models.user import User
+from app.services.invoice_state_service import InvoiceStateService
 
 
 @pytest.fixture
@@ -387,6 +388,7 @@ class TestGetOverdueInvoicesHandler:
     
     def test_get_overdue_invoices_all_customers(self, db_session, sample_customer_with_invoices, sample_customer2_with_invoices):
         """Test getting overdue invoices for all customers."""
+        InvoiceStateService(db_session).mark_overdue_invoices()
         handler = GetOverdueInvoicesHandler()
         query = GetOverdueInvoicesQuery(
             customer_id=None,
@@ -418,6 +420,7 @@ class TestGetOverdueInvoicesHandler:
     
     def test_get_overdue_invoices_specific_customer(self, db_session, sample_customer_with_invoices):
         """Test getting overdue invoices for a specific customer."""
+        InvoiceStateService(db_session).mark_overdue_invoices()
         handler = GetOverdueInvoicesHandler()
         query = GetOverdueInvoicesQuery(
             customer_id=sample_customer_with_invoices.id,
@@ -435,6 +438,7 @@ class TestGetOverdueInvoicesHandler:
     
     def test_get_overdue_invoices_minimum_days(self, db_session, sample_customer_with_invoices):
         """Test getting overdue invoices with minimum days overdue filter."""
+        InvoiceStateService(db_session).mark_overdue_invoices()
         handler = GetOverdueInvoicesHandler()
         query = GetOverdueInvoicesQuery(
             customer_id=None,
@@ -455,6 +459,7 @@ class TestGetOverdueInvoicesHandler:
     
     def test_get_overdue_invoices_pagination(self, db_session, sample_customer_with_invoices, sample_customer2_with_invoices):
         """Test pagination for overdue invoices."""
+        InvoiceStateService(db_session).mark_overdue_invoices()
         handler = GetOverdueInvoicesHandler()
         query = GetOverdueInvoicesQuery(
             customer_id=None,
@@ -482,6 +487,7 @@ class TestGetOverdueInvoicesHandler:
     
     def test_get_overdue_invoices_empty_result(self, db_session):
         """Test getting overdue invoices when none exist."""
+        InvoiceStateService(db_session).mark_overdue_invoices()
         handler = GetOverdueInvoicesHandler()
         query = GetOverdueInvoicesQuery(
             customer_id=None,
@@ -496,6 +502,7 @@ class TestGetOverdueInvoicesHandler:
     
     def test_get_overdue_invoices_days_overdue_calculation(self, db_session, sample_customer_with_invoices):
         """Test that days_overdue is calculated correctly."""
+        InvoiceStateService(db_session).mark_overdue_invoices()
         handler = GetOverdueInvoicesHandler()
         query = GetOverdueInvoicesQuery(
             customer_id=sample_customer_with_invoices.id,
@@ -569,7 +576,8 @@ class TestPaymentDashboardKPIs:
         assert bucket_61_90 == Decimal("1800.00")
         assert bucket_90_plus == Decimal("600.00")
         
-        # Get overdue invoices using handler directly
+        # Get overdue invoices using handler directly, after the daily overdue transition
+        InvoiceStateService(db_session).mark_overdue_invoices()
         overdue_handler = GetOverdueInvoicesHandler()
         overdue_query = GetOverdueInvoicesQuery(
             customer_id=None,
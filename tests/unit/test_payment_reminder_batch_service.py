@@ -0,0 +1,192 @@
+"""Unit tests for the batched payment reminder run, against a local SMTP stand-in."""
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from flask import Flask
+from app.domain.models.customer import Customer
+from app.domain.models.invoice import Invoice, InvoiceStatus
+from app.domain.models.payment import PaymentReminder
+from app.services.payment_reminder_batch_service import PaymentReminderBatchService
+from app.services.payment_reminder_service import PaymentReminderService
+
+
+@pytest.fixture
+def reminder_app(smtp_server):
+    """App context sending mail to the SMTP stand-in."""
+    app = Flask(__name__)
+    app.config.update(
+        MAIL_SERVER="127.0.0.1",
+        MAIL_PORT=smtp_server.server_address[1],
+        MAIL_USE_TLS=False,
+        MAIL_USE_SSL=False,
+        MAIL_DEFAULT_SENDER="noreply@example.com",
+        MAIL_RATE_LIMIT=0,
+        MAIL_RETRY_BACKOFF=0,
+        COMPANY_NAME="Test Company"
+    )
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def overdue_invoices(db_session, sample_user):
+    """Invoices due 3, 10, 20 and 70 days ago; the 20-day one already had its first reminder."""
+    customer = Customer.create(
+        type="B2B",
+        name="Late Payer",
+        email="late.payer@example.com",
+        company_name="Late Payer SARL"
+    )
+    no_email = Customer.create(
+        type="B2B",
+        name="No Email",
+        email="no.email@example.com",
+        company_name="No Email SARL"
+    )
+    no_email.email = ""
+    db_session.add_all([customer, no_email])
+    db_session.flush()
+    
+    today = date.today()
+    invoices = []
+    for index, days in enumerate((3, 10, 20, 70), 1):
+        invoice = Invoice.create(
+            customer_id=customer.id,
+            order_id=None,
+            invoice_date=today - timedelta(days=days + 30),
+            due_date=today - timedelta(days=days),
+            created_by=sample_user.id
+        )
+        invoice.number = f"LATE-INV-{index:03d}"
+        invoice.status = InvoiceStatus.SENT.value
+        invoice.total = Decimal("100.00")
+        invoice.paid_amount = Decimal("0.00")
+        invoice.remaining_amount = Decimal("100.00")
+        db_session.add(invoice)
+        invoices.append(invoice)
+    
+    orphan = Invoice.create(
+        customer_id=no_email.id,
+        order_id=None,
+        invoice_date=today - timedelta(days=40),
+        due_date=today - timedelta(days=10),
+        created_by=sample_user.id
+    )
+    orphan.number = "LATE-INV-NOMAIL"
+    orphan.status = InvoiceStatus.SENT.value
+    orphan.total = Decimal("50.00")
+    orphan.paid_amount = Decimal("0.00")
+    orphan.remaining_amount = Decimal("50.00")
+    db_session.add(orphan)
+    db_session.flush()
+    
+    db_session.add(PaymentReminder.create(
+        invoice_id=invoices[2].id,
+        reminder_type='first',
+        reminder_date=today - timedelta(days=10)
+    ))
+    db_session.commit()
+    return invoices, orphan
+
+
+class TestPaymentReminderBatchService:
+    """Tests for PaymentReminderBatchService."""
+    
+    def test_candidates_take_highest_level_due(self, db_session, overdue_invoices):
+        """One query returns the highest level due that was not sent yet."""
+        invoices, orphan = overdue_invoices
+        
+        candidates = PaymentReminderService(db_session).get_reminder_candidates(date.today())
+        
+        assert candidates == [
+            (invoices[1].id, 'first'),
+            (invoices[2].id, 'second'),
+            (invoices[3].id, 'final'),
+            (orphan.id, 'first'),
+        ]
+    
+    def test_run_sends_on_one_connection_and_checkpoints(
+        self, db_session, overdue_invoices, reminder_app, smtp_server
+    ):
+        """Batches reuse the pooled SMTP connection, and a second run sends nothing again."""
+        invoices, orphan = overdue_invoices
+        service = PaymentReminderBatchService(batch_size=2, pdf_workers=0)
+        
+        results = service.run()
+        
+        assert [entry['invoice_id'] for entry in results['sent']] == [invoice.id for invoice in invoices[1:]]
+        assert results['skipped'] == [{
+            'invoice_id': orphan.id,
+            'invoice_number': orphan.number,
+            'reason': 'Customer email not found'
+        }]
+        assert results['failed'] == []
+        assert smtp_server.connections == 1
+        assert len(smtp_server.messages) == 3
+        assert all(recipients == ["late.payer@example.com"] for recipients, _ in smtp_server.messages)
+        assert all(b"application/octet-stream" in data for _, data in smtp_server.messages)
+        
+        db_session.expire_all()
+        reminders = db_session.query(PaymentReminder).filter(PaymentReminder.email_sent.is_(True)).all()
+        assert sorted(reminder.reminder_type for reminder in reminders) == ['final', 'first', 'second']
+        assert all(reminder.sent_at is not None for reminder in reminders)
+        # Invoice statuses belong to the daily overdue transition
+        assert all(db_session.get(Invoice, invoice.id).status == 'sent' for invoice in invoices)
+        
+        assert service.run()['sent'] == []
+        assert len(smtp_server.messages) == 3
+    
+    def test_failed_sends_are_released(self, db_session, overdue_invoices, reminder_app, smtp_server):
+        """Reminders whose send failed are deleted so the next run retries them."""
+        reminder_app.config['MAIL_PORT'] = 1  # nothing listens there
+        
+        results = PaymentReminderBatchService(pdf_workers=0).run()
+        
+        assert results['sent'] == []
+        assert len(results['failed']) == 3
+        db_session.expire_all()
+        assert db_session.query(PaymentReminder).count() == 1  # the pre-existing first reminder
+    
+    def test_stale_claims_are_taken_over(self, db_session, overdue_invoices, reminder_app, smtp_server):
+        """An unsent reminder of an earlier run is sent again; one claimed today is left to its run."""
+        invoices, orphan = overdue_invoices
+        today = date.today()
+        stale = PaymentReminder.create(
+            invoice_id=invoices[1].id,
+            reminder_type='first',
+            reminder_date=today - timedelta(days=1)
+        )
+        in_flight = PaymentReminder.create(invoice_id=invoices[3].id, reminder_type='final', reminder_date=today)
+        db_session.add_all([stale, in_flight])
+        db_session.commit()
+        
+        candidates = PaymentReminderService(db_session).get_reminder_candidates(today)
+        assert candidates == [(invoices[1].id, 'first'), (invoices[2].id, 'second'), (orphan.id, 'first')]
+        
+        results = PaymentReminderBatchService(pdf_workers=0).run()
+        
+        assert [entry['invoice_id'] for entry in results['sent']] == [invoices[1].id, invoices[2].id]
+        db_session.expire_all()
+        reminders = db_session.query(PaymentReminder).filter(PaymentReminder.invoice_id == invoices[1].id).all()
+        assert [(reminder.id, reminder.reminder_date, reminder.email_sent) for reminder in reminders] == [
+            (stale.id, today, True)
+        ]
+        assert db_session.get(PaymentReminder, in_flight.id).sent_at is None
+    
+    def test_claims_skip_levels_claimed_by_another_run(self, db_session, overdue_invoices):
+        """Claiming a level another run inserted meanwhile returns no reminder for it."""
+        invoices, _ = overdue_invoices
+        today = date.today()
+        other_run = PaymentReminder.create(invoice_id=invoices[1].id, reminder_type='first', reminder_date=today)
+        db_session.add(other_run)
+        db_session.commit()
+        
+        claimed = PaymentReminderBatchService._claim(
+            db_session, [(invoices[1].id, 'first'), (invoices[3].id, 'final')], today
+        )
+        db_session.commit()
+        
+        assert list(claimed) == [invoices[3].id]
+        assert db_session.query(PaymentReminder).filter(
+            PaymentReminder.invoice_id == invoices[1].id
+        ).count() == 1
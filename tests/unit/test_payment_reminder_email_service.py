@@ -0,0 +1,52 @@
+"""Unit tests for the payment reminder email."""
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from flask import Flask
+from app.application.billing.invoices.queries.invoice_dto import InvoiceDTO
+from app.services.payment_reminder_email_service import PaymentReminderEmailService
+
+
+@pytest.fixture
+def mail_app():
+    """App context with the mail settings used to build messages."""
+    app = Flask(__name__)
+    app.config.update(MAIL_DEFAULT_SENDER="noreply@example.com", COMPANY_NAME="Test Company")
+    with app.app_context():
+        yield app
+
+
+def _invoice():
+    """Header-only overdue invoice DTO."""
+    today = date.today()
+    return InvoiceDTO(
+        id=1, number="REM-INV-001", order_id=None, order_number=None,
+        customer_id=1, customer_code="C001", customer_name="Late Customer",
+        invoice_date=today - timedelta(days=40), due_date=today - timedelta(days=10), status="overdue",
+        subtotal=Decimal("1000.00"), discount_percent=Decimal("0"), discount_amount=Decimal("0"),
+        tax_amount=Decimal("200.00"), total=Decimal("1200.00"), paid_amount=Decimal("200.00"),
+        remaining_amount=Decimal("1000.00"), vat_number=None, siret=None,
+        legal_mention=None, notes=None, internal_notes=None, sent_at=None, sent_by=None,
+        sent_by_name=None, email_sent=False, validated_at=None, validated_by=None,
+        validated_by_name=None, created_by=1, created_by_name=None, created_at=None,
+        updated_at=None, lines=[], credit_notes=[]
+    )
+
+
+class TestPaymentReminderEmailService:
+    """Tests for PaymentReminderEmailService."""
+    
+    def test_html_body_formats_amounts(self, mail_app):
+        """The Jinja template formats the amounts (Python format specs do not parse in Jinja)."""
+        message, recipients = PaymentReminderEmailService().build_reminder(
+            _invoice(), 'first', "late@example.com", include_pdf=False
+        )
+        
+        html = next(
+            part.get_payload(decode=True).decode('utf-8')
+            for part in message.walk() if part.get_content_type() == 'text/html'
+        )
+        assert recipients == ["late@example.com"]
+        assert "1,200.00 €" in html
+        assert "1,000.00 €" in html
+        assert "Jours de retard: 10 jour(s)" in html
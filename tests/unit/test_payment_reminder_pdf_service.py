@@ -0,0 +1,53 @@
+"""Unit tests for the payment reminder PDF."""
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from flask import Flask
+from app.application.billing.invoices.queries.invoice_dto import InvoiceDTO
+from app.services import pdf_service_helper
+from app.services.payment_reminder_pdf_service import PaymentReminderPDFService
+
+
+COMPANY_INFO = {
+    'name': 'Test Company', 'address': '1 Rue du Test', 'postal_code': '69000', 'city': 'Lyon',
+    'country': 'France', 'phone': '', 'email': '', 'website': ''
+}
+
+
+@pytest.fixture
+def pdf_app():
+    """App context with the company information of the header."""
+    app = Flask(__name__)
+    app.config.update(COMPANY_NAME="Test Company")
+    pdf_service_helper.prime_company_info(COMPANY_INFO)
+    with app.app_context():
+        yield app
+    pdf_service_helper.invalidate_company_info()
+
+
+def _invoice():
+    """Header-only overdue invoice DTO."""
+    today = date.today()
+    return InvoiceDTO(
+        id=1, number="REM-INV-001", order_id=None, order_number=None,
+        customer_id=1, customer_code="C001", customer_name="Late Customer",
+        invoice_date=today - timedelta(days=40), due_date=today - timedelta(days=10), status="overdue",
+        subtotal=Decimal("100.00"), discount_percent=Decimal("0"), discount_amount=Decimal("0"),
+        tax_amount=Decimal("20.00"), total=Decimal("120.00"), paid_amount=Decimal("0.00"),
+        remaining_amount=Decimal("120.00"), vat_number=None, siret=None,
+        legal_mention=None, notes=None, internal_notes=None, sent_at=None, sent_by=None,
+        sent_by_name=None, email_sent=False, validated_at=None, validated_by=None,
+        validated_by_name=None, created_by=1, created_by_name=None, created_at=None,
+        updated_at=None, lines=[], credit_notes=[]
+    )
+
+
+class TestPaymentReminderPDFService:
+    """Tests for PaymentReminderPDFService."""
+    
+    @pytest.mark.parametrize("reminder_type", ["first", "second", "third", "final"])
+    def test_generate_reminder_pdf(self, pdf_app, reminder_type):
+        """Every reminder level renders (table alignments are reportlab names, not TA_* enums)."""
+        pdf = PaymentReminderPDFService().generate_reminder_pdf(_invoice(), reminder_type)
+        
+        assert pdf.getvalue().startswith(b"%PDF")
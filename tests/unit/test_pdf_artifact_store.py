@@ -0,0 +1,127 @@
+"""Unit tests for the PDF artifact store."""
+import os
+import time
+import pytest
+from decimal import Decimal
+from datetime import date, datetime, timedelta
+from io import BytesIO
+from flask import Flask
+from app.application.billing.invoices.queries.invoice_dto import InvoiceDTO
+from app.services import pdf_artifact_store
+from app.services import pdf_service_helper
+from app.services.pdf_artifact_store import PDFArtifactStore
+
+
+COMPANY_INFO = {
+    'name': 'Test Company', 'address': '1 Rue du Test', 'postal_code': '69000', 'city': 'Lyon',
+    'country': 'France', 'phone': '', 'email': '', 'website': ''
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store in a temporary directory, within an app context."""
+    app = Flask(__name__)
+    app.config.update(COMPANY_NAME="Test Company")
+    pdf_service_helper.prime_company_info(COMPANY_INFO)
+    with app.app_context():
+        yield PDFArtifactStore(root=str(tmp_path))
+    pdf_service_helper.invalidate_company_info()
+
+
+def _invoice(status="validated", number="ART-INV-001", invoice_id=1, paid_amount=Decimal("0.00")):
+    """Header-only invoice DTO."""
+    now = date.today()
+    return InvoiceDTO(
+        id=invoice_id, number=number, order_id=None, order_number=None,
+        customer_id=1, customer_code="C001", customer_name="Artifact Customer",
+        invoice_date=now, due_date=now + timedelta(days=30), status=status,
+        subtotal=Decimal("100.00"), discount_percent=Decimal("0"), discount_amount=Decimal("0"),
+        tax_amount=Decimal("20.00"), total=Decimal("120.00"), paid_amount=paid_amount,
+        remaining_amount=Decimal("120.00") - paid_amount, vat_number=None, siret=None,
+        legal_mention=None, notes=None, internal_notes=None, sent_at=None, sent_by=None,
+        sent_by_name=None, email_sent=False, validated_at=None, validated_by=None,
+        validated_by_name=None, created_by=1, created_by_name=None, created_at=None,
+        updated_at=None, lines=[], credit_notes=[]
+    )
+
+
+class TestPDFArtifactStore:
+    """Tests for PDFArtifactStore."""
+    
+    def test_renders_once(self, store, monkeypatch):
+        """A validated invoice is rendered on the first request only."""
+        renders = []
+        render = pdf_artifact_store.render_pdf_job
+        monkeypatch.setattr(
+            pdf_artifact_store, 'render_pdf_job',
+            lambda kind, args: renders.append(kind) or render(kind, args)
+        )
+        invoice = _invoice()
+        
+        path = store.open('invoice', invoice.id, invoice)
+        assert store.open('invoice', invoice.id, invoice) == path
+        
+        assert renders == ['invoice']
+        assert os.path.basename(path).startswith("1-")
+        assert store.read('invoice', invoice.id, invoice).startswith(b"%PDF")
+    
+    def test_drafts_not_stored(self, store):
+        """Documents that can still change are rendered into a buffer."""
+        invoice = _invoice(status="draft")
+        
+        pdf = store.open('invoice', invoice.id, invoice)
+        
+        assert isinstance(pdf, BytesIO)
+        assert pdf.getvalue().startswith(b"%PDF")
+        assert not list(os.scandir(store.root))
+    
+    def test_new_key_on_change(self, store):
+        """A payment or a company settings change maps to a new file."""
+        invoice = _invoice()
+        path = store.artifact_path('invoice', invoice.id, invoice)
+        
+        assert store.artifact_path('invoice', invoice.id, _invoice(paid_amount=Decimal("20.00"))) != path
+        
+        pdf_service_helper.prime_company_info({**COMPANY_INFO, 'name': 'Renamed Company'})
+        assert store.artifact_path('invoice', invoice.id, invoice) != path
+    
+    def test_same_key_on_non_rendered_change(self, store):
+        """Bookkeeping fields the PDF does not show keep the stored file."""
+        invoice = _invoice()
+        path = store.artifact_path('invoice', invoice.id, invoice)
+        
+        invoice.updated_at = datetime.now()
+        invoice.internal_notes = "Called the customer"
+        invoice.email_sent = True
+        
+        assert store.artifact_path('invoice', invoice.id, invoice) == path
+    
+    def test_lru_eviction(self, store):
+        """Beyond the size limit, the least recently used files are deleted."""
+        store.evict_every = 1
+        invoices = [_invoice(number=f"ART-INV-{index:03d}", invoice_id=index) for index in (1, 2, 3)]
+        paths = []
+        for invoice in invoices[:2]:
+            paths.append(store.get_or_render('invoice', invoice.id, invoice))
+            time.sleep(0.01)
+        # Reading the first file makes the second the least recently used
+        store.get_or_render('invoice', invoices[0].id, invoices[0])
+        store.max_bytes = os.path.getsize(paths[0]) * 5 // 2
+        time.sleep(0.01)
+        
+        paths.append(store.get_or_render('invoice', invoices[2].id, invoices[2]))
+        
+        assert [os.path.exists(path) for path in paths] == [True, False, True]
+    
+    def test_size_checked_every_n_writes(self, store, monkeypatch):
+        """The cache directory is walked once per evict_every stored files, not per miss."""
+        checks = []
+        monkeypatch.setattr(store, 'evict', lambda: checks.append(1) or 0)
+        store.evict_every = 3
+        
+        for index in range(1, 8):
+            invoice = _invoice(number=f"ART-INV-{index:03d}", invoice_id=index)
+            store.get_or_render('invoice', invoice.id, invoice)
+        
+        assert len(checks) == 2
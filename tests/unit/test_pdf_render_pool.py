@@ -0,0 +1,110 @@
+"""Unit tests for PDF style caching, batch invoice loading and the render pool."""
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from flask import Flask
+from app.application.billing.invoices.queries.handlers import GetInvoicesByIdsHandler
+from app.application.billing.invoices.queries.queries import GetInvoicesByIdsQuery
+from app.application.common.mediator import mediator
+from app.domain.models.customer import Customer
+from app.domain.models.invoice import Invoice, InvoiceStatus
+from app.services import pdf_service_helper
+from app.services.invoice_pdf_batch_service import InvoicePDFBatchService
+from app.services.invoice_pdf_service import InvoicePDFService
+from app.services.pdf_render_pool import PDFRenderPool
+from app.services.pdf_service import PDFService
+
+
+@pytest.fixture
+def pdf_app():
+    """App context with company settings, company info cache cleared around the test."""
+    app = Flask(__name__)
+    app.config.update(COMPANY_NAME="Test Company", PDF_RENDER_WORKERS=0)
+    pdf_service_helper.invalidate_company_info()
+    with app.app_context():
+        yield app
+    pdf_service_helper.invalidate_company_info()
+
+
+@pytest.fixture
+def invoices(db_session, sample_user, sample_product):
+    """Three validated invoices with two lines each."""
+    customer = Customer.create(
+        type="B2B",
+        name="Batch Customer",
+        email="batch@example.com",
+        company_name="Batch Customer SARL"
+    )
+    db_session.add(customer)
+    db_session.flush()
+    
+    invoices = []
+    for index in range(3):
+        invoice = Invoice.create(
+            customer_id=customer.id,
+            order_id=None,
+            invoice_date=date.today() - timedelta(days=index),
+            due_date=date.today() + timedelta(days=30),
+            created_by=sample_user.id
+        )
+        invoice.number = f"BATCH-INV-{index:03d}"
+        db_session.add(invoice)
+        db_session.flush()
+        invoice.add_line(product_id=sample_product.id, quantity=Decimal("2"), unit_price=Decimal("10.00"), description="Widget")
+        invoice.add_line(product_id=sample_product.id, quantity=Decimal("1"), unit_price=Decimal("5.00"), description="Shipping")
+        invoice.status = InvoiceStatus.VALIDATED.value
+        invoices.append(invoice)
+    db_session.commit()
+    return invoices
+
+
+class TestPDFCaching:
+    """Tests for the stylesheet and company info caches."""
+    
+    def test_stylesheet_built_once_per_class(self, pdf_app):
+        """Service instances of a class share one stylesheet, with their own styles."""
+        first, second = InvoicePDFService(), InvoicePDFService()
+        
+        assert first.styles is second.styles
+        assert 'InvoiceStatusBadge' in first.styles
+        assert 'InvoiceStatusBadge' not in PDFService().styles
+    
+    def test_company_info_cached_until_invalidated(self, pdf_app):
+        """Primed company info is served from the cache until invalidated."""
+        pdf_service_helper.prime_company_info({'name': 'Primed Company'})
+        assert pdf_service_helper.get_company_info()['name'] == 'Primed Company'
+        
+        pdf_service_helper.invalidate_company_info()
+        assert pdf_service_helper.get_company_info()['name'] != 'Primed Company'
+
+
+class TestInvoicePDFBatch:
+    """Tests for GetInvoicesByIdsHandler and InvoicePDFBatchService."""
+    
+    def test_get_invoices_by_ids(self, invoices):
+        """DTOs come back with their lines, in the order of the IDs."""
+        ids = [invoices[2].id, invoices[0].id, 999999]
+        
+        dtos = GetInvoicesByIdsHandler().handle(GetInvoicesByIdsQuery(ids=ids))
+        
+        assert [dto.id for dto in dtos] == ids[:2]
+        assert all(len(dto.lines) == 2 for dto in dtos)
+        assert dtos[0].customer_name == "Batch Customer SARL"
+    
+    def test_render_batch_in_process(self, pdf_app, invoices):
+        """Invoices of a period are rendered in chunks, in number order."""
+        mediator.register_query(GetInvoicesByIdsQuery, GetInvoicesByIdsHandler())
+        with PDFRenderPool(workers=0, max_pending=2) as pool:
+            service = InvoicePDFBatchService(render_pool=pool, chunk_size=2)
+            ids = service.invoice_ids_for_period(date.today() - timedelta(days=5), date.today())
+            
+            rendered = list(service.render(ids))
+        
+        assert pool.in_process
+        assert [dto.number for dto, _ in rendered] == ["BATCH-INV-000", "BATCH-INV-001", "BATCH-INV-002"]
+        assert all(pdf.startswith(b"%PDF") for _, pdf in rendered)
+    
+    def test_unknown_kind_fails_softly(self, pdf_app):
+        """A failed render yields None instead of raising."""
+        with PDFRenderPool(workers=0) as pool:
+            assert pool.render('unknown') is None
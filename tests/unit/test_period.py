@@ -0,0 +1,38 @@
+"""Unit tests for the date range helpers."""
+from datetime import date, datetime
+from decimal import Decimal
+from app.utils.period import day_range, date_range_filter
+from app.domain.models.order import Order
+
+
+class TestDateRangeFilter:
+    """Tests for half-open timestamp range filtering."""
+
+    def test_day_range_is_half_open(self):
+        assert day_range(date(2026, 2, 27), date(2026, 2, 28)) == (
+            datetime(2026, 2, 27, 0, 0), datetime(2026, 3, 1, 0, 0)
+        )
+
+    def test_filter_includes_whole_last_day(self, db_session, sample_b2b_customer, sample_user):
+        for number, created_at in (
+            ("CMD-P-1", datetime(2026, 2, 28, 23, 59, 59, 999999)),
+            ("CMD-P-2", datetime(2026, 3, 1, 0, 0)),
+            ("CMD-P-3", datetime(2026, 2, 1, 0, 0)),
+            ("CMD-P-4", datetime(2026, 1, 31, 23, 59)),
+        ):
+            db_session.add(Order(
+                number=number, customer_id=sample_b2b_customer.id, created_by=sample_user.id,
+                status="confirmed", total=Decimal("10.00"), created_at=created_at
+            ))
+        db_session.commit()
+
+        february = db_session.query(Order.number).filter(
+            date_range_filter(Order.created_at, date(2026, 2, 1), date(2026, 2, 28))
+        ).order_by(Order.number).all()
+        open_start = db_session.query(Order.number).filter(
+            date_range_filter(Order.created_at, end=date(2026, 1, 31))
+        ).all()
+
+        assert [n for (n,) in february] == ["CMD-P-1", "CMD-P-3"]
+        assert [n for (n,) in open_start] == ["CMD-P-4"]
+        assert db_session.query(Order).filter(date_range_filter(Order.created_at)).count() == 4
@@ -0,0 +1,98 @@
+"""Unit tests for PriceListImportService."""
+import io
+import pytest
+from decimal import Decimal
+from app.services.price_list_import_service import PriceListImportService
+from app.domain.models.product import Product, PriceList, ProductPriceList, ProductPriceHistory
+
+
+@pytest.fixture
+def price_list_with_products(db_session):
+    """Price list with entries for P-1 (10.00) and P-2 (20.00); P-3 not in the list."""
+    products = []
+    for code in ("P-1", "P-2", "P-3"):
+        product = Product(code=code, name=f"Product {code}", price=Decimal("30.00"))
+        db_session.add(product)
+        products.append(product)
+    price_list = PriceList(name="Tarif fournisseur", is_active=False)
+    db_session.add(price_list)
+    db_session.flush()
+    db_session.add_all([
+        ProductPriceList(price_list_id=price_list.id, product_id=products[0].id, price=Decimal("10.00")),
+        ProductPriceList(price_list_id=price_list.id, product_id=products[1].id, price=Decimal("20.00")),
+    ])
+    db_session.commit()
+    return price_list, products
+
+
+def _csv(content: str) -> io.BytesIO:
+    return io.BytesIO(content.encode("utf-8"))
+
+
+class TestPriceListImportService:
+    """Tests for the streaming price list bulk load."""
+
+    def test_iter_rows_reads_semicolon_csv(self):
+        rows = list(PriceListImportService.iter_rows(_csv("Code;Prix\nP-1;12,50\n\nP-2;20\n"), "tarif.csv"))
+
+        assert rows == [(2, "P-1", "12,50"), (4, "P-2", "20")]
+
+    def test_iter_rows_reads_xlsx(self):
+        openpyxl = pytest.importorskip("openpyxl")
+        wb = openpyxl.Workbook()
+        wb.active.append(["Reference", "Price"])
+        wb.active.append(["P-1", 12.5])
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        buffer.seek(0)
+
+        rows = list(PriceListImportService.iter_rows(buffer, "tarif.xlsx"))
+
+        assert rows == [(2, "P-1", 12.5)]
+
+    def test_dry_run_reports_changes_without_writing(self, db_session, price_list_with_products):
+        price_list, products = price_list_with_products
+        rows = PriceListImportService.iter_rows(_csv("code,price\nP-1,12.50\nP-2,20.00\nP-3,5\nX-9,1\n"), "t.csv")
+
+        summary = PriceListImportService(db_session).import_price_list(
+            price_list.id, rows, replace_missing=True, dry_run=True
+        )
+
+        assert (summary.inserted, summary.updated, summary.deleted, summary.unchanged) == (1, 1, 0, 1)
+        assert summary.errors == [{'row': 5, 'code': 'X-9', 'error': 'Unknown product code'}]
+        db_session.expire_all()
+        assert db_session.query(ProductPriceList).filter_by(price_list_id=price_list.id).count() == 2
+
+    def test_apply_inserts_updates_deletes_and_history(self, db_session, price_list_with_products, sample_user):
+        price_list, products = price_list_with_products
+        rows = PriceListImportService.iter_rows(_csv("code,price\nP-1,12.50\nP-3,5\nP-3,abc\n"), "t.csv")
+
+        summary = PriceListImportService(db_session).import_price_list(
+            price_list.id, rows, replace_missing=True, changed_by=sample_user.id
+        )
+        db_session.commit()
+
+        assert (summary.inserted, summary.updated, summary.deleted) == (1, 1, 1)
+        assert summary.errors[0]['error'].startswith('Invalid price')
+        prices = dict(
+            db_session.query(ProductPriceList.product_id, ProductPriceList.price)
+            .filter_by(price_list_id=price_list.id).all()
+        )
+        assert prices == {products[0].id: Decimal("12.50"), products[2].id: Decimal("5.00")}
+
+        history = db_session.query(ProductPriceHistory).filter_by(price_list_id=price_list.id).all()
+        assert sorted((h.old_price, h.new_price) for h in history if h.old_price) == [
+            (Decimal("10.00"), Decimal("12.50"))
+        ]
+        assert len(history) == 2
+
+    def test_non_finite_prices_reported_as_row_errors(self, db_session, price_list_with_products):
+        price_list, products = price_list_with_products
+        rows = PriceListImportService.iter_rows(_csv("code,price\nP-1,NaN\nP-2,Infinity\nP-3,-inf\n"), "t.csv")
+
+        summary = PriceListImportService(db_session).import_price_list(price_list.id, rows, dry_run=True)
+
+        assert [(error['row'], error['error']) for error in summary.errors] == [
+            (2, 'Invalid price: NaN'), (3, 'Invalid price: Infinity'), (4, 'Invalid price: -inf')
+        ]
+        assert (summary.inserted, summary.updated) == (0, 0)
@@ -0,0 +1,107 @@
+"""Unit tests for PricingSimulationService."""
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from app.application.products.pricing.queries.handlers import SimulatePricingHandler
+from app.application.products.pricing.queries.queries import SimulatePricingQuery
+from app.services.pricing_simulation_service import (
+    MAX_SIMULATION_TOP, PricingRuleSet, PricingSimulationService, VolumeTierRule
+)
+from app.domain.models.order import Order, OrderLine
+
+
+def _add_order(db_session, customer, user, product, number, status, lines):
+    order = Order(
+        number=number,
+        customer_id=customer.id,
+        created_by=user.id,
+        status=status,
+        discount_percent=Decimal("0")
+    )
+    db_session.add(order)
+    db_session.flush()
+    for sequence, (quantity, discount) in enumerate(lines, start=1):
+        line = OrderLine(
+            order_id=order.id,
+            product_id=product.id,
+            quantity=Decimal(quantity),
+            unit_price=product.price,
+            discount_percent=Decimal(discount),
+            tax_rate=Decimal("20.0"),
+            sequence=sequence
+        )
+        line.calculate_totals()
+        order.lines.append(line)
+    db_session.commit()
+    return order
+
+
+@pytest.fixture
+def order_history(db_session, sample_b2b_customer, sample_user, sample_product):
+    """Confirmed order with 5 units (no discount) and 20 units (10% off); one draft order."""
+    _add_order(db_session, sample_b2b_customer, sample_user, sample_product,
+               "CMD-SIM-001", "confirmed", [("5", "0"), ("20", "10")])
+    _add_order(db_session, sample_b2b_customer, sample_user, sample_product,
+               "CMD-SIM-002", "draft", [("100", "0")])
+    return sample_product
+
+
+def _period():
+    return date.today() - timedelta(days=1), date.today()
+
+
+class TestPricingSimulationService:
+    """Tests for the pricing what-if simulation."""
+
+    def test_simulates_price_list_and_volume_tiers(self, db_session, order_history, sample_b2b_customer):
+        rule_set = PricingRuleSet(
+            product_prices={order_history.id: Decimal("90.00")},
+            volume_tiers={order_history.id: [VolumeTierRule(Decimal("10"), None, Decimal("80.00"))]}
+        )
+
+        result = PricingSimulationService(db_session).simulate(rule_set, *_period(), chunk_size=1)
+
+        # Draft order is ignored; 5 x 90 + 20 x 80 x 0.9 vs 5 x 99.99 + 20 x 99.99 x 0.9
+        assert result.line_count == 2
+        assert result.repriced_line_count == 2
+        assert result.totals.current_revenue == Decimal("2299.77")
+        assert result.totals.simulated_revenue == Decimal("1890.00")
+        assert result.totals.revenue_delta == Decimal("-409.77")
+        assert result.totals.simulated_margin == Decimal("640.00")
+        assert result.by_product[0].key == order_history.id
+        assert result.by_customer[0].key == sample_b2b_customer.id
+        assert result.by_category[0].key == order_history.categories[0].id
+
+    def test_price_list_scoped_to_customers(self, db_session, order_history):
+        rule_set = PricingRuleSet(
+            product_prices={order_history.id: Decimal("90.00")},
+            customer_ids=set()
+        )
+
+        result = PricingSimulationService(db_session).simulate(rule_set, *_period())
+
+        assert result.line_count == 2
+        assert result.repriced_line_count == 0
+        assert result.totals.revenue_delta == Decimal("0.00")
+
+    def test_rule_set_from_dict_validates(self):
+        with pytest.raises(ValueError):
+            PricingRuleSet.from_dict({
+                'volume_tiers': {'1': [{'min_quantity': 10, 'max_quantity': 5, 'price': 1}]}
+            })
+
+        rule_set = PricingRuleSet.from_dict({'product_prices': {'3': '12.50'}})
+        assert rule_set.product_prices == {3: Decimal("12.50")}
+        assert rule_set.customer_ids is None
+
+    def test_amounts_are_summed_exactly(self):
+        rows = [(1, 7, Decimal("1"), Decimal("0.10"), Decimal("0"), Decimal("0.10"), Decimal("0.07"))] * 3
+
+        sums = PricingSimulationService._aggregate_by_customer(rows, [10, 10, 10], [False] * 3)
+
+        assert sums == {7: (3, 0, Decimal("3.000"), Decimal("0.30"), Decimal("0.30"), Decimal("0.21"))}
+
+    def test_top_is_bounded(self):
+        for top in (0, MAX_SIMULATION_TOP + 1):
+            with pytest.raises(ValueError, match="top must be between"):
+                SimulatePricingHandler().handle(SimulatePricingQuery(*_period(), rules={}, top=top))
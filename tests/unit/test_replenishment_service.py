@@ -0,0 +1,86 @@
+"""Unit tests for the replenishment planner."""
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from app.domain.models.product import Product
+from app.domain.models.purchase import PurchaseOrderLine, PurchaseRequest
+from app.domain.models.replenishment import ReplenishmentSkuState
+from app.domain.models.sales_fact import SalesDailyFact
+from app.domain.models.stock import Location, StockItem
+from app.services.replenishment_service import ReplenishmentService
+
+AS_OF = date(2026, 4, 1)
+
+
+@pytest.fixture
+def catalog(db_session, sample_product, sample_b2c_customer, sample_purchase_order):
+    """
+    sample_product sells 2 units a day and was last bought from sample_supplier
+    (7 days lead time); a second product has no sales but a minimum stock.
+    """
+    slow = Product(code="RP-SLOW", name="Slow mover", price=Decimal("4.00"), cost=Decimal("2.00"))
+    location = Location(code="RP-LOC", name="Replenishment", type="warehouse")
+    db_session.add_all([slow, location])
+    db_session.flush()
+    db_session.add_all([
+        StockItem(product_id=sample_product.id, location_id=location.id, physical_quantity=Decimal("12"),
+                  reserved_quantity=Decimal("2")),
+        StockItem(product_id=slow.id, location_id=location.id, physical_quantity=Decimal("2"),
+                  min_stock=Decimal("5")),
+    ])
+    sample_purchase_order.status = 'received'
+    db_session.add(PurchaseOrderLine(
+        purchase_order_id=sample_purchase_order.id, product_id=sample_product.id, quantity=Decimal("5"),
+        quantity_received=Decimal("5"), unit_price=Decimal("10.00"), line_total_ht=Decimal("50.00"),
+        line_total_ttc=Decimal("60.00"), sequence=1
+    ))
+    for offset in range(1, 91):
+        db_session.add(SalesDailyFact(
+            sale_date=AS_OF - timedelta(days=offset), product_id=sample_product.id,
+            customer_id=sample_b2c_customer.id, status='delivered', quantity=Decimal("2"),
+            revenue_ht=Decimal("20.00")
+        ))
+    db_session.commit()
+    return sample_product, slow, sample_purchase_order.supplier_id
+
+
+class TestReplenishmentService:
+    """Tests for bulk replenishment planning."""
+
+    def test_needs_are_grouped_by_supplier(self, db_session, catalog, sample_user):
+        product, slow, supplier_id = catalog
+
+        result = ReplenishmentService(db_session).run(sample_user.id, as_of=AS_OF)
+        db_session.commit()
+
+        needs = {need.product_id: need for need in result.needs}
+        assert result.evaluated == 2 and result.skipped == 0
+        # 2/day over 7 days lead time, no deviation; ordered up to 30 more days of demand
+        assert needs[product.id].reorder_point == Decimal("14")
+        assert needs[product.id].suggested_quantity == Decimal("64")
+        assert needs[slow.id].reorder_point == Decimal("5") and needs[slow.id].suggested_quantity == Decimal("3")
+
+        requests = db_session.query(PurchaseRequest).filter(
+            PurchaseRequest.id.in_(result.purchase_request_ids)
+        ).all()
+        by_supplier = {request.supplier_id: request for request in requests}
+        assert set(by_supplier) == {supplier_id, None}
+        assert [(line.product_id, line.quantity) for line in by_supplier[supplier_id].lines] == [
+            (product.id, Decimal("64"))
+        ]
+        assert by_supplier[supplier_id].required_date == AS_OF + timedelta(days=7)
+        assert db_session.get(ReplenishmentSkuState, product.id).purchase_request_id == by_supplier[supplier_id].id
+
+    def test_unchanged_products_are_skipped(self, db_session, catalog, sample_user):
+        service = ReplenishmentService(db_session)
+        assert len(service.run(sample_user.id, as_of=AS_OF, dry_run=True).needs) == 2
+        assert db_session.query(ReplenishmentSkuState).count() == 0
+
+        service.run(sample_user.id, as_of=AS_OF)
+        # The requested quantities are now on order: both products are planned again, without needs
+        second = service.run(sample_user.id, as_of=AS_OF)
+        third = service.run(sample_user.id, as_of=AS_OF)
+
+        assert (second.evaluated, second.needs) == (2, [])
+        assert (third.evaluated, third.skipped) == (0, 2)
+        assert service.run(sample_user.id, as_of=AS_OF, force=True).evaluated == 2
@@ -0,0 +1,143 @@
+"""Unit tests for ReportBuilderService and the columnar ReportFrame."""
+import pytest
+from decimal import Decimal
+from datetime import date
+from app.services import report_frame
+from app.services.report_builder_service import (
+    ReportBuilderService, ColumnDefinition, FilterCondition, SortDefinition, GroupDefinition, CalculatedField
+)
+from app.services.report_formula import FormulaError, compile_formula
+from app.domain.models.report import ReportTemplate
+from app.services.report_service import ReportData
+
+
+@pytest.fixture(params=["numpy", "python"])
+def frame_backend(request, monkeypatch):
+    """Run each test with NumPy (when installed) and with the pure-Python fallback."""
+    if request.param == "numpy" and report_frame.np is None:
+        pytest.skip("numpy is not installed")
+    if request.param == "python":
+        monkeypatch.setattr(report_frame, "np", None)
+    return request.param
+
+
+def _report(rows):
+    return ReportData(
+        title="Sales", report_type="sales", period_start=date(2026, 1, 1), period_end=date(2026, 1, 31),
+        data=rows, summary={}, metadata={}
+    )
+
+
+ROWS = [
+    {'customer': 'Acme', 'region': 'North', 'revenue': Decimal('100.00'), 'qty': 2, 'day': date(2026, 1, 5)},
+    {'customer': 'Bolt', 'region': 'South', 'revenue': Decimal('250.50'), 'qty': 5, 'day': date(2026, 1, 9)},
+    {'customer': 'Core', 'region': 'North', 'revenue': None, 'qty': 1, 'day': date(2026, 1, 12)},
+    {'customer': 'Dyna', 'region': 'South', 'revenue': Decimal('80.25'), 'qty': 3, 'day': date(2026, 1, 20)},
+    {'customer': 'Echo', 'region': 'North', 'revenue': Decimal('250.50'), 'qty': 4, 'day': date(2026, 1, 28)},
+]
+
+
+class TestReportBuilderService:
+    """Tests for filtering, grouping and sorting custom reports."""
+
+    def test_filters_combine_as_masks(self, frame_backend):
+        report = ReportBuilderService().build_report(_report(list(ROWS)), filters=[
+            FilterCondition(field='revenue', operator='greater_than', value=90),
+            FilterCondition(field='day', operator='between', value='2026-01-01', value2=date(2026, 1, 25)),
+            FilterCondition(field='customer', operator='contains', value='O'),
+        ])
+
+        assert [row['customer'] for row in report.data] == ['Bolt']
+
+        report = ReportBuilderService().build_report(_report(list(ROWS)), filters=[
+            FilterCondition(field='region', operator='in', value=['South']),
+            FilterCondition(field='qty', operator='not_equals', value=5),
+        ])
+        assert [row['customer'] for row in report.data] == ['Dyna']
+
+    def test_text_range_filters_and_sort_on_filtered_rows(self, frame_backend):
+        rows = [dict(row, code=code) for row, code in zip(ROWS, ['B-2', None, 'A-9', 'C-1', 'B-10'], strict=True)]
+        report = ReportBuilderService().build_report(
+            _report(rows),
+            filters=[
+                FilterCondition(field='code', operator='greater_than', value='A-9'),
+                FilterCondition(field='code', operator='less_than', value='C'),
+                FilterCondition(field='code', operator='between', value='B-1', value2='B-2'),
+            ],
+            sorting=[SortDefinition(field='code', direction='asc')]
+        )
+
+        # Null codes never match; text compares lexicographically
+        assert [row['code'] for row in report.data] == ['B-10', 'B-2']
+
+    def test_group_by_aggregates_exactly(self, frame_backend):
+        report = ReportBuilderService().build_report(
+            _report(list(ROWS)),
+            grouping=[GroupDefinition(field='region', label='Region', aggregate='sum')]
+        )
+
+        assert report.data == [
+            {'region': 'North', 'customer': 'Acme', 'revenue': Decimal('350.50'), 'qty': Decimal('7'),
+             'day': date(2026, 1, 5)},
+            {'region': 'South', 'customer': 'Bolt', 'revenue': Decimal('330.75'), 'qty': Decimal('8'),
+             'day': date(2026, 1, 9)},
+        ]
+
+        maxima = ReportBuilderService().build_report(
+            _report(list(ROWS)),
+            grouping=[GroupDefinition(field='region', label='Region', aggregate='max')],
+            columns=[ColumnDefinition(field='region', label='Region', type='string'),
+                     ColumnDefinition(field='day', label='Day', type='date')]
+        )
+        assert maxima.data == [
+            {'region': 'North', 'day': date(2026, 1, 28)},
+            {'region': 'South', 'day': date(2026, 1, 20)},
+        ]
+
+    def test_multi_key_sort_uses_first_key_as_primary(self, frame_backend):
+        report = ReportBuilderService().build_report(_report(list(ROWS)), sorting=[
+            SortDefinition(field='revenue', direction='desc'),
+            SortDefinition(field='customer', direction='desc'),
+        ])
+
+        # Equal revenues ordered by customer desc; null revenue last in descending order
+        assert [row['customer'] for row in report.data] == ['Echo', 'Bolt', 'Acme', 'Dyna', 'Core']
+
+        report = ReportBuilderService().build_report(_report(list(ROWS)), sorting=[
+            SortDefinition(field='region', direction='asc'),
+            SortDefinition(field='revenue', direction='asc'),
+        ])
+        assert [row['customer'] for row in report.data] == ['Core', 'Acme', 'Echo', 'Dyna', 'Bolt']
+
+    def test_calculated_fields_are_evaluated_per_column(self, frame_backend):
+        report = ReportBuilderService().build_report(_report(list(ROWS)), calculated_fields=[
+            CalculatedField(name='unit_price', label='Unit price', formula='revenue / qty'),
+            # 'revenue' is a prefix of 'revenue_per_unit': names are resolved as tokens, not substrings
+            CalculatedField(name='revenue_per_unit', label='Check', formula='round(unit_price * qty - revenue, 2)'),
+            CalculatedField(name='safe', label='Safe', formula='coalesce(revenue, 0) + max(qty, 3)'),
+        ])
+
+        assert [row['unit_price'] for row in report.data] == [
+            Decimal('50'), Decimal('50.1'), None, Decimal('26.75'), Decimal('62.625')
+        ]
+        assert [row['revenue_per_unit'] for row in report.data] == [Decimal('0.00'), Decimal('0.00'), None,
+                                                                    Decimal('0.00'), Decimal('0.00')]
+        assert [row['safe'] for row in report.data] == [
+            Decimal('103.00'), Decimal('255.50'), Decimal('3'), Decimal('83.25'), Decimal('254.50')
+        ]
+        assert report.data[0]['customer'] == 'Acme'
+
+    def test_formulas_are_whitelisted_and_cached(self):
+        for formula in ("__import__('os').system('true')", "revenue.real", "qty ** 2", "'a' + 'b'", "revenue -"):
+            with pytest.raises(FormulaError):
+                compile_formula(formula)
+
+        assert compile_formula("revenue / qty") is compile_formula("revenue / qty")
+        assert compile_formula("abs(revenue - cost) % 7").fields == frozenset({'revenue', 'cost'})
+        assert compile_formula("qty / 0").evaluate({'qty': [1, None]}, 2) == [None, None]
+
+        with pytest.raises(ValueError, match="Calculated field 'margin'"):
+            ReportTemplate.create(
+                name="Margins", report_type="sales", created_by=1,
+                calculated_fields=[{'name': 'margin', 'formula': 'open("x")'}]
+            )
@@ -0,0 +1,80 @@
+"""Unit tests for background report jobs."""
+import os
+import pytest
+from decimal import Decimal
+from datetime import date, datetime, timedelta
+from app.application.reports.queries.report_dto import ReportDataDTO
+from app.application.reports.queries.queries import GetSalesReportQuery
+from app.config import Config
+from app.domain.models.report_job import ReportJob
+from app.services.report_job_service import ReportJobService
+from app.tasks.report_tasks import run_report_job_task
+
+
+def _report():
+    return ReportDataDTO(
+        title="Sales Report", report_type="sales", period_start="2026-01-01", period_end="2026-01-31",
+        data=[{'date': date(2026, 1, 2), 'total': Decimal('10.50')}],
+        summary={'total': Decimal('10.50')}
+    )
+
+
+class TestReportJobService:
+    """Tests for report job submission, caching and cleanup."""
+
+    def test_same_request_reuses_job(self, db_session):
+        service = ReportJobService(db_session)
+        parameters = {'start_date': date(2026, 1, 1), 'end_date': date(2026, 1, 31), 'unknown': 'x'}
+
+        job, created = service.submit('sales', parameters)
+        again, created_again = service.submit('sales', dict(parameters))
+        other, created_other = service.submit('sales', parameters, output_format='csv')
+
+        assert created and not created_again and created_other
+        assert again.id == job.id and other.id != job.id
+        assert job.parameters == {'end_date': '2026-01-31', 'start_date': '2026-01-01'}
+        assert service.build_query(job) == GetSalesReportQuery(start_date=date(2026, 1, 1), end_date=date(2026, 1, 31))
+        with pytest.raises(ValueError):
+            service.submit('unknown', {})
+
+    def test_completed_json_job_is_cached_until_expiry(self, db_session):
+        service = ReportJobService(db_session)
+        job, _ = service.submit('sales', {})
+        service.start(job)
+        service.complete(job, _report())
+
+        assert job.status == 'completed' and job.progress == 100
+        assert job.result['data'] == [{'date': '2026-01-02', 'total': '10.50'}]
+        assert service.submit('sales', {}) == (job, False)
+
+        job.expires_at = datetime.now() - timedelta(seconds=1)
+        db_session.flush()
+        assert service.submit('sales', {})[1] is True
+
+    def test_file_jobs_are_purged_with_their_files(self, db_session, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, 'REPORT_JOBS_DIR', str(tmp_path))
+        service = ReportJobService(db_session)
+        job, _ = service.submit('sales', {}, output_format='csv')
+        service.complete(job, _report())
+
+        assert job.file_name == 'Sales_Report.csv'
+        assert os.path.exists(job.file_path)
+
+        job.expires_at = datetime.now() - timedelta(seconds=1)
+        db_session.flush()
+        assert service.purge_expired() == 1
+        db_session.flush()
+        assert not os.path.exists(job.file_path)
+        assert db_session.get(ReportJob, job.id) is None
+
+    def test_task_fails_job_with_invalid_parameters(self, db_session):
+        job, _ = ReportJobService(db_session).submit('sales', {'start_date': date(2026, 1, 1)})
+        job.parameters = {'start_date': 'not-a-date'}
+        db_session.commit()
+
+        message = run_report_job_task.run(job.id)
+
+        db_session.expire_all()
+        job = db_session.get(ReportJob, job.id)
+        assert message.startswith(f"Report job {job.id} failed")
+        assert job.status == 'failed' and 'not-a-date' in job.error
@@ -0,0 +1,145 @@
+"""Unit tests for the custom report query planner."""
+import pytest
+from decimal import Decimal
+from datetime import date, datetime
+from app.domain.models.purchase import PurchaseOrder
+from app.domain.models.report import ReportTemplate
+from app.domain.models.stock import Location, StockItem
+from app.services.report_builder_service import (
+    ReportBuilderService, ColumnDefinition, FilterCondition, SortDefinition, GroupDefinition, CalculatedField
+)
+from app.services.report_query_planner import ReportQueryPlanner
+from app.services.report_service import ReportService
+
+
+@pytest.fixture
+def purchase_orders(db_session, sample_supplier, sample_user):
+    """Four confirmed/received purchase orders in January 2026 and one draft."""
+    for number, status, order_date, subtotal in (
+        ("PO-T-1", "confirmed", date(2026, 1, 5), "100.00"),
+        ("PO-T-2", "received", date(2026, 1, 9), "250.50"),
+        ("PO-T-3", "confirmed", date(2026, 1, 12), "80.25"),
+        ("PO-T-4", "received", date(2026, 1, 20), "40.00"),
+        ("PO-T-5", "draft", date(2026, 1, 21), "999.00"),
+    ):
+        db_session.add(PurchaseOrder(
+            number=number, supplier_id=sample_supplier.id, created_by=sample_user.id, status=status,
+            order_date=order_date, subtotal_ht=Decimal(subtotal), total_ttc=Decimal(subtotal) * Decimal("1.2"),
+            created_at=datetime.combine(order_date, datetime.min.time())
+        ))
+    db_session.commit()
+
+
+@pytest.fixture
+def stock_items(db_session, sample_product):
+    """One stock item with thresholds, one without and one with zero thresholds."""
+    locations = [Location(code=f"RQ-LOC-{index}", name="Planner", type="warehouse") for index in range(3)]
+    db_session.add_all(locations)
+    db_session.flush()
+    db_session.add_all([
+        StockItem(product_id=sample_product.id, location_id=locations[0].id, physical_quantity=Decimal("12"),
+                  reserved_quantity=Decimal("2"), min_stock=Decimal("5"), max_stock=Decimal("50")),
+        StockItem(product_id=sample_product.id, location_id=locations[1].id, physical_quantity=Decimal("3")),
+        StockItem(product_id=sample_product.id, location_id=locations[2].id, physical_quantity=Decimal("0"),
+                  min_stock=Decimal("0"), max_stock=Decimal("0")),
+    ])
+    db_session.commit()
+
+
+def _template(**definitions):
+    return ReportTemplate.create(name="Purchases", report_type="purchases", created_by=1, **definitions)
+
+
+class TestReportQueryPlanner:
+    """Tests for SQL push-down of custom report definitions."""
+
+    def test_untranslatable_parts_stay_in_memory(self):
+        plan = ReportQueryPlanner().plan(
+            'purchases',
+            filters=[
+                FilterCondition(field='total_ht', operator='greater_than', value='90'),
+                FilterCondition(field='supplier_name', operator='greater_than', value='M'),  # collation dependent
+                FilterCondition(field='margin', operator='equals', value=1),  # calculated field
+            ],
+            sorting=[SortDefinition(field='order_date', direction='desc')],
+            grouping=[GroupDefinition(field='status', label='Status', aggregate='sum')],
+            calculated_fields=[CalculatedField(name='margin', label='Margin', formula='total_ttc - total_ht')]
+        )
+
+        assert [f.field for f in plan.sql_filters] == ['total_ht']
+        assert [f.field for f in plan.memory_filters] == ['supplier_name', 'margin']
+        assert plan.sql_grouping is None and plan.memory_grouping[0].field == 'status'
+        assert plan.sql_sorting == [] and plan.memory_sorting[0].field == 'order_date'
+        assert ReportQueryPlanner().plan('sales') is None
+
+    def test_filters_and_sorting_run_in_sql(self, db_session, purchase_orders):
+        template = _template(
+            filters=[FilterCondition(field='order_date', operator='between', value='2026-01-06',
+                                     value2='2026-01-31').__dict__],
+            sorting=[{'field': 'total_ht', 'direction': 'desc'}],
+            calculated_fields=[{'name': 'tax', 'label': 'Tax', 'formula': 'total_ttc - total_ht'}],
+            columns=[{'field': 'purchase_order_number', 'label': 'Number'}, {'field': 'tax', 'label': 'Tax'}]
+        )
+
+        report = ReportBuilderService().build_from_template(template, date(2026, 1, 1), date(2026, 1, 31))
+
+        assert report.metadata['sql_pushdown'] == {
+            'source': 'purchases', 'filters': ['order_date'], 'grouping': None, 'sorting': ['total_ht']
+        }
+        assert [row['purchase_order_number'] for row in report.data] == ['PO-T-2', 'PO-T-3', 'PO-T-4']
+        assert [row['tax'] for row in report.data] == [Decimal('50.1'), Decimal('16.05'), Decimal('8')]
+        assert report.summary['total_orders'] == 4
+
+    def test_grouping_runs_in_sql(self, db_session, purchase_orders):
+        template = _template(
+            grouping=[{'field': 'status', 'label': 'Status', 'aggregate': 'sum'}],
+            sorting=[{'field': 'total_ht', 'direction': 'asc'}],
+            columns=[ColumnDefinition(field='status', label='Status', type='string').__dict__,
+                     ColumnDefinition(field='total_ht', label='Total', type='currency').__dict__]
+        )
+
+        report = ReportBuilderService().build_from_template(template, date(2026, 1, 1), date(2026, 1, 31))
+
+        assert report.metadata['sql_pushdown']['grouping'] == 'status'
+        assert report.data == [
+            {'status': 'confirmed', 'total_ht': Decimal('180.25')},
+            {'status': 'received', 'total_ht': Decimal('290.50')},
+        ]
+
+    def test_stock_rows_match_base_report(self, db_session, stock_items):
+        """Planned rows have the base report value types (int IDs, null thresholds, float quantities)."""
+        base = ReportService().generate_stock_report().data
+
+        planned = ReportQueryPlanner().plan('stock').execute(db_session, date(2026, 1, 1), date(2026, 1, 31))
+
+        assert len(planned) == len(base) == 3
+        for planned_row, base_row in zip(
+            sorted(planned, key=lambda row: row['location_id']),
+            sorted(base, key=lambda row: row['location_id']),
+            strict=True
+        ):
+            assert planned_row == base_row
+            assert {name: type(value) for name, value in planned_row.items()} == {
+                name: type(value) for name, value in base_row.items()
+            }
+
+    def test_purchase_rows_match_base_report(self, db_session, purchase_orders, sample_supplier):
+        """Purchase rows have the base report layout and value types."""
+        planned = ReportQueryPlanner().plan('purchases').execute(db_session, date(2026, 1, 1), date(2026, 1, 31))
+
+        base = [
+            {
+                'purchase_order_id': order.id,
+                'purchase_order_number': order.number,
+                'supplier_id': order.supplier_id,
+                'supplier_name': sample_supplier.name,
+                'order_date': str(order.order_date) if order.order_date else None,
+                'expected_delivery_date': None,
+                'status': order.status,
+                'total_ht': float(order.subtotal_ht),
+                'total_ttc': float(order.total_ttc)
+            }
+            for order in db_session.query(PurchaseOrder).filter(PurchaseOrder.status != 'draft').order_by(PurchaseOrder.id)
+        ]
+        assert sorted(planned, key=lambda row: row['purchase_order_id']) == base
+        assert all(type(row['purchase_order_id']) is int and type(row['supplier_id']) is int for row in planned)
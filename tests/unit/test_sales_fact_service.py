@@ -0,0 +1,175 @@
+"""Unit tests for SalesFactService (sales star-schema read model)."""
+import pytest
+from decimal import Decimal
+from datetime import date, datetime
+from sqlalchemy import event
+from app import create_app
+from app.application.common.domain_event_dispatcher import domain_event_dispatcher
+from app.services.sales_fact_service import SalesFactService, period_bounds
+from app.domain.models.order import Order, OrderCanceledDomainEvent, OrderLine
+from app.domain.models.sales_fact import SalesDailyFact, SalesPeriodRollup
+
+
+def _add_order(db_session, customer, user, product, number, status, created_at, quantity, unit_price):
+    order = Order(
+        number=number,
+        customer_id=customer.id,
+        created_by=user.id,
+        status=status,
+        discount_percent=Decimal("0"),
+        created_at=created_at
+    )
+    db_session.add(order)
+    db_session.flush()
+    line = OrderLine(
+        order_id=order.id,
+        product_id=product.id,
+        quantity=Decimal(quantity),
+        unit_price=Decimal(unit_price),
+        discount_percent=Decimal("0"),
+        tax_rate=Decimal("20.0"),
+        sequence=1
+    )
+    line.calculate_totals()
+    order.lines.append(line)
+    order.calculate_totals()
+    return order
+
+
+@pytest.fixture
+def orders(db_session, sample_b2b_customer, sample_user, sample_product):
+    """Orders on 2026-01-30, 2026-02-10, 2026-02-28 (draft) and 2026-03-02 (TTC totals 120, 240, 360, 480)."""
+    result = [
+        _add_order(db_session, sample_b2b_customer, sample_user, sample_product,
+                   "CMD-F-001", "confirmed", datetime(2026, 1, 30, 23, 30), "1", "100.00"),
+        _add_order(db_session, sample_b2b_customer, sample_user, sample_product,
+                   "CMD-F-002", "delivered", datetime(2026, 2, 10, 9, 0), "2", "100.00"),
+        _add_order(db_session, sample_b2b_customer, sample_user, sample_product,
+                   "CMD-F-003", "draft", datetime(2026, 2, 28, 12, 0), "3", "100.00"),
+        _add_order(db_session, sample_b2b_customer, sample_user, sample_product,
+                   "CMD-F-004", "shipped", datetime(2026, 3, 2, 0, 0), "4", "100.00"),
+    ]
+    db_session.commit()
+    SalesFactService(db_session).backfill(date(2026, 1, 1), date(2026, 3, 31))
+    db_session.commit()
+    return result
+
+
+class TestSalesFactService:
+    """Tests for sales facts, rollups and range queries."""
+
+    def test_period_bounds(self):
+        assert period_bounds('week', date(2026, 3, 4)) == (date(2026, 3, 1), date(2026, 3, 7))
+        assert period_bounds('month', date(2026, 2, 10)) == (date(2026, 2, 1), date(2026, 2, 28))
+
+    def test_backfill_builds_facts_and_rollups(self, db_session, orders):
+        assert db_session.query(SalesDailyFact).count() == 4
+        month = db_session.query(SalesPeriodRollup).filter_by(
+            period_type='month', period_start=date(2026, 2, 1), status='delivered'
+        ).one()
+        assert month.order_count == 1
+        assert month.order_total == Decimal("240.00")
+        assert month.revenue_ht == Decimal("200.00")
+        assert month.cost_amount == Decimal("100.00")
+
+    def test_totals_combine_months_and_edge_days(self, db_session, orders):
+        service = SalesFactService(db_session)
+
+        # Jan 30 (day rows) + February (month row) + Mar 1-2 (day rows)
+        totals = service.get_totals(date(2026, 1, 30), date(2026, 3, 2))
+        assert totals.order_total == Decimal("840.00")
+        assert totals.order_count == 3
+
+        all_statuses = service.get_totals(date(2026, 1, 31), date(2026, 3, 1), statuses=None)
+        assert all_statuses.order_count == 2  # delivered + draft
+
+    def test_series_by_week_and_top_lists(self, db_session, orders, sample_product, sample_b2b_customer):
+        service = SalesFactService(db_session)
+
+        series = service.get_series(date(2026, 2, 1), date(2026, 3, 7), group_by='week')
+        assert [(start, totals.order_total) for start, totals in series] == [
+            (date(2026, 2, 8), Decimal("240.00")),
+            (date(2026, 3, 1), Decimal("480.00")),
+        ]
+
+        top_products = service.get_top_products(date(2026, 1, 1), date(2026, 3, 31))
+        assert top_products[0].product_id == sample_product.id
+        assert top_products[0].quantity == Decimal("7")
+        assert top_products[0].order_count == 3
+
+        top_customers = service.get_top_customers(date(2026, 1, 1), date(2026, 3, 31))
+        assert top_customers[0].customer_id == sample_b2b_customer.id
+        assert top_customers[0].last_order_date == date(2026, 3, 2)
+
+    def test_late_correction_refreshes_slice_and_rollups(self, db_session, orders):
+        old_order = orders[1]
+        old_order.status = "canceled"
+        db_session.commit()
+
+        SalesFactService(db_session).refresh_order(old_order.id)
+        db_session.commit()
+
+        totals = SalesFactService(db_session).get_totals(date(2026, 2, 1), date(2026, 2, 28))
+        assert totals.order_total == Decimal("0")
+        canceled = db_session.query(SalesPeriodRollup).filter_by(
+            period_type='month', period_start=date(2026, 2, 1), status='canceled'
+        ).one()
+        assert canceled.order_count == 1
+
+    def test_order_event_adds_slice_change_to_shared_rollups(
+        self, db_session, orders, sample_b2c_customer, sample_user, sample_product
+    ):
+        month = db_session.query(SalesPeriodRollup).filter_by(
+            period_type='month', period_start=date(2026, 2, 1), status='delivered'
+        ).one()
+        month_id = month.id
+        new_order = _add_order(db_session, sample_b2c_customer, sample_user, sample_product,
+                               "CMD-F-005", "delivered", datetime(2026, 2, 10, 15, 0), "1", "50.00")
+        db_session.commit()
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            SalesFactService(db_session).refresh_order(new_order.id)
+            db_session.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        # The other customer's rows are untouched: the change is added in place
+        assert not [statement for statement in statements if statement.startswith("DELETE FROM sales_period_rollup")]
+        assert any("ON CONFLICT" in statement for statement in statements)
+        db_session.expire_all()
+        month = db_session.query(SalesPeriodRollup).filter_by(
+            period_type='month', period_start=date(2026, 2, 1), status='delivered'
+        ).one()
+        assert month.id == month_id
+        assert month.order_count == 2
+        assert month.order_total == Decimal("300.00")
+        week = db_session.query(SalesPeriodRollup).filter_by(
+            period_type='week', period_start=date(2026, 2, 8), status='delivered'
+        ).one()
+        assert week.revenue_ht == Decimal("250.00")
+
+    def test_cancel_event_dispatched_refreshes_old_slice(self, db_session, orders):
+        create_app()
+        old_order = orders[1]
+        previous_status = old_order.status
+        old_order.status = "canceled"
+        db_session.commit()
+
+        domain_event_dispatcher.dispatch(OrderCanceledDomainEvent(
+            order_id=old_order.id,
+            order_number=old_order.number,
+            customer_id=old_order.customer_id,
+            order_total=old_order.total,
+            previous_status=previous_status
+        ))
+
+        db_session.expire_all()
+        totals = SalesFactService(db_session).get_totals(date(2026, 2, 1), date(2026, 2, 28))
+        assert totals.order_total == Decimal("0")
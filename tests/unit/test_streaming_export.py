@@ -0,0 +1,61 @@
+"""Unit tests for streaming CSV / Excel exports."""
+import csv
+import io
+from decimal import Decimal
+from datetime import date
+from openpyxl import load_workbook
+from app.domain.models.product import Product
+from app.services.import_export import ImportExportService
+from app.services.report_export_service import ReportExportService
+from app.services.report_service import ReportData
+from app.services.streaming_export import iter_csv, estimate_column_widths, MAX_COLUMN_WIDTH
+
+
+class TestStreamingExport:
+    """Tests for chunked CSV, write-only Excel and keyset-paginated product exports."""
+
+    def test_csv_is_yielded_in_chunks(self):
+        rows = ([i, f"name {i}"] for i in range(5))
+
+        chunks = list(iter_csv(rows, chunk_rows=2))
+
+        assert len(chunks) == 3
+        assert list(csv.reader(io.StringIO(''.join(chunks)))) == [[str(i), f"name {i}"] for i in range(5)]
+        assert estimate_column_widths(['Code', 'Name'], [['A', 'x' * 80]]) == [8, MAX_COLUMN_WIDTH]
+
+    def test_products_are_exported_by_keyset_pages(self, db_session, sample_product, sample_category):
+        for index in range(4):
+            db_session.add(Product(code=f"EXP-{index}", name=f"Export {index}", price=Decimal("10.00"),
+                                   status="archived" if index == 3 else "active"))
+        db_session.commit()
+
+        products = list(ImportExportService.iter_products_for_export(status="active", batch_size=2))
+
+        assert [p['code'] for p in products] == ["TEST-PROD-001", "EXP-0", "EXP-1", "EXP-2"]
+        assert products[0]['categories'] == [{'name': sample_category.name}]
+
+        output = io.BytesIO()
+        ImportExportService.write_products_excel(iter(products), output)
+        sheet = load_workbook(io.BytesIO(output.getvalue())).active
+        values = list(sheet.values)
+        assert len(values) == 5
+        assert values[1][:4] == ("TEST-PROD-001", "Test Product", "Test product description", 99.99)
+        assert sheet.column_dimensions['B'].width >= len("Test Product")
+
+    def test_report_export_streams_rows(self):
+        report = ReportData(
+            title="Sales", report_type="sales", period_start=date(2026, 1, 1), period_end=date(2026, 1, 31),
+            data=[{'day': date(2026, 1, 5), 'revenue': Decimal("10.50")}] * 3,
+            summary={'total_revenue': 31.5, 'top_products': []}, metadata={}
+        )
+        service = ReportExportService()
+
+        lines = service.export_to_csv(report).splitlines()
+        assert lines[3:5] == ['day,revenue', '2026-01-05,10.50']
+        assert lines[-1] == 'Total Revenue,31.50'
+
+        values = list(load_workbook(io.BytesIO(service.export_to_excel(report))).active.values)
+        assert values[0][0] == "Sales"
+        assert values[2] == ('day', 'revenue')
+        assert values[3] == ('2026-01-05', 10.5)
+        assert values[-1] == ('Total Revenue', 31.5)